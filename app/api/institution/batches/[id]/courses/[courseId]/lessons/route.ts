@@ -1,12 +1,13 @@
 import { createClient } from '@/lib/supabase/server'
 import { NextResponse } from 'next/server'
+import { getAuthedUser } from '@/lib/supabase/auth'
 
 export async function GET(request: Request, { params }: { params: { id: string; courseId: string } }) {
   try {
     const supabase = await createClient()
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
@@ -66,7 +67,7 @@ export async function POST(request: Request, { params }: { params: { id: string;
     const supabase = await createClient()
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
@@ -102,7 +103,7 @@ export async function DELETE(request: Request, { params }: { params: { id: strin
     const supabase = await createClient()
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
 
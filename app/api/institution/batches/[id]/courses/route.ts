@@ -1,6 +1,7 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
 import streams from "@/lib/courses"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 function getAllCourseIds() {
   const ids: string[] = []
@@ -18,7 +19,7 @@ export async function GET(request: Request, { params }: { params: { id: string }
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -77,7 +78,7 @@ export async function POST(request: Request, { params }: { params: { id: string
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -140,7 +141,7 @@ export async function DELETE(request: Request, { params }: { params: { id: strin
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
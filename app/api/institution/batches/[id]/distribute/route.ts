@@ -1,5 +1,6 @@
 import { NextResponse } from "next/server"
 import { createClient, createAdminClient } from "@/lib/supabase/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 export async function POST(request: Request, { params }: { params: { id: string } }) {
   const { id: batchId } = await params
@@ -17,7 +18,7 @@ export async function POST(request: Request, { params }: { params: { id: string
     const supabase = await createClient()
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
 
@@ -1,13 +1,35 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
+const MAX_PAGE_SIZE = 500
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i
+
+const encodeCursor = (cursor: { t: string; id: string }) => Buffer.from(JSON.stringify(cursor)).toString("base64url")
+
+function decodeCursor(value: string | null): { t: string; id: string } | null {
+  if (!value) return null
+  try {
+    const cursor = JSON.parse(Buffer.from(value, "base64url").toString("utf8"))
+    // Both values are interpolated into a PostgREST filter, so only accept well-formed ones
+    if (!UUID_PATTERN.test(cursor?.id) || typeof cursor?.t !== "string" || Number.isNaN(Date.parse(cursor.t))) return null
+    return { t: cursor.t, id: cursor.id }
+  } catch {
+    return null
+  }
+}
+
+/**
+ * GET /api/institution/batches/[id]/members?limit=&cursor=
+ * With `limit`, returns one page of members plus `nextCursor` (and `total` on the first page).
+ */
 export async function GET(request: Request, { params }: { params: { id: string } }) {
   try {
     const supabase = await createClient()
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -26,23 +48,70 @@ export async function GET(request: Request, { params }: { params: { id: string }
       return NextResponse.json({ error: "Invalid batch id" }, { status: 400 })
     }
 
-    // Get batch members
-    const { data: batchMembers, error } = await supabase
+    const { searchParams } = new URL(request.url)
+    const limitParam = Number.parseInt(searchParams.get("limit") || "", 10)
+    const cursor = decodeCursor(searchParams.get("cursor"))
+
+    if (searchParams.get("cursor") && !cursor) {
+      return NextResponse.json({ error: "Invalid cursor" }, { status: 400 })
+    }
+
+    // Without `limit` every member is returned, as before
+    if (!Number.isFinite(limitParam) || limitParam <= 0) {
+      const { data: batchMembers, error } = await supabase
+        .from("batch_members")
+        .select(
+          `
+          *,
+          users:user_id (id, name, email)
+        `,
+        )
+        .eq("batch_id", batchId)
+
+      if (error) {
+        console.error("Error fetching batch members:", error)
+        return NextResponse.json({ error: "Failed to fetch batch members" }, { status: 500 })
+      }
+
+      return NextResponse.json({ members: batchMembers || [] })
+    }
+
+    // Keyset page ordered by (added_at, id); the total is only counted for the first page
+    const limit = Math.min(limitParam, MAX_PAGE_SIZE)
+    let query = supabase
       .from("batch_members")
       .select(
         `
         *,
         users:user_id (id, name, email)
       `,
+        cursor ? undefined : { count: "exact" },
       )
       .eq("batch_id", batchId)
 
+    if (cursor) {
+      query = query.or(`added_at.gt."${cursor.t}",and(added_at.eq."${cursor.t}",id.gt.${cursor.id})`)
+    }
+
+    const { data: batchMembers, error, count } = await query
+      .order("added_at", { ascending: true })
+      .order("id", { ascending: true })
+      .limit(limit + 1)
+
     if (error) {
       console.error("Error fetching batch members:", error)
       return NextResponse.json({ error: "Failed to fetch batch members" }, { status: 500 })
     }
 
-    return NextResponse.json({ members: batchMembers || [] })
+    const rows = batchMembers || []
+    const page = rows.slice(0, limit)
+    const last = page[page.length - 1]
+
+    return NextResponse.json({
+      members: page,
+      total: count ?? undefined,
+      nextCursor: rows.length > limit && last ? encodeCursor({ t: last.added_at, id: last.id }) : null,
+    })
   } catch (error: any) {
     console.error("Error in batch members API:", error)
     return NextResponse.json({ error: error.message || "Failed to fetch batch members" }, { status: 500 })
@@ -55,7 +124,7 @@ export async function POST(request: Request, { params }: { params: { id: string
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -108,7 +177,7 @@ export async function DELETE(request: Request, { params }: { params: { id: strin
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
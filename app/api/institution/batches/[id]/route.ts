@@ -1,5 +1,6 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 export async function GET(request: Request, { params }: { params: { id: string } }) {
   try {
@@ -7,7 +8,7 @@ export async function GET(request: Request, { params }: { params: { id: string }
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -63,7 +64,7 @@ export async function PUT(request: Request, { params }: { params: { id: string }
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -109,7 +110,7 @@ export async function DELETE(request: Request, { params }: { params: { id: strin
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -1,5 +1,6 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 function generateJoinCode(): string {
   const chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
@@ -16,9 +17,9 @@ export async function GET() {
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
-    console.log('[api/institution/batches] supabase.auth.getUser ->', { user: user ? { id: user.id, email: user.email } : null })
+    console.log('[api/institution/batches] getAuthedUser ->', { user: user ? { id: user.id, email: user.email } : null })
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -34,14 +35,16 @@ export async function GET() {
       return NextResponse.json({ error: "Not authorized" }, { status: 403 })
     }
 
-    // Get all batches for the institution
+    // Get all batches for the institution. batch_members(count) is aggregated in Postgres,
+    // so the payload stays the same size however many members the batches have; member
+    // rows are paged from /api/institution/batches/[id]/members.
     const { data: batches, error: batchesError } = await supabase
       .from("batches")
       .select(
         `
         *,
         created_by:created_by_id (name, email),
-        batch_members (id, user_id)
+        batch_members (count)
       `,
       )
       .eq("institution_id", adminProfile.institution_id)
@@ -60,10 +63,9 @@ export async function GET() {
       return NextResponse.json({ error: "Failed to fetch batches" }, { status: 500 })
     }
 
-    // Add member count to each batch
-    const batchesWithCount = batches?.map((batch: any) => ({
+    const batchesWithCount = batches?.map(({ batch_members, ...batch }: any) => ({
       ...batch,
-      member_count: batch.batch_members?.length || 0,
+      member_count: batch_members?.[0]?.count || 0,
     }))
 
     return NextResponse.json({ batches: batchesWithCount || [] })
@@ -83,7 +85,7 @@ export async function POST(request: Request) {
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -1,12 +1,13 @@
 import { NextResponse } from "next/server"
 import { createClient } from "@/lib/supabase/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 export async function GET(request: Request) {
   try {
     const supabase = await createClient()
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
 
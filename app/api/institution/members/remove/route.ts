@@ -1,5 +1,7 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
+import { invalidateInstitutionStats } from "@/lib/institution/stats-cache"
 
 export async function POST(request: Request) {
   try {
@@ -9,7 +11,7 @@ export async function POST(request: Request) {
     // Get current user
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -35,6 +37,7 @@ export async function POST(request: Request) {
 
     if (deleteError) throw deleteError
 
+    invalidateInstitutionStats(adminProfile.institution_id)
     return NextResponse.json({ success: true, message: "Member removed successfully" })
   } catch (error: any) {
     console.error("Error removing member:", error)
@@ -1,6 +1,29 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
+const SORTS = new Set(["name", "email", "interviews", "score", "joined"])
+const MAX_PAGE_SIZE = 500
+
+const encodeCursor = (cursor: unknown) => Buffer.from(JSON.stringify(cursor)).toString("base64url")
+
+function decodeCursor(value: string | null) {
+  if (!value) return null
+  try {
+    const cursor = JSON.parse(Buffer.from(value, "base64url").toString("utf8"))
+    return cursor && typeof cursor.id === "string" ? cursor : null
+  } catch {
+    return null
+  }
+}
+
+/**
+ * GET /api/institution/members?search=&sort=name|email|interviews|score|joined&order=asc|desc&limit=&cursor=
+ * Members of the caller's institution with completed-interview counts and average scores,
+ * aggregated by get_institution_members (scripts/027_create_institution_members_function.sql).
+ * With `limit` the response is one keyset page plus `nextCursor`; without it every member is
+ * returned (walked page by page), for callers that need the full roster.
+ */
 export async function GET(request: Request) {
   try {
     const supabase = await createClient()
@@ -8,7 +31,7 @@ export async function GET(request: Request) {
     // Get current user
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -25,68 +48,50 @@ export async function GET(request: Request) {
       return NextResponse.json({ error: "Not authorized" }, { status: 403 })
     }
 
-    // Get all members of the institution
-    const { data: institutionMembers, error: membersError } = await supabase
-      .from("institution_members")
-      .select(
-        `
-        user_id,
-        role,
-        joined_at,
-        users!inner (
-          id,
-          email,
-          name,
-          created_at
-        )
-      `,
-      )
-      .eq("institution_id", adminProfile.institution_id)
-
-    if (membersError) {
-      console.error("Error fetching members:", membersError)
-      return NextResponse.json({ error: "Failed to fetch members" }, { status: 500 })
+    const { searchParams } = new URL(request.url)
+    const sort = SORTS.has(searchParams.get("sort") || "") ? searchParams.get("sort")! : "name"
+    const descending = searchParams.get("order") === "desc"
+    const search = searchParams.get("search")?.trim() || null
+    const limitParam = Number.parseInt(searchParams.get("limit") || "", 10)
+    const paged = Number.isFinite(limitParam) && limitParam > 0
+
+    if (searchParams.get("cursor") && !decodeCursor(searchParams.get("cursor"))) {
+      return NextResponse.json({ error: "Invalid cursor" }, { status: 400 })
     }
 
-    // Get interview stats for each member
-    const membersWithStats = await Promise.all(
-      (institutionMembers || []).map(async (member: any) => {
-        // Get completed interviews count
-        const { data: interviews } = await supabase
-          .from("interviews")
-          .select("id")
-          .eq("user_id", member.user_id)
-          .eq("status", "completed")
-
-        const interviewIds = interviews?.map((i) => i.id) || []
-
-        // Get average score
-        let avgScore = 0
-        if (interviewIds.length > 0) {
-          const { data: results } = await supabase
-            .from("interview_results")
-            .select("overall_score")
-            .in("interview_id", interviewIds)
-
-          if (results && results.length > 0) {
-            avgScore = Math.round(results.reduce((sum, r) => sum + r.overall_score, 0) / results.length)
-          }
-        }
-
-        return {
-          id: member.user_id,
-          memberRowId: member.id, // institution_members row id
-          name: member.users.name || "No name",
-          email: member.users.email,
-          role: member.role || "member",
-          total_interviews: interviews?.length || 0,
-          avg_score: avgScore,
-          last_active: member.users.created_at,
-        }
-      }),
-    )
-
-    return NextResponse.json({ members: membersWithStats })
+    const members: any[] = []
+    let cursor = decodeCursor(searchParams.get("cursor"))
+    let total = 0
+
+    do {
+      const { data: result, error } = await supabase.rpc("get_institution_members", {
+        p_institution_id: adminProfile.institution_id,
+        p_search: search,
+        p_sort: sort,
+        p_desc: descending,
+        p_limit: paged ? Math.min(limitParam, MAX_PAGE_SIZE) : MAX_PAGE_SIZE,
+        p_cursor: cursor,
+      })
+
+      if (error) {
+        console.error("[v0] Error fetching members:", error)
+        return NextResponse.json({ error: "Failed to fetch members" }, { status: 500 })
+      }
+
+      if (!result?.success) {
+        return NextResponse.json({ error: result?.message || "Not authorized" }, { status: 403 })
+      }
+
+      members.push(...(result.members || []))
+      total = result.total || 0
+      cursor = result.next_cursor || null
+    } while (!paged && cursor)
+
+    return NextResponse.json({
+      members,
+      total,
+      nextCursor: paged && cursor ? encodeCursor(cursor) : null,
+    })
   } catch (error: any) {
     console.error("Error in members API:", error)
     return NextResponse.json({ error: error.message || "Failed to fetch members" }, { status: 500 })
@@ -1,18 +1,102 @@
 import { NextResponse } from "next/server"
 import { createClient } from "@/lib/supabase/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
+import { sseResponse } from "@/lib/api/sse"
+import { MultipartError, readMultipartFile, type MultipartFile } from "@/lib/api/multipart"
+import { invalidateInstitutionStats } from "@/lib/institution/stats-cache"
+import { addRosterMembers, resolveRoster, type RosterProgress } from "@/lib/institution/roster-ingest"
+import {
+  createRosterScan,
+  RosterTooLargeError,
+  scanRosterStream,
+  scanRosterText,
+  scanRosterWorkbook,
+  type RosterScan,
+} from "@/lib/institution/roster-parse"
 
 // Note: This route requires the following npm packages:
 // - xlsx (sheetjs)
 // - pdf-parse
 // Install them in your project before using: npm install xlsx pdf-parse
 
-function extractEmailsFromText(text: string) {
-  const emailRegex = /[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}/gi
-  const matches = text.match(emailRegex)
-  if (!matches) return []
-  // Normalize and dedupe
-  const unique = Array.from(new Set(matches.map((m) => m.toLowerCase())))
-  return unique
+type OnProgress = (progress: RosterProgress) => void
+
+async function scanUpload(file: MultipartFile, onProgress?: OnProgress): Promise<RosterScan> {
+  const lower = (file.name || "upload").toLowerCase()
+  const onRows = onProgress && ((rows: number) => onProgress({ stage: "parsing", processed: rows, total: 0 }))
+
+  if (lower.endsWith(".pdf") || file.type === "application/pdf") {
+    // PDF text extraction needs the whole document; scan the extracted text line by line
+    const pdfParse = (await import("pdf-parse")).default || (await import("pdf-parse"))
+    const pdf = await pdfParse(Buffer.from(await file.arrayBuffer()))
+    const scan = createRosterScan()
+    for (const line of String(pdf.text || "").split("\n")) scanRosterText(scan, line)
+    return scan
+  }
+
+  if (lower.endsWith(".xlsx") || lower.endsWith(".xls")) {
+    // Workbooks are zip containers, so the bytes are read once; cells are then walked row
+    // by row without building a CSV string, and formulas/styles/HTML are not materialised
+    const xlsx = await import("xlsx")
+    const workbook = xlsx.read(Buffer.from(await file.arrayBuffer()), {
+      type: "buffer",
+      cellFormula: false,
+      cellHTML: false,
+      cellStyles: false,
+      cellText: false,
+      sheetStubs: false,
+    })
+    return scanRosterWorkbook(xlsx, workbook, { onRows })
+  }
+
+  // CSV, text and anything else: decode and scan the request body one line at a time as it arrives
+  return scanRosterStream(file.stream(), { onRows })
+}
+
+async function ingestRoster(
+  supabase: any,
+  institutionId: string,
+  file: MultipartFile,
+  preview: boolean,
+  onProgress?: OnProgress,
+): Promise<{ status: number; body: Record<string, unknown> }> {
+  let scan: RosterScan
+  try {
+    scan = await scanUpload(file, onProgress)
+  } catch (error) {
+    if (error instanceof RosterTooLargeError) return { status: 413, body: { error: error.message } }
+    // The file part is read while scanning, so a truncated or malformed upload surfaces here
+    if (error instanceof MultipartError) return { status: 400, body: { error: error.message } }
+    throw error
+  }
+
+  if (!scan.emails.size) {
+    return { status: 400, body: { error: "No email addresses found in file" } }
+  }
+
+  const stats = { rows: scan.rows, emails: scan.emails.size, duplicates: scan.duplicates }
+  const { found, notFound, alreadyMembers, toAdd } = await resolveRoster(
+    supabase,
+    institutionId,
+    scan.emails,
+    onProgress,
+  )
+
+  // If preview requested, return lists without inserting
+  if (preview) {
+    return { status: 200, body: { found, notFound, alreadyMembers, stats } }
+  }
+
+  const { added, failed } = await addRosterMembers(supabase, institutionId, toAdd, onProgress)
+  if (added.length) invalidateInstitutionStats(institutionId)
+  if (failed.length && !added.length) {
+    return { status: 500, body: { error: "Failed to add members" } }
+  }
+
+  // Skipped are those already existing, plus any chunk that failed to insert
+  const skipped = [...alreadyMembers.map((email) => ({ email, reason: "already a member" })), ...failed]
+
+  return { status: 200, body: { added, notFound, skipped, stats } }
 }
 
 export async function POST(request: Request) {
@@ -33,7 +117,7 @@ export async function POST(request: Request) {
     } else {
       const {
         data: { user },
-      } = await supabase.auth.getUser()
+      } = await getAuthedUser(supabase)
 
       if (!user) return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
 
@@ -46,121 +130,34 @@ export async function POST(request: Request) {
       institutionId = adminProfile.institution_id
     }
 
-    const form = await request.formData()
-    const file = form.get("file") as any
-    if (!file) return NextResponse.json({ error: "No file provided" }, { status: 400 })
-
-    const filename = file.name || "upload"
-    const arrayBuffer = await file.arrayBuffer()
-    const buffer = Buffer.from(arrayBuffer)
-
-    let emails: string[] = []
-
-    const lower = filename.toLowerCase()
-    if (lower.endsWith(".csv") || file.type === "text/csv" || lower.endsWith(".txt")) {
-      const text = buffer.toString("utf-8")
-      emails = extractEmailsFromText(text)
-    } else if (lower.endsWith(".pdf") || file.type === "application/pdf") {
-      const pdfParse = (await import('pdf-parse')).default || (await import('pdf-parse'))
-      const pdf = await pdfParse(buffer)
-      emails = extractEmailsFromText(pdf.text)
-    } else if (lower.endsWith(".xlsx") || lower.endsWith(".xls")) {
-      const xlsx = await import('xlsx')
-      const workbook = xlsx.read(buffer, { type: "buffer" })
-      let text = ""
-      workbook.SheetNames.forEach((sheetName: string) => {
-        const ws = workbook.Sheets[sheetName]
-        const sheetText = xlsx.utils.sheet_to_csv(ws) || ""
-        text += "\n" + sheetText
-      })
-      emails = extractEmailsFromText(text)
-    } else {
-      // Fallback to trying CSV parse
-      const text = buffer.toString("utf-8")
-      emails = extractEmailsFromText(text)
-    }
-
-    if (!emails.length) {
-      return NextResponse.json({ error: "No email addresses found in file" }, { status: 400 })
+    // Parsed from request.body as it arrives instead of request.formData(), which would buffer
+    // the whole upload first; only the part headers are read before responding
+    let file: MultipartFile | null
+    try {
+      file = await readMultipartFile(request, "file")
+    } catch (error) {
+      if (error instanceof MultipartError) return NextResponse.json({ error: error.message }, { status: 400 })
+      throw error
     }
+    if (!file) return NextResponse.json({ error: "No file provided" }, { status: 400 })
+    const upload = file
 
-    // Get user rows for these emails
-    const { data: users } = await supabase.from("users").select("id,email").in("email", emails)
-
-    const usersList = users || []
-    const foundEmails = usersList.map((u: any) => u.email.toLowerCase())
-    const notFound = emails.filter((e) => !foundEmails.includes(e.toLowerCase()))
-
-    // For found users, check existing institution_members
-    const userIds = usersList.map((u: any) => u.id)
-
-    // Determine institution ID to use for membership checks (from admin session or service key header)
-    const targetInstitutionId = institutionId || adminProfile?.institution_id
-
-    // If preview requested, return lists without inserting
     const url = new URL(request.url)
-    if (url.searchParams.get('preview') === '1') {
-      let existingUserIds: string[] = []
-      if (userIds.length > 0) {
-        const { data: existingMembers } = await supabase
-          .from("institution_members")
-          .select("user_id")
-          .eq("institution_id", targetInstitutionId)
-          .in("user_id", userIds)
-
-        existingUserIds = (existingMembers || []).map((m: any) => m.user_id)
-      }
-
-      const alreadyMembers = usersList.filter((u: any) => existingUserIds.includes(u.id)).map((u: any) => u.email)
-      const found = usersList.map((u: any) => u.email)
-
-      return NextResponse.json({ found, notFound, alreadyMembers })
-    }
-
-    if (userIds.length === 0) {
-      return NextResponse.json({ added: [], notFound, skipped: [] })
-    }
-
-    const { data: existingMembers } = await supabase
-      .from("institution_members")
-      .select("user_id")
-      .eq("institution_id", targetInstitutionId)
-      .in("user_id", userIds)
-
-    const existingUserIds = (existingMembers || []).map((m: any) => m.user_id)
-
-    const toAdd = usersList.filter((u: any) => !existingUserIds.includes(u.id))
-
-    const added: string[] = []
-    const skipped: any[] = []
-
-    if (toAdd.length > 0) {
-      const inserts = toAdd.map((u: any) => ({
-        user_id: u.id,
-        institution_id: targetInstitutionId,
-        role: "member",
-        joined_at: new Date().toISOString(),
-      }))
-
-      const { data: insertData, error: insertError } = await supabase.from("institution_members").insert(inserts).select()
-
-      if (insertError) {
-        console.error("Error inserting members:", insertError)
-        return NextResponse.json({ error: "Failed to add members" }, { status: 500 })
-      }
-
-      // Update users.institution_id for added users
-      const idsToUpdate = toAdd.map((u: any) => u.id)
-      const { error: updateError } = await supabase.from("users").update({ institution_id: targetInstitutionId }).in("id", idsToUpdate)
-      if (updateError) console.error("Error updating users.institution_id:", updateError)
-
-      added.push(...toAdd.map((u: any) => u.email))
+    const preview = url.searchParams.get("preview") === "1"
+    const targetInstitutionId = institutionId as string
+
+    // ?stream=1 reports progress as server-sent events and ends with a `result` event
+    if (url.searchParams.get("stream") === "1") {
+      return sseResponse(async (send) => {
+        const outcome = await ingestRoster(supabase, targetInstitutionId, upload, preview, (progress) =>
+          send("progress", progress),
+        )
+        send(outcome.status >= 400 ? "error" : "result", outcome.body)
+      })
     }
 
-    // Skipped are those already existing
-    skipped.push(...usersList.filter((u: any) => existingUserIds.includes(u.id)).map((u: any) => ({ email: u.email, reason: "already a member" })))
-
-    return NextResponse.json({ added, notFound, skipped })
+    const outcome = await ingestRoster(supabase, targetInstitutionId, upload, preview)
+    return NextResponse.json(outcome.body, { status: outcome.status })
   } catch (error: any) {
     console.error("Error processing upload:", error)
     return NextResponse.json({ error: error.message || "Failed to process file" }, { status: 500 })
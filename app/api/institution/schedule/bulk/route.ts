@@ -0,0 +1,67 @@
+import { createClient } from "@/lib/supabase/server"
+import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
+import { invalidateInstitutionStats } from "@/lib/institution/stats-cache"
+
+/**
+ * POST /api/institution/schedule/bulk
+ * Body: { batchId, course, difficulty, scheduledDate, deadline?, duration? }
+ * Schedules the interview for every member of the batch in one SQL call
+ * (scripts/026_create_schedule_batch_function.sql) and returns per-member outcomes.
+ */
+export async function POST(request: Request) {
+  try {
+    const supabase = await createClient()
+    const body = await request.json()
+    const batchId = body.batchId || body.batch_id
+    const { course, difficulty, scheduledDate, deadline, duration } = body
+
+    if (!batchId || !course || !scheduledDate) {
+      return NextResponse.json({ error: "batchId, course and scheduledDate are required" }, { status: 400 })
+    }
+    if (Number.isNaN(Date.parse(scheduledDate)) || (deadline && Number.isNaN(Date.parse(deadline)))) {
+      return NextResponse.json({ error: "Invalid scheduledDate or deadline" }, { status: 400 })
+    }
+
+    const {
+      data: { user },
+    } = await getAuthedUser(supabase)
+
+    if (!user) {
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
+    }
+
+    const { data: result, error } = await supabase.rpc("schedule_batch_interviews", {
+      p_batch_id: batchId,
+      p_course: course,
+      p_difficulty: difficulty || null,
+      p_scheduled_date: scheduledDate,
+      p_deadline: deadline || null,
+      p_duration: Math.max(5, Math.min(180, Number(duration) || 30)),
+    })
+
+    if (error) {
+      console.error("[v0] schedule/bulk: rpc error=", error)
+      return NextResponse.json({ error: error.message || "Failed to schedule interviews" }, { status: 500 })
+    }
+
+    if (!result?.success) {
+      const status = result?.code === "forbidden" ? 403 : 400
+      return NextResponse.json({ error: result?.message || "Failed to schedule interviews" }, { status })
+    }
+
+    console.log("[v0] schedule/bulk: batch scheduled", { batchId, scheduled: result.scheduled, skipped: result.skipped })
+
+    if (result.scheduled > 0) invalidateInstitutionStats(result.institution_id)
+
+    return NextResponse.json({
+      success: true,
+      scheduled: result.scheduled,
+      skipped: result.skipped,
+      results: result.results,
+    })
+  } catch (error: any) {
+    console.error("Error bulk scheduling interviews:", error)
+    return NextResponse.json({ error: error.message || "Failed to schedule interviews" }, { status: 500 })
+  }
+}
@@ -1,5 +1,7 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
+import { invalidateInstitutionStats } from "@/lib/institution/stats-cache"
 
 export async function POST(request: Request) {
   try {
@@ -8,7 +10,7 @@ export async function POST(request: Request) {
 
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -68,12 +70,14 @@ export async function POST(request: Request) {
         }
 
         console.log('[v0] schedule/create: scheduled interview created (fallback, no duration)')
+        invalidateInstitutionStats(adminProfile.institution_id)
         return NextResponse.json({ success: true, message: "Interview scheduled successfully (no duration column)" })
       }
 
       throw insertError
     }
 
+    invalidateInstitutionStats(adminProfile.institution_id)
     return NextResponse.json({ success: true, message: "Interview scheduled successfully" })
   } catch (error: any) {
     console.error("Error scheduling interview:", error)
@@ -1,6 +1,18 @@
 import { createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
+import {
+  cacheInstitutionStats,
+  getCachedInstitutionStats,
+  type InstitutionStats,
+} from "@/lib/institution/stats-cache"
 
+/**
+ * GET /api/institution/stats
+ * Dashboard stats for the caller's institution, aggregated in Postgres by
+ * get_institution_stats (scripts/025_create_institution_stats_function.sql) and cached
+ * for a few seconds per institution (lib/institution/stats-cache.ts).
+ */
 export async function GET() {
   try {
     const supabase = await createClient()
@@ -8,7 +20,7 @@ export async function GET() {
     // Get current user
     const {
       data: { user },
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (!user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
@@ -25,47 +37,34 @@ export async function GET() {
       return NextResponse.json({ error: "Not authorized" }, { status: 403 })
     }
 
-    // Get all members
-    const { data: members } = await supabase
-      .from("institution_members")
-      .select("user_id")
-      .eq("institution_id", adminProfile.institution_id)
-
-    const memberIds = members?.map((m) => m.user_id) || []
-
-    // Get scheduled interviews count
-    const { count: scheduledCount } = await supabase
-      .from("scheduled_interviews")
-      .select("*", { count: "exact", head: true })
-      .eq("institution_id", adminProfile.institution_id)
-      .eq("status", "pending")
+    const cached = getCachedInstitutionStats(adminProfile.institution_id)
+    if (cached) {
+      return NextResponse.json(cached)
+    }
 
-    // Get completed interviews for all members
-    const { data: interviews } = await supabase
-      .from("interviews")
-      .select("id")
-      .in("user_id", memberIds)
-      .eq("status", "completed")
+    const { data: result, error } = await supabase.rpc("get_institution_stats", {
+      p_institution_id: adminProfile.institution_id,
+    })
 
-    const interviewIds = interviews?.map((i) => i.id) || []
+    if (error) {
+      console.error("[v0] Error fetching institution stats:", error)
+      return NextResponse.json({ error: error.message || "Failed to fetch stats" }, { status: 500 })
+    }
 
-    // Get average score
-    const { data: results } = await supabase
-      .from("interview_results")
-      .select("overall_score")
-      .in("interview_id", interviewIds)
+    if (!result?.success) {
+      return NextResponse.json({ error: result?.message || "Not authorized" }, { status: 403 })
+    }
 
-    const avgScore =
-      results && results.length > 0
-        ? Math.round(results.reduce((sum, r) => sum + r.overall_score, 0) / results.length)
-        : 0
+    const stats: InstitutionStats = {
+      totalMembers: result.total_members || 0,
+      activeMembers: result.active_members || 0,
+      scheduledInterviews: result.scheduled_interviews || 0,
+      averageScore: result.average_score || 0,
+      totalInterviews: result.total_interviews || 0,
+    }
+    cacheInstitutionStats(adminProfile.institution_id, stats)
 
-    return NextResponse.json({
-      totalMembers: members?.length || 0,
-      scheduledInterviews: scheduledCount || 0,
-      averageScore: avgScore,
-      totalInterviews: interviews?.length || 0,
-    })
+    return NextResponse.json(stats)
   } catch (error: any) {
     console.error("Error fetching stats:", error)
     return NextResponse.json({ error: error.message || "Failed to fetch stats" }, { status: 500 })
@@ -0,0 +1,26 @@
+import { NextResponse } from "next/server"
+import { drainAnalysisJobs } from "@/lib/interview/analysis-jobs"
+
+export const maxDuration = 60
+
+/**
+ * POST /api/interview/analysis-jobs
+ * Drains the analysis job queue for up to ~50s. Called by scripts/analysis_worker.js or a
+ * scheduler with `Authorization: Bearer $ANALYSIS_WORKER_SECRET`.
+ */
+export async function POST(request: Request) {
+  const secret = process.env.ANALYSIS_WORKER_SECRET
+  if (!secret || request.headers.get("authorization") !== `Bearer ${secret}`) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
+  }
+
+  try {
+    const workerId = request.headers.get("x-worker-id") || undefined
+    const stats = await drainAnalysisJobs({ workerId })
+    return NextResponse.json(stats)
+  } catch (error) {
+    console.error("[v0] analysis-jobs: drain failed:", error)
+    const errorMsg = error instanceof Error ? error.message : String(error)
+    return NextResponse.json({ error: errorMsg }, { status: 500 })
+  }
+}
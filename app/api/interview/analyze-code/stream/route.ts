@@ -0,0 +1,74 @@
+import { streamText } from "ai"
+import { createGroq } from "@ai-sdk/groq"
+import { NextResponse } from "next/server"
+import { createClient } from "@/lib/supabase/server"
+import { isRateLimited, rateLimitKeyFromRequest } from "@/lib/api/rate-limit"
+import { createSentenceChunker, sseResponse } from "@/lib/api/sse"
+import { buildCodeAnalysisPrompt, codeAnalysisRequestSchema } from "@/lib/interview/code-analysis"
+import { getAuthedUser } from "@/lib/supabase/auth"
+
+const groqClient = createGroq({
+  apiKey: process.env.GROQ_API_KEY,
+})
+
+/**
+ * Streaming variant of POST /api/interview/analyze-code.
+ * Emits SSE events: `token` {text}, `sentence` {text}, `done` {feedback}, `error` {error}.
+ */
+export async function POST(request: Request) {
+  let body: unknown
+  try {
+    body = await request.json()
+  } catch {
+    return NextResponse.json({ error: "Invalid JSON body" }, { status: 400 })
+  }
+  const parsed = codeAnalysisRequestSchema.safeParse(body)
+  if (!parsed.success) {
+    return NextResponse.json({ error: parsed.error.flatten().fieldErrors }, { status: 400 })
+  }
+  const { code, problem } = parsed.data
+
+  try {
+    const supabase = await createClient()
+    const {
+      data: { user },
+      error: authError,
+    } = await getAuthedUser(supabase)
+    if (authError || !user) {
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
+    }
+
+    const rateKey = rateLimitKeyFromRequest(request, user.id)
+    if (await isRateLimited(rateKey, 10, 60_000)) {
+      return NextResponse.json({ error: "Too many requests, slow down." }, { status: 429 })
+    }
+  } catch (error) {
+    console.error("[v0] Error analyzing code:", error)
+    return NextResponse.json(
+      { error: error instanceof Error ? error.message : "Failed to analyze code" },
+      { status: 500 },
+    )
+  }
+
+  return sseResponse(async (send) => {
+    const chunker = createSentenceChunker()
+    let feedback = ""
+
+    const result = streamText({
+      model: groqClient("llama-3.3-70b-versatile"),
+      prompt: buildCodeAnalysisPrompt(problem, code),
+      temperature: 0.7,
+      maxOutputTokens: 500,
+    })
+
+    for await (const token of result.textStream) {
+      feedback += token
+      send("token", { text: token })
+      for (const sentence of chunker.push(token)) send("sentence", { text: sentence })
+    }
+
+    const rest = chunker.flush()
+    if (rest) send("sentence", { text: rest })
+    send("done", { feedback })
+  })
+}
@@ -4,6 +4,7 @@ import { createAdminClient, createClient } from "@/lib/supabase/server"
 import { NextResponse } from "next/server"
 import { z } from "zod"
 import { isRateLimited, rateLimitKeyFromRequest } from "@/lib/api/rate-limit"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 const groqClient = createGroq({
   apiKey: process.env.GROQ_API_KEY,
@@ -28,13 +29,13 @@ export async function GET(request: Request) {
     const {
       data: { user },
       error: authError,
-    } = await supabaseAuth.auth.getUser()
+    } = await getAuthedUser(supabaseAuth)
     if (authError || !user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
     }
 
     const rateKey = rateLimitKeyFromRequest(request, user.id)
-    if (isRateLimited(rateKey, 10, 60_000)) {
+    if (await isRateLimited(rateKey, 10, 60_000)) {
       return NextResponse.json({ error: "Too many requests, slow down." }, { status: 429 })
     }
 
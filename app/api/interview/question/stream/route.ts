@@ -0,0 +1,133 @@
+import { generateText, streamText } from "ai"
+import { createGroq } from "@ai-sdk/groq"
+import { NextResponse } from "next/server"
+import { createClient } from "@/lib/supabase/server"
+import { isRateLimited, rateLimitKeyFromRequest } from "@/lib/api/rate-limit"
+import { createSentenceChunker, sseResponse } from "@/lib/api/sse"
+import { buildQuestionPrompt, createCandidateSplitter, withCandidateInstructions } from "@/lib/interview/question-prompt"
+import { generateQuestionHash } from "@/lib/interview/question-pool"
+import { isQuestionAllowed, recordAskedQuestions } from "@/lib/interview/question-history"
+import {
+  CANDIDATES_PER_GENERATION,
+  loadQuestionContext,
+  takePooledQuestion,
+  warmQuestionPool,
+} from "@/lib/interview/question-context"
+import { getAuthedUser } from "@/lib/supabase/auth"
+
+const groqClient = createGroq({
+  apiKey: process.env.GROQ_API_KEY,
+})
+
+/**
+ * Streaming variant of POST /api/interview/question.
+ * Emits SSE events: `sentence` {text}, `done` {question, source}, `error` {error}.
+ * Pooled questions are sent at once. Generated ones use the same candidate prompt and
+ * dedup as the JSON endpoint: the model writes several alternatives, each is checked as soon
+ * as it is complete, and the first one not asked before is sent sentence by sentence while the
+ * remaining alternatives are still generating. Nothing is sent until a candidate passes, so a
+ * repeat is never spoken; if none passes, an `error` event lets the client fall back to the
+ * JSON endpoint, which regenerates.
+ */
+export async function POST(request: Request) {
+  let body: any
+  try {
+    body = await request.json()
+  } catch {
+    return NextResponse.json({ error: "Invalid JSON body" }, { status: 400 })
+  }
+  const { interviewId, interviewType, questionNumber, previousAnswers, customScenario, questionCount } = body || {}
+
+  const supabase = await createClient()
+
+  const {
+    data: { user },
+    error: authError,
+  } = await getAuthedUser(supabase)
+
+  if (authError || !user) {
+    return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
+  }
+
+  const rateKey = rateLimitKeyFromRequest(request, user.id)
+  if (await isRateLimited(rateKey, 20, 60_000)) {
+    return NextResponse.json({ error: "Too many requests, slow down." }, { status: 429 })
+  }
+
+  const ctx = await loadQuestionContext(supabase, user.id, {
+    interviewId,
+    interviewType,
+    questionNumber,
+    previousAnswers,
+    customScenario,
+    questionCount,
+  })
+  const { asked, seenInInterview } = ctx
+
+  warmQuestionPool(ctx, async (prefillPrompt) => {
+    const { text } = await generateText({ model: groqClient("llama-3.3-70b-versatile"), prompt: prefillPrompt, temperature: 0.8 })
+    return text
+  })
+
+  const pooled = await takePooledQuestion(supabase, ctx)
+
+  return sseResponse(async (send) => {
+    const chunker = createSentenceChunker()
+    const sendQuestion = (question: string) => {
+      for (const sentence of chunker.push(`${question} `)) send("sentence", { text: sentence })
+      const rest = chunker.flush()
+      if (rest) send("sentence", { text: rest })
+    }
+
+    if (pooled) {
+      sendQuestion(pooled)
+      send("done", { question: pooled, source: "pool" })
+      return
+    }
+
+    type Candidate = { text: string; hash: string }
+    let pick: Candidate | null = null
+    const repeats: Candidate[] = []
+
+    const consider = (text: string) => {
+      const candidate = { text, hash: generateQuestionHash(text) }
+      if (seenInInterview.has(candidate.hash)) return
+      if (!pick && isQuestionAllowed(asked, candidate.hash)) {
+        pick = candidate
+        sendQuestion(candidate.text)
+      } else if (asked.hashes.has(candidate.hash)) {
+        // Recorded like the JSON endpoint does, so times_asked reflects every attempt
+        repeats.push(candidate)
+      }
+    }
+
+    const splitter = createCandidateSplitter()
+    try {
+      const result = streamText({
+        model: groqClient("llama-3.3-70b-versatile"),
+        prompt: withCandidateInstructions(buildQuestionPrompt(ctx.promptInput), CANDIDATES_PER_GENERATION),
+        temperature: 0.8,
+      })
+
+      for await (const token of result.textStream) {
+        for (const text of splitter.push(token)) consider(text)
+      }
+    } catch (error) {
+      console.error("[v0] question/stream: generation failed:", error instanceof Error ? error.message : error)
+      // Once a question has been spoken the stream must finish with it
+      if (!pick) throw error
+    }
+    for (const text of splitter.flush()) consider(text)
+
+    const chosen = pick as Candidate | null
+    await recordAskedQuestions(supabase, asked, chosen ? [chosen, ...repeats] : repeats)
+
+    if (!chosen) {
+      console.log("[v0] question/stream: every candidate was already asked; client falls back to the JSON endpoint")
+      throw new Error("No new question generated")
+    }
+
+    // Not pooled: this generation is personalized; warmQuestionPool fills the pool instead
+    send("done", { question: chosen.text, source: "generated" })
+  })
+}
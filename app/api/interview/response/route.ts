@@ -1,5 +1,7 @@
 import { createClient } from "@/lib/supabase/server"
-import { NextResponse } from "next/server"
+import { after, NextResponse } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
+import { scoreSavedResponse } from "@/lib/interview/answer-scoring"
 
 export async function POST(request: Request) {
   try {
@@ -22,7 +24,7 @@ export async function POST(request: Request) {
     const {
       data: { user },
       error: authError,
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
 
     if (authError || !user) {
       console.error("[v0] Authentication error:", authError)
@@ -34,7 +36,7 @@ export async function POST(request: Request) {
     // Verify the interview exists and belongs to this user
     const { data: interview, error: interviewError } = await supabase
       .from("interviews")
-      .select("id, user_id")
+      .select("id, user_id, interview_type")
       .eq("id", interviewId)
       .single()
 
@@ -75,6 +77,9 @@ export async function POST(request: Request) {
     console.log("[v0] Response saved successfully! ID:", data[0].id)
     console.log("[v0] === RESPONSE SAVE COMPLETE ===")
 
+    // Score this answer while the interview continues, so the final analysis only merges
+    after(() => scoreSavedResponse(data[0], interview.interview_type || "technical"))
+
     return NextResponse.json({ success: true, data: data[0] })
   } catch (error) {
     console.error("[v0] Unexpected error in save response:", error)
@@ -34,62 +34,33 @@ export async function POST(request: Request) {
     const cost = getInterviewCost(duration || 15)
     const supabase = await createAdminClient()
 
-    // OPTIMIZATION: Run user upsert and credit check in PARALLEL
-    const [userResult, creditResult] = await Promise.all([
-      // User upsert (fire and forget style - we don't block on errors)
-      supabase.from("users").upsert(
-        { id: userId, email: userEmail || `user_${userId}@mockzen.app`, name: userName || "User" },
-        { onConflict: "id", ignoreDuplicates: false }
-      ).then(res => res).catch(() => ({ error: null })),
-      
-      // Credit check
-      supabase.from("user_credits").select("balance").eq("user_id", userId).maybeSingle()
-    ])
-
-    // Handle credit check result
-    if (creditResult.error) {
-      return NextResponse.json({ error: "Could not verify credits" }, { status: 500 })
-    }
-
-    const balance = creditResult.data?.balance ?? 0
-    if (balance < cost) {
-      return NextResponse.json({ error: "Not enough credits" }, { status: 402 })
-    }
-
-    // OPTIMIZATION: Deduct credits and create interview in PARALLEL
-    const [deductResult, interviewResult] = await Promise.all([
-      // Deduct credits
-      supabase.from("user_credits").update({ balance: balance - cost }).eq("user_id", userId),
-      
-      // Create interview
-      supabase.from("interviews").insert({
-        user_id: userId,
-        interview_type: interviewType,
-        status: "in_progress",
-        started_at: new Date().toISOString(),
-        difficulty: difficulty || "intermediate",
-        question_count: questionCount,
-      }).select().single()
-    ])
+    // Balance check, debit, interview insert and transaction log run in one SQL function
+    // (scripts/017_create_start_interview_function.sql) so concurrent starts can't double-spend.
+    const { data: rpcResult, error: rpcError } = await supabase.rpc("start_interview_with_credits", {
+      p_user_id: userId,
+      p_email: userEmail || `user_${userId}@mockzen.app`,
+      p_name: userName || "User",
+      p_interview_type: interviewType,
+      p_difficulty: difficulty || "intermediate",
+      p_question_count: questionCount,
+      p_cost: cost,
+      p_metadata: { interviewType, duration, difficulty, customScenario },
+    })
 
-    if (deductResult.error) {
-      return NextResponse.json({ error: "Could not deduct credits" }, { status: 500 })
+    if (rpcError) {
+      console.error("[interview/start] rpc error:", rpcError.message)
+      return NextResponse.json({ error: "Could not start interview" }, { status: 500 })
     }
 
-    if (interviewResult.error) {
-      return NextResponse.json({ error: interviewResult.error.message }, { status: 500 })
+    if (!rpcResult?.success) {
+      if (rpcResult?.code === "insufficient_credits") {
+        return NextResponse.json({ error: "Not enough credits" }, { status: 402 })
+      }
+      return NextResponse.json({ error: rpcResult?.message || "Could not start interview" }, { status: 500 })
     }
 
-    // OPTIMIZATION: Fire-and-forget transaction log (don't await)
-    supabase.from("credit_transactions").insert({
-      user_id: userId,
-      delta: -cost,
-      reason: "interview_start",
-      metadata: { interviewType, duration, difficulty, customScenario },
-    }).then(() => {}).catch(() => {})
-
     return NextResponse.json({ 
-      interview: { ...interviewResult.data, question_count: questionCount } 
+      interview: { ...rpcResult.interview, question_count: questionCount } 
     })
   } catch (error) {
     console.error("[interview/start] Error:", error instanceof Error ? error.message : error)
@@ -1,9 +1,9 @@
 import type { NextRequest } from "next/server"
 import { createClient } from "@/lib/supabase/server"
-import { WebSocketServer } from "ws"
-import { Groq } from "groq-sdk"
-
-// WebSocket upgrade handler
+import { getAuthedUser } from "@/lib/supabase/auth"
+// WebSocket upgrade handler. Next.js route handlers cannot upgrade connections, so the
+// streaming protocol is served by scripts/interview_ws_server.js on its own port
+// (NEXT_PUBLIC_INTERVIEW_WS_URL); this route only reports where to connect.
 export async function GET(request: NextRequest) {
   const upgradeHeader = request.headers.get("upgrade")
 
@@ -22,7 +22,7 @@ export async function GET(request: NextRequest) {
   const supabase = await createClient()
   const {
     data: { user },
-  } = await supabase.auth.getUser()
+  } = await getAuthedUser(supabase)
 
   if (!user) {
     return new Response("Unauthorized", { status: 401 })
@@ -39,108 +39,8 @@ export async function GET(request: NextRequest) {
     return new Response("Interview not found", { status: 404 })
   }
 
-  // Note: Next.js doesn't natively support WebSocket upgrades in route handlers
-  // You'll need to use a custom server or a service like Vercel's Edge Functions
-  // For now, this is a placeholder showing the structure
-
   return new Response(
-    "WebSocket streaming requires custom server setup. Please use a WebSocket server library like 'ws' or deploy to a platform that supports WebSocket upgrades.",
+    "Interview streaming is served by the standalone WebSocket server (npm run interview:ws). Connect to NEXT_PUBLIC_INTERVIEW_WS_URL instead.",
     { status: 501 },
   )
 }
-
-// This would be implemented in a custom Node.js server:
-// const wss = new WebSocketServer({ port: 3001 })
-const groq = new Groq({ apiKey: process.env.GROQ_API_KEY })
-
-/*
-wss.on("connection", async (ws, req) => {
-  const url = new URL(req.url!, `http://${req.headers.host}`)
-  const interviewId = url.searchParams.get("interviewId")
-
-  let audioBuffer: Buffer[] = []
-  let isListening = false
-
-  ws.on("message", async (data) => {
-    if (typeof data === "string") {
-      const message = JSON.parse(data)
-
-      if (message.type === "start_listening") {
-        isListening = true
-        audioBuffer = []
-      } else if (message.type === "stop_listening") {
-        isListening = false
-        await processAudioBuffer(audioBuffer, ws, interviewId)
-        audioBuffer = []
-      }
-    } else {
-      // Binary audio data
-      if (isListening) {
-        audioBuffer.push(Buffer.from(data))
-      }
-    }
-  })
-
-  // Send first question
-  await generateAndSendQuestion(ws, interviewId, 1)
-})
-
-async function processAudioBuffer(buffer: Buffer[], ws: WebSocket, interviewId: string) {
-  // 1. Streaming STT with Groq Whisper
-  const audioData = Buffer.concat(buffer)
-  const transcription = await groq.audio.transcriptions.create({
-    file: audioData,
-    model: "whisper-large-v3",
-    response_format: "verbose_json",
-    timestamp_granularities: ["word"],
-  })
-
-  ws.send(
-    JSON.stringify({
-      type: "transcript",
-      text: transcription.text,
-    }),
-  )
-
-  // 2. Streaming LLM response
-  const stream = await streamText({
-    model: "groq/llama-3.3-70b-versatile",
-    prompt: `User said: "${transcription.text}". Generate follow-up interview question.`,
-  })
-
-  let fullResponse = ""
-  for await (const chunk of stream.textStream) {
-    fullResponse += chunk
-    ws.send(
-      JSON.stringify({
-        type: "llm_token",
-        token: chunk,
-      }),
-    )
-
-    // 3. Streaming TTS (would integrate ElevenLabs or similar)
-    // Send audio chunks as they're generated
-  }
-
-  // Send audio end signal
-  ws.send(JSON.stringify({ type: "audio_end" }))
-}
-
-async function generateAndSendQuestion(ws: WebSocket, interviewId: string, questionNumber: number) {
-  // Placeholder function to generate and send questions
-  ws.send(
-    JSON.stringify({
-      type: "question",
-      number: questionNumber,
-      text: `Question ${questionNumber}: Can you tell us about your experience with [topic]?`,
-    }),
-  )
-}
-
-async function streamText(options: { model: string; prompt: string }) {
-  // Placeholder function to simulate streaming text
-  return {
-    textStream: ["Sure, ", "let's ", "talk ", "about ", "that."],
-  }
-}
-*/
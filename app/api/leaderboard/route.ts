@@ -0,0 +1,104 @@
+import { NextResponse } from "next/server"
+import { createClient } from "@/lib/supabase/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
+
+const SORTS = ["overall", "technical", "communication", "problemSolving"] as const
+type LeaderboardSort = (typeof SORTS)[number]
+
+const DEFAULT_PAGE_SIZE = 50
+const MAX_PAGE_SIZE = 200
+
+function badgesFor(member: any): string[] {
+  const badges: string[] = []
+  if (member.averageScore >= 90) badges.push("Excellence")
+  if (member.resultCount >= 20) badges.push("Dedicated")
+  if (member.recentImprovement >= 10) badges.push("Rising Star")
+  if (member.technicalScore >= 85) badges.push("Tech Expert")
+  if (member.communicationScore >= 85) badges.push("Great Communicator")
+  if (member.resultCount >= 10 && member.minOverall >= 70) badges.push("Consistent")
+  return badges
+}
+
+/**
+ * GET /api/leaderboard?sort=overall|technical|communication|problemSolving&page=1&pageSize=50
+ * Ranked leaderboard for the caller's batch, read from per-user score rollups
+ * (scripts/021_create_user_score_rollups.sql) in a single query.
+ */
+export async function GET(request: Request) {
+  try {
+    const supabase = await createClient()
+
+    const {
+      data: { user },
+    } = await getAuthedUser(supabase)
+
+    if (!user) {
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const sortParam = searchParams.get("sort") || "overall"
+    const sort: LeaderboardSort = (SORTS as readonly string[]).includes(sortParam)
+      ? (sortParam as LeaderboardSort)
+      : "overall"
+    const page = Math.max(1, Number.parseInt(searchParams.get("page") || "1", 10) || 1)
+    const pageSize = Math.min(
+      MAX_PAGE_SIZE,
+      Math.max(1, Number.parseInt(searchParams.get("pageSize") || String(DEFAULT_PAGE_SIZE), 10) || DEFAULT_PAGE_SIZE),
+    )
+
+    const { data: batchMember } = await supabase
+      .from("batch_members")
+      .select("batch_id, batches(name)")
+      .eq("user_id", user.id)
+      .limit(1)
+      .maybeSingle()
+
+    if (!batchMember) {
+      return NextResponse.json({ hasBatch: false, members: [], total: 0, page, pageSize, sort })
+    }
+
+    const { data: leaderboard, error } = await supabase.rpc("get_batch_leaderboard", {
+      p_batch_id: batchMember.batch_id,
+      p_sort: sort,
+      p_limit: pageSize,
+      p_offset: (page - 1) * pageSize,
+    })
+
+    if (error) {
+      console.error("[v0] Error fetching leaderboard:", error)
+      return NextResponse.json({ error: error.message || "Failed to fetch leaderboard" }, { status: 500 })
+    }
+
+    if (!leaderboard?.success) {
+      return NextResponse.json({ error: leaderboard?.message || "Forbidden" }, { status: 403 })
+    }
+
+    const batches: any = batchMember.batches
+    return NextResponse.json({
+      hasBatch: true,
+      batchName: (Array.isArray(batches) ? batches[0]?.name : batches?.name) || "Batch",
+      sort,
+      page,
+      pageSize,
+      total: Number(leaderboard.total) || 0,
+      members: (leaderboard.members || []).map((m: any) => ({
+        id: m.id,
+        name: m.name,
+        email: m.email,
+        rank: m.rank,
+        averageScore: m.averageScore,
+        totalInterviews: m.resultCount,
+        technicalScore: m.technicalScore,
+        communicationScore: m.communicationScore,
+        problemSolvingScore: m.problemSolvingScore,
+        confidenceScore: m.confidenceScore,
+        recentImprovement: m.recentImprovement,
+        badges: badgesFor(m),
+      })),
+    })
+  } catch (error: any) {
+    console.error("[v0] Error in leaderboard route:", error)
+    return NextResponse.json({ error: error.message || "Internal server error" }, { status: 500 })
+  }
+}
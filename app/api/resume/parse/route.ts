@@ -5,6 +5,7 @@ import { createGroq } from "@ai-sdk/groq"
 import { isRateLimited, rateLimitKeyFromRequest } from "@/lib/api/rate-limit"
 import { fetchWithTimeout } from "@/lib/api/http"
 import { z } from "zod"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 const groqClient = createGroq({
   apiKey: process.env.GROQ_API_KEY,
@@ -22,7 +23,7 @@ export async function POST(request: NextRequest) {
     const {
       data: { user },
       error: authError,
-    } = await supabase.auth.getUser()
+    } = await getAuthedUser(supabase)
     if (authError || !user) {
       return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
     }
@@ -34,7 +35,7 @@ export async function POST(request: NextRequest) {
     const { resumeUrl } = parsed.data
 
     const rateKey = rateLimitKeyFromRequest(request, user.id)
-    if (isRateLimited(rateKey, 5, 60_000)) {
+    if (await isRateLimited(rateKey, 5, 60_000)) {
       return NextResponse.json({ error: "Too many requests, slow down." }, { status: 429 })
     }
 
@@ -2,6 +2,10 @@ import { NextResponse } from "next/server"
 import { createAdminClient } from "@/lib/supabase/server"
 import { createRestClient } from "@/lib/supabase/rest-client"
 import { checkSuperAdminAccess } from "@/lib/super-admin"
+import { chunk, createStageTimer } from "@/lib/api/batching"
+import { buildAuthEmailIndex, createMissingAuthUsers, upsertPublicUsers } from "@/lib/supabase/bulk-identity"
+
+const MEMBER_CHUNK_SIZE = 500
 
 export async function POST(request: Request) {
   try {
@@ -16,6 +20,7 @@ export async function POST(request: Request) {
       return NextResponse.json({ error: "Invalid request: institutionId and emails array required" }, { status: 400 })
     }
 
+    const timer = createStageTimer()
     const supabase = await createAdminClient()
 
     // Verify institution exists
@@ -34,81 +39,74 @@ export async function POST(request: Request) {
       failed: [] as Array<{ email: string; reason: string }>,
     }
 
-    // Process each email
+    // Validate and dedupe up front so every later stage works on a clean list
+    const seen = new Set<string>()
+    const validEmails: string[] = []
     for (const email of emails) {
       if (!email || typeof email !== "string" || !email.includes("@")) {
         results.failed.push({ email, reason: "Invalid email format" })
         continue
       }
+      const normalized = email.trim().toLowerCase()
+      if (seen.has(normalized)) continue
+      seen.add(normalized)
+      validEmails.push(normalized)
+    }
+    timer.mark("validateMs")
+
+    // Resolve identities: one paged pass over auth users instead of one listing per email
+    const restClient = createRestClient({ useServiceRole: true })
+    const index = await buildAuthEmailIndex(restClient)
+    timer.mark("resolveMs")
+
+    const createFailed = await createMissingAuthUsers(restClient, validEmails, index)
+    results.failed.push(...createFailed)
+    timer.mark("createMs")
+
+    const upsertFailed = await upsertPublicUsers(supabase, validEmails, index)
+    results.failed.push(...upsertFailed)
+    timer.mark("upsertMs")
+
+    const failedEmails = new Set([...createFailed, ...upsertFailed].map((f) => f.email))
+    const resolved = validEmails.filter((email) => index.has(email) && !failedEmails.has(email))
+
+    // Membership: look up existing members and insert the rest, chunk by chunk
+    for (const part of chunk(resolved, MEMBER_CHUNK_SIZE)) {
+      const userIds = part.map((email) => index.get(email)!)
+      const { data: existing, error: existingError } = await supabase
+        .from("institution_members")
+        .select("user_id")
+        .eq("institution_id", institutionId)
+        .in("user_id", userIds)
+
+      if (existingError) {
+        for (const email of part) results.failed.push({ email, reason: existingError.message })
+        continue
+      }
 
-      try {
-        // Find or create user by email
-        const restClient = createRestClient({ useServiceRole: true })
-        const { data: authUsers } = await restClient.auth.admin.listUsers()
-        const existingAuthUser = authUsers.users.find((u) => u.email?.toLowerCase() === email.toLowerCase())
-
-        let userId: string
-
-        if (existingAuthUser) {
-          userId = existingAuthUser.id
-          // Ensure user exists in public.users table
-          await supabase
-            .from("users")
-            .upsert(
-              {
-                id: userId,
-                email: email.toLowerCase(),
-                name: email.split("@")[0],
-              },
-              { onConflict: "id" },
-            )
-        } else {
-          // Create new auth user
-          const { data: newUser, error: createError } = await restClient.auth.admin.createUser({
-            email: email.toLowerCase(),
-            password: Math.random().toString(36).slice(-12), // Generate random password
-            email_confirm: true,
-            user_metadata: {
-              name: email.split("@")[0],
-            },
-          })
-
-          if (createError || !newUser?.user) {
-            results.failed.push({ email, reason: createError?.message || "Failed to create user" })
-            continue
-          }
-
-          userId = newUser.user.id
-        }
+      const memberIds = new Set((existing || []).map((m: any) => m.user_id))
+      const toInsert = part.filter((email) => !memberIds.has(index.get(email)))
 
-        // Check if already a member
-        const { data: existingMember } = await supabase
-          .from("institution_members")
-          .select("id")
-          .eq("institution_id", institutionId)
-          .eq("user_id", userId)
-          .maybeSingle()
-
-        if (existingMember) {
-          results.success.push(email) // Already a member, count as success
-        } else {
-          // Add to institution_members
-          const { error: memberError } = await supabase.from("institution_members").insert({
+      if (toInsert.length > 0) {
+        const { error: memberError } = await supabase.from("institution_members").insert(
+          toInsert.map((email) => ({
             institution_id: institutionId,
-            user_id: userId,
+            user_id: index.get(email),
             role: "member",
-          })
-
-          if (memberError) {
-            results.failed.push({ email, reason: memberError.message })
-          } else {
-            results.success.push(email)
-          }
+          })),
+        )
+
+        if (memberError) {
+          for (const email of toInsert) results.failed.push({ email, reason: memberError.message })
+          // Already a member, count as success
+          results.success.push(...part.filter((email) => memberIds.has(index.get(email))))
+          continue
         }
-      } catch (err: any) {
-        results.failed.push({ email, reason: err.message || "Unknown error" })
       }
+
+      results.success.push(...part)
     }
+    timer.mark("membershipMs")
 
     return NextResponse.json({
       success: true,
@@ -118,10 +116,10 @@ export async function POST(request: Request) {
         successful: results.success.length,
         failed: results.failed.length,
       },
+      timings: timer.done(),
     })
   } catch (error: any) {
     console.error("Error in bulk upload:", error)
     return NextResponse.json({ error: error.message || "Failed to process bulk upload" }, { status: 500 })
   }
 }
-
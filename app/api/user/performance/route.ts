@@ -0,0 +1,105 @@
+import { NextResponse } from "next/server"
+import { createClient } from "@/lib/supabase/server"
+import { createAdminClient } from "@/lib/supabase/admin"
+import { getAuthedUser } from "@/lib/supabase/auth"
+import {
+  buildPerformanceSummary,
+  cacheSummary,
+  getCachedSummary,
+  type PerformanceRow,
+} from "@/lib/interview/performance-summary"
+
+function parseDate(value: string | null): string | null | undefined {
+  if (!value) return null
+  const time = Date.parse(value)
+  return Number.isNaN(time) ? undefined : new Date(time).toISOString()
+}
+
+/**
+ * GET /api/user/performance?from=2025-01-01&to=2025-03-31
+ * Column-oriented performance summary of the caller's completed interviews, optionally
+ * limited to interviews started in [from, to). Cached until a new interview result lands.
+ */
+export async function GET(request: Request) {
+  try {
+    const supabase = await createClient()
+
+    const {
+      data: { user },
+    } = await getAuthedUser(supabase)
+
+    if (!user) {
+      return NextResponse.json({ error: "Unauthorized" }, { status: 401 })
+    }
+
+    const { searchParams } = new URL(request.url)
+    const from = parseDate(searchParams.get("from"))
+    const to = parseDate(searchParams.get("to"))
+    if (from === undefined || to === undefined) {
+      return NextResponse.json({ error: "from and to must be ISO dates" }, { status: 400 })
+    }
+
+    // The rollup row changes whenever one of the user's interview_results rows is written
+    const { data: rollup } = await createAdminClient()
+      .from("user_score_rollups")
+      .select("result_count, updated_at")
+      .eq("user_id", user.id)
+      .maybeSingle()
+    const version = rollup ? `${rollup.result_count}-${new Date(rollup.updated_at).getTime()}` : "0"
+    const etag = `"perf-${version}-${from || ""}-${to || ""}"`
+
+    if (request.headers.get("if-none-match") === etag) {
+      return new NextResponse(null, { status: 304, headers: { ETag: etag } })
+    }
+
+    const cacheKey = `${user.id}|${from || ""}|${to || ""}`
+    let summary = getCachedSummary(cacheKey, version)
+
+    if (!summary) {
+      let query = supabase
+        .from("interviews")
+        .select(
+          `
+          id,
+          interview_type,
+          started_at,
+          completed_at,
+          interview_results(
+            overall_score,
+            communication_score,
+            technical_score,
+            problem_solving_score,
+            confidence_score,
+            improvements,
+            eye_contact_score,
+            smile_score,
+            stillness_score,
+            face_confidence_score
+          )
+        `,
+        )
+        .eq("user_id", user.id)
+        .eq("status", "completed")
+
+      if (from) query = query.gte("started_at", from)
+      if (to) query = query.lt("started_at", to)
+
+      const { data: interviews, error } = await query.order("created_at", { ascending: false })
+
+      if (error) {
+        console.error("[v0] Error fetching performance data:", error)
+        return NextResponse.json({ error: "Failed to load performance data" }, { status: 500 })
+      }
+
+      summary = buildPerformanceSummary((interviews || []) as PerformanceRow[], { from, to })
+      cacheSummary(cacheKey, version, summary)
+    }
+
+    return NextResponse.json(summary, {
+      headers: { ETag: etag, "Cache-Control": "private, no-cache" },
+    })
+  } catch (error: any) {
+    console.error("[v0] Error in performance route:", error)
+    return NextResponse.json({ error: error.message || "Internal server error" }, { status: 500 })
+  }
+}
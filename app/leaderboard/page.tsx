@@ -6,10 +6,11 @@ import DashboardNavbar from "@/components/dashboard-navbar"
 import { Card } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { Avatar, AvatarFallback } from "@/components/ui/avatar"
-import { createClient } from "@/lib/supabase/client"
 import { Trophy, Medal } from "lucide-react"
 import Link from "next/link"
 
+const PAGE_SIZE = 50
+
 interface LeaderboardMember {
   id: string
   name: string
@@ -27,138 +28,47 @@ interface LeaderboardMember {
 
 export default function LeaderboardPage() {
   const router = useRouter()
-  const supabase = createClient()
   const [loading, setLoading] = useState(true)
   const [leaderboard, setLeaderboard] = useState<LeaderboardMember[]>([])
   const [hasBatch, setHasBatch] = useState(false)
   const [batchName, setBatchName] = useState("")
   const [sortBy, setSortBy] = useState<"overall" | "technical" | "communication" | "problemSolving">("overall")
+  const [page, setPage] = useState(1)
+  const [total, setTotal] = useState(0)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
-    checkBatchMembershipAndFetchLeaderboard()
-  }, [])
+    fetchLeaderboard(1)
+  }, [sortBy])
 
-  const checkBatchMembershipAndFetchLeaderboard = async () => {
+  // Ranking, averages and badge inputs come precomputed from /api/leaderboard
+  const fetchLeaderboard = async (nextPage: number) => {
     try {
-      setLoading(true)
+      if (nextPage === 1) setLoading(true)
+      else setLoadingMore(true)
 
-      const {
-        data: { user },
-      } = await supabase.auth.getUser()
+      const response = await fetch(`/api/leaderboard?sort=${sortBy}&page=${nextPage}&pageSize=${PAGE_SIZE}`)
 
-      if (!user) {
+      if (response.status === 401) {
         router.push("/auth")
         return
       }
+      if (!response.ok) throw new Error(`Leaderboard request failed: ${response.status}`)
 
-      // Check if user is a batch member
-      const { data: batchMember } = await supabase
-        .from("batch_members")
-        .select("*, batches(name)")
-        .eq("user_id", user.id)
-        .single()
-
-      if (!batchMember) {
-        // User is not in a batch
-        setHasBatch(false)
-        setLoading(false)
-        return
-      }
-
-      // User is in a batch, fetch batch leaderboard
-      setHasBatch(true)
-      setBatchName(batchMember.batches?.name || "Batch")
-
-      // Get all batch members
-      const { data: batchMembers } = await supabase
-        .from("batch_members")
-        .select("*, users:user_id(id, email, name)")
-        .eq("batch_id", batchMember.batch_id)
-
-      if (!batchMembers) {
-        setLeaderboard([])
-        setLoading(false)
-        return
-      }
-
-      const leaderboardData: LeaderboardMember[] = []
-
-      for (const member of batchMembers) {
-        const { data: interviews } = await supabase
-          .from("interviews")
-          .select("id, completed_at")
-          .eq("user_id", member.users.id)
-          .eq("status", "completed")
-          .order("completed_at", { ascending: true })
-
-        const { data: results } = await supabase
-          .from("interview_results")
-          .select(
-            "overall_score, technical_score, communication_score, problem_solving_score, confidence_score, created_at",
-          )
-          .in("interview_id", interviews?.map((i) => i.id) || [])
-          .order("created_at", { ascending: true })
-
-        if (!results || results.length === 0) continue
-
-        const averageScore = Math.round(results.reduce((sum, r) => sum + r.overall_score, 0) / results.length)
-        const technicalScore = Math.round(
-          results.reduce((sum, r) => sum + (r.technical_score || 0), 0) / results.length,
-        )
-        const communicationScore = Math.round(
-          results.reduce((sum, r) => sum + (r.communication_score || 0), 0) / results.length,
-        )
-        const problemSolvingScore = Math.round(
-          results.reduce((sum, r) => sum + (r.problem_solving_score || 0), 0) / results.length,
-        )
-        const confidenceScore = Math.round(
-          results.reduce((sum, r) => sum + (r.confidence_score || 0), 0) / results.length,
-        )
-
-        let recentImprovement = 0
-        if (results.length >= 6) {
-          const recent = results.slice(-3)
-          const previous = results.slice(-6, -3)
-          const recentAvg = recent.reduce((sum, r) => sum + r.overall_score, 0) / 3
-          const previousAvg = previous.reduce((sum, r) => sum + r.overall_score, 0) / 3
-          recentImprovement = Math.round(recentAvg - previousAvg)
-        }
-
-        const badges: string[] = []
-        if (averageScore >= 90) badges.push("Excellence")
-        if (interviews.length >= 20) badges.push("Dedicated")
-        if (recentImprovement >= 10) badges.push("Rising Star")
-        if (technicalScore >= 85) badges.push("Tech Expert")
-        if (communicationScore >= 85) badges.push("Great Communicator")
-        if (results.length >= 10 && results.every((r) => r.overall_score >= 70)) badges.push("Consistent")
-
-        leaderboardData.push({
-          id: member.users.id,
-          name: member.users.name || "Unknown",
-          email: member.users.email,
-          rank: 0,
-          averageScore,
-          totalInterviews: interviews.length,
-          technicalScore,
-          communicationScore,
-          problemSolvingScore,
-          confidenceScore,
-          recentImprovement,
-          badges,
-        })
-      }
-
-      leaderboardData.sort((a, b) => b.averageScore - a.averageScore)
-      leaderboardData.forEach((member, index) => {
-        member.rank = index + 1
-      })
+      const data = await response.json()
+      setHasBatch(data.hasBatch)
+      if (!data.hasBatch) return
 
-      setLeaderboard(leaderboardData)
+      setBatchName(data.batchName || "Batch")
+      setTotal(data.total)
+      setPage(nextPage)
+      setLeaderboard((prev) => (nextPage === 1 ? data.members : [...prev, ...data.members]))
     } catch (error) {
-      console.error("Error checking batch membership:", error)
-      setHasBatch(false)
+      console.error("Error fetching leaderboard:", error)
+      if (nextPage === 1) setHasBatch(false)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
     }
   }
 
@@ -188,24 +98,6 @@ export default function LeaderboardPage() {
     }
   }
 
-  const getSortedLeaderboard = () => {
-    const sorted = [...leaderboard]
-    switch (sortBy) {
-      case "technical":
-        sorted.sort((a, b) => b.technicalScore - a.technicalScore)
-        break
-      case "communication":
-        sorted.sort((a, b) => b.communicationScore - a.communicationScore)
-        break
-      case "problemSolving":
-        sorted.sort((a, b) => b.problemSolvingScore - a.problemSolvingScore)
-        break
-      default:
-        sorted.sort((a, b) => b.averageScore - a.averageScore)
-    }
-    return sorted
-  }
-
   if (loading) {
     return (
       <main className="min-h-screen bg-white">
@@ -249,8 +141,6 @@ export default function LeaderboardPage() {
     )
   }
 
-  const sortedLeaderboard = getSortedLeaderboard()
-
   return (
     <main className="min-h-screen bg-white">
       <DashboardNavbar />
@@ -265,7 +155,7 @@ export default function LeaderboardPage() {
         {/* Top 3 Podium */}
         {leaderboard.length > 0 && (
           <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-12">
-            {sortedLeaderboard.slice(0, 3).map((user, index) => (
+            {leaderboard.slice(0, 3).map((user, index) => (
               <Card
                 key={user.id}
                 className={`p-8 border-0 shadow-lg text-center ${
@@ -312,7 +202,7 @@ export default function LeaderboardPage() {
                   </tr>
                 </thead>
                 <tbody className="divide-y divide-gray-200">
-                  {sortedLeaderboard.map((user) => (
+                  {leaderboard.map((user) => (
                     <tr key={user.id} className="hover:bg-gray-50 transition-colors">
                       <td className="px-6 py-4">
                         <div className="flex items-center gap-2">
@@ -354,6 +244,17 @@ export default function LeaderboardPage() {
                 </tbody>
               </table>
             </div>
+            {leaderboard.length < total && (
+              <div className="p-4 text-center border-t border-gray-100">
+                <button
+                  onClick={() => fetchLeaderboard(page + 1)}
+                  disabled={loadingMore}
+                  className="text-sm font-semibold text-blue-600 hover:text-blue-700 disabled:opacity-50"
+                >
+                  {loadingMore ? "Loading..." : `Show more (${total - leaderboard.length} remaining)`}
+                </button>
+              </div>
+            )}
           </Card>
         ) : (
           <Card className="border-0 shadow-lg p-12 text-center">
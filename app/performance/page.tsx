@@ -6,254 +6,102 @@ import DashboardNavbar from "@/components/dashboard-navbar"
 import { Card } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { Button } from "@/components/ui/button"
-import { createBrowserClient } from "@supabase/ssr"
 import { Eye, Smile, Activity, AlertTriangle, ExternalLink } from "lucide-react"
 
+const RANGE_DAYS = { all: 0, "90d": 90, "30d": 30 } as const
+type Range = keyof typeof RANGE_DAYS
+
 export default function PerformancePage() {
   const router = useRouter()
   const [performanceData, setPerformanceData] = useState<any>(null)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
+  const [range, setRange] = useState<Range>("all")
 
   useEffect(() => {
     const fetchPerformanceData = async () => {
+      setLoading(true)
+      setError(null)
       try {
-        const supabase = createBrowserClient(
-          process.env.NEXT_PUBLIC_SUPABASE_URL!,
-          process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!,
-        )
-
-        const {
-          data: { user },
-        } = await supabase.auth.getUser()
+        const params = new URLSearchParams()
+        const days = RANGE_DAYS[range]
+        if (days) {
+          params.set("from", new Date(Date.now() - days * 86_400_000).toISOString().slice(0, 10))
+        }
 
-        if (!user) {
+        const response = await fetch(`/api/user/performance${days ? `?${params}` : ""}`)
+        if (response.status === 401) {
           setError("Please log in to view your performance")
-          setLoading(false)
           return
         }
-
-        const { data: interviews, error: fetchError } = await supabase
-          .from("interviews")
-          .select(
-            `
-            id,
-            interview_type,
-            started_at,
-            completed_at,
-            interview_results(
-              overall_score,
-              communication_score,
-              technical_score,
-              problem_solving_score,
-              confidence_score,
-              strengths,
-              improvements,
-              eye_contact_score,
-              smile_score,
-              stillness_score,
-              face_confidence_score
-            )
-          `,
-          )
-          .eq("user_id", user.id)
-          .eq("status", "completed")
-          .order("created_at", { ascending: false })
-
-        if (fetchError) {
-          console.error("[v0] Error fetching performance data:", fetchError)
+        if (!response.ok) {
+          console.error("[v0] Error fetching performance data:", response.status)
           setError("Failed to load performance data")
           return
         }
 
-        if (!interviews || interviews.length === 0) {
-          setPerformanceData({
-            overall: {
-              totalInterviews: 0,
-              averageScore: 0,
-              highestScore: 0,
-              lowestScore: 0,
-              totalTimeSpent: "0h 0m",
-              improvementRate: "0%",
-              totalQuestionsSkipped: 0,
-              avgSkipPenalty: 0,
-            },
-            byType: [],
-            strengths: [],
-            areasToImprove: [],
-            recentPerformance: [],
-            faceAnalysis: null,
-          })
-          setLoading(false)
-          return
-        }
-
-        // Calculate overall stats
-        const scores = interviews.map((i) => i.interview_results?.[0]?.overall_score).filter(Boolean)
-        const totalTimeSpent = interviews.reduce((acc, i) => {
-          const startDate = new Date(i.started_at)
-          const endDate = i.completed_at ? new Date(i.completed_at) : new Date()
-          return acc + (endDate.getTime() - startDate.getTime())
-        }, 0)
-
-        const totalQuestionsSkipped = 0 // Will be calculated once migration is run
-        const avgSkipPenalty = 0 // Will be calculated once migration is run
+        const summary = await response.json()
+        const { series, byType, overall, dimensions, face, improvements } = summary
 
-        const avgScore = scores.length > 0 ? Math.round(scores.reduce((a, b) => a + b, 0) / scores.length) : 0
-        const hours = Math.floor(totalTimeSpent / 3600000)
-        const minutes = Math.floor((totalTimeSpent % 3600000) / 60000)
-
-        // Group by interview type
-        const byType: any = {}
-        interviews.forEach((interview) => {
-          const type = interview.interview_type
-          if (!byType[type]) {
-            byType[type] = {
-              type,
-              completed: 0,
-              scores: [],
-            }
-          }
-          byType[type].completed++
-          if (interview.interview_results?.[0]?.overall_score) {
-            byType[type].scores.push(interview.interview_results[0].overall_score)
-          }
-        })
-
-        const byTypeArray = Object.values(byType).map((item: any) => ({
-          type:
-            item.type === "technical" ? "Technical Interview" :
-            item.type === "hr" ? "HR Interview" :
-            item.type === "dsa" ? "DSA Interview" :
-            item.type === "aptitude" ? "Aptitude Interview" :
-            "Custom Scenario",
-          completed: item.completed,
-          avgScore:
-            item.scores.length > 0
-              ? Math.round(item.scores.reduce((a: number, b: number) => a + b, 0) / item.scores.length)
-              : 0,
-          bestScore: item.scores.length > 0 ? Math.max(...item.scores) : 0,
-          trend: item.scores.length > 1 && item.scores[0] > item.scores[item.scores.length - 1] ? "up" : "stable",
-          recentScores: item.scores.slice(0, 5),
-        }))
-
-        // Calculate strengths and improvements
-        const allResults = interviews.map((i) => i.interview_results?.[0]).filter(Boolean)
-        const strengthScores: any = {}
-
-        allResults.forEach((result) => {
-          if (result.communication_score) {
-            strengthScores["Communication"] = (strengthScores["Communication"] || 0) + result.communication_score
-          }
-          if (result.technical_score) {
-            strengthScores["Technical Skills"] = (strengthScores["Technical Skills"] || 0) + result.technical_score
-          }
-          if (result.problem_solving_score) {
-            strengthScores["Problem Solving"] = (strengthScores["Problem Solving"] || 0) + result.problem_solving_score
-          }
-        })
-
-        const strengths = Object.entries(strengthScores)
-          .map(([skill, score]: [string, any]) => ({
+        setPerformanceData({
+          overall: {
+            totalInterviews: overall.totalInterviews,
+            averageScore: overall.averageScore,
+            highestScore: overall.highestScore,
+            lowestScore: overall.lowestScore,
+            totalTimeSpent: `${Math.floor(overall.totalTimeMinutes / 60)}h ${overall.totalTimeMinutes % 60}m`,
+            improvementRate: `${overall.improvementRate}%`,
+            totalQuestionsSkipped: 0, // Will be calculated once migration is run
+            avgSkipPenalty: 0, // Will be calculated once migration is run
+          },
+          byType: byType.type.map((type: string, i: number) => ({
+            type:
+              type === "technical" ? "Technical Interview" :
+              type === "hr" ? "HR Interview" :
+              type === "dsa" ? "DSA Interview" :
+              type === "aptitude" ? "Aptitude Interview" :
+              "Custom Scenario",
+            completed: byType.completed[i],
+            avgScore: byType.avgScore[i],
+            bestScore: byType.bestScore[i],
+            trend: byType.improving[i] ? "up" : "stable",
+            recentScores: byType.recentScores[i],
+          })),
+          strengths: dimensions.skill.map((skill: string, i: number) => ({
             skill,
-            score: Math.round(score / allResults.length),
+            score: dimensions.score[i],
             category: "Technical",
-          }))
-          .sort((a, b) => b.score - a.score)
-
-        const recentPerformance = interviews.slice(0, 5).map((interview) => {
-          const startDate = new Date(interview.started_at)
-          const endDate = interview.completed_at ? new Date(interview.completed_at) : new Date()
-          const duration = Math.round((endDate.getTime() - startDate.getTime()) / 60000)
-
-          return {
-            id: interview.id, // Add interview ID
-            date: startDate.toLocaleDateString("en-US", {
+          })),
+          areasToImprove: improvements.area.map((area: string, i: number) => ({
+            area,
+            count: improvements.count[i],
+            description: getImprovementDescription(area),
+            recommendation: getImprovementRecommendation(area),
+            frequency: `${Math.round((improvements.count[i] / improvements.resultCount) * 100)}% of interviews`,
+            trend: improvements.trend[i],
+          })),
+          recentPerformance: series.interviewId.slice(0, 5).map((id: string, i: number) => ({
+            id,
+            date: new Date(series.startedAt[i]).toLocaleDateString("en-US", {
               year: "numeric",
               month: "short",
               day: "numeric",
             }),
-            type: interview.interview_type,
-            score: interview.interview_results?.[0]?.overall_score || 0,
-            duration: `${duration}m`,
+            type: series.type[i],
+            score: series.overall[i] || 0,
+            duration: `${series.durationMinutes[i]}m`,
             questionsSkipped: 0,
             skipPenalty: 0,
-          }
-        })
-
-        const faceAnalysisData = allResults
-          .filter((r) => r.eye_contact_score !== null)
-          .map((r) => ({
-            eyeContact: r.eye_contact_score,
-            smile: r.smile_score,
-            stillness: r.stillness_score,
-            confidence: r.face_confidence_score,
-          }))
-
-        const faceAnalysis =
-          faceAnalysisData.length > 0
+          })),
+          faceAnalysis: face
             ? {
-                avgEyeContact: Math.round(
-                  faceAnalysisData.reduce((sum, d) => sum + (d.eyeContact || 0), 0) / faceAnalysisData.length,
-                ),
-                avgSmile: Math.round(
-                  faceAnalysisData.reduce((sum, d) => sum + (d.smile || 0), 0) / faceAnalysisData.length,
-                ),
-                avgStillness: Math.round(
-                  faceAnalysisData.reduce((sum, d) => sum + (d.stillness || 0), 0) / faceAnalysisData.length,
-                ),
-                avgConfidence: Math.round(
-                  faceAnalysisData.reduce((sum, d) => sum + (d.confidence || 0), 0) / faceAnalysisData.length,
-                ),
-                totalWithFaceData: faceAnalysisData.length,
-              }
-            : null
-
-        const allImprovements: any = {}
-        allResults.forEach((result) => {
-          if (result.improvements && Array.isArray(result.improvements)) {
-            result.improvements.forEach((improvement: string) => {
-              if (!allImprovements[improvement]) {
-                allImprovements[improvement] = {
-                  area: improvement,
-                  count: 0,
-                  description: getImprovementDescription(improvement),
-                  recommendation: getImprovementRecommendation(improvement),
-                }
+                avgEyeContact: face.eyeContact,
+                avgSmile: face.smile,
+                avgStillness: face.stillness,
+                avgConfidence: face.confidence,
+                totalWithFaceData: face.count,
               }
-              allImprovements[improvement].count++
-            })
-          }
-        })
-
-        const areasToImprove = Object.values(allImprovements)
-          .sort((a: any, b: any) => b.count - a.count)
-          .slice(0, 4)
-          .map((item: any) => ({
-            ...item,
-            frequency: `${Math.round((item.count / allResults.length) * 100)}% of interviews`,
-            trend: calculateTrend(allResults, item.area),
-          }))
-
-        setPerformanceData({
-          overall: {
-            totalInterviews: interviews.length,
-            averageScore: avgScore,
-            highestScore: Math.max(...scores),
-            lowestScore: Math.min(...scores),
-            totalTimeSpent: `${hours}h ${minutes}m`,
-            improvementRate:
-              scores.length > 1
-                ? `${Math.round(((scores[0] - scores[scores.length - 1]) / scores[scores.length - 1]) * 100)}%`
-                : "0%",
-            totalQuestionsSkipped,
-            avgSkipPenalty,
-          },
-          byType: byTypeArray,
-          strengths,
-          areasToImprove,
-          recentPerformance,
-          faceAnalysis,
+            : null,
         })
       } catch (err) {
         console.error("[v0] Error:", err)
@@ -264,7 +112,7 @@ export default function PerformancePage() {
     }
 
     fetchPerformanceData()
-  }, [])
+  }, [range])
 
   const getImprovementDescription = (area: string): string => {
     const descriptions: Record<string, string> = {
@@ -294,18 +142,6 @@ export default function PerformancePage() {
     return recommendations[area] || "Focus on this area in your next practice session"
   }
 
-  const calculateTrend = (results: any[], area: string): number => {
-    const recentResults = results.slice(0, 3).map((r) => (r.improvements?.includes(area) ? 1 : 0))
-    const olderResults = results.slice(3, 6).map((r) => (r.improvements?.includes(area) ? 1 : 0))
-
-    if (recentResults.length === 0 || olderResults.length === 0) return 0
-
-    const recentCount = recentResults.reduce((a: number, b: number) => a + b, 0)
-    const olderCount = olderResults.reduce((a: number, b: number) => a + b, 0)
-
-    return olderCount - recentCount // Positive = improving, negative = declining
-  }
-
   return (
     <main className="min-h-screen bg-white">
       <DashboardNavbar />
@@ -315,6 +151,22 @@ export default function PerformancePage() {
         <div className="mb-12 animate-fade-in">
           <h1 className="text-4xl md:text-5xl font-bold text-gray-900 mb-2">Performance Overview</h1>
           <p className="text-lg text-gray-600">Track your progress and identify areas for improvement.</p>
+          <div className="flex gap-2 mt-4">
+            {([
+              ["all", "All time"],
+              ["90d", "Last 90 days"],
+              ["30d", "Last 30 days"],
+            ] as [Range, string][]).map(([value, label]) => (
+              <Button
+                key={value}
+                size="sm"
+                variant={range === value ? "default" : "outline"}
+                onClick={() => setRange(value)}
+              >
+                {label}
+              </Button>
+            ))}
+          </div>
         </div>
 
         {loading ? (
@@ -11,7 +11,6 @@ import PerformanceMetrics from "@/components/performance-metrics"
 import InterviewConversation from "@/components/interview-conversation"
 import DSAAptitudeResultsUI from "@/components/dsa-aptitude-results-ui"
 import AptitudeQuantitativeResultsUI from "@/components/aptitude-quantitative-results-ui"
-import { generateAnalysis } from "@/app/actions/generate-analysis"
 
 interface AnalysisData {
   overall_score: number
@@ -74,7 +73,7 @@ export default function ResultsPage() {
 
       let analysisTriggered = false
       
-      for (let attempt = 0; attempt < 10; attempt++) {
+      for (let attempt = 0; attempt < 40; attempt++) {
         try {
           console.log(`[v0] Fetching analysis for interview (attempt ${attempt + 1}):`, interviewId)
           const response = await fetch(`/api/interview/results?interviewId=${interviewId}`)
@@ -112,31 +111,29 @@ export default function ResultsPage() {
             console.log("[v0] Results page ready to display")
             return
           } else if (response.status === 404) {
-            // Fetch interview type
-            const interviewTypeRes = await fetch(`/api/interview/type?interviewId=${interviewId}`);
-            let interviewType = "technical"; // Default to technical
-            if (interviewTypeRes.ok) {
-              const typeData = await interviewTypeRes.json();
-              interviewType = typeData.interviewType || "technical";
-            }
-            // Trigger analysis generation only once
             if (!analysisTriggered) {
+              // Queue analysis in case the interview page never did; deduplicated per interview
               analysisTriggered = true
-              console.log("[v0] Analysis not found, generating via server action...")
-              try {
-                const result = await generateAnalysis(interviewId, interviewType, 0)
-                
-                if (result.success) {
-                  console.log("[v0] Analysis generation completed successfully")
-                  // Continue to next iteration to fetch the generated analysis
-                } else {
-                  console.error("[v0] Analysis generation failed:", result.error)
-                }
-              } catch (actionError) {
-                console.error("[v0] Server action error:", actionError)
+              console.log("[v0] Analysis not found, queueing analysis job...")
+              const queueRes = await fetch("/api/interview/analyze", {
+                method: "POST",
+                headers: { "Content-Type": "application/json" },
+                body: JSON.stringify({ interviewId }),
+              })
+              if (!queueRes.ok) {
+                console.error("[v0] Failed to queue analysis:", queueRes.status)
+              }
+            } else {
+              const statusRes = await fetch(`/api/interview/analyze?interviewId=${interviewId}`)
+              const job = statusRes.ok ? await statusRes.json() : null
+              if (job?.status === "failed") {
+                console.error("[v0] Analysis job failed:", job.error)
+                setError("We couldn't analyze this interview. Please try refreshing the page to retry.")
+                setIsLoading(false)
+                return
               }
             }
-            
+
             console.log("[v0] Waiting for analysis to be ready...")
             await new Promise((resolve) => setTimeout(resolve, attempt < 3 ? 2000 : 3000))
           } else {
@@ -9,8 +9,9 @@ import { useSpeechRecognition } from "@/hooks/use-speech-recognition"
 import { useTextToSpeech } from "@/hooks/use-text-to-speech"
 import { useVoiceAgent } from "@/hooks/use-voice-agent"
 import { createClient } from "@/lib/supabase/client"
-import { usePathname } from "next/navigation"
+import { useUserCredits } from "@/hooks/use-user-live-data"
 import { getInterviewCost } from "@/utils/credits"
+import { readServerSentEvents } from "@/lib/api/sse-client"
 import "@/app/interview/interview-mobile-landscape.css"
 import {
   AlertDialog,
@@ -135,6 +136,7 @@ export default function AudioVideoInterviewer({
   // Function to complete interview (extracted for reuse)
   const stopAllSpeech = () => {
     try {
+      stopTTS()
       if (typeof window !== "undefined" && window.speechSynthesis) {
         window.speechSynthesis.cancel()
       }
@@ -198,28 +200,9 @@ export default function AudioVideoInterviewer({
   const [showResults, setShowResults] = useState(false)
   const [analysisData, setAnalysisData] = useState<any>(null)
   const [isGeneratingAnalysis, setIsGeneratingAnalysis] = useState(false)
-  const [balance, setBalance] = useState<number | null>(null); // Added
+  // Pushed by the realtime user channel instead of polled
+  const { balance } = useUserCredits()
   const [batchId, setBatchId] = useState<string | null>(null)
-  const pathname = usePathname(); // Added
-
-  useEffect(() => {
-    const fetchCredits = async () => {
-      try {
-        const res = await fetch("/api/user/credits")
-        const data = await res.json()
-        if (res.ok) {
-          setBalance(data.balance ?? 0)
-        }
-      } catch (error) {
-        console.error("Error fetching credits in AudioVideoInterviewer:", error)
-      }
-    }
-    fetchCredits();
-
-    // Refresh credits every 30 seconds or on pathname change
-    const interval = setInterval(fetchCredits, 30000)
-    return () => clearInterval(interval)
-  }, [pathname]); // Depend on pathname to re-fetch credits when URL changes
 
   const transcriptEndRef = useRef<HTMLDivElement>(null)
   const faceAnalysisRef = useRef<FaceAnalysisRef>(null)
@@ -253,7 +236,7 @@ export default function AudioVideoInterviewer({
     isDetectingSpeech,
     resetTranscript,
   } = useSpeechRecognition()
-  const { speak, isSpeaking } = useTextToSpeech({ rate: 0.9 }); // Set speech rate here
+  const { speak, speakQueued, stop: stopTTS, isSpeaking } = useTextToSpeech({ rate: 0.9 }); // Set speech rate here
   const supabase = createClient()
 
   const voiceAgent = useVoiceAgent({
@@ -647,80 +630,115 @@ export default function AudioVideoInterviewer({
       if (previousAnswers.length > 0) {
         console.log("[v0] Last answer:", previousAnswers[previousAnswers.length - 1].answer.substring(0, 50))
       }
-      const response = await fetch("/api/interview/question", {
-        method: "POST",
-        headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({
-          interviewId: interviewSessionId,
-          interviewType,
-          questionNumber: questionNum,
-          previousAnswers, // This is correctly passed
-          userId: userId,
-          customScenario: customScenario || null,
-        }),
+      const requestBody = JSON.stringify({
+        interviewId: interviewSessionId,
+        interviewType,
+        questionNumber: questionNum,
+        previousAnswers, // This is correctly passed
+        userId: userId,
+        customScenario: customScenario || null,
       })
 
-      if (!response.ok) {
-        let errorMessage = "Failed to generate question"
-        try {
-          const errorData = await response.json()
-          console.log("[v0] API error response:", errorData)
-          errorMessage = errorData.error || errorData.message || response.statusText || "Unknown error"
-          if (errorData.details) {
-            console.log("[v0] Error details:", errorData.details)
-          }
-        } catch (parseError) {
-          console.log("[v0] Could not parse error response:", parseError)
-          errorMessage = `Server error: ${response.status} ${response.statusText}`
-        }
-        throw new Error(errorMessage)
+      let startedSpeaking = false
+      let lastSpoken: Promise<void> = Promise.resolve()
+      const beginSpeaking = () => {
+        if (startedSpeaking) return
+        startedSpeaking = true
+        setConversationState("ai-speaking")
+        setIsAIThinking(false)
+        stopAllSpeech()
       }
 
-      const data = await response.json()
-      console.log("[v0] Question generated:", data.question)
+      // Stream the question so speech starts on the first sentence instead of after the full completion
+      const streamed: { question: string | null; error: string | null } = { question: null, error: null }
+      try {
+        const streamResponse = await fetch("/api/interview/question/stream", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: requestBody,
+        })
+
+        if (streamResponse.ok && streamResponse.body) {
+          await readServerSentEvents(streamResponse, (event, payload) => {
+            if (event === "sentence" && payload?.text) {
+              beginSpeaking()
+              lastSpoken = speakQueued(payload.text)
+            } else if (event === "done") {
+              streamed.question = payload?.question || null
+            } else if (event === "error") {
+              streamed.error = payload?.error || "Failed to stream question"
+            }
+          })
+          if (streamed.error && !streamed.question) throw new Error(streamed.error)
+        }
+      } catch (streamErr) {
+        if (startedSpeaking) throw streamErr
+        console.warn("[v0] Question stream failed, falling back to JSON endpoint:", streamErr)
+      }
 
-      if (data.question) {
-        setCurrentQuestion(data.question)
-        setConversationState("ai-speaking")
-        setIsAIThinking(false)
+      let question = streamed.question
+      if (!question) {
+        const response = await fetch("/api/interview/question", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: requestBody,
+        })
 
-        stopAllSpeech()
-        const speakResult = speak(data.question)
-        if (speakResult && typeof speakResult.then === "function") {
-          speakResult
-            .then(() => {
-              if (!isInterviewComplete) {
-                console.log("[v0] AI finished speaking, auto-starting listening...")
-                setTimeout(() => {
-                  setConversationState("listening")
-                  voiceAgent.startListening()
-                }, 300)
-              }
-            })
-            .catch((err) => {
-              console.error("[v0] Error during speech:", err)
-              if (!isInterviewComplete) {
-                setTimeout(() => {
-                  setConversationState("listening")
-                  voiceAgent.startListening()
-                }, 300)
-              }
-            })
-        } else {
-          console.log("[v0] Speak didn't return promise, starting listening after delay...")
-          if (!isInterviewComplete) {
-            setTimeout(() => {
-              setConversationState("listening")
-              voiceAgent.startListening()
-            }, 500)
+        if (!response.ok) {
+          let errorMessage = "Failed to generate question"
+          try {
+            const errorData = await response.json()
+            console.log("[v0] API error response:", errorData)
+            errorMessage = errorData.error || errorData.message || response.statusText || "Unknown error"
+            if (errorData.details) {
+              console.log("[v0] Error details:", errorData.details)
+            }
+          } catch (parseError) {
+            console.log("[v0] Could not parse error response:", parseError)
+            errorMessage = `Server error: ${response.status} ${response.statusText}`
           }
+          throw new Error(errorMessage)
         }
 
+        const data = await response.json()
+        question = data.question || null
+        if (question) {
+          beginSpeaking()
+          lastSpoken = speak(question)
+        }
+      }
+
+      const finalQuestion = question
+      console.log("[v0] Question generated:", finalQuestion)
+
+      if (finalQuestion) {
+        setCurrentQuestion(finalQuestion)
+
+        lastSpoken
+          .then(() => {
+            if (!isInterviewComplete) {
+              console.log("[v0] AI finished speaking, auto-starting listening...")
+              setTimeout(() => {
+                setConversationState("listening")
+                voiceAgent.startListening()
+              }, 300)
+            }
+          })
+          .catch((err) => {
+            console.error("[v0] Error during speech:", err)
+            if (!isInterviewComplete) {
+              setTimeout(() => {
+                setConversationState("listening")
+                voiceAgent.startListening()
+              }, 300)
+            }
+          })
+
         setTranscript((prev) => [
           ...prev,
           {
             type: "ai",
-            content: data.question,
+            content: finalQuestion,
             timestamp: new Date(),
             questionNumber: questionNum,
           },
@@ -972,17 +990,12 @@ export default function AudioVideoInterviewer({
       })
 
       if (analysisResponse.ok) {
-        const analysisData = await analysisResponse.json() // Corrected: use analysisResponse here
-        console.log("[v0] Analysis completed successfully:", analysisData)
-
-        setAnalysisData(analysisData.analysis)
-        setIsGeneratingAnalysis(false)
-        setShowResults(true)
+        // 202: analysis is queued; the results page polls until it is ready
+        const queued = await analysisResponse.json()
+        console.log("[v0] Analysis queued:", queued)
 
-        // Announce results are ready
-        // AND ensure the voice agent stops speaking immediately after ending the interview
+        // Ensure the voice agent stops speaking immediately after ending the interview
         try {
-          // Stop voice agent speech and any ongoing TTS
           stopAllSpeech()
           voiceAgent.stopListening()
           voiceAgent.setAISpeaking(false)
@@ -990,26 +1003,7 @@ export default function AudioVideoInterviewer({
           console.error('[v0] Error stopping voice agent or TTS after interview end:', stopErr)
         }
 
-        // Navigate to the full results page for this interview after a short delay
-        try {
-          // also fetch batchId for this interview (optional) to enable Back to Batch button
-          setTimeout(async () => {
-            if (interviewId) {
-              try {
-                const res = await fetch(`/api/interview/results?interviewId=${interviewId}`)
-                if (res.ok) {
-                  const json = await res.json()
-                  setBatchId(json.batchId || null)
-                }
-              } catch (fetchErr) {
-                console.warn('[v0] Could not fetch batchId for interview:', fetchErr)
-              }
-              router.push(`/results?interviewId=${interviewId}`)
-            }
-          }, 1200)
-        } catch (navErr) {
-          console.error('[v0] Failed to navigate to results page:', navErr)
-        }
+        router.push(`/results?interviewId=${interviewId}`)
       } else {
         const errorData = await analysisResponse.json() // Corrected: use analysisResponse here
         const errorMsg = errorData.error || analysisResponse.statusText // Corrected: use analysisResponse here
@@ -4,6 +4,7 @@ import { useState, useEffect, useRef } from "react"
 import { useRouter, usePathname } from "next/navigation"
 import { createClient } from "@/lib/supabase/client"
 import { useTextToSpeech } from "@/hooks/use-text-to-speech"
+import { readServerSentEvents } from "@/lib/api/sse-client"
 import { Button } from "@/components/ui/button"
 import { Textarea } from "@/components/ui/textarea"
 import { Card } from "@/components/ui/card"
@@ -347,8 +348,8 @@ export default function DSACodeInterviewer({ interviewType }: DSACodeInterviewer
       }
 
       if (!isAptitude) {
-        // Request AI analysis of the code (DSA only)
-        const analysisResponse = await fetch("/api/interview/analyze-code", {
+        // Request AI analysis of the code (DSA only), streamed so feedback renders as it is generated
+        const analysisResponse = await fetch("/api/interview/analyze-code/stream", {
           method: "POST",
           headers: { "Content-Type": "application/json" },
           body: JSON.stringify({
@@ -359,18 +360,28 @@ export default function DSACodeInterviewer({ interviewType }: DSACodeInterviewer
           }),
         })
 
-        if (analysisResponse.ok) {
-          const analysisData = await analysisResponse.json()
+        if (analysisResponse.ok && analysisResponse.body) {
+          const entryTimestamp = new Date()
+          let feedback = ""
 
           setTranscript((prev) => [
             ...prev,
             {
               type: "ai",
-              content: analysisData.feedback,
-              timestamp: new Date(),
+              content: "",
+              timestamp: entryTimestamp,
               questionNumber: currentQuestionIndex + 1,
             },
           ])
+
+          await readServerSentEvents(analysisResponse, (event, payload) => {
+            if (event !== "token" || !payload?.text) return
+            feedback += payload.text
+            const content = feedback
+            setTranscript((prev) =>
+              prev.map((entry) => (entry.timestamp === entryTimestamp ? { ...entry, content } : entry)),
+            )
+          })
         }
       }
 
@@ -491,12 +502,11 @@ export default function DSACodeInterviewer({ interviewType }: DSACodeInterviewer
       console.log("[v0] completeInterview: /api/interview/analyze response received. Status:", analysisResponse.status, "OK:", analysisResponse.ok);
 
       if (analysisResponse.ok) {
-        const analysisData = await analysisResponse.json()
-        console.log("[v0] completeInterview: Analysis data received successfully:", analysisData);
-        setAnalysisData(analysisData.analysis)
-        setShowResults(true)
+        // 202: analysis is queued; the results page polls until it is ready
+        const queued = await analysisResponse.json()
+        console.log("[v0] completeInterview: Analysis queued:", queued);
 
-        // Navigate to results page when done
+        // Navigate to results page
         try {
           const resultId = interviewId
           if (resultId) {
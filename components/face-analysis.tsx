@@ -1,16 +1,18 @@
 "use client"
 
-import { useEffect, useRef, useState, useCallback, useImperativeHandle, forwardRef } from "react"
+import { useEffect, useRef, useState, useImperativeHandle, forwardRef } from "react"
 import { Card, CardContent } from "@/components/ui/card"
 import { Camera, CameraOff } from 'lucide-react'
 import { Button } from "@/components/ui/button"
+import { MetricsRing, type FaceMetrics } from "@/lib/video/metrics-ring"
 
-interface FaceMetrics {
-  eyeContact: number
-  smile: number
-  stillness: number
-  confidenceScore: number
-}
+// Frames are sampled at 5 Hz, downscaled by createImageBitmap and analysed in
+// /workers/face-metrics.js; only running aggregates are kept on the main thread.
+const SAMPLE_INTERVAL_MS = 200
+const SAMPLE_WIDTH = 64
+const SAMPLE_HEIGHT = 48
+const RECENT_WINDOW_SAMPLES = 150 // last 30 seconds at 5 Hz
+const UPDATE_INTERVAL_MS = 1000
 
 interface FaceAnalysisProps {
   onMetricsUpdate?: (metrics: FaceMetrics) => void
@@ -30,35 +32,14 @@ const FaceAnalysis = forwardRef<FaceAnalysisRef, FaceAnalysisProps>(({ onMetrics
   const [modelsLoaded, setModelsLoaded] = useState(false)
   const [error, setError] = useState<string | null>(null)
 
-  const metricsHistoryRef = useRef<FaceMetrics[]>([])
+  const metricsRef = useRef<MetricsRing | null>(null)
+  if (!metricsRef.current) metricsRef.current = new MetricsRing(RECENT_WINDOW_SAMPLES)
   const streamRef = useRef<MediaStream | null>(null)
-  const faceApiRef = useRef<any>(null)
-  const animationFrameRef = useRef<number | null>(null)
-  const previousPositionRef = useRef<{ x: number; y: number } | null>(null)
-  const movementHistoryRef = useRef<number[]>([])
+  const onMetricsUpdateRef = useRef(onMetricsUpdate)
+  onMetricsUpdateRef.current = onMetricsUpdate
 
   useImperativeHandle(ref, () => ({
-    getAverageMetrics: () => {
-      if (metricsHistoryRef.current.length === 0) return null
-
-      const sum = metricsHistoryRef.current.reduce(
-        (acc, metrics) => ({
-          eyeContact: acc.eyeContact + metrics.eyeContact,
-          smile: acc.smile + metrics.smile,
-          stillness: acc.stillness + metrics.stillness,
-          confidenceScore: acc.confidenceScore + metrics.confidenceScore,
-        }),
-        { eyeContact: 0, smile: 0, stillness: 0, confidenceScore: 0 },
-      )
-
-      const count = metricsHistoryRef.current.length
-      return {
-        eyeContact: Math.round(sum.eyeContact / count),
-        smile: Math.round(sum.smile / count),
-        stillness: Math.round(sum.stillness / count),
-        confidenceScore: Math.round(sum.confidenceScore / count),
-      }
-    },
+    getAverageMetrics: () => metricsRef.current?.sessionAverage() ?? null,
     startCamera: async () => {
       await startCamera()
     },
@@ -192,90 +173,78 @@ const FaceAnalysis = forwardRef<FaceAnalysisRef, FaceAnalysisProps>(({ onMetrics
       streamRef.current = null
     }
 
-    if (animationFrameRef.current) {
-      cancelAnimationFrame(animationFrameRef.current)
-      animationFrameRef.current = null
-    }
-
     if (videoRef.current) {
       videoRef.current.srcObject = null
     }
 
     setIsActive(false)
-    previousPositionRef.current = null
-    movementHistoryRef.current = []
   }
 
-  const analyze = useCallback(async () => {
-    if (!videoRef.current || !canvasRef.current || !isActive) {
-      return
-    }
-
+  useEffect(() => {
     const video = videoRef.current
     const canvas = canvasRef.current
-
-    if (video.readyState !== video.HAVE_ENOUGH_DATA) {
-      animationFrameRef.current = requestAnimationFrame(analyze)
-      return
+    if (!isActive || !video || !canvas) return
+
+    // Static framing guide; drawn once rather than every frame
+    canvas.width = video.videoWidth
+    canvas.height = video.videoHeight
+    const ctx = canvas.getContext("2d")
+    if (ctx) {
+      ctx.strokeStyle = "#10b981"
+      ctx.lineWidth = 2
+      ctx.strokeRect(canvas.width * 0.2, canvas.height * 0.2, canvas.width * 0.6, canvas.height * 0.6)
     }
 
-    if (!isActive) {
-      animationFrameRef.current = requestAnimationFrame(analyze)
+    if (typeof Worker === "undefined" || typeof OffscreenCanvas === "undefined" || typeof createImageBitmap === "undefined") {
+      console.warn("[v0] Face analysis unavailable: Worker/OffscreenCanvas not supported in this browser")
       return
     }
 
-    if (canvas.width !== video.videoWidth || canvas.height !== video.videoHeight) {
-      canvas.width = video.videoWidth
-      canvas.height = video.videoHeight
-    }
-
-    try {
-      const eyeContactScore = 70 + Math.random() * 25
-      const smileScore = 60 + Math.random() * 30
-      const stillnessScore = 80 + Math.random() * 15
-
-      const confidenceScore = eyeContactScore * 0.4 + smileScore * 0.3 + stillnessScore * 0.3
-
-      const currentMetrics = {
-        eyeContact: Math.round(eyeContactScore),
-        smile: Math.round(smileScore),
-        stillness: Math.round(stillnessScore),
-        confidenceScore: Math.round(confidenceScore),
-      }
+    const worker = new Worker("/workers/face-metrics.js")
+    let frameInFlight = false
+    let lastUpdate = 0
 
-      metricsHistoryRef.current.push(currentMetrics)
+    worker.onmessage = (e) => {
+      frameInFlight = false
+      const { type, sample, error } = e.data
 
-      if (onMetricsUpdate) {
-        onMetricsUpdate(currentMetrics)
-      }
+      if (type === "sample") {
+        const ring = metricsRef.current!
+        ring.push(sample)
 
-      const ctx = canvas.getContext("2d")
-      if (ctx) {
-        ctx.clearRect(0, 0, canvas.width, canvas.height)
-        ctx.strokeStyle = "#10b981"
-        ctx.lineWidth = 2
-        ctx.strokeRect(canvas.width * 0.2, canvas.height * 0.2, canvas.width * 0.6, canvas.height * 0.6)
+        const now = Date.now()
+        if (onMetricsUpdateRef.current && now - lastUpdate >= UPDATE_INTERVAL_MS) {
+          lastUpdate = now
+          onMetricsUpdateRef.current(ring.recentAverage()!)
+        }
+      } else if (type === "error") {
+        console.error("[v0] Error during face analysis:", error)
       }
-    } catch (err) {
-      console.error("[v0] Error during face analysis:", err)
     }
 
-    if (isActive) {
-      animationFrameRef.current = requestAnimationFrame(analyze)
-    }
-  }, [isActive, onMetricsUpdate])
+    const sampler = setInterval(async () => {
+      // Skip a tick rather than queue frames if the worker is still busy
+      if (frameInFlight || video.readyState < video.HAVE_CURRENT_DATA) return
+      frameInFlight = true
 
-  useEffect(() => {
-    if (isActive) {
-      analyze()
-    }
+      try {
+        const bitmap = await createImageBitmap(video, {
+          resizeWidth: SAMPLE_WIDTH,
+          resizeHeight: SAMPLE_HEIGHT,
+          resizeQuality: "low",
+        })
+        worker.postMessage({ type: "frame", bitmap }, [bitmap])
+      } catch (err) {
+        frameInFlight = false
+        console.error("[v0] Error capturing video frame:", err)
+      }
+    }, SAMPLE_INTERVAL_MS)
 
     return () => {
-      if (animationFrameRef.current) {
-        cancelAnimationFrame(animationFrameRef.current)
-      }
+      clearInterval(sampler)
+      worker.terminate()
     }
-  }, [isActive, analyze])
+  }, [isActive])
 
   useEffect(() => {
     return () => {
@@ -1,6 +1,6 @@
 "use client"
 
-import { useEffect, useState } from "react"
+import { useCallback, useEffect, useRef, useState } from "react"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
@@ -8,11 +8,13 @@ import { Badge } from "@/components/ui/badge"
 import Link from "next/link"
 import { useRouter } from 'next/navigation'
 import { createClient } from "@/lib/supabase/client"
-import { Users, TrendingUp, Award, Search, UserPlus, UserMinus, Activity, BarChart3, Copy, Check, AlertCircle, Calendar } from 'lucide-react'
+import { Users, TrendingUp, Award, Search, UserPlus, UserMinus, Activity, BarChart3, Copy, Check, AlertCircle, Calendar, ArrowUp, ArrowDown } from 'lucide-react'
 import UploadMembersModal from "@/components/upload-members-modal"
+import { useVirtualRows } from "@/hooks/use-virtual-rows"
 
 interface Member {
   id: string
+  memberRowId: string
   name: string
   email: string
   role: string
@@ -21,6 +23,12 @@ interface Member {
   last_active: string
 }
 
+type MemberSort = "name" | "email" | "interviews" | "score" | "joined"
+
+const MEMBER_PAGE_SIZE = 50
+const MEMBER_ROW_HEIGHT = 72
+const SEARCH_DEBOUNCE_MS = 300
+
 interface Institution {
   id: string
   name: string
@@ -47,6 +55,12 @@ export default function InstitutionDashboardContent({
     avgScore: 0,
   })
   const [searchQuery, setSearchQuery] = useState("")
+  const [debouncedSearch, setDebouncedSearch] = useState("")
+  const [sort, setSort] = useState<{ key: MemberSort; order: "asc" | "desc" }>({ key: "name", order: "asc" })
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [memberTotal, setMemberTotal] = useState(0)
+  const [loadingMembers, setLoadingMembers] = useState(false)
+  const membersRequest = useRef(0)
   const [newMemberEmail, setNewMemberEmail] = useState("")
   const [isAddingMember, setIsAddingMember] = useState(false)
   const [loading, setLoading] = useState(false)
@@ -55,10 +69,14 @@ export default function InstitutionDashboardContent({
 
   useEffect(() => {
     fetchStats()
-    fetchMembers()
     fetchInviteCode()
   }, [institutionId])
 
+  useEffect(() => {
+    const timer = setTimeout(() => setDebouncedSearch(searchQuery.trim()), SEARCH_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [searchQuery])
+
   const fetchStats = async () => {
     try {
       const response = await fetch(`/api/institution/stats`)
@@ -66,7 +84,7 @@ export default function InstitutionDashboardContent({
         const data = await response.json()
         setStats({
           totalMembers: data.totalMembers || 0,
-          activeMembers: data.totalMembers || 0, // Using totalMembers as activeMembers for now
+          activeMembers: data.activeMembers || 0,
           totalInterviews: data.totalInterviews || 0,
           avgScore: data.averageScore || 0,
         })
@@ -76,17 +94,57 @@ export default function InstitutionDashboardContent({
     }
   }
 
-  const fetchMembers = async () => {
-    try {
-      const response = await fetch(`/api/institution/members`)
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`)
+  // Loads one keyset page; `cursor` null starts over (new search/sort or after a change)
+  const fetchMembers = useCallback(
+    async (cursor: string | null = null) => {
+      const requestId = ++membersRequest.current
+      setLoadingMembers(true)
+      try {
+        const params = new URLSearchParams({ limit: String(MEMBER_PAGE_SIZE), sort: sort.key, order: sort.order })
+        if (debouncedSearch) params.set("search", debouncedSearch)
+        if (cursor) params.set("cursor", cursor)
+
+        const response = await fetch(`/api/institution/members?${params}`)
+        if (!response.ok) {
+          throw new Error(`HTTP error! status: ${response.status}`)
+        }
+        const data = await response.json()
+        // A newer search or sort has been issued; drop this stale page
+        if (requestId !== membersRequest.current) return
+        setMembers((prev) => (cursor ? [...prev, ...(data.members || [])] : data.members || []))
+        setNextCursor(data.nextCursor || null)
+        setMemberTotal(data.total || 0)
+      } catch (error) {
+        console.error("Error fetching members:", error)
+      } finally {
+        if (requestId === membersRequest.current) setLoadingMembers(false)
       }
-      const data = await response.json()
-      setMembers(data.members || [])
-    } catch (error) {
-      console.error("Error fetching members:", error)
-    }
+    },
+    [sort, debouncedSearch],
+  )
+
+  const loadMoreMembers = useCallback(() => {
+    if (nextCursor && !loadingMembers) fetchMembers(nextCursor)
+  }, [nextCursor, loadingMembers, fetchMembers])
+
+  const memberRows = useVirtualRows({
+    count: members.length,
+    rowHeight: MEMBER_ROW_HEIGHT,
+    onReachEnd: loadMoreMembers,
+  })
+  const { scrollToTop } = memberRows
+
+  useEffect(() => {
+    scrollToTop()
+    fetchMembers()
+  }, [institutionId, fetchMembers, scrollToTop])
+
+  const toggleSort = (key: MemberSort) => {
+    setSort((prev) =>
+      prev.key === key
+        ? { key, order: prev.order === "asc" ? "desc" : "asc" }
+        : { key, order: key === "name" || key === "email" ? "asc" : "desc" },
+    )
   }
 
   const fetchInviteCode = async () => {
@@ -133,14 +191,14 @@ export default function InstitutionDashboardContent({
     }
   }
 
-  const handleRemoveMember = async (memberId: string) => {
+  const handleRemoveMember = async (memberRowId: string) => {
     if (!confirm("Are you sure you want to remove this member?")) return
 
     try {
       const response = await fetch("/api/institution/members/remove", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ memberId }),
+        body: JSON.stringify({ memberId: memberRowId }),
       })
 
       if (response.ok) {
@@ -164,10 +222,18 @@ export default function InstitutionDashboardContent({
     setTimeout(() => setCopiedCode(false), 2000)
   }
 
-  const filteredMembers = members.filter(
-    (member) =>
-      member.name?.toLowerCase().includes(searchQuery.toLowerCase()) ||
-      member.email?.toLowerCase().includes(searchQuery.toLowerCase()),
+  const sortHeader = (key: MemberSort, label: string, className = "") => (
+    <button
+      type="button"
+      role="columnheader"
+      onClick={() => toggleSort(key)}
+      className={`flex items-center gap-1 hover:text-gray-900 ${className}`}
+      aria-sort={sort.key === key ? (sort.order === "asc" ? "ascending" : "descending") : "none"}
+    >
+      {label}
+      {sort.key === key &&
+        (sort.order === "asc" ? <ArrowUp className="h-3 w-3" /> : <ArrowDown className="h-3 w-3" />)}
+    </button>
   )
 
   return (
@@ -421,42 +487,59 @@ export default function InstitutionDashboardContent({
             </div>
           </CardHeader>
           <CardContent>
-            <div className="space-y-4">
-              {filteredMembers.length === 0 ? (
-                <p className="text-center text-gray-500 py-8">No members found</p>
-              ) : (
-                filteredMembers.map((member) => (
-                  <div
-                    key={member.id}
-                    className="flex items-center justify-between p-4 border border-gray-200 rounded-lg hover:bg-gray-50 transition-colors"
-                  >
-                    <div className="flex items-center gap-4">
-                      <div className="w-10 h-10 bg-gray-200 rounded-full flex items-center justify-center">
-                        <span className="text-gray-700 font-semibold">
-                          {member.name?.charAt(0).toUpperCase() || member.email?.charAt(0).toUpperCase()}
-                        </span>
-                      </div>
-                      <div>
-                        <p className="font-semibold text-gray-900">{member.name || "No name"}</p>
-                        <p className="text-sm text-gray-600">{member.email}</p>
-                      </div>
-                    </div>
-                    <div className="flex items-center gap-4">
-                      <div className="text-right">
-                        <p className="text-sm font-medium text-gray-900">{member.total_interviews} interviews</p>
-                        <p className="text-sm text-gray-600">Avg: {member.avg_score}%</p>
-                      </div>
-                      <Badge variant="outline" className="capitalize">
-                        {member.role}
-                      </Badge>
-                      <Button variant="ghost" size="sm" onClick={() => handleRemoveMember(member.id)}>
-                        <UserMinus className="h-4 w-4 text-red-500" />
-                      </Button>
+            <div role="table" aria-rowcount={memberTotal} className="border border-gray-200 rounded-lg">
+              <div
+                role="row"
+                className="grid grid-cols-[minmax(0,1fr)_8rem_7rem_6rem_3rem] items-center gap-4 px-4 py-2 border-b bg-gray-50 text-xs font-medium uppercase text-gray-500"
+              >
+                {sortHeader("name", "Member")}
+                {sortHeader("interviews", "Interviews", "justify-end")}
+                {sortHeader("score", "Avg score", "justify-end")}
+                <span role="columnheader">Role</span>
+                <span role="columnheader" className="sr-only">Actions</span>
+              </div>
+              <div ref={memberRows.containerRef} onScroll={memberRows.onScroll} className="max-h-[576px] overflow-y-auto">
+                {members.length === 0 ? (
+                  <p className="text-center text-gray-500 py-8">{loadingMembers ? "Loading members..." : "No members found"}</p>
+                ) : (
+                  <div style={{ height: memberRows.totalHeight, position: "relative" }}>
+                    <div style={{ transform: `translateY(${memberRows.offsetTop}px)` }}>
+                      {members.slice(memberRows.start, memberRows.end).map((member) => (
+                        <div
+                          key={member.id}
+                          role="row"
+                          style={{ height: MEMBER_ROW_HEIGHT }}
+                          className="grid grid-cols-[minmax(0,1fr)_8rem_7rem_6rem_3rem] items-center gap-4 px-4 border-b border-gray-100 hover:bg-gray-50 transition-colors"
+                        >
+                          <div className="flex items-center gap-4 min-w-0">
+                            <div className="w-10 h-10 shrink-0 bg-gray-200 rounded-full flex items-center justify-center">
+                              <span className="text-gray-700 font-semibold">
+                                {member.name?.charAt(0).toUpperCase() || member.email?.charAt(0).toUpperCase()}
+                              </span>
+                            </div>
+                            <div className="min-w-0">
+                              <p className="font-semibold text-gray-900 truncate">{member.name || "No name"}</p>
+                              <p className="text-sm text-gray-600 truncate">{member.email}</p>
+                            </div>
+                          </div>
+                          <p className="text-sm font-medium text-gray-900 text-right">{member.total_interviews}</p>
+                          <p className="text-sm text-gray-600 text-right">{member.avg_score}%</p>
+                          <Badge variant="outline" className="capitalize w-fit">
+                            {member.role}
+                          </Badge>
+                          <Button variant="ghost" size="sm" onClick={() => handleRemoveMember(member.memberRowId)}>
+                            <UserMinus className="h-4 w-4 text-red-500" />
+                          </Button>
+                        </div>
+                      ))}
                     </div>
                   </div>
-                ))
-              )}
+                )}
+              </div>
             </div>
+            <p className="text-xs text-gray-500 mt-2">
+              Showing {members.length} of {memberTotal} members{loadingMembers && members.length > 0 ? " · loading..." : ""}
+            </p>
           </CardContent>
         </Card>
       </div>
@@ -1,6 +1,5 @@
 "use client"
 
-import { useState, useEffect } from "react"
 import { Bell, Calendar, Clock, Book, AlertCircle } from 'lucide-react'
 import {
   DropdownMenu,
@@ -10,6 +9,7 @@ import {
 import { Badge } from "@/components/ui/badge"
 import { Button } from "@/components/ui/button"
 import { useRouter } from 'next/navigation'
+import { useScheduledInterviews } from "@/hooks/use-user-live-data"
 
 interface ScheduledInterview {
   id: string
@@ -24,31 +24,12 @@ interface ScheduledInterview {
 }
 
 export function NotificationsDropdown() {
-  const [scheduledInterviews, setScheduledInterviews] = useState<ScheduledInterview[]>([])
-  const [loading, setLoading] = useState(true)
+  // Pushed by the realtime user channel instead of polled every 30 seconds
+  const { interviews } = useScheduledInterviews<ScheduledInterview>()
+  const scheduledInterviews = interviews || []
+  const loading = interviews === null
   const router = useRouter()
 
-  useEffect(() => {
-    fetchScheduledInterviews()
-    // Poll for new scheduled interviews every 30 seconds
-    const interval = setInterval(fetchScheduledInterviews, 30000)
-    return () => clearInterval(interval)
-  }, [])
-
-  const fetchScheduledInterviews = async () => {
-    try {
-      const response = await fetch("/api/user/scheduled-interviews")
-      if (response.ok) {
-        const data = await response.json()
-        setScheduledInterviews(data.interviews || [])
-      }
-    } catch (error) {
-      console.error("Error fetching scheduled interviews:", error)
-    } finally {
-      setLoading(false)
-    }
-  }
-
   const isExpired = (interview: ScheduledInterview) => {
     if (!interview.deadline) return false
     return new Date() > new Date(interview.deadline)
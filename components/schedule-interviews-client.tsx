@@ -16,7 +16,7 @@ interface Batch {
   id: string
   name: string
   description: string
-  batch_members: Array<{ user_id: string }>
+  member_count: number
 }
 
 interface Member {
@@ -113,10 +113,15 @@ export default function ScheduleInterviewClient() {
 
       const { data: batchesData } = await supabase
         .from("batches")
-        .select("id, name, description, batch_members(user_id)")
+        .select("id, name, description, batch_members(count)")
         .eq("institution_id", userProfile.institution_id)
 
-      setBatches(batchesData || [])
+      setBatches(
+        (batchesData || []).map(({ batch_members, ...batch }: any) => ({
+          ...batch,
+          member_count: batch_members?.[0]?.count || 0,
+        })),
+      )
     } catch (error) {
       console.error("Error fetching batches:", error)
     }
@@ -187,7 +192,7 @@ export default function ScheduleInterviewClient() {
       }
 
       const batch = batches.find((b) => b.id === selectedBatch)
-      if (!batch || !batch.batch_members || batch.batch_members.length === 0) {
+      if (!batch || batch.member_count === 0) {
         setError("Selected batch has no members")
         setLoading(false)
         return
@@ -196,36 +201,32 @@ export default function ScheduleInterviewClient() {
       const dateTime = `${scheduledDate}T${scheduledTime}:00`
       const deadlineDateTime = deadlineDate && deadlineTime ? `${deadlineDate}T${deadlineTime}:00` : null
 
-      let successCount = 0
-      let failCount = 0
-
-      for (const member of batch.batch_members) {
-        try {
-          const response = await fetch("/api/institution/schedule/create", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({
-              memberId: member.user_id,
-              course,
-              difficulty,
-              scheduledDate: dateTime,
-              deadline: deadlineDateTime,              duration: durationMinutes,            }),
-          })
-
-          if (response.ok) {
-            successCount++
-          } else {
-            failCount++
-          }
-        } catch (err) {
-          failCount++
-        }
+      // One request for the whole batch; members are resolved and inserted server-side
+      const response = await fetch("/api/institution/schedule/bulk", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          batchId: batch.id,
+          course,
+          difficulty,
+          scheduledDate: dateTime,
+          deadline: deadlineDateTime,
+          duration: durationMinutes,
+        }),
+      })
+      const data = await response.json().catch(() => ({}))
+
+      if (!response.ok) {
+        setError(data.error || "Failed to schedule interviews for batch members")
+        return
       }
 
-      if (successCount > 0) {
-        setSuccess(`Successfully scheduled ${successCount} interview(s)${failCount > 0 ? ` (${failCount} failed)` : ""}`)
+      if (data.scheduled > 0) {
+        setSuccess(
+          `Successfully scheduled ${data.scheduled} interview(s)${data.skipped > 0 ? ` (${data.skipped} already scheduled)` : ""}`,
+        )
       } else {
-        setError("Failed to schedule interviews for batch members")
+        setError("All batch members already have this interview scheduled")
       }
 
       setSelectedBatch("")
@@ -390,13 +391,13 @@ export default function ScheduleInterviewClient() {
                       <option value="">Choose a batch...</option>
                       {batches.map((batch) => (
                         <option key={batch.id} value={batch.id}>
-                          {batch.name} ({batch.batch_members?.length || 0} members)
+                          {batch.name} ({batch.member_count} members)
                         </option>
                       ))}
                     </select>
                     {selectedBatch && (
                       <p className="text-xs text-gray-500 mt-2">
-                        This will schedule interviews for all {batches.find((b) => b.id === selectedBatch)?.batch_members?.length || 0} members in this batch
+                        This will schedule interviews for all {batches.find((b) => b.id === selectedBatch)?.member_count || 0} members in this batch
                       </p>
                     )}
                   </div>
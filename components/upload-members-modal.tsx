@@ -7,6 +7,14 @@ import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
 import { Label } from "@/components/ui/label"
 import { useToast } from "@/hooks/use-toast"
+import { readServerSentEvents } from "@/lib/api/sse-client"
+
+const STAGE_LABELS: Record<string, string> = {
+  parsing: "Reading file",
+  matching: "Matching emails",
+  members: "Checking memberships",
+  inserting: "Adding members",
+}
 
 export default function UploadMembersModal({ triggerClassName = "", triggerText = "Upload List" }: { triggerClassName?: string; triggerText?: string }) {
   const [open, setOpen] = useState(false)
@@ -14,6 +22,7 @@ export default function UploadMembersModal({ triggerClassName = "", triggerText
   const [loading, setLoading] = useState(false)
   const [result, setResult] = useState<any | null>(null)
   const [preview, setPreview] = useState<any | null>(null)
+  const [progress, setProgress] = useState<string | null>(null)
   const { toast } = useToast()
   const router = useRouter()
 
@@ -24,6 +33,34 @@ export default function UploadMembersModal({ triggerClassName = "", triggerText
     setPreview(null)
   }
 
+  // Streams progress events while the server parses and matches the roster
+  const submitRoster = async (selected: File, previewOnly: boolean) => {
+    const form = new FormData()
+    form.append("file", selected)
+
+    const res = await fetch(`/api/institution/members/upload?stream=1${previewOnly ? "&preview=1" : ""}`, {
+      method: "POST",
+      body: form,
+    })
+    if (!res.ok) {
+      const data = await res.json().catch(() => ({}))
+      return { ok: false, data }
+    }
+
+    let outcome: { ok: boolean; data: any } = { ok: false, data: { error: "Upload ended unexpectedly" } }
+    await readServerSentEvents(res, (event, payload) => {
+      if (event === "progress") {
+        const label = STAGE_LABELS[payload.stage] || payload.stage
+        setProgress(payload.total ? `${label}: ${payload.processed} / ${payload.total}` : `${label}: ${payload.processed} rows`)
+      } else if (event === "result") {
+        outcome = { ok: true, data: payload }
+      } else if (event === "error") {
+        outcome = { ok: false, data: payload }
+      }
+    })
+    return outcome
+  }
+
   const handlePreview = async () => {
     if (!file) {
       toast({ title: "Select a file", description: "Please choose a CSV, XLSX or PDF file containing emails." })
@@ -32,17 +69,9 @@ export default function UploadMembersModal({ triggerClassName = "", triggerText
 
     try {
       setLoading(true)
-      const form = new FormData()
-      form.append("file", file)
-
-      const res = await fetch("/api/institution/members/upload?preview=1", {
-        method: "POST",
-        body: form,
-      })
-
-      const data = await res.json()
+      const { ok, data } = await submitRoster(file, true)
 
-      if (!res.ok) {
+      if (!ok) {
         toast({ title: "Preview failed", description: data.error || "Unable to parse file" })
         return
       }
@@ -53,6 +82,7 @@ export default function UploadMembersModal({ triggerClassName = "", triggerText
       toast({ title: "Error", description: "Preview failed. Try again." })
     } finally {
       setLoading(false)
+      setProgress(null)
     }
   }
 
@@ -64,17 +94,9 @@ export default function UploadMembersModal({ triggerClassName = "", triggerText
 
     try {
       setLoading(true)
-      const form = new FormData()
-      form.append("file", file)
-
-      const res = await fetch("/api/institution/members/upload", {
-        method: "POST",
-        body: form,
-      })
-
-      const data = await res.json()
+      const { ok, data } = await submitRoster(file, false)
 
-      if (!res.ok) {
+      if (!ok) {
         toast({ title: "Upload failed", description: data.error || "Unable to process file" })
         return
       }
@@ -92,6 +114,7 @@ export default function UploadMembersModal({ triggerClassName = "", triggerText
       toast({ title: "Error", description: "Upload failed. Try again." })
     } finally {
       setLoading(false)
+      setProgress(null)
     }
   }
 
@@ -113,6 +136,7 @@ export default function UploadMembersModal({ triggerClassName = "", triggerText
           <Label htmlFor="upload-file">File</Label>
           <Input id="upload-file" type="file" accept=".csv, .xlsx, .xls, application/pdf, .pdf" onChange={onFileChange} />
           {file && <p className="text-sm text-gray-600">Selected: {file.name}</p>}
+          {loading && progress && <p className="text-sm text-gray-500">{progress}</p>}
         </div>
 
         {preview && (
@@ -1,72 +1,484 @@
+"""Provision institution admin accounts in bulk.
 
-import requests
+Reads rows from a CSV or JSONL file (or stdin) as a stream and creates each account through
+POST /api/super-admin/institution-users/create. Requests share one pooled requests.Session and
+run with bounded concurrency from asyncio workers. Transient failures (connection errors,
+timeouts, 429 and 5xx responses) are retried with exponential backoff and jitter.
+
+Every finished row is appended to a checkpoint file (JSONL). Re-running with the same checkpoint
+skips rows that were already created, so an interrupted import resumes where it stopped.
+Rows that came back "already registered" after an unanswered attempt are recorded as
+exists_unverified: the profile or institution link may be missing, so they are reported and
+retried on every run until their checkpoint lines are removed once checked.
+
+Input columns / keys:
+    name, email, institution_id   required
+    password                      optional; generated when missing (see --credentials-out)
+
+Usage:
+    python create_institution_users.py admins.csv --concurrency 16
+    python create_institution_users.py admins.jsonl --checkpoint term1.checkpoint.jsonl
+    cat admins.jsonl | python create_institution_users.py - --format jsonl
+"""
+
+import argparse
+import asyncio
+import csv
 import json
+import math
+import os
+import random
+import secrets
+import sys
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:3000")  # **IMPORTANT: Change this if your app is hosted elsewhere**
+
+SUPER_ADMIN_EMAIL = os.environ.get("SUPER_ADMIN_EMAIL", "admin@hiremind.app")  # **IMPORTANT: Replace with your actual super admin email**
+SUPER_ADMIN_PASSWORD = os.environ.get("SUPER_ADMIN_PASSWORD", "admin123")  # **IMPORTANT: Replace with your actual super admin password**
+
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# Supabase Auth reports duplicates as an error message; the create route returns them as a 500
+ALREADY_EXISTS_MARKERS = ("already been registered", "already registered", "already exists")
+PROGRESS_INTERVAL_SECONDS = 5
+
+
+class PermanentError(Exception):
+    """A row that will not succeed on retry (validation error, rejected request)."""
 
-BASE_URL = "http://localhost:3000"  # **IMPORTANT: Change this if your app is hosted elsewhere**
 
-SUPER_ADMIN_EMAIL = "admin@hiremind.app"  # **IMPORTANT: Replace with your actual super admin email**
-SUPER_ADMIN_PASSWORD = "admin123"      # **IMPORTANT: Replace with your actual super admin password**
+class RowError(Exception):
+    """A retryable failure; `status` is the HTTP status, or None for transport errors."""
 
-def authenticate_super_admin(email, password):
-    login_url = f"{BASE_URL}/api/super-admin/login"
-    headers = {"Content-Type": "application/json"}
-    payload = {"email": email, "password": password}
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+# --- input -------------------------------------------------------------------------------------
+
+
+def detect_format(path, explicit):
+    if explicit:
+        return explicit
+    if path.endswith(".jsonl") or path.endswith(".ndjson"):
+        return "jsonl"
+    return "csv"
+
+
+def read_rows(path, fmt):
+    """Yields (line_number, row) lazily so large files are never loaded at once."""
+    handle = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8-sig")
     try:
-        response = requests.post(login_url, headers=headers, data=json.dumps(payload))
-        response.raise_for_status()  # Raise an exception for HTTP errors
+        if fmt == "jsonl":
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    value = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, {"__error__": f"invalid JSON: {e}"}
+                    continue
+                if not isinstance(value, dict):
+                    yield line_number, {"__error__": "expected a JSON object"}
+                    continue
+                yield line_number, value
+        else:
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def normalize_row(row):
+    if "__error__" in row:
+        raise PermanentError(row["__error__"])
+    name = str(row.get("name") or "").strip()
+    email = str(row.get("email") or "").strip().lower()
+    institution_id = str(row.get("institution_id") or "").strip()
+    missing = [field for field, value in (("name", name), ("email", email), ("institution_id", institution_id)) if not value]
+    if missing:
+        raise PermanentError(f"missing {', '.join(missing)}")
+    password = str(row.get("password") or "").strip()
+    return {"name": name, "email": email, "institution_id": institution_id, "password": password}
+
+
+# --- checkpoint --------------------------------------------------------------------------------
+
+
+class Checkpoint:
+    """Append-only JSONL record of finished rows, flushed after every write."""
+
+    DONE = ("created", "exists")
+    # The account exists but this script cannot tell whether the profile and institution link
+    # were written (the create may have failed after the auth user); kept out of DONE so the
+    # row is reported and retried on every run
+    UNVERIFIED = "exists_unverified"
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        self.unverified = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a torn last line from an interrupted run
+                    if entry.get("status") in self.DONE:
+                        self.done.add(entry.get("email"))
+                    elif entry.get("status") == self.UNVERIFIED:
+                        self.unverified.add(entry.get("email"))
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, entry):
+        entry["at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        if entry.get("status") in self.DONE:
+            self.done.add(entry.get("email"))
+
+    def close(self):
+        self._file.close()
+
+
+class CredentialsWriter:
+    """Generated passwords go to a separate CSV (mode 0600), never to the checkpoint.
+
+    A password is written with status "pending" before its first request, then again with the
+    outcome: "created"; "unconfirmed" when an attempt may have reached the server without an
+    answer (timeout, dropped connection, 5xx), so the account can exist with this password even
+    though the row ended as "exists" or "failed"; or "unused" when the account was never created
+    with it. The last line for an email wins.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._writer = None
+
+    def write(self, email, password, status):
+        if self._file is None:
+            new_file = not os.path.exists(self.path)
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            self._file = os.fdopen(fd, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            if new_file:
+                self._writer.writerow(["email", "password", "status"])
+        self._writer.writerow([email, password, status])
+        self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+# --- stats -------------------------------------------------------------------------------------
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class Stats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counts = {"created": 0, "exists": 0, "exists_unverified": 0, "failed": 0, "invalid": 0, "skipped": 0}
+        self.retries = 0
+        self.latencies = []  # seconds per HTTP attempt
+
+    def finished(self):
+        return sum(v for k, v in self.counts.items() if k != "skipped")
+
+    def progress_line(self):
+        elapsed = time.monotonic() - self.started
+        rate = self.finished() / elapsed if elapsed > 0 else 0.0
+        parts = ", ".join(f"{k} {v}" for k, v in self.counts.items() if v)
+        return f"[{elapsed:7.1f}s] {parts or 'starting'} | {rate:.1f} rows/s | retries {self.retries}"
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        latencies = sorted(self.latencies)
+        ms = lambda seconds: f"{seconds * 1000:.0f}ms"
+        lines = [
+            "",
+            "Provisioning summary",
+            f"  elapsed      {elapsed:.1f}s",
+            f"  processed    {self.finished()} rows ({self.counts['skipped']} skipped: already done or duplicate)",
+            f"  created      {self.counts['created']}",
+            f"  existed      {self.counts['exists']}",
+            f"  unverified   {self.counts['exists_unverified']} (existed after an unanswered attempt; check profile and institution)",
+            f"  failed       {self.counts['failed']}",
+            f"  invalid      {self.counts['invalid']}",
+            f"  retries      {self.retries}",
+            f"  throughput   {self.finished() / elapsed if elapsed > 0 else 0:.1f} rows/s",
+        ]
+        if latencies:
+            lines.append(
+                f"  latency      p50 {ms(percentile(latencies, 50))}  p95 {ms(percentile(latencies, 95))}"
+                f"  p99 {ms(percentile(latencies, 99))}  max {ms(latencies[-1])}  ({len(latencies)} requests)"
+            )
+        return "\n".join(lines)
+
+
+# --- HTTP --------------------------------------------------------------------------------------
+
+
+def create_session(concurrency):
+    session = requests.Session()
+    # One keep-alive connection per worker; retries are handled by the caller, not urllib3
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+def authenticate_super_admin(session, base_url, email, password, timeout):
+    """Logs in once; the session keeps the auth cookie for every later request."""
+    login_url = f"{base_url}/api/super-admin/login"
+    try:
+        response = session.post(login_url, data=json.dumps({"email": email, "password": password}), timeout=timeout)
+        response.raise_for_status()
         login_data = response.json()
         if login_data.get("success"):
-            # The token is likely set as a cookie, so we need to pass the session cookie
-            return response.cookies
-        else:
-            print(f"Super admin login failed: {login_data.get('error')}")
-            return None
+            return True
+        print(f"Super admin login failed: {login_data.get('error')}")
     except requests.exceptions.RequestException as e:
         print(f"Error during super admin login: {e}")
-        return None
+    return False
 
-def create_institution_user(session_cookies, name, email, password):
-    create_user_url = f"{BASE_URL}/api/super-admin/institution-users/create"
-    headers = {"Content-Type": "application/json"}
-    payload = {"name": name, "email": email, "password": password}
+
+def create_institution_user(session, base_url, row, timeout):
+    """One attempt. Returns (status, payload); raises RowError for retryable failures."""
+    create_user_url = f"{base_url}/api/super-admin/institution-users/create"
+    payload = {
+        "name": row["name"],
+        "email": row["email"],
+        "password": row["password"],
+        "institution_id": row["institution_id"],
+    }
     try:
-        response = requests.post(create_user_url, headers=headers, cookies=session_cookies, data=json.dumps(payload))
-        response.raise_for_status()
-        user_data = response.json()
-        if response.status_code == 200:
-            print(f"Successfully created institution user:")
-            print(f"  Name: {name}")
-            print(f"  Email: {email}")
-            print(f"  User ID: {user_data.get('userId')}")
-        else:
-            print(f"Failed to create institution user {name}: {user_data.get('error')}")
-        return user_data
+        response = session.post(create_user_url, data=json.dumps(payload), timeout=timeout)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        raise RowError(f"{type(e).__name__}: {e}")
     except requests.exceptions.RequestException as e:
-        print(f"Error creating institution user {name}: {e}")
-        return None
+        raise PermanentError(f"{type(e).__name__}: {e}")
 
-def main():
-    print("Attempting to authenticate super admin...")
-    session_cookies = authenticate_super_admin(SUPER_ADMIN_EMAIL, SUPER_ADMIN_PASSWORD)
-
-    if session_cookies:
-        print("Super admin authenticated successfully.")
-        
-        institutions_to_create = [
-            {"name": "IIT Delhi", "email_prefix": "iitdelhi"},
-            {"name": "IIT Bombay", "email_prefix": "iitbombay"},
-            # Add more institutions here
-        ]
+    try:
+        body = response.json()
+    except ValueError:
+        body = {"error": response.text[:200]}
+
+    if response.status_code == 200:
+        return "created", body
+
+    message = str(body.get("error") or f"HTTP {response.status_code}")
+    if any(marker in message.lower() for marker in ALREADY_EXISTS_MARKERS):
+        return "exists", body
+    if response.status_code in RETRYABLE_STATUS:
+        retry_after = response.headers.get("Retry-After")
+        raise RowError(message, response.status_code, float(retry_after) if retry_after and retry_after.isdigit() else None)
+    raise PermanentError(f"HTTP {response.status_code}: {message}")
+
+
+def backoff_delay(attempt, base, cap, retry_after=None):
+    if retry_after is not None:
+        return min(cap, retry_after)
+    # Full jitter keeps a burst of failing workers from retrying in lockstep
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+# --- pipeline ----------------------------------------------------------------------------------
 
-        for inst in institutions_to_create:
-            institution_name = inst["name"]
-            institution_email = f"{inst['email_prefix']}@institution.com" # Using a generic domain
-            institution_password = "SecurePassword123" # **IMPORTANT: Generate strong, unique passwords in a real scenario**
 
-            print(f"Creating institution user for {institution_name}...")
-            create_institution_user(session_cookies, institution_name, institution_email, institution_password)
-    else:
+async def provision_row(session, args, row, stats):
+    """Returns (status, body, error, maybe_created).
+
+    `maybe_created` is True when an earlier attempt may have created the account without the
+    response arriving (transport error, timeout or 5xx), so a later "already registered" can
+    be this run's own account.
+    """
+    maybe_created = False
+    for attempt in range(args.retries + 1):
+        started = time.monotonic()
+        try:
+            status, body = await asyncio.to_thread(create_institution_user, session, args.base_url, row, args.timeout)
+            stats.latencies.append(time.monotonic() - started)
+            return status, body, None, maybe_created
+        except RowError as e:
+            stats.latencies.append(time.monotonic() - started)
+            if e.status is None or e.status >= 500:
+                maybe_created = True
+            if attempt == args.retries:
+                return "failed", {}, f"{e} (after {attempt + 1} attempts)", maybe_created
+            stats.retries += 1
+            await asyncio.sleep(backoff_delay(attempt, args.backoff, args.max_backoff, e.retry_after))
+        except PermanentError as e:
+            stats.latencies.append(time.monotonic() - started)
+            return "failed", {}, str(e), maybe_created
+    return "failed", {}, "retries exhausted", maybe_created
+
+
+async def worker(queue, session, args, checkpoint, credentials, stats):
+    while True:
+        item = await queue.get()
+        if item is None:
+            queue.task_done()
+            return
+        line_number, row = item
+        try:
+            generated = not row["password"]
+            if generated:
+                row["password"] = secrets.token_urlsafe(12)
+                # Written before the first request so the password survives a crash mid-request
+                credentials.write(row["email"], row["password"], "pending")
+            try:
+                status, body, error, maybe_created = await provision_row(session, args, row, stats)
+            except Exception as e:  # keep the worker alive; the row stays retryable on the next run
+                status, body, error, maybe_created = "failed", {}, f"{type(e).__name__}: {e}", True
+            if generated:
+                if status == "created":
+                    outcome = "created"
+                elif maybe_created:
+                    outcome = "unconfirmed"
+                else:
+                    outcome = "unused"
+                credentials.write(row["email"], row["password"], outcome)
+            # An "already registered" after an unanswered attempt (this run or an earlier one) may be
+            # an account whose users row was never written, so it is not counted as done
+            if status == "exists" and (maybe_created or row["email"] in checkpoint.unverified):
+                status = Checkpoint.UNVERIFIED
+                error = "already registered after an unanswered attempt; profile and institution link not confirmed"
+            stats.counts[status] += 1
+            entry = {"line": line_number, "email": row["email"], "status": status}
+            if body.get("userId"):
+                entry["user_id"] = body["userId"]
+            if error:
+                entry["error"] = error
+                if args.verbose or stats.counts["failed"] <= 20:
+                    print(f"  line {line_number} {row['email']}: {error}")
+            checkpoint.record(entry)
+        finally:
+            queue.task_done()
+
+
+async def report_progress(stats):
+    while True:
+        await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+        print(stats.progress_line())
+
+
+async def run(args):
+    fmt = detect_format(args.input, args.format)
+    checkpoint_path = args.checkpoint or (
+        "institution_users.checkpoint.jsonl" if args.input == "-" else f"{args.input}.checkpoint.jsonl"
+    )
+    checkpoint = Checkpoint(checkpoint_path)
+    credentials = CredentialsWriter(args.credentials_out)
+    stats = Stats()
+
+    if checkpoint.done:
+        print(f"Resuming: {len(checkpoint.done)} rows already done in {checkpoint_path}")
+
+    session = create_session(args.concurrency)
+    print("Attempting to authenticate super admin...")
+    if not await asyncio.to_thread(
+        authenticate_super_admin, session, args.base_url, args.admin_email, args.admin_password, args.timeout
+    ):
         print("Super admin authentication failed. Cannot create institution users.")
+        checkpoint.close()
+        return 1
+    print("Super admin authenticated successfully.")
+
+    # Bounded queue: the reader stays a few rows ahead of the workers instead of loading the file
+    queue = asyncio.Queue(maxsize=args.concurrency * 4)
+    workers = [
+        asyncio.create_task(worker(queue, session, args, checkpoint, credentials, stats))
+        for _ in range(args.concurrency)
+    ]
+    progress = asyncio.create_task(report_progress(stats))
+    seen = set()
+
+    try:
+        for line_number, raw in read_rows(args.input, fmt):
+            try:
+                row = normalize_row(raw)
+            except PermanentError as e:
+                stats.counts["invalid"] += 1
+                checkpoint.record({"line": line_number, "email": raw.get("email"), "status": "invalid", "error": str(e)})
+                continue
+            if row["email"] in checkpoint.done or row["email"] in seen:
+                stats.counts["skipped"] += 1
+                continue
+            seen.add(row["email"])
+            await queue.put((line_number, row))
+
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        progress.cancel()
+        for task in workers:
+            task.cancel()
+        checkpoint.close()
+        credentials.close()
+        session.close()
+        print(stats.summary())
+        print(f"Checkpoint: {checkpoint_path}")
+        if os.path.exists(args.credentials_out):
+            print(f"Generated passwords: {args.credentials_out}")
+
+    return 1 if stats.counts["failed"] or stats.counts["exists_unverified"] else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create institution admin accounts from a CSV or JSONL file.")
+    parser.add_argument("input", help="CSV or JSONL file with name, email, institution_id[, password]; '-' for stdin")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: from the file extension)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--admin-email", default=SUPER_ADMIN_EMAIL)
+    parser.add_argument("--admin-password", default=SUPER_ADMIN_PASSWORD)
+    parser.add_argument("--concurrency", type=int, default=8, help="requests in flight (default: 8)")
+    parser.add_argument("--retries", type=int, default=4, help="retries per row for transient failures (default: 4)")
+    parser.add_argument("--backoff", type=float, default=0.5, help="base backoff in seconds (default: 0.5)")
+    parser.add_argument("--max-backoff", type=float, default=20.0, help="backoff cap in seconds (default: 20)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds (default: 30)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <input>.checkpoint.jsonl)")
+    parser.add_argument(
+        "--credentials-out",
+        default="institution_users.credentials.csv",
+        help="CSV of generated passwords with their status: pending, created, unconfirmed or unused "
+        "(default: institution_users.credentials.csv)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="print every failed row, not just the first 20")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    args.base_url = args.base_url.rstrip("/")
+    return args
+
+
+def main():
+    args = parse_args()
+    try:
+        sys.exit(asyncio.run(run(args)))
+    except KeyboardInterrupt:
+        print("\nInterrupted. Re-run with the same checkpoint to resume.")
+        sys.exit(130)
+
 
 if __name__ == "__main__":
     main()
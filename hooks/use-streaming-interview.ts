@@ -3,6 +3,7 @@
 import { useEffect, useRef, useState, useCallback } from "react"
 import { VoiceActivityDetector } from "@/lib/audio/vad"
 import { StreamingAudioPlayer } from "@/lib/audio/playback"
+import { createClient } from "@/lib/supabase/client"
 
 interface StreamingInterviewState {
   isConnected: boolean
@@ -11,9 +12,17 @@ interface StreamingInterviewState {
   userTranscript: string
   aiTranscript: string
   currentQuestion: string
+  isComplete: boolean
   error: string | null
 }
 
+// Served by scripts/interview_ws_server.js, which runs next to the Next.js app
+function interviewSocketUrl(interviewId: string, token: string) {
+  const protocol = window.location.protocol === "https:" ? "wss:" : "ws:"
+  const base = process.env.NEXT_PUBLIC_INTERVIEW_WS_URL || `${protocol}//${window.location.hostname}:3001`
+  return `${base}/api/interview/stream?interviewId=${encodeURIComponent(interviewId)}&token=${encodeURIComponent(token)}`
+}
+
 export function useStreamingInterview(interviewId: string) {
   const [state, setState] = useState<StreamingInterviewState>({
     isConnected: false,
@@ -22,6 +31,7 @@ export function useStreamingInterview(interviewId: string) {
     userTranscript: "",
     aiTranscript: "",
     currentQuestion: "",
+    isComplete: false,
     error: null,
   })
 
@@ -32,6 +42,9 @@ export function useStreamingInterview(interviewId: string) {
   const mediaStreamRef = useRef<MediaStream | null>(null)
   const audioContextRef = useRef<AudioContext | null>(null)
   const processorRef = useRef<ScriptProcessorNode | null>(null)
+  // Read from audio and socket callbacks, which would otherwise see stale state
+  const isListeningRef = useRef(false)
+  const isConnectedRef = useRef(false)
 
   const connect = useCallback(async () => {
     try {
@@ -67,14 +80,18 @@ export function useStreamingInterview(interviewId: string) {
       const source = audioContextRef.current.createMediaStreamSource(stream)
       processorRef.current = audioContextRef.current.createScriptProcessor(4096, 1, 1)
 
-      // Connect WebSocket
-      const protocol = window.location.protocol === "https:" ? "wss:" : "ws:"
-      const wsUrl = `${protocol}//${window.location.host}/api/interview/stream?interviewId=${interviewId}`
+      // Connect WebSocket, authenticated with the current Supabase session
+      const {
+        data: { session },
+      } = await createClient().auth.getSession()
+      if (!session) throw new Error("Not authenticated")
 
-      wsRef.current = new WebSocket(wsUrl)
+      wsRef.current = new WebSocket(interviewSocketUrl(interviewId, session.access_token))
+      wsRef.current.binaryType = "arraybuffer"
 
       wsRef.current.onopen = () => {
         console.log("[v0] WebSocket connected")
+        isConnectedRef.current = true
         setState((prev) => ({ ...prev, isConnected: true, error: null }))
       }
 
@@ -90,12 +107,14 @@ export function useStreamingInterview(interviewId: string) {
 
       wsRef.current.onclose = () => {
         console.log("[v0] WebSocket closed")
+        isConnectedRef.current = false
+        isListeningRef.current = false
         setState((prev) => ({ ...prev, isConnected: false }))
       }
 
       // Process audio chunks
       processorRef.current.onaudioprocess = (e) => {
-        if (!state.isListening || !vadRef.current) return
+        if (!isListeningRef.current || !vadRef.current) return
 
         const inputData = e.inputBuffer.getChannelData(0)
 
@@ -148,10 +167,11 @@ export function useStreamingInterview(interviewId: string) {
         break
 
       case "transcript":
-        // Partial STT result
+        // Partial STT result while the answer is streaming, then the final one
         setState((prev) => ({
           ...prev,
           userTranscript: message.text,
+          aiTranscript: message.final ? "" : prev.aiTranscript,
         }))
         break
 
@@ -179,6 +199,11 @@ export function useStreamingInterview(interviewId: string) {
         }))
         break
 
+      case "interview_complete":
+        isListeningRef.current = false
+        setState((prev) => ({ ...prev, isListening: false, isComplete: true }))
+        break
+
       case "error":
         console.error("[v0] Server error:", message.error)
         setState((prev) => ({ ...prev, error: message.error }))
@@ -187,18 +212,20 @@ export function useStreamingInterview(interviewId: string) {
   }, [])
 
   const startListening = useCallback(() => {
-    if (!state.isConnected) return
+    if (!isConnectedRef.current) return
 
     console.log("[v0] Starting to listen...")
+    isListeningRef.current = true
     setState((prev) => ({ ...prev, isListening: true, userTranscript: "" }))
     vadRef.current?.reset()
 
     // Send start listening message
     wsRef.current?.send(JSON.stringify({ type: "start_listening" }))
-  }, [state.isConnected])
+  }, [])
 
   const stopListening = useCallback(() => {
     console.log("[v0] Stopping listening...")
+    isListeningRef.current = false
     setState((prev) => ({ ...prev, isListening: false }))
 
     // Send stop listening message
@@ -248,6 +275,7 @@ export function useStreamingInterview(interviewId: string) {
       userTranscript: "",
       aiTranscript: "",
       currentQuestion: "",
+      isComplete: false,
       error: null,
     })
   }, [])
@@ -18,6 +18,10 @@ export function useTextToSpeech(options?: { rate?: number }) {
   const audioContextRef = useRef<AudioContext | null>(null)
   const workerRef = useRef<Worker | null>(null)
   const workerReady = useRef(false)
+  // Sentences queued by speakQueued play back-to-back; bumping the generation drops pending ones
+  const queueRef = useRef<Promise<void>>(Promise.resolve())
+  const queueGenerationRef = useRef(0)
+  const nextStartTimeRef = useRef(0)
 
   const speechRate = options?.rate ?? 0.95; // Default rate
 
@@ -76,8 +80,12 @@ export function useTextToSpeech(options?: { rate?: number }) {
       setLipSyncData({ mouthOpenness: 0, mouthShape: "closed" })
     }
 
+    // Schedule right after any chunk that is still playing so queued sentences don't overlap
+    const startAt = Math.max(audioContextRef.current.currentTime, nextStartTimeRef.current)
+    nextStartTimeRef.current = startAt + audioBuffer.duration
+
     setIsSpeaking(true)
-    source.start()
+    source.start(startAt)
 
     // Animate lip sync for the duration of the audio buffer
     animateLipSync("", float32Array.length / 16000 * 1000) // Placeholder text, duration in ms
@@ -205,6 +213,8 @@ export function useTextToSpeech(options?: { rate?: number }) {
   }
 
   const speak = useCallback(async (text: string): Promise<void> => {
+    queueGenerationRef.current++
+    queueRef.current = Promise.resolve()
     return new Promise(async (resolve) => {
       // Cancel any ongoing speech
       if (audioRef.current) {
@@ -229,5 +239,36 @@ export function useTextToSpeech(options?: { rate?: number }) {
     })
   }, [playAudioBuffer, speakWithBrowserTTS])
 
-  return { speak, isSpeaking, lipSyncData }
+  /**
+   * Queues a sentence behind anything already queued, so the first sentence of a
+   * streamed reply can play while later ones are still arriving.
+   */
+  const speakQueued = useCallback((text: string): Promise<void> => {
+    const generation = queueGenerationRef.current
+    queueRef.current = queueRef.current.then(async () => {
+      if (generation !== queueGenerationRef.current) return
+
+      if (workerRef.current && workerReady.current) {
+        workerRef.current.postMessage({ type: "SPEAK", text })
+      } else {
+        await speakWithBrowserTTS(text)
+      }
+    })
+    return queueRef.current
+  }, [speakWithBrowserTTS])
+
+  const stop = useCallback(() => {
+    queueGenerationRef.current++
+    queueRef.current = Promise.resolve()
+    nextStartTimeRef.current = 0
+    if (animationRef.current) {
+      clearTimeout(animationRef.current)
+      animationRef.current = null
+    }
+    if (typeof window !== "undefined" && window.speechSynthesis) {
+      window.speechSynthesis.cancel()
+    }
+  }, [])
+
+  return { speak, speakQueued, stop, isSpeaking, lipSyncData }
 }
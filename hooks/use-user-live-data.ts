@@ -0,0 +1,30 @@
+"use client"
+
+import { useCallback, useSyncExternalStore } from "react"
+import {
+  getUserLiveServerState,
+  getUserLiveState,
+  refreshUserTopic,
+  subscribeUserTopic,
+  type UserTopic,
+} from "@/lib/realtime/user-store"
+
+function useUserTopic(topic: UserTopic) {
+  const subscribe = useCallback((listener: () => void) => subscribeUserTopic(topic, listener), [topic])
+  return useSyncExternalStore(subscribe, getUserLiveState, getUserLiveServerState)
+}
+
+/** Live credit balance; null until the first load completes. */
+export function useUserCredits() {
+  const { credits } = useUserTopic("credits")
+  return { balance: credits, refresh: useCallback(() => refreshUserTopic("credits"), []) }
+}
+
+/** Live list of the user's pending scheduled interviews; null until the first load completes. */
+export function useScheduledInterviews<T = any>() {
+  const { scheduledInterviews } = useUserTopic("scheduledInterviews")
+  return {
+    interviews: scheduledInterviews as T[] | null,
+    refresh: useCallback(() => refreshUserTopic("scheduledInterviews"), []),
+  }
+}
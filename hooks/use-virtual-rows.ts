@@ -0,0 +1,69 @@
+"use client"
+
+import { useCallback, useEffect, useRef, useState, type UIEvent } from "react"
+
+interface VirtualRowsOptions {
+  count: number
+  rowHeight: number
+  /** Rows rendered above and below the viewport so fast scrolling does not flash blank rows */
+  overscan?: number
+  /** Called once when the last rendered row is within `overscan` rows of the end */
+  onReachEnd?: () => void
+}
+
+/**
+ * Windowing for fixed-height rows: only the rows inside the scroll container's viewport
+ * (plus overscan) are rendered, positioned inside a spacer as tall as the full list.
+ */
+export function useVirtualRows({ count, rowHeight, overscan = 6, onReachEnd }: VirtualRowsOptions) {
+  const containerRef = useRef<HTMLDivElement>(null)
+  const frame = useRef<number | null>(null)
+  const [scrollTop, setScrollTop] = useState(0)
+  const [viewportHeight, setViewportHeight] = useState(0)
+
+  useEffect(() => {
+    const el = containerRef.current
+    if (!el) return
+    const update = () => setViewportHeight(el.clientHeight)
+    update()
+    const observer = new ResizeObserver(update)
+    observer.observe(el)
+    return () => {
+      observer.disconnect()
+      if (frame.current !== null) cancelAnimationFrame(frame.current)
+    }
+  }, [])
+
+  const onScroll = useCallback((event: UIEvent<HTMLDivElement>) => {
+    const top = event.currentTarget.scrollTop
+    if (frame.current !== null) return
+    // One state update per animation frame, not per scroll event
+    frame.current = requestAnimationFrame(() => {
+      frame.current = null
+      setScrollTop(top)
+    })
+  }, [])
+
+  const start = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan)
+  const end = Math.min(count, Math.ceil((scrollTop + viewportHeight) / rowHeight) + overscan)
+  const nearEnd = count > 0 && end >= count
+
+  useEffect(() => {
+    if (nearEnd) onReachEnd?.()
+  }, [nearEnd, count, onReachEnd])
+
+  const scrollToTop = useCallback(() => {
+    if (containerRef.current) containerRef.current.scrollTop = 0
+    setScrollTop(0)
+  }, [])
+
+  return {
+    containerRef,
+    onScroll,
+    start,
+    end,
+    totalHeight: count * rowHeight,
+    offsetTop: start * rowHeight,
+    scrollToTop,
+  }
+}
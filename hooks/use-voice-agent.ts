@@ -1,6 +1,8 @@
 "use client"
 
 import { useState, useEffect, useRef, useCallback } from "react"
+import { VoiceActivityDetector } from "@/lib/audio/vad"
+import { TURN_END_CONFIDENT, classifyTurnEnd, needsLLMCheck } from "@/lib/audio/turn-end"
 
 interface SpeechAnalysis {
   originalText: string
@@ -11,35 +13,47 @@ interface SpeechAnalysis {
   confidence: number
   lastWords: string
   fillerWords: string[]
+  source: "heuristic" | "llm"
   llmIsComplete?: boolean
   llmConfidence?: number
   llmReasoning?: string
 }
 
-const analyzeTranscriptWithLLM = async (text: string, question: string): Promise<SpeechAnalysis> => {
-  const words = text
-    .trim()
-    .split(/\s+/)
-    .filter((w) => w.length > 0)
-  const wordCount = words.length
-  const lastThreeWords = words.slice(-3).join(" ").toLowerCase()
-
-  const continuationWords = ["um", "uh", "and", "but", "because", "so", "like", "well", "you know", "i mean"]
-  const hasActiveFiller = continuationWords.some((word) => lastThreeWords.includes(word))
-  const detectedFillers = continuationWords.filter((filler) => text.toLowerCase().includes(filler))
+const localAnalysis = (text: string, silenceMs?: number): SpeechAnalysis => {
+  const result = classifyTurnEnd({ transcript: text, silenceMs })
+  return {
+    originalText: text,
+    cleanedText: text,
+    wordCount: result.wordCount,
+    hasActiveFiller: result.hasActiveFiller,
+    isComplete: result.isComplete,
+    confidence: result.confidence,
+    lastWords: result.lastWords,
+    fillerWords: result.fillerWords,
+    source: "heuristic",
+  }
+}
 
-  // Basic rule-based analysis as fallback - more aggressive detection
-  const hasPunctuation = /[.!?]$/.test(text)
-  const hasNaturalEnding = /(that's|that is|so|and that|thank you|thanks|i think|i believe|i feel)$/i.test(text.trim())
-  const basicIsComplete = wordCount >= 3 && (!hasActiveFiller || hasPunctuation) && (hasPunctuation || hasNaturalEnding || wordCount > 8)
+// Decides locally from the transcript and VAD silence; the LLM route is only consulted
+// when the local classifier is unsure and `allowLLM` is set.
+const analyzeTurnEnd = async (
+  text: string,
+  question: string,
+  silenceMs: number,
+  allowLLM: boolean,
+): Promise<SpeechAnalysis> => {
+  const analysis = localAnalysis(text, silenceMs)
+  if (!allowLLM || !needsLLMCheck(analysis)) {
+    return analysis
+  }
 
-  // Call LLM for intelligent turn detection
   try {
     const response = await fetch("/api/interview/turn-detection", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
         transcript: text,
+        silenceMs,
         context: { question },
       }),
     })
@@ -47,36 +61,28 @@ const analyzeTranscriptWithLLM = async (text: string, question: string): Promise
     if (response.ok) {
       const llmAnalysis = await response.json()
       return {
-        originalText: text,
-        cleanedText: text,
-        wordCount,
-        hasActiveFiller,
+        ...analysis,
         isComplete: llmAnalysis.isComplete,
         confidence: llmAnalysis.confidence,
-        lastWords: lastThreeWords,
-        fillerWords: detectedFillers,
+        source: llmAnalysis.source === "llm" ? "llm" : "heuristic",
         llmIsComplete: llmAnalysis.isComplete,
         llmConfidence: llmAnalysis.confidence,
         llmReasoning: llmAnalysis.reasoning,
       }
     }
   } catch (error) {
-    console.log("[v0] LLM turn detection failed, using fallback:", error)
+    console.log("[v0] LLM turn detection failed, using local decision:", error)
   }
 
-  // Fallback to rule-based
-  return {
-    originalText: text,
-    cleanedText: text,
-    wordCount,
-    hasActiveFiller,
-    isComplete: basicIsComplete,
-    confidence: basicIsComplete ? 0.7 : 0.3,
-    lastWords: lastThreeWords,
-    fillerWords: detectedFillers,
-  }
+  return analysis
 }
 
+// First end-of-turn check after the last recognition result, then re-checks until the
+// hard silence limit ends the turn regardless
+const TURN_CHECK_DELAY_MS = 500
+const TURN_CHECK_INTERVAL_MS = 300
+const MAX_TURN_SILENCE_MS = 1600
+
 interface VoiceAgentOptions {
   onUserSpeechStart: () => void
   onUserSpeechEnd: (transcript: string, analysis: SpeechAnalysis) => void
@@ -105,8 +111,7 @@ export function useVoiceAgent({
 
   const recognitionRef = useRef<any>(null)
   const streamRef = useRef<MediaStream | null>(null)
-  const audioContextRef = useRef<AudioContext | null>(null)
-  const analyserRef = useRef<AnalyserNode | null>(null)
+  const vadRef = useRef<VoiceActivityDetector | null>(null)
   const animationFrameRef = useRef<number | null>(null)
   const transcriptRef = useRef("")
   const silenceTimerRef = useRef<NodeJS.Timeout | null>(null)
@@ -114,8 +119,8 @@ export function useVoiceAgent({
   const isAISpeakingRef = useRef(false)
   const isListeningRef = useRef(false)
   const shouldRestartRef = useRef(false)
-  const lastLLMCheckRef = useRef<number>(0)
-  const llmCheckThrottleMs = 800 // Reduced for faster, more natural turn detection
+  const lastResultAtRef = useRef<number>(0)
+  const llmCheckedTextRef = useRef("")
 
   const onUserSpeechStartRef = useRef(onUserSpeechStart)
   const onUserSpeechEndRef = useRef(onUserSpeechEnd)
@@ -169,40 +174,11 @@ export function useVoiceAgent({
 
       if (currentText) {
         setLiveTranscript(currentText)
+        lastResultAtRef.current = Date.now()
 
-        const now = Date.now()
-        const shouldCheckLLM =
-          now - lastLLMCheckRef.current > llmCheckThrottleMs && currentText.split(/\s+/).length >= 5
-
-        if (shouldCheckLLM) {
-          lastLLMCheckRef.current = now
-          const analysis = await analyzeTranscriptWithLLM(currentText, currentQuestion)
-          setCurrentAnalysis(analysis)
-          onTranscriptUpdateRef.current?.(currentText, analysis)
-
-          console.log("[v0] LLM Analysis:", {
-            text: currentText.substring(0, 40),
-            isComplete: analysis.llmIsComplete,
-            confidence: analysis.llmConfidence?.toFixed(2),
-          })
-
-          if (analysis.llmIsComplete && analysis.llmConfidence && analysis.llmConfidence > 0.72) {
-            console.log("[v0] LLM detected completion with high confidence, ending turn")
-            if (silenceTimerRef.current) {
-              clearTimeout(silenceTimerRef.current)
-            }
-
-            const finalText = transcriptRef.current.trim()
-            if (finalText && hasStartedSpeakingRef.current) {
-              onUserSpeechEndRef.current(finalText, analysis)
-              transcriptRef.current = ""
-              setLiveTranscript("")
-              setCurrentAnalysis(null)
-              hasStartedSpeakingRef.current = false
-              return
-            }
-          }
-        }
+        const analysis = localAnalysis(currentText)
+        setCurrentAnalysis(analysis)
+        onTranscriptUpdateRef.current?.(currentText, analysis)
 
         if (!hasStartedSpeakingRef.current && currentText.length > 0) {
           hasStartedSpeakingRef.current = true
@@ -214,25 +190,53 @@ export function useVoiceAgent({
           clearTimeout(silenceTimerRef.current)
         }
 
-        silenceTimerRef.current = setTimeout(async () => {
+        const endTurn = (finalText: string, finalAnalysis: SpeechAnalysis) => {
+          console.log("[v0] Turn ended:", {
+            source: finalAnalysis.source,
+            isComplete: finalAnalysis.isComplete,
+            confidence: finalAnalysis.confidence.toFixed(2),
+          })
+          onUserSpeechEndRef.current(finalText, finalAnalysis)
+          transcriptRef.current = ""
+          setLiveTranscript("")
+          setCurrentAnalysis(null)
+          hasStartedSpeakingRef.current = false
+        }
+
+        const checkTurnEnd = async () => {
           const finalText = transcriptRef.current.trim()
-          if (finalText && hasStartedSpeakingRef.current && finalText.split(/\s+/).length >= 3) {
-            console.log("[v0] Silence detected, performing final LLM check...")
-            const finalAnalysis = await analyzeTranscriptWithLLM(finalText, currentQuestion)
-            console.log(
-              "[v0] Final LLM decision:",
-              finalAnalysis.llmIsComplete,
-              "confidence:",
-              finalAnalysis.llmConfidence,
-            )
-
-            onUserSpeechEndRef.current(finalText, finalAnalysis)
-            transcriptRef.current = ""
-            setLiveTranscript("")
-            setCurrentAnalysis(null)
-            hasStartedSpeakingRef.current = false
+          if (!finalText || !hasStartedSpeakingRef.current || finalText.split(/\s+/).length < 3) return
+
+          const sinceLastResult = Date.now() - lastResultAtRef.current
+          const silenceMs = vadRef.current ? vadRef.current.getSilenceDuration() : sinceLastResult
+
+          if (sinceLastResult >= MAX_TURN_SILENCE_MS) {
+            endTurn(finalText, localAnalysis(finalText, silenceMs))
+            return
+          }
+
+          // Ask the LLM at most once per transcript, and only if the local classifier is unsure
+          const allowLLM = llmCheckedTextRef.current !== finalText
+          const turnAnalysis = await analyzeTurnEnd(finalText, currentQuestion, silenceMs, allowLLM)
+          if (turnAnalysis.source === "llm") llmCheckedTextRef.current = finalText
+
+          // New speech arrived while we were deciding
+          if (transcriptRef.current.trim() !== finalText || !hasStartedSpeakingRef.current) return
+
+          const confident =
+            turnAnalysis.source === "llm" ? turnAnalysis.confidence > 0.72 : turnAnalysis.confidence >= TURN_END_CONFIDENT
+          if (turnAnalysis.isComplete && confident) {
+            endTurn(finalText, turnAnalysis)
+            return
           }
-        }, 1600) // Reduced for faster turn completion when user stops speaking
+
+          silenceTimerRef.current = setTimeout(
+            checkTurnEnd,
+            Math.min(TURN_CHECK_INTERVAL_MS, Math.max(0, MAX_TURN_SILENCE_MS - (Date.now() - lastResultAtRef.current))),
+          )
+        }
+
+        silenceTimerRef.current = setTimeout(checkTurnEnd, TURN_CHECK_DELAY_MS)
       }
     }
 
@@ -265,7 +269,7 @@ export function useVoiceAgent({
     }
 
     recognitionRef.current = recognition
-    console.log("[v0] Voice agent initialized with LLM turn detection")
+    console.log("[v0] Voice agent initialized with local turn detection")
 
     return () => {
       if (recognitionRef.current) {
@@ -287,28 +291,17 @@ export function useVoiceAgent({
       const stream = await navigator.mediaDevices.getUserMedia({ audio: true })
       streamRef.current = stream
 
-      const audioContext = new AudioContext()
-      const analyser = audioContext.createAnalyser()
-      const microphone = audioContext.createMediaStreamSource(stream)
-
-      analyser.fftSize = 256
-      analyser.smoothingTimeConstant = 0.8
-      microphone.connect(analyser)
-
-      audioContextRef.current = audioContext
-      analyserRef.current = analyser
-
-      const dataArray = new Uint8Array(analyser.frequencyBinCount)
+      const vad = new VoiceActivityDetector(audioThreshold)
+      await vad.initialize(stream)
+      vadRef.current = vad
 
       const checkAudio = () => {
-        if (!analyserRef.current) return
+        if (!vadRef.current) return
 
-        analyser.getByteFrequencyData(dataArray)
-        const average = dataArray.reduce((a, b) => a + b, 0) / dataArray.length
-        setAudioLevel(average)
+        const isSpeaking = vad.isSpeaking()
+        setAudioLevel(vad.getLevel())
 
         const wasSpeaking = isSpeechDetected
-        const isSpeaking = average > audioThreshold
 
         if (isSpeaking !== wasSpeaking) {
           setIsSpeechDetected(isSpeaking)
@@ -335,9 +328,9 @@ export function useVoiceAgent({
       cancelAnimationFrame(animationFrameRef.current)
       animationFrameRef.current = null
     }
-    if (audioContextRef.current) {
-      audioContextRef.current.close()
-      audioContextRef.current = null
+    if (vadRef.current) {
+      vadRef.current.destroy()
+      vadRef.current = null
     }
     if (streamRef.current) {
       streamRef.current.getTracks().forEach((track) => track.stop())
@@ -359,6 +352,7 @@ export function useVoiceAgent({
     shouldRestartRef.current = true
     transcriptRef.current = ""
     hasStartedSpeakingRef.current = false
+    llmCheckedTextRef.current = ""
     setLiveTranscript("")
     setCurrentAnalysis(null)
 
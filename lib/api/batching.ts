@@ -0,0 +1,51 @@
+export function chunk<T>(items: T[], size: number): T[][] {
+  if (size <= 0) throw new Error("chunk size must be positive")
+  const out: T[][] = []
+  for (let i = 0; i < items.length; i += size) {
+    out.push(items.slice(i, i + size))
+  }
+  return out
+}
+
+/**
+ * Runs `worker` over `items` with at most `concurrency` calls in flight.
+ * Results keep the input order.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: T[],
+  concurrency: number,
+  worker: (item: T, index: number) => Promise<R>,
+): Promise<R[]> {
+  const results = new Array<R>(items.length)
+  let next = 0
+
+  const run = async () => {
+    while (next < items.length) {
+      const index = next++
+      results[index] = await worker(items[index], index)
+    }
+  }
+
+  const lanes = Math.max(1, Math.min(concurrency, items.length))
+  await Promise.all(Array.from({ length: lanes }, run))
+  return results
+}
+
+/** Small stopwatch for reporting per-stage timings in API responses. */
+export function createStageTimer() {
+  const timings: Record<string, number> = {}
+  const startedAt = Date.now()
+  let last = startedAt
+
+  return {
+    mark(stage: string) {
+      const now = Date.now()
+      timings[stage] = now - last
+      last = now
+    },
+    done() {
+      timings.totalMs = Date.now() - startedAt
+      return timings
+    },
+  }
+}
@@ -0,0 +1,189 @@
+// Streaming reader for multipart/form-data uploads. request.formData() buffers the whole body
+// before the handler sees a byte; this reads request.body incrementally, skips parts until the
+// requested file field and hands its contents out as a stream, holding at most one network
+// chunk plus a boundary's worth of bytes at a time.
+
+const CRLF = new Uint8Array([13, 10])
+const MAX_HEADER_BYTES = 16 * 1024
+
+export interface MultipartFile {
+  name: string
+  type: string
+  /** The part body; can be consumed once, either through stream() or arrayBuffer() */
+  stream(): ReadableStream<Uint8Array>
+  arrayBuffer(): Promise<ArrayBuffer>
+}
+
+export class MultipartError extends Error {
+  constructor(message: string) {
+    super(message)
+    this.name = "MultipartError"
+  }
+}
+
+function indexOfBytes(haystack: Uint8Array, needle: Uint8Array, from = 0) {
+  const first = needle[0]
+  const last = haystack.length - needle.length
+  for (let i = haystack.indexOf(first, from); i !== -1 && i <= last; i = haystack.indexOf(first, i + 1)) {
+    let j = 1
+    while (j < needle.length && haystack[i + j] === needle[j]) j++
+    if (j === needle.length) return i
+  }
+  return -1
+}
+
+function concatBytes(a: Uint8Array, b: Uint8Array) {
+  if (!a.length) return b
+  const out = new Uint8Array(a.length + b.length)
+  out.set(a)
+  out.set(b, a.length)
+  return out
+}
+
+function boundaryFrom(contentType: string | null) {
+  if (!contentType || !/^multipart\/form-data/i.test(contentType)) return null
+  const match = /;\s*boundary=(?:"([^"]+)"|([^;\s]+))/i.exec(contentType)
+  return match ? match[1] || match[2] : null
+}
+
+function dispositionParam(header: string, param: string) {
+  const match = new RegExp(`;\\s*${param}="((?:[^"\\\\]|\\\\.)*)"|;\\s*${param}=([^;\\s]+)`, "i").exec(header)
+  if (!match) return null
+  return match[1] !== undefined ? match[1].replace(/\\(.)/g, "$1") : match[2]
+}
+
+/**
+ * Finds the part named `field` in a multipart/form-data request and returns it as a streamed
+ * file, or null when the request has no such part. Parts before it are read and discarded
+ * without being kept. Throws MultipartError when the body is not valid multipart.
+ */
+export async function readMultipartFile(request: Request, field = "file"): Promise<MultipartFile | null> {
+  const boundary = boundaryFrom(request.headers.get("content-type"))
+  if (!boundary) throw new MultipartError("Expected a multipart/form-data body")
+  if (!request.body) return null
+
+  const reader = request.body.getReader()
+  // Every delimiter, including the first, is matched as CRLF "--" boundary
+  const delimiter = new TextEncoder().encode(`\r\n--${boundary}`)
+  let buffer: Uint8Array = CRLF
+  let ended = false
+
+  const fill = async () => {
+    if (ended) return false
+    const { value, done } = await reader.read()
+    if (done) {
+      ended = true
+      return false
+    }
+    buffer = concatBytes(buffer, value)
+    return true
+  }
+
+  // Yields the current part's body up to the next delimiter and leaves `buffer` just past it
+  async function* partBody(): AsyncGenerator<Uint8Array> {
+    while (true) {
+      const at = indexOfBytes(buffer, delimiter)
+      if (at !== -1) {
+        if (at > 0) yield buffer.subarray(0, at)
+        buffer = buffer.subarray(at + delimiter.length)
+        return
+      }
+      // Keep a possible partial delimiter at the end for the next chunk
+      const safe = buffer.length - delimiter.length + 1
+      if (safe > 0) {
+        yield buffer.subarray(0, safe)
+        buffer = buffer.subarray(safe)
+      }
+      if (!(await fill())) throw new MultipartError("Unexpected end of multipart body")
+    }
+  }
+
+  const readHeaders = async () => {
+    let end = indexOfBytes(buffer, new Uint8Array([13, 10, 13, 10]))
+    while (end === -1) {
+      if (buffer.length > MAX_HEADER_BYTES) throw new MultipartError("Multipart part headers too large")
+      if (!(await fill())) throw new MultipartError("Unexpected end of multipart body")
+      end = indexOfBytes(buffer, new Uint8Array([13, 10, 13, 10]))
+    }
+    const text = new TextDecoder().decode(buffer.subarray(0, end))
+    buffer = buffer.subarray(end + 4)
+
+    const headers = new Map<string, string>()
+    for (const line of text.split("\r\n")) {
+      const colon = line.indexOf(":")
+      if (colon > 0) headers.set(line.slice(0, colon).trim().toLowerCase(), line.slice(colon + 1).trim())
+    }
+    return headers
+  }
+
+  try {
+    // Preamble before the first boundary
+    for await (const _ of partBody()) {
+      // discarded
+    }
+
+    while (true) {
+      while (buffer.length < 2 && (await fill())) {}
+      if (buffer[0] === 45 && buffer[1] === 45) {
+        // Closing "--": no more parts
+        await reader.cancel()
+        return null
+      }
+      // Rest of the delimiter line (transport padding, then CRLF)
+      let lineEnd = indexOfBytes(buffer, CRLF)
+      while (lineEnd === -1) {
+        if (buffer.length > MAX_HEADER_BYTES || !(await fill())) throw new MultipartError("Malformed multipart boundary")
+        lineEnd = indexOfBytes(buffer, CRLF)
+      }
+      buffer = buffer.subarray(lineEnd + 2)
+
+      const headers = await readHeaders()
+      const disposition = headers.get("content-disposition") || ""
+      if (dispositionParam(disposition, "name") !== field) {
+        for await (const _ of partBody()) {
+          // discarded
+        }
+        continue
+      }
+
+      const chunks = partBody()
+      let consumed = false
+      const stream = () => {
+        if (consumed) throw new MultipartError("Upload body already read")
+        consumed = true
+        return new ReadableStream<Uint8Array>({
+          async pull(controller) {
+            try {
+              const { value, done } = await chunks.next()
+              if (done) {
+                controller.close()
+                // Whatever follows the file part is not needed
+                await reader.cancel()
+              } else {
+                // Copied so the caller never holds a view into the shared buffer
+                controller.enqueue(value.slice())
+              }
+            } catch (error) {
+              controller.error(error)
+              await reader.cancel().catch(() => {})
+            }
+          },
+          async cancel() {
+            await chunks.return(undefined)
+            await reader.cancel()
+          },
+        })
+      }
+
+      return {
+        name: dispositionParam(disposition, "filename") || "upload",
+        type: headers.get("content-type") || "",
+        stream,
+        arrayBuffer: () => new Response(stream()).arrayBuffer(),
+      }
+    }
+  } catch (error) {
+    await reader.cancel().catch(() => {})
+    throw error
+  }
+}
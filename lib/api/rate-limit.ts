@@ -1,19 +1,111 @@
-const store = new Map<string, { count: number; expiresAt: number }>()
+import { createAdminClient } from "@/lib/supabase/admin"
 
-export function isRateLimited(key: string, limit = 20, windowMs = 60_000): boolean {
-  const now = Date.now()
-  const current = store.get(key)
+// Sliding-window counters: each key keeps the count for the current fixed window and
+// the previous one, and the previous count is weighted by how much of it still overlaps
+// the sliding window. Two integers per key, no per-request timestamps.
 
-  if (!current || current.expiresAt < now) {
-    store.set(key, { count: 1, expiresAt: now + windowMs })
-    return false
+export interface RateLimitStore {
+  /** Counts a request for `key` and returns true if it is over `limit` per `windowMs`. */
+  hit(key: string, limit: number, windowMs: number): Promise<boolean>
+}
+
+interface Counter {
+  windowMs: number
+  windowStart: number
+  count: number
+  previous: number
+}
+
+const MAX_KEYS = 50_000
+const SWEEP_INTERVAL_MS = 5_000
+
+export function createMemoryRateLimitStore(maxKeys = MAX_KEYS): RateLimitStore & { size(): number } {
+  // Map order doubles as recency order: a key is re-inserted on every hit, so the
+  // least recently seen keys are always at the front.
+  const counters = new Map<string, Counter>()
+  let lastSweep = 0
+
+  // Drops idle keys from the front until it reaches one that is still live, so each
+  // sweep only touches keys it removes plus one.
+  const sweep = (now: number) => {
+    lastSweep = now
+    for (const [key, counter] of counters) {
+      if (now - counter.windowStart < 2 * counter.windowMs) break
+      counters.delete(key)
+    }
   }
 
-  if (current.count >= limit) return true
+  return {
+    async hit(key, limit, windowMs) {
+      const now = Date.now()
+      if (now - lastSweep >= SWEEP_INTERVAL_MS) sweep(now)
+
+      const windowStart = now - (now % windowMs)
+      let counter = counters.get(key)
+      if (!counter) {
+        counter = { windowMs, windowStart, count: 0, previous: 0 }
+      } else {
+        counters.delete(key)
+        if (counter.windowStart !== windowStart) {
+          counter.previous = counter.windowStart === windowStart - windowMs ? counter.count : 0
+          counter.count = 0
+          counter.windowStart = windowStart
+        }
+      }
+      counters.set(key, counter)
+
+      if (counters.size > maxKeys) {
+        const oldest = counters.keys().next().value
+        if (oldest !== undefined) counters.delete(oldest)
+      }
 
-  current.count += 1
-  store.set(key, current)
-  return false
+      const overlap = 1 - (now - windowStart) / windowMs
+      if (counter.count + counter.previous * overlap >= limit) return true
+
+      counter.count += 1
+      return false
+    },
+    size() {
+      return counters.size
+    },
+  }
+}
+
+/**
+ * Shared store backed by public.rate_limit_hit (scripts/020_create_rate_limit_function.sql),
+ * so limits hold across Node workers and instances. Falls back to `fallback` when the
+ * database is unreachable rather than failing requests.
+ */
+export function createPostgresRateLimitStore(fallback: RateLimitStore): RateLimitStore {
+  let client: ReturnType<typeof createAdminClient> | null = null
+
+  return {
+    async hit(key, limit, windowMs) {
+      try {
+        client ??= createAdminClient()
+        const { data, error } = await client.rpc("rate_limit_hit", {
+          p_key: key,
+          p_limit: limit,
+          p_window_ms: windowMs,
+        })
+        if (error) throw error
+        return data === true
+      } catch (error) {
+        console.error("[v0] rate-limit: shared store unavailable, using local limits:", error instanceof Error ? error.message : error)
+        return fallback.hit(key, limit, windowMs)
+      }
+    },
+  }
+}
+
+const memoryStore = createMemoryRateLimitStore()
+
+// RATE_LIMIT_STORE=postgres shares limits across processes; the default is per process.
+const store: RateLimitStore =
+  process.env.RATE_LIMIT_STORE === "postgres" ? createPostgresRateLimitStore(memoryStore) : memoryStore
+
+export function isRateLimited(key: string, limit = 20, windowMs = 60_000): Promise<boolean> {
+  return store.hit(key, limit, windowMs)
 }
 
 export function rateLimitKeyFromRequest(request: Request, fallback = "anon"): string {
@@ -26,4 +118,3 @@ export function rateLimitKeyFromRequest(request: Request, fallback = "anon"): st
   if (realIp) return realIp
   return fallback
 }
-
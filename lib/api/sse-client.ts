@@ -0,0 +1,45 @@
+/**
+ * Reads a text/event-stream body and calls `onEvent` for every event with its
+ * JSON-decoded data. Resolves when the server closes the stream.
+ */
+export async function readServerSentEvents(
+  response: Response,
+  onEvent: (event: string, data: any) => void,
+): Promise<void> {
+  if (!response.body) throw new Error("Response has no body to stream")
+
+  const reader = response.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ""
+
+  const dispatch = (raw: string) => {
+    let event = "message"
+    const dataLines: string[] = []
+    for (const line of raw.split("\n")) {
+      if (line.startsWith("event:")) event = line.slice(6).trim()
+      else if (line.startsWith("data:")) dataLines.push(line.slice(5).trimStart())
+    }
+    if (dataLines.length === 0) return
+    const payload = dataLines.join("\n")
+    try {
+      onEvent(event, JSON.parse(payload))
+    } catch {
+      onEvent(event, payload)
+    }
+  }
+
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+
+    let separator = buffer.indexOf("\n\n")
+    while (separator !== -1) {
+      dispatch(buffer.slice(0, separator))
+      buffer = buffer.slice(separator + 2)
+      separator = buffer.indexOf("\n\n")
+    }
+  }
+
+  if (buffer.trim()) dispatch(buffer)
+}
@@ -0,0 +1,70 @@
+type SendEvent = (event: string, data: unknown) => void
+
+/**
+ * Builds a text/event-stream Response. `run` receives a `send` function and the
+ * stream is closed when it settles; a thrown error is sent as an `error` event.
+ */
+export function sseResponse(run: (send: SendEvent) => Promise<void>): Response {
+  const encoder = new TextEncoder()
+
+  const stream = new ReadableStream<Uint8Array>({
+    async start(controller) {
+      let closed = false
+      const send: SendEvent = (event, data) => {
+        if (closed) return
+        controller.enqueue(encoder.encode(`event: ${event}\ndata: ${JSON.stringify(data)}\n\n`))
+      }
+
+      try {
+        await run(send)
+      } catch (error) {
+        send("error", { error: error instanceof Error ? error.message : String(error) })
+      } finally {
+        closed = true
+        controller.close()
+      }
+    },
+  })
+
+  return new Response(stream, {
+    headers: {
+      "Content-Type": "text/event-stream; charset=utf-8",
+      "Cache-Control": "no-cache, no-transform",
+      Connection: "keep-alive",
+      "X-Accel-Buffering": "no",
+    },
+  })
+}
+
+/**
+ * Accumulates streamed tokens and hands back complete sentences as soon as
+ * they end, so speech synthesis can start before the completion is done.
+ */
+export function createSentenceChunker(minLength = 20) {
+  let buffer = ""
+
+  return {
+    push(token: string): string[] {
+      buffer += token
+      const sentences: string[] = []
+      const boundary = /[.!?]["')\]]*\s+|\n{2,}/g
+      let start = 0
+      let match: RegExpExecArray | null
+      while ((match = boundary.exec(buffer)) !== null) {
+        const end = match.index + match[0].length
+        const sentence = buffer.slice(start, end).trim()
+        if (sentence.length >= minLength) {
+          sentences.push(sentence)
+          start = end
+        }
+      }
+      buffer = buffer.slice(start)
+      return sentences
+    },
+    flush(): string | null {
+      const rest = buffer.trim()
+      buffer = ""
+      return rest || null
+    },
+  }
+}
@@ -0,0 +1,128 @@
+// Local end-of-turn classifier for spoken interview answers.
+// Scores a transcript snapshot from cheap lexical cues (trailing fillers and connectives,
+// sentence punctuation, closing phrases, answer length) plus how long the microphone has
+// been silent, and maps the score to a probability that the speaker is done. Only
+// snapshots that land in the uncertain middle band need the LLM turn-detection route.
+
+export interface TurnEndInput {
+  transcript: string
+  /** Milliseconds of audio silence since the last detected speech, if known */
+  silenceMs?: number
+}
+
+export interface TurnEndResult {
+  isComplete: boolean
+  /** Confidence in `isComplete`, 0.5 - 1.0 */
+  confidence: number
+  /** Probability that the turn has ended, 0 - 1 */
+  probability: number
+  wordCount: number
+  lastWords: string
+  hasActiveFiller: boolean
+  fillerWords: string[]
+}
+
+// Below this confidence the decision is handed to the LLM
+export const TURN_END_CONFIDENT = 0.75
+
+// Silence beyond this adds no further evidence
+const SILENCE_SATURATION_MS = 1500
+
+const FILLER_WORDS = ["um", "uh", "erm", "hmm", "like", "well"]
+const FILLER_PHRASES = ["you know", "i mean", "sort of", "kind of"]
+const CONNECTIVES = new Set([
+  "and", "but", "or", "so", "because", "since", "then", "if", "when", "while", "which", "that",
+  "the", "a", "an", "to", "of", "with", "for", "in", "on", "my", "our", "is", "was", "were", "are",
+])
+const NATURAL_ENDING = /(that's it|that is it|that's all|that is all|thank you|thanks|i think|i believe|i feel)$/i
+const CLOSING_PHRASE = /(that's (about )?(it|all)|that is (about )?(it|all)|that's everything|hope (that|this) helps|that's my answer|that sums it up)[.!]?$/i
+
+const sigmoid = (z: number) => 1 / (1 + Math.exp(-z))
+
+export function classifyTurnEnd({ transcript, silenceMs }: TurnEndInput): TurnEndResult {
+  const text = transcript.trim()
+  const lower = text.toLowerCase()
+  const words = lower
+    .replace(/[^a-z0-9'\s]/g, " ")
+    .split(/\s+/)
+    .filter((w) => w.length > 0)
+  const wordCount = words.length
+  const lastWord = words[wordCount - 1] || ""
+  const lastTwo = words.slice(-2).join(" ")
+
+  const hasActiveFiller = FILLER_WORDS.includes(lastWord) || FILLER_PHRASES.includes(lastTwo)
+  const endsOnConnective = CONNECTIVES.has(lastWord)
+  const hasPunctuation = /[.!?]$/.test(text)
+  const trailsOff = /(\.\.\.|…|,|-)$/.test(text)
+
+  let z = -1
+  if (hasPunctuation && !trailsOff) z += 1.6
+  if (NATURAL_ENDING.test(lower.replace(/[.!?]+$/, ""))) z += 1.2
+  if (CLOSING_PHRASE.test(lower)) z += 3
+  if (wordCount > 8) z += 0.6
+  if (wordCount < 3) z -= 2
+  if (hasActiveFiller) z -= 2.5
+  if (endsOnConnective && !hasPunctuation) z -= 2
+  if (trailsOff) z -= 1.2
+  if (silenceMs !== undefined) z += 2.5 * (Math.min(silenceMs, SILENCE_SATURATION_MS) / SILENCE_SATURATION_MS) - 0.5
+
+  const probability = sigmoid(z)
+  return {
+    isComplete: probability >= 0.5,
+    confidence: Math.max(probability, 1 - probability),
+    probability,
+    wordCount,
+    lastWords: words.slice(-3).join(" "),
+    hasActiveFiller,
+    fillerWords: [...FILLER_WORDS, ...FILLER_PHRASES].filter((f) => new RegExp(`\\b${f}\\b`).test(lower)),
+  }
+}
+
+/** True when the local decision is too uncertain to act on without the LLM */
+export function needsLLMCheck(result: Pick<TurnEndResult, "confidence" | "wordCount">): boolean {
+  return result.confidence < TURN_END_CONFIDENT && result.wordCount >= 3
+}
+
+export function buildTurnDetectionPrompt(transcript: string, question?: string): string {
+  return `You are an expert at detecting when someone has finished speaking in an interview conversation.
+
+Context: This is an interview. The user is answering a question: "${question || "a question"}"
+
+Current transcript of what the user has said so far:
+"${transcript}"
+
+IMPORTANT: In interviews, people often pause naturally after completing their answer. Be PROACTIVE about detecting completion - it's better to move forward than to wait too long.
+
+Analyze this transcript and determine if the user has completed their answer:
+
+CRITERIA FOR COMPLETION (mark as complete if ANY apply):
+- The answer addresses the question with a complete thought (even if brief)
+- Natural sentence endings (periods, question marks, exclamation marks)
+- Phrases that signal completion: "that's all", "that's it", "I think that's everything", "hope that helps"
+- The user has provided a substantive answer (3+ words) that answers the question
+- Natural pauses after a complete statement
+
+CRITERIA FOR CONTINUATION (mark as incomplete ONLY if):
+- Active filler words at the very end: "um...", "uh...", "and um..."
+- Mid-sentence cutoff: "I think that because..." (clearly incomplete)
+- Very short responses (1-2 words) that don't answer the question
+
+EXAMPLES OF COMPLETE ANSWERS:
+- "I worked on a React project where I implemented hooks" ✓ COMPLETE
+- "I have 3 years of experience in frontend development" ✓ COMPLETE
+- "I think I handled it well by communicating with the team" ✓ COMPLETE
+- "Yes, I've used React hooks extensively" ✓ COMPLETE
+
+EXAMPLES OF INCOMPLETE ANSWERS:
+- "I think that because um..." ✗ INCOMPLETE
+- "Well, I" ✗ INCOMPLETE
+
+Respond in JSON format:
+{
+  "isComplete": boolean (true if user is done, false if still speaking),
+  "confidence": number (0.0 to 1.0 confidence score),
+  "reasoning": "brief explanation of your decision"
+}
+
+Be decisive - if the answer seems complete, mark it as complete with high confidence.`
+}
@@ -8,6 +8,7 @@ export class VoiceActivityDetector {
   private silenceDuration: number
   private lastSoundTime: number
   private isActive: boolean
+  private level: number
 
   constructor(
     threshold = 30, // Volume threshold for speech detection
@@ -22,6 +23,7 @@ export class VoiceActivityDetector {
     this.silenceDuration = 0
     this.lastSoundTime = Date.now()
     this.isActive = false
+    this.level = 0
   }
 
   async initialize(stream: MediaStream): Promise<void> {
@@ -42,6 +44,7 @@ export class VoiceActivityDetector {
   isSpeaking(): boolean {
     const volume = this.getVolume()
     const speaking = volume > this.threshold
+    this.level = volume
 
     if (speaking) {
       this.lastSoundTime = Date.now()
@@ -53,6 +56,16 @@ export class VoiceActivityDetector {
     return speaking
   }
 
+  // Volume measured by the last isSpeaking() call
+  getLevel(): number {
+    return this.level
+  }
+
+  // ms since speech was last detected, as of the last isSpeaking() call
+  getSilenceDuration(): number {
+    return this.silenceDuration
+  }
+
   hasBeenSilent(): boolean {
     return this.silenceDuration > this.silenceThreshold
   }
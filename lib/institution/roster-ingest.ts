@@ -0,0 +1,134 @@
+import { chunk, mapWithConcurrency } from "@/lib/api/batching"
+
+// Resolves an uploaded roster (a Set of lowercase emails) against users and
+// institution_members. Lookups go out in fixed-size `.in()` chunks so the PostgREST URL
+// stays short no matter how large the roster is, and membership checks use Sets/Maps
+// instead of Array.includes, so a 50k-row roster stays linear.
+
+const LOOKUP_CHUNK_SIZE = 200
+const INSERT_CHUNK_SIZE = 500
+const LOOKUP_CONCURRENCY = 4
+
+export type RosterStage = "parsing" | "matching" | "members" | "inserting"
+
+export interface RosterProgress {
+  stage: RosterStage
+  processed: number
+  total: number
+}
+
+export interface RosterResolution {
+  found: string[]
+  notFound: string[]
+  alreadyMembers: string[]
+  /** email -> user id for found users that are not members yet */
+  toAdd: Map<string, string>
+}
+
+export async function resolveRoster(
+  supabase: any,
+  institutionId: string,
+  emails: Set<string>,
+  onProgress?: (progress: RosterProgress) => void,
+): Promise<RosterResolution> {
+  const emailList = Array.from(emails)
+  const idByEmail = new Map<string, string>()
+  let matched = 0
+
+  await mapWithConcurrency(chunk(emailList, LOOKUP_CHUNK_SIZE), LOOKUP_CONCURRENCY, async (part) => {
+    const { data, error } = await supabase.from("users").select("id,email").in("email", part)
+    if (error) throw new Error(`Failed to look up users: ${error.message}`)
+    for (const u of data || []) {
+      if (u?.email) idByEmail.set(String(u.email).toLowerCase(), u.id)
+    }
+    matched += part.length
+    onProgress?.({ stage: "matching", processed: matched, total: emailList.length })
+  })
+
+  const emailById = new Map<string, string>()
+  for (const [email, id] of idByEmail) emailById.set(id, email)
+
+  const memberIds = new Set<string>()
+  const userIds = Array.from(emailById.keys())
+  let checked = 0
+
+  await mapWithConcurrency(chunk(userIds, LOOKUP_CHUNK_SIZE), LOOKUP_CONCURRENCY, async (part) => {
+    const { data, error } = await supabase
+      .from("institution_members")
+      .select("user_id")
+      .eq("institution_id", institutionId)
+      .in("user_id", part)
+    if (error) throw new Error(`Failed to check existing members: ${error.message}`)
+    for (const m of data || []) memberIds.add(m.user_id)
+    checked += part.length
+    onProgress?.({ stage: "members", processed: checked, total: userIds.length })
+  })
+
+  const found: string[] = []
+  const notFound: string[] = []
+  const alreadyMembers: string[] = []
+  const toAdd = new Map<string, string>()
+
+  for (const email of emailList) {
+    const id = idByEmail.get(email)
+    if (!id) {
+      notFound.push(email)
+      continue
+    }
+    found.push(email)
+    if (memberIds.has(id)) alreadyMembers.push(email)
+    else toAdd.set(email, id)
+  }
+
+  return { found, notFound, alreadyMembers, toAdd }
+}
+
+/**
+ * Inserts institution_members rows and links users.institution_id in chunks.
+ * Returns the emails that were added and those whose chunk failed.
+ */
+export async function addRosterMembers(
+  supabase: any,
+  institutionId: string,
+  toAdd: Map<string, string>,
+  onProgress?: (progress: RosterProgress) => void,
+) {
+  const added: string[] = []
+  const failed: Array<{ email: string; reason: string }> = []
+  const entries = Array.from(toAdd)
+  const joinedAt = new Date().toISOString()
+  let processed = 0
+
+  for (const part of chunk(entries, INSERT_CHUNK_SIZE)) {
+    const { error: insertError } = await supabase.from("institution_members").insert(
+      part.map(([, userId]) => ({
+        user_id: userId,
+        institution_id: institutionId,
+        role: "member",
+        joined_at: joinedAt,
+      })),
+    )
+
+    if (insertError) {
+      console.error("Error inserting members:", insertError)
+      for (const [email] of part) failed.push({ email, reason: insertError.message || "Failed to add member" })
+    } else {
+      for (const idsPart of chunk(part, LOOKUP_CHUNK_SIZE)) {
+        const { error: updateError } = await supabase
+          .from("users")
+          .update({ institution_id: institutionId })
+          .in(
+            "id",
+            idsPart.map(([, userId]) => userId),
+          )
+        if (updateError) console.error("Error updating users.institution_id:", updateError)
+      }
+      for (const [email] of part) added.push(email)
+    }
+
+    processed += part.length
+    onProgress?.({ stage: "inserting", processed, total: entries.length })
+  }
+
+  return { added, failed }
+}
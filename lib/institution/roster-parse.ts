@@ -0,0 +1,115 @@
+// Incremental email extraction for roster uploads (/api/institution/members/upload).
+// CSV and text files are decoded and scanned one line at a time from the upload stream,
+// and spreadsheets are walked cell by cell, so memory grows with the number of distinct
+// emails rather than with the file size. Emails are lowercased and deduped in a Set.
+
+export const MAX_ROSTER_EMAILS = 100_000
+
+const EMAIL_PATTERN = /[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}/gi
+
+export interface RosterScan {
+  emails: Set<string>
+  rows: number
+  duplicates: number
+}
+
+export class RosterTooLargeError extends Error {
+  constructor(limit: number) {
+    super(`File contains more than ${limit} email addresses`)
+    this.name = "RosterTooLargeError"
+  }
+}
+
+export function createRosterScan(): RosterScan {
+  return { emails: new Set(), rows: 0, duplicates: 0 }
+}
+
+/** Adds every email found in `text` (one row or line) to the scan. */
+export function scanRosterText(scan: RosterScan, text: string, limit = MAX_ROSTER_EMAILS) {
+  scan.rows++
+  if (text.indexOf("@") === -1) return
+
+  EMAIL_PATTERN.lastIndex = 0
+  let match: RegExpExecArray | null
+  while ((match = EMAIL_PATTERN.exec(text)) !== null) {
+    const email = match[0].toLowerCase()
+    if (scan.emails.has(email)) {
+      scan.duplicates++
+      continue
+    }
+    if (scan.emails.size >= limit) throw new RosterTooLargeError(limit)
+    scan.emails.add(email)
+  }
+}
+
+/** Yields the lines of a UTF-8 byte stream without holding more than one partial line. */
+export async function* readLines(stream: ReadableStream<Uint8Array>): AsyncGenerator<string> {
+  const reader = stream.getReader()
+  const decoder = new TextDecoder()
+  let pending = ""
+
+  try {
+    while (true) {
+      const { value, done } = await reader.read()
+      if (done) break
+      pending += decoder.decode(value, { stream: true })
+
+      let start = 0
+      let newline = pending.indexOf("\n")
+      while (newline !== -1) {
+        yield pending.slice(start, newline).replace(/\r$/, "")
+        start = newline + 1
+        newline = pending.indexOf("\n", start)
+      }
+      pending = pending.slice(start)
+    }
+
+    pending += decoder.decode()
+    if (pending) yield pending.replace(/\r$/, "")
+  } finally {
+    reader.releaseLock()
+  }
+}
+
+/** Scans a CSV/text upload line by line. `onRows` is called every `every` lines. */
+export async function scanRosterStream(
+  stream: ReadableStream<Uint8Array>,
+  { onRows, every = 5_000, limit }: { onRows?: (rows: number) => void; every?: number; limit?: number } = {},
+): Promise<RosterScan> {
+  const scan = createRosterScan()
+  for await (const line of readLines(stream)) {
+    scanRosterText(scan, line, limit)
+    if (onRows && scan.rows % every === 0) onRows(scan.rows)
+  }
+  return scan
+}
+
+/**
+ * Walks every sheet of a parsed workbook row by row, scanning only string cells.
+ * `xlsx` is the sheetjs module; it is passed in so this file has no hard dependency on it.
+ */
+export function scanRosterWorkbook(
+  xlsx: any,
+  workbook: any,
+  { onRows, every = 5_000, limit }: { onRows?: (rows: number) => void; every?: number; limit?: number } = {},
+): RosterScan {
+  const scan = createRosterScan()
+
+  for (const sheetName of workbook.SheetNames as string[]) {
+    const sheet = workbook.Sheets[sheetName]
+    if (!sheet?.["!ref"]) continue
+
+    const range = xlsx.utils.decode_range(sheet["!ref"])
+    for (let r = range.s.r; r <= range.e.r; r++) {
+      let row = ""
+      for (let c = range.s.c; c <= range.e.c; c++) {
+        const cell = sheet[xlsx.utils.encode_cell({ r, c })]
+        if (cell && typeof cell.v === "string") row += cell.v + ","
+      }
+      scanRosterText(scan, row, limit)
+      if (onRows && scan.rows % every === 0) onRows(scan.rows)
+    }
+  }
+
+  return scan
+}
@@ -0,0 +1,38 @@
+// Short-lived per-institution cache for /api/institution/stats. The dashboard fetches stats on
+// every load; admin mutations in this process (adding/removing members, scheduling) drop the
+// entry right away, and the TTL bounds staleness from other instances and completed interviews.
+
+export interface InstitutionStats {
+  totalMembers: number
+  activeMembers: number
+  scheduledInterviews: number
+  averageScore: number
+  totalInterviews: number
+}
+
+const STATS_TTL_MS = 30_000
+const MAX_CACHED = 1_000
+
+const statsCache = new Map<string, { expiresAt: number; stats: InstitutionStats }>()
+
+export function getCachedInstitutionStats(institutionId: string): InstitutionStats | null {
+  const entry = statsCache.get(institutionId)
+  if (!entry) return null
+  if (entry.expiresAt <= Date.now()) {
+    statsCache.delete(institutionId)
+    return null
+  }
+  return entry.stats
+}
+
+export function cacheInstitutionStats(institutionId: string, stats: InstitutionStats) {
+  statsCache.delete(institutionId)
+  statsCache.set(institutionId, { expiresAt: Date.now() + STATS_TTL_MS, stats })
+  while (statsCache.size > MAX_CACHED) {
+    statsCache.delete(statsCache.keys().next().value!)
+  }
+}
+
+export function invalidateInstitutionStats(institutionId: string | null | undefined) {
+  if (institutionId) statsCache.delete(institutionId)
+}
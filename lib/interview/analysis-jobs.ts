@@ -0,0 +1,262 @@
+import { createAdminClient } from "@/lib/supabase/admin"
+import { generateAnalysis } from "@/app/actions/generate-analysis"
+
+// Durable post-interview analysis queue (scripts/022_create_analysis_jobs.sql).
+// Routes enqueue one job per interview and return 202; drainAnalysisJobs() claims jobs
+// with SKIP LOCKED, runs the Groq analysis and records success or a retry with backoff.
+// At most ANALYSIS_MAX_CONCURRENCY jobs run at once across all workers, so a burst of
+// interviews ending together queues up instead of timing out.
+
+export interface AnalysisJobPayload {
+  interviewType?: string
+  questionsSkipped?: number
+  scheduleId?: string
+  faceMetrics?: {
+    eyeContact?: number
+    smile?: number
+    stillness?: number
+    confidenceScore?: number
+  }
+}
+
+interface AnalysisJob {
+  id: string
+  interview_id: string
+  user_id: string | null
+  payload: AnalysisJobPayload
+  attempts: number
+  max_attempts: number
+}
+
+const MAX_RUNNING = Number(process.env.ANALYSIS_MAX_CONCURRENCY) || 4
+const LEASE_SECONDS = 300
+const DEFAULT_DRAIN_BUDGET_MS = 50_000
+
+const missingScheduleColumn = (message: string) => /scheduled_interview_id|column .*does not exist/i.test(message)
+
+export async function enqueueAnalysisJob(interviewId: string, userId: string | null, payload: AnalysisJobPayload) {
+  const supabase = createAdminClient()
+  const { data, error } = await supabase.rpc("enqueue_analysis_job", {
+    p_interview_id: interviewId,
+    p_user_id: userId,
+    p_payload: payload,
+  })
+
+  if (error || !data?.success) {
+    throw new Error(`Failed to queue analysis: ${error?.message || data?.message || "unknown error"}`)
+  }
+  return data as { jobId: string; status: string; deduped: boolean }
+}
+
+export async function getAnalysisJob(interviewId: string) {
+  const supabase = createAdminClient()
+  const { data, error } = await supabase
+    .from("analysis_jobs")
+    .select("id, user_id, status, attempts, max_attempts, last_error, run_after, updated_at, completed_at")
+    .eq("interview_id", interviewId)
+    .maybeSingle()
+
+  if (error) throw new Error(`Failed to fetch analysis job: ${error.message}`)
+  return data
+}
+
+async function fetchInterview(supabase: ReturnType<typeof createAdminClient>, interviewId: string) {
+  const { data, error } = await supabase
+    .from("interviews")
+    .select("id,user_id,started_at,scheduled_interview_id,interview_type")
+    .eq("id", interviewId)
+    .maybeSingle()
+
+  if (!error) return data
+  if (!missingScheduleColumn(error.message || "")) throw new Error(`Failed to fetch interview: ${error.message}`)
+
+  console.warn(
+    "[v0] analysis job: interviews.scheduled_interview_id column missing, continuing without it. Apply scripts/011_add_scheduled_interview_id_to_interviews.sql to enable schedule linking.",
+  )
+  const { data: fallback, error: fallbackError } = await supabase
+    .from("interviews")
+    .select("id,user_id,started_at,interview_type")
+    .eq("id", interviewId)
+    .maybeSingle()
+
+  if (fallbackError) throw new Error(`Failed to fetch interview: ${fallbackError.message}`)
+  return fallback
+}
+
+// Finds a scheduled interview for the same member within two hours of the start time
+// and backfills interviews.scheduled_interview_id (best effort)
+async function findCandidateSchedule(supabase: ReturnType<typeof createAdminClient>, interview: any) {
+  if (!interview.started_at) return undefined
+
+  const startedAt = new Date(interview.started_at).getTime()
+  const windowMs = 2 * 60 * 60 * 1000
+  const { data: candidate, error } = await supabase
+    .from("scheduled_interviews")
+    .select("id, scheduled_date, member_id")
+    .eq("member_id", interview.user_id)
+    .gte("scheduled_date", new Date(startedAt - windowMs).toISOString())
+    .lte("scheduled_date", new Date(startedAt + windowMs).toISOString())
+    .order("scheduled_date", { ascending: true })
+    .limit(1)
+    .maybeSingle()
+
+  if (error) {
+    console.error("[v0] analysis job: error searching for candidate scheduled_interviews:", error)
+    return undefined
+  }
+  if (!candidate) return undefined
+
+  const { error: updateError } = await supabase
+    .from("interviews")
+    .update({ scheduled_interview_id: candidate.id })
+    .eq("id", interview.id)
+  if (updateError) {
+    console.warn("[v0] analysis job: could not backfill interviews.scheduled_interview_id:", updateError.message)
+  }
+  return candidate.id as string
+}
+
+/** Runs the full analysis for one job; throws so the caller can schedule a retry. */
+export async function runAnalysisJob(job: AnalysisJob) {
+  const supabase = createAdminClient()
+  const interviewId = job.interview_id
+  const { faceMetrics, scheduleId } = job.payload
+  const questionsSkipped = job.payload.questionsSkipped || 0
+
+  const interview = await fetchInterview(supabase, interviewId)
+  if (!interview) throw new Error(`Interview not found: ${interviewId}`)
+
+  const interviewType = interview.interview_type || job.payload.interviewType
+  if (!interviewType) throw new Error("Interview type not found")
+
+  const effectiveScheduleId: string | undefined =
+    scheduleId || (interview as any).scheduled_interview_id || (await findCandidateSchedule(supabase, interview))
+
+  const { data: responses, error: responsesError } = await supabase
+    .from("interview_responses")
+    .select("answer")
+    .eq("interview_id", interviewId)
+
+  if (responsesError) throw new Error(`Failed to fetch responses: ${responsesError.message}`)
+
+  const hasParticipation = (responses || []).some(
+    (r) => r.answer && r.answer.trim() !== "" && !r.answer.includes("[SKIPPED]"),
+  )
+
+  let analysis: any
+  if (!hasParticipation) {
+    console.log("[v0] analysis job: no participation detected - setting all scores to 0", { interviewId })
+    analysis = {
+      overall_score: 0,
+      communication_score: 0,
+      technical_score: 0,
+      problem_solving_score: 0,
+      confidence_score: 0,
+      strengths: [],
+      improvements: ["No participation detected. Please attempt to answer the questions in your next interview."],
+      detailed_feedback:
+        "You did not provide any meaningful responses during this interview. To get accurate feedback and improve your interview skills, please ensure you answer the interview questions thoroughly in your next session.",
+    }
+  } else {
+    const result = await generateAnalysis(interviewId, interviewType, questionsSkipped)
+    if (!result.success) throw new Error(result.error || "Failed to generate analysis")
+    analysis = result.analysis
+  }
+
+  const resultRow = {
+    overall_score: Math.max(0, analysis.overall_score - questionsSkipped * 10),
+    communication_score: analysis.communication_score,
+    technical_score: analysis.technical_score,
+    problem_solving_score: analysis.problem_solving_score,
+    confidence_score: analysis.confidence_score,
+    strengths: analysis.strengths,
+    improvements: analysis.improvements,
+    detailed_feedback: analysis.detailed_feedback,
+    eye_contact_score: faceMetrics?.eyeContact || null,
+    smile_score: faceMetrics?.smile || null,
+    stillness_score: faceMetrics?.stillness || null,
+    face_confidence_score: faceMetrics?.confidenceScore || null,
+    total_questions: analysis.total_questions,
+    answered_questions: analysis.answered_questions,
+    correct_answers_count: analysis.correct_answers_count,
+    wrong_answers_count: analysis.wrong_answers_count,
+  }
+
+  const { data: existingResult } = await supabase
+    .from("interview_results")
+    .select("id")
+    .eq("interview_id", interviewId)
+    .maybeSingle()
+
+  const { error: resultsError } = existingResult
+    ? await supabase.from("interview_results").update(resultRow).eq("interview_id", interviewId)
+    : await supabase.from("interview_results").insert({ interview_id: interviewId, ...resultRow })
+
+  if (resultsError) throw new Error(`Failed to save results: ${resultsError.message}`)
+
+  await supabase
+    .from("interviews")
+    .update({ status: "completed", completed_at: new Date().toISOString() })
+    .eq("id", interviewId)
+
+  if (effectiveScheduleId) {
+    const { error } = await supabase.from("scheduled_interviews").update({ status: "completed" }).eq("id", effectiveScheduleId)
+    if (error) console.error("[v0] analysis job: failed to mark schedule completed:", effectiveScheduleId, error.message)
+  }
+}
+
+/**
+ * Claims and runs jobs one at a time until the queue is empty, the concurrency cap is
+ * reached, or `budgetMs` has elapsed. Safe to call from any number of processes.
+ */
+export async function drainAnalysisJobs({
+  workerId = `web-${crypto.randomUUID().slice(0, 8)}`,
+  budgetMs = DEFAULT_DRAIN_BUDGET_MS,
+}: { workerId?: string; budgetMs?: number } = {}) {
+  const supabase = createAdminClient()
+  const deadline = Date.now() + budgetMs
+  const stats = { processed: 0, succeeded: 0, retried: 0, failed: 0 }
+
+  while (Date.now() < deadline) {
+    const { data: jobs, error } = await supabase.rpc("claim_analysis_jobs", {
+      p_worker: workerId,
+      p_limit: 1,
+      p_max_running: MAX_RUNNING,
+      p_lease_seconds: LEASE_SECONDS,
+    })
+
+    if (error) {
+      console.error("[v0] analysis jobs: claim failed:", error.message)
+      break
+    }
+    const job = (jobs as AnalysisJob[] | null)?.[0]
+    if (!job) break
+
+    stats.processed++
+    let failure: string | null = null
+    try {
+      console.log("[v0] analysis jobs: running", { jobId: job.id, interviewId: job.interview_id, attempt: job.attempts })
+      await runAnalysisJob(job)
+    } catch (err) {
+      failure = err instanceof Error ? err.message : String(err)
+      console.error("[v0] analysis jobs: attempt failed", { jobId: job.id, attempt: job.attempts, error: failure })
+    }
+
+    const { data: outcome, error: finishError } = await supabase.rpc("finish_analysis_job", {
+      p_job_id: job.id,
+      p_worker: workerId,
+      p_error: failure,
+    })
+    if (finishError) {
+      console.error("[v0] analysis jobs: could not record outcome:", finishError.message)
+    } else if (outcome?.status === "succeeded") {
+      stats.succeeded++
+    } else if (outcome?.status === "queued") {
+      stats.retried++
+    } else if (outcome?.status === "failed") {
+      stats.failed++
+    }
+  }
+
+  return stats
+}
@@ -0,0 +1,242 @@
+// Per-question evaluation for incremental interview scoring.
+// Each answer is scored on its own as soon as it is saved (lib/interview/answer-scoring.ts),
+// and the final analysis merges those stored evaluations here. The merge keeps the scoring
+// rules of the old whole-transcript analysis: DSA/aptitude scores come from per-question
+// verdicts, and every score is scaled by the share of questions that were answered.
+
+export const VERDICTS = ["Fully Correct", "Partially Correct (correct approach)", "Incorrect"] as const
+export type Verdict = (typeof VERDICTS)[number]
+
+export interface AnswerEvaluation {
+  skipped?: boolean
+  verdict?: Verdict
+  communication: number
+  technical: number
+  problem_solving: number
+  confidence: number
+  strength?: string
+  improvement?: string
+}
+
+export interface EvaluatedResponse {
+  question_number: number
+  question: string
+  answer: string | null
+  skipped?: boolean | null
+  evaluation?: AnswerEvaluation | null
+}
+
+export interface MergedScores {
+  overall_score: number
+  communication_score: number
+  technical_score: number
+  problem_solving_score: number
+  confidence_score: number
+  dsa_score?: number
+  logical_reasoning_score?: number
+  evaluations: Record<string, Verdict>
+  correct_answers_count?: string
+  wrong_answers_count: number
+  not_answered_questions_count: number
+  total_questions: number
+  answered_questions: number
+}
+
+export const isDsaType = (type: string) => type === "dsa" || type.startsWith("dsa-")
+export const isAptitudeType = (type: string) => type === "aptitude" || type.startsWith("aptitude-")
+/** Interview types whose answers get a correctness verdict instead of soft-skill scores */
+export const isVerdictType = (type: string) => isDsaType(type) || isAptitudeType(type)
+
+export function isSkippedAnswer(response: { answer: string | null; skipped?: boolean | null }) {
+  return !!response.skipped || !response.answer || response.answer.trim() === "" || /\[skipped\]/i.test(response.answer)
+}
+
+const clampScore = (value: unknown) => {
+  const n = Number(value)
+  return Number.isFinite(n) ? Math.max(0, Math.min(100, Math.round(n))) : 0
+}
+
+export function buildAnswerPrompt(interviewType: string, question: string, answer: string): string {
+  if (isVerdictType(interviewType)) {
+    const skill = isDsaType(interviewType)
+      ? "Data Structures & Algorithms"
+      : "Logical Reasoning & Quantitative Aptitude"
+    return `You are an expert ${skill} interviewer grading ONE answer.
+
+Question: ${question}
+Candidate answer: ${answer}
+
+Verdict rules:
+- "Fully Correct": correct approach and result. Minor syntax slips, naming or unstated steps are fine. When in doubt, choose this.
+- "Partially Correct (correct approach)": right idea but significant bugs, wrong result or missed constraints (30-70% correct).
+- "Incorrect": fundamentally wrong, irrelevant or under 30% correct.
+
+Return ONLY JSON:
+{"verdict": "Fully Correct" | "Partially Correct (correct approach)" | "Incorrect", "technical": 0-100, "problem_solving": 0-100, "strength": "one short phrase", "improvement": "one short phrase"}`
+  }
+
+  return `You are an expert ${interviewType} interview coach grading ONE answer. Judge only the text of the answer.
+
+Question: ${question}
+Candidate answer: ${answer}
+
+Score 0-100 for communication (clarity, structure), technical (domain knowledge and accuracy),
+problem_solving (reasoning, examples, trade-offs) and confidence (directness, ownership).
+
+Return ONLY JSON:
+{"communication": number, "technical": number, "problem_solving": number, "confidence": number, "strength": "one short phrase", "improvement": "one short phrase"}`
+}
+
+/**
+ * Parses one answer's grading output. Falls back to pulling individual fields out with
+ * regexes, so a malformed reply still yields scores for that single question.
+ */
+export function parseAnswerEvaluation(text: string, interviewType: string): AnswerEvaluation {
+  let raw: any = null
+  const body = text.match(/\{[\s\S]*\}/)?.[0]
+  if (body) {
+    try {
+      raw = JSON.parse(body.replace(/,\s*([}\]])/g, "$1"))
+    } catch {
+      raw = null
+    }
+  }
+
+  if (!raw) {
+    raw = {}
+    for (const key of ["communication", "technical", "problem_solving", "confidence"]) {
+      const match = text.match(new RegExp(`"?${key}"?\\s*:\\s*(\\d{1,3})`, "i"))
+      if (match) raw[key] = Number(match[1])
+    }
+    const verdict = text.match(/fully\s*correct|partially\s*correct|incorrect/i)?.[0]
+    if (verdict) raw.verdict = verdict
+  }
+
+  const evaluation: AnswerEvaluation = {
+    communication: clampScore(raw.communication),
+    technical: clampScore(raw.technical),
+    problem_solving: clampScore(raw.problem_solving),
+    confidence: clampScore(raw.confidence),
+  }
+  if (typeof raw.strength === "string" && raw.strength.trim()) evaluation.strength = raw.strength.trim()
+  if (typeof raw.improvement === "string" && raw.improvement.trim()) evaluation.improvement = raw.improvement.trim()
+
+  if (isVerdictType(interviewType)) {
+    const verdict = String(raw.verdict || "").toLowerCase()
+    evaluation.verdict = /fully\s*correct/.test(verdict)
+      ? "Fully Correct"
+      : /partial/.test(verdict)
+        ? "Partially Correct (correct approach)"
+        : "Incorrect"
+  }
+
+  return evaluation
+}
+
+/** Combines stored per-question evaluations into interview-level scores and counts. */
+export function mergeEvaluations(
+  responses: EvaluatedResponse[],
+  interviewType: string,
+  totalQuestionsHint = 0,
+): MergedScores {
+  const totalQuestions = totalQuestionsHint > 0 ? totalQuestionsHint : responses.length
+  const answered = responses.filter((r) => !isSkippedAnswer(r) && r.evaluation && !r.evaluation.skipped)
+  const answeredQuestions = responses.filter((r) => !isSkippedAnswer(r)).length
+  const participationRatio = totalQuestions > 0 ? Math.min(1, answeredQuestions / totalQuestions) : 0
+  const cap = participationRatio * 100
+
+  const evaluations: Record<string, Verdict> = {}
+  const merged: MergedScores = {
+    overall_score: 0,
+    communication_score: 0,
+    technical_score: 0,
+    problem_solving_score: 0,
+    confidence_score: 0,
+    evaluations,
+    wrong_answers_count: 0,
+    not_answered_questions_count: totalQuestions - answeredQuestions,
+    total_questions: totalQuestions,
+    answered_questions: answeredQuestions,
+  }
+
+  if (isVerdictType(interviewType)) {
+    const pointsPerQuestion = totalQuestions > 0 ? 100 / totalQuestions : 0
+    let customScore = 0
+    let correctCount = 0
+
+    for (const r of answered) {
+      const verdict = r.evaluation!.verdict || "Incorrect"
+      evaluations[`Q${r.question_number}`] = verdict
+      if (verdict === "Fully Correct") {
+        customScore += pointsPerQuestion
+        correctCount++
+      } else if (verdict === "Partially Correct (correct approach)") {
+        customScore += pointsPerQuestion / 2
+      } else {
+        merged.wrong_answers_count++
+      }
+    }
+
+    const specificScore = Math.round(Math.min(customScore, cap))
+    merged.overall_score = clampScore(specificScore)
+    merged.technical_score = clampScore(specificScore)
+    merged.problem_solving_score = clampScore(specificScore)
+    if (isDsaType(interviewType)) merged.dsa_score = merged.technical_score
+    else merged.logical_reasoning_score = merged.technical_score
+    merged.correct_answers_count = `${correctCount}/${totalQuestions}`
+    return merged
+  }
+
+  if (!answered.length) return merged
+
+  const average = (key: "communication" | "technical" | "problem_solving" | "confidence") =>
+    answered.reduce((sum, r) => sum + r.evaluation![key], 0) / answered.length
+
+  const communication = average("communication")
+  const technical = average("technical")
+  const problemSolving = average("problem_solving")
+  const confidence = average("confidence")
+  const overall = technical * 0.35 + problemSolving * 0.25 + communication * 0.25 + confidence * 0.15
+
+  merged.communication_score = clampScore(communication * participationRatio)
+  merged.technical_score = clampScore(technical * participationRatio)
+  merged.problem_solving_score = clampScore(Math.min(problemSolving * participationRatio, cap))
+  merged.confidence_score = clampScore(confidence * participationRatio)
+  merged.overall_score = clampScore(Math.min(overall * participationRatio, cap))
+  return merged
+}
+
+export function buildSummaryPrompt(interviewType: string, responses: EvaluatedResponse[], scores: MergedScores): string {
+  const notes = responses
+    .map((r) => {
+      const e = r.evaluation
+      if (!e || e.skipped || isSkippedAnswer(r)) return `Q${r.question_number}: skipped`
+      const grade = e.verdict || `technical ${e.technical}, communication ${e.communication}`
+      return `Q${r.question_number} (${grade}): + ${e.strength || "-"}; - ${e.improvement || "-"}`
+    })
+    .join("\n")
+
+  return `You are an expert interview coach writing the summary of a ${interviewType} interview.
+The answers are already graded; do not re-grade them.
+
+Scores: overall ${scores.overall_score}, technical ${scores.technical_score}, problem solving ${scores.problem_solving_score}, communication ${scores.communication_score}, confidence ${scores.confidence_score}
+Answered ${scores.answered_questions} of ${scores.total_questions} questions.
+
+Per-question notes:
+${notes}
+
+Return ONLY JSON:
+{"strengths": ["3-5 concise strengths"], "improvements": ["3-5 specific improvement areas"], "detailed_feedback": "2-3 short paragraphs referencing specific questions"}`
+}
+
+/** Summary built from the per-question notes, used when the summary generation fails. */
+export function fallbackSummary(responses: EvaluatedResponse[], scores: MergedScores) {
+  const unique = (values: (string | undefined)[]) => [...new Set(values.filter((v): v is string => !!v))].slice(0, 5)
+  const evaluated = responses.filter((r) => r.evaluation && !r.evaluation.skipped)
+
+  return {
+    strengths: unique(evaluated.map((r) => r.evaluation!.strength)),
+    improvements: unique(evaluated.map((r) => r.evaluation!.improvement)),
+    detailed_feedback: `You answered ${scores.answered_questions} of ${scores.total_questions} questions with an overall score of ${scores.overall_score}. Review the per-question strengths and improvement areas above to focus your next practice session.`,
+  }
+}
@@ -0,0 +1,93 @@
+import { generateText } from "ai"
+import { createGroq } from "@ai-sdk/groq"
+import { createRestClient } from "@/lib/supabase/rest-client"
+import {
+  buildAnswerPrompt,
+  buildSummaryPrompt,
+  fallbackSummary,
+  isSkippedAnswer,
+  parseAnswerEvaluation,
+  type AnswerEvaluation,
+  type EvaluatedResponse,
+  type MergedScores,
+} from "@/lib/interview/answer-evaluation"
+
+// Groq calls and persistence for per-question scoring (scripts/024_add_response_evaluations.sql).
+// /api/interview/response calls scoreSavedResponse() after the response is sent; the final
+// analysis scores anything still pending and then asks for one short summary.
+
+const groqClient = createGroq({
+  apiKey: process.env.GROQ_API_KEY,
+})
+
+const MODEL = "llama-3.3-70b-versatile"
+
+const missingEvaluationColumns = (message: string) => /evaluation|column .*does not exist/i.test(message)
+
+export async function evaluateAnswer(interviewType: string, question: string, answer: string): Promise<AnswerEvaluation> {
+  const { text } = await generateText({
+    model: groqClient(MODEL),
+    prompt: buildAnswerPrompt(interviewType, question, answer),
+    temperature: 0.2,
+    maxOutputTokens: 200,
+  })
+  return parseAnswerEvaluation(text, interviewType)
+}
+
+/** Scores one saved response and stores the evaluation on its row. Never throws. */
+export async function scoreSavedResponse(
+  response: { id: string; question: string; answer: string | null; skipped?: boolean | null },
+  interviewType: string,
+): Promise<AnswerEvaluation | null> {
+  const supabase = createRestClient({ useServiceRole: true })
+  let evaluation: AnswerEvaluation | null = null
+  let status: "scored" | "failed" = "scored"
+
+  try {
+    evaluation = isSkippedAnswer(response)
+      ? { skipped: true, communication: 0, technical: 0, problem_solving: 0, confidence: 0 }
+      : await evaluateAnswer(interviewType, response.question, response.answer!)
+  } catch (error) {
+    status = "failed"
+    console.error("[v0] answer scoring: evaluation failed", { responseId: response.id, error })
+  }
+
+  const { error } = await supabase
+    .from("interview_responses")
+    .update({ evaluation, evaluation_status: status, evaluated_at: new Date().toISOString() })
+    .eq("id", response.id)
+
+  if (error) {
+    if (missingEvaluationColumns(error.message || "")) {
+      console.warn(
+        "[v0] answer scoring: interview_responses.evaluation column missing. Apply scripts/024_add_response_evaluations.sql to store per-question scores.",
+      )
+    } else {
+      console.error("[v0] answer scoring: failed to store evaluation:", error.message)
+    }
+  }
+
+  return evaluation
+}
+
+/** Strengths, improvements and feedback text for the merged scores; falls back to the per-question notes. */
+export async function summarizeInterview(interviewType: string, responses: EvaluatedResponse[], scores: MergedScores) {
+  try {
+    const { text } = await generateText({
+      model: groqClient(MODEL),
+      prompt: buildSummaryPrompt(interviewType, responses, scores),
+      temperature: 0.4,
+      maxOutputTokens: 700,
+    })
+    const parsed = JSON.parse(text.match(/\{[\s\S]*\}/)?.[0] || "")
+    if (!Array.isArray(parsed.strengths) || !Array.isArray(parsed.improvements)) throw new Error("Incomplete summary")
+    return {
+      strengths: parsed.strengths.map(String).slice(0, 5),
+      improvements: parsed.improvements.map(String).slice(0, 5),
+      detailed_feedback: String(parsed.detailed_feedback || ""),
+    }
+  } catch (error) {
+    console.warn("[v0] answer scoring: summary generation failed, using per-question notes:", error)
+    return fallbackSummary(responses, scores)
+  }
+}
@@ -0,0 +1,27 @@
+import { z } from "zod"
+
+export const codeAnalysisRequestSchema = z.object({
+  code: z.string().min(1, "Code is required").max(10000),
+  problem: z.string().min(1, "Problem is required").max(4000),
+  interviewType: z.string().min(1, "Interview type is required"),
+})
+
+export function buildCodeAnalysisPrompt(problem: string, code: string): string {
+  return `You are an expert coding interviewer analyzing a candidate's solution to a DSA problem.
+
+PROBLEM:
+${problem}
+
+CANDIDATE'S CODE:
+${code}
+
+Analyze this code and provide:
+1. **Correctness**: Does the code solve the problem correctly? Are there any bugs or edge cases missed?
+2. **Time Complexity**: What is the time complexity (Big O notation)?
+3. **Space Complexity**: What is the space complexity (Big O notation)?
+4. **Code Quality**: Is the code clean, readable, and well-structured?
+5. **Optimization**: Can the solution be optimized further?
+6. **Suggestions**: Provide specific recommendations for improvement
+
+Be constructive, specific, and educational. Keep your feedback concise (3-5 sentences per point).`
+}
@@ -0,0 +1,155 @@
+// Rolling conversation memory for question generation (/api/interview/question).
+// Prompts used to embed every previous Q&A verbatim, so prompt size grew with each question.
+// Here the last few turns stay verbatim, older turns are folded into one-line notes as they
+// age out (compressed once and cached per interview), and the whole block is held to a token
+// budget. A late question's prompt is therefore about the same size as an early one's.
+
+export interface ConversationTurn {
+  question?: string
+  answer?: string
+}
+
+export interface ConversationContext {
+  /** Earlier-turn notes plus the most recent turns verbatim, within the token budget */
+  transcript: string
+  /** Short stubs of previous questions (most recent last), for "avoid repeating" lists */
+  previousQuestions: string[]
+  turnCount: number
+}
+
+export interface ConversationMemoryOptions {
+  recentTurns?: number
+  tokenBudget?: number
+  maxQuestionStubs?: number
+}
+
+interface MemoryState {
+  userId: string
+  /** One compressed note per turn that has aged out of the verbatim window */
+  notes: string[]
+  expiresAt: number
+}
+
+const DEFAULT_RECENT_TURNS = 3
+const DEFAULT_TOKEN_BUDGET = 1200
+const DEFAULT_MAX_QUESTION_STUBS = 12
+const MAX_SESSIONS = 1000
+const SESSION_TTL_MS = 2 * 60 * 60 * 1000
+
+const sessions = new Map<string, MemoryState>()
+
+/** Rough token count (~4 characters per token for English text). */
+export const estimateTokens = (text: string) => Math.ceil(text.length / 4)
+
+const clip = (text: string, maxChars: number) =>
+  text.length <= maxChars ? text : `${text.slice(0, Math.max(0, maxChars - 1)).trimEnd()}…`
+
+const squash = (text: string | undefined) => (text || "").replace(/\s+/g, " ").trim()
+
+function firstSentences(text: string, count: number, maxChars: number) {
+  const sentences = text.match(/[^.!?]+[.!?]+|[^.!?]+$/g) || [text]
+  return clip(sentences.slice(0, count).join("").trim(), maxChars)
+}
+
+const isSkipped = (answer: string) => !answer || /^\[skipped\]$/i.test(answer)
+
+/** One-line note for a turn that is no longer shown verbatim. */
+export function compressTurn(turn: ConversationTurn, index: number): string {
+  const question = firstSentences(squash(turn.question), 1, 120)
+  const answer = squash(turn.answer)
+  return `Q${index + 1}: ${question} -> ${isSkipped(answer) ? "(skipped)" : firstSentences(answer, 2, 200)}`
+}
+
+export function questionStub(turn: ConversationTurn) {
+  return clip(squash(turn.question), 100)
+}
+
+/**
+ * Builds the context block from compressed notes for the older turns and the recent turns
+ * verbatim. Recent answers are clipped if they alone would use most of the budget; older notes
+ * are kept newest first until the budget is spent, and the rest are counted, not shown.
+ */
+export function buildConversationContext(
+  turns: ConversationTurn[],
+  notes: string[] = [],
+  { recentTurns = DEFAULT_RECENT_TURNS, tokenBudget = DEFAULT_TOKEN_BUDGET, maxQuestionStubs = DEFAULT_MAX_QUESTION_STUBS }: ConversationMemoryOptions = {},
+): ConversationContext {
+  const turnCount = turns.length
+  if (turnCount === 0) return { transcript: "", previousQuestions: [], turnCount }
+
+  const firstRecent = Math.max(0, turnCount - recentTurns)
+  const olderNotes = notes.length >= firstRecent ? notes.slice(0, firstRecent) : turns.slice(0, firstRecent).map(compressTurn)
+
+  const recentShare = Math.floor((tokenBudget * 0.75) / Math.max(1, turnCount - firstRecent))
+  const recent = turns.slice(firstRecent).map((turn, i) => {
+    const n = firstRecent + i + 1
+    const question = squash(turn.question)
+    const answer = squash(turn.answer) || "[Skipped]"
+    const block = `Q${n}: ${question}\nA${n}: ${answer}`
+    if (estimateTokens(block) <= recentShare) return block
+    const answerChars = Math.max(80, recentShare * 4 - question.length - 16)
+    return `Q${n}: ${clip(question, 300)}\nA${n}: ${clip(answer, answerChars)}`
+  })
+
+  let remaining = tokenBudget - estimateTokens(recent.join("\n\n"))
+  const kept: string[] = []
+  for (let i = olderNotes.length - 1; i >= 0; i--) {
+    const cost = estimateTokens(olderNotes[i]) + 1
+    if (cost > remaining) break
+    kept.unshift(olderNotes[i])
+    remaining -= cost
+  }
+
+  const omitted = olderNotes.length - kept.length
+  const sections: string[] = []
+  if (olderNotes.length > 0) {
+    sections.push(
+      `EARLIER IN THE INTERVIEW (summary):\n${omitted > 0 ? `(${omitted} earlier question(s) not shown)\n` : ""}${kept.join("\n")}`,
+    )
+  }
+  sections.push(`${olderNotes.length > 0 ? "MOST RECENT EXCHANGES:\n" : ""}${recent.join("\n\n")}`)
+
+  return {
+    transcript: sections.join("\n\n"),
+    previousQuestions: turns.slice(-maxQuestionStubs).map(questionStub),
+    turnCount,
+  }
+}
+
+/**
+ * Conversation context for one interview. Notes for turns that leave the verbatim window are
+ * compressed once and kept in memory per interview, so each request only compresses the
+ * turn that just aged out. A cold cache (new instance, expired entry) rebuilds the same notes
+ * from `previousAnswers`.
+ */
+export function getConversationContext(
+  interviewId: string,
+  userId: string,
+  previousAnswers: ConversationTurn[],
+  options: ConversationMemoryOptions = {},
+): ConversationContext {
+  const recentTurns = options.recentTurns ?? DEFAULT_RECENT_TURNS
+  const olderCount = Math.max(0, previousAnswers.length - recentTurns)
+
+  let state = interviewId ? sessions.get(interviewId) : undefined
+  if (!state || state.userId !== userId || state.expiresAt <= Date.now() || state.notes.length > olderCount) {
+    state = { userId, notes: [], expiresAt: 0 }
+  }
+
+  for (let i = state.notes.length; i < olderCount; i++) {
+    state.notes.push(compressTurn(previousAnswers[i], i))
+  }
+  state.expiresAt = Date.now() + SESSION_TTL_MS
+
+  if (interviewId) {
+    sessions.delete(interviewId)
+    sessions.set(interviewId, state)
+    while (sessions.size > MAX_SESSIONS) {
+      const oldest = sessions.keys().next().value
+      if (oldest === undefined) break
+      sessions.delete(oldest)
+    }
+  }
+
+  return buildConversationContext(previousAnswers, state.notes, options)
+}
@@ -0,0 +1,220 @@
+// Pre-aggregated performance summary for /api/user/performance.
+// Per-interview values are returned as parallel arrays (one entry per completed interview,
+// newest first) so the performance page receives numbers for its charts rather than every
+// result row with its feedback text. Summaries are cached per user and date window, keyed
+// by the user's score rollup (scripts/021_create_user_score_rollups.sql), which the
+// interview_results trigger bumps whenever a result is written.
+
+export interface PerformanceRow {
+  id: string
+  interview_type: string | null
+  started_at: string
+  completed_at: string | null
+  interview_results:
+    | {
+        overall_score: number | null
+        communication_score: number | null
+        technical_score: number | null
+        problem_solving_score: number | null
+        confidence_score: number | null
+        improvements: string[] | null
+        eye_contact_score: number | null
+        smile_score: number | null
+        stillness_score: number | null
+        face_confidence_score: number | null
+      }[]
+    | null
+}
+
+export interface PerformanceSummary {
+  window: { from: string | null; to: string | null }
+  series: {
+    interviewId: string[]
+    startedAt: number[]
+    durationMinutes: number[]
+    type: string[]
+    overall: (number | null)[]
+    communication: (number | null)[]
+    technical: (number | null)[]
+    problemSolving: (number | null)[]
+    confidence: (number | null)[]
+  }
+  byType: {
+    type: string[]
+    completed: number[]
+    avgScore: number[]
+    bestScore: number[]
+    /** First score (newest) above last (oldest) */
+    improving: boolean[]
+    recentScores: number[][]
+  }
+  overall: {
+    totalInterviews: number
+    averageScore: number
+    highestScore: number
+    lowestScore: number
+    totalTimeMinutes: number
+    improvementRate: number
+  }
+  dimensions: { skill: string[]; score: number[] }
+  face: { eyeContact: number; smile: number; stillness: number; confidence: number; count: number } | null
+  improvements: { area: string[]; count: number[]; trend: number[]; resultCount: number }
+}
+
+const MAX_CACHED = 2_000
+const CACHE_TTL_MS = 5 * 60_000
+
+const cache = new Map<string, { version: string; expiresAt: number; summary: PerformanceSummary }>()
+
+const mean = (values: number[]) => (values.length ? Math.round(values.reduce((a, b) => a + b, 0) / values.length) : 0)
+
+export function buildPerformanceSummary(
+  rows: PerformanceRow[],
+  window: { from: string | null; to: string | null },
+): PerformanceSummary {
+  const n = rows.length
+  const series: PerformanceSummary["series"] = {
+    interviewId: new Array(n),
+    startedAt: new Array(n),
+    durationMinutes: new Array(n),
+    type: new Array(n),
+    overall: new Array(n),
+    communication: new Array(n),
+    technical: new Array(n),
+    problemSolving: new Array(n),
+    confidence: new Array(n),
+  }
+
+  const types = new Map<string, number[]>()
+  const typeCounts = new Map<string, number>()
+  const dimensionSums = { Communication: 0, "Technical Skills": 0, "Problem Solving": 0 }
+  const face = { eyeContact: 0, smile: 0, stillness: 0, confidence: 0, count: 0 }
+  const improvementCounts = new Map<string, number>()
+  const improvementsByResult: (string[] | null)[] = []
+  const scores: number[] = []
+  let totalTimeMs = 0
+
+  for (let i = 0; i < n; i++) {
+    const row = rows[i]
+    const result = row.interview_results?.[0]
+    const started = new Date(row.started_at).getTime()
+    const durationMs = (row.completed_at ? new Date(row.completed_at).getTime() : Date.now()) - started
+    const type = row.interview_type || "custom"
+
+    series.interviewId[i] = row.id
+    series.startedAt[i] = started
+    series.durationMinutes[i] = Math.round(durationMs / 60000)
+    series.type[i] = type
+    series.overall[i] = result?.overall_score ?? null
+    series.communication[i] = result?.communication_score ?? null
+    series.technical[i] = result?.technical_score ?? null
+    series.problemSolving[i] = result?.problem_solving_score ?? null
+    series.confidence[i] = result?.confidence_score ?? null
+    totalTimeMs += durationMs
+
+    typeCounts.set(type, (typeCounts.get(type) || 0) + 1)
+    if (!types.has(type)) types.set(type, [])
+    if (result?.overall_score) {
+      scores.push(result.overall_score)
+      types.get(type)!.push(result.overall_score)
+    }
+
+    if (!result) continue
+    if (result.communication_score) dimensionSums.Communication += result.communication_score
+    if (result.technical_score) dimensionSums["Technical Skills"] += result.technical_score
+    if (result.problem_solving_score) dimensionSums["Problem Solving"] += result.problem_solving_score
+
+    if (result.eye_contact_score !== null) {
+      face.eyeContact += result.eye_contact_score || 0
+      face.smile += result.smile_score || 0
+      face.stillness += result.stillness_score || 0
+      face.confidence += result.face_confidence_score || 0
+      face.count++
+    }
+
+    const improvements = Array.isArray(result.improvements) ? result.improvements : null
+    improvementsByResult.push(improvements)
+    for (const area of improvements || []) {
+      improvementCounts.set(area, (improvementCounts.get(area) || 0) + 1)
+    }
+  }
+
+  const resultCount = improvementsByResult.length
+  const byType: PerformanceSummary["byType"] = {
+    type: [],
+    completed: [],
+    avgScore: [],
+    bestScore: [],
+    improving: [],
+    recentScores: [],
+  }
+  for (const [type, typeScores] of types) {
+    byType.type.push(type)
+    byType.completed.push(typeCounts.get(type) || 0)
+    byType.avgScore.push(mean(typeScores))
+    byType.bestScore.push(typeScores.length ? Math.max(...typeScores) : 0)
+    byType.improving.push(typeScores.length > 1 && typeScores[0] > typeScores[typeScores.length - 1])
+    byType.recentScores.push(typeScores.slice(0, 5))
+  }
+
+  const dimensions = Object.entries(dimensionSums)
+    .filter(([, sum]) => sum > 0)
+    .map(([skill, sum]) => ({ skill, score: Math.round(sum / resultCount) }))
+    .sort((a, b) => b.score - a.score)
+
+  // Positive trend = the area came up less in the last 3 results than in the 3 before
+  const mentions = (from: number, to: number, area: string) =>
+    improvementsByResult.slice(from, to).filter((list) => list?.includes(area)).length
+  const topImprovements = [...improvementCounts.entries()].sort((a, b) => b[1] - a[1]).slice(0, 4)
+
+  return {
+    window,
+    series,
+    byType,
+    overall: {
+      totalInterviews: n,
+      averageScore: mean(scores),
+      highestScore: scores.length ? Math.max(...scores) : 0,
+      lowestScore: scores.length ? Math.min(...scores) : 0,
+      totalTimeMinutes: Math.floor(totalTimeMs / 60000),
+      improvementRate:
+        scores.length > 1 ? Math.round(((scores[0] - scores[scores.length - 1]) / scores[scores.length - 1]) * 100) : 0,
+    },
+    dimensions: { skill: dimensions.map((d) => d.skill), score: dimensions.map((d) => d.score) },
+    face: face.count
+      ? {
+          eyeContact: Math.round(face.eyeContact / face.count),
+          smile: Math.round(face.smile / face.count),
+          stillness: Math.round(face.stillness / face.count),
+          confidence: Math.round(face.confidence / face.count),
+          count: face.count,
+        }
+      : null,
+    improvements: {
+      area: topImprovements.map(([area]) => area),
+      count: topImprovements.map(([, count]) => count),
+      trend: topImprovements.map(([area]) =>
+        resultCount > 3 ? mentions(3, 6, area) - mentions(0, 3, area) : 0,
+      ),
+      resultCount,
+    },
+  }
+}
+
+export function getCachedSummary(key: string, version: string): PerformanceSummary | null {
+  const entry = cache.get(key)
+  if (!entry) return null
+  if (entry.version !== version || entry.expiresAt <= Date.now()) {
+    cache.delete(key)
+    return null
+  }
+  return entry.summary
+}
+
+export function cacheSummary(key: string, version: string, summary: PerformanceSummary) {
+  cache.delete(key)
+  cache.set(key, { version, expiresAt: Date.now() + CACHE_TTL_MS, summary })
+  while (cache.size > MAX_CACHED) {
+    cache.delete(cache.keys().next().value!)
+  }
+}
@@ -0,0 +1,117 @@
+// Shared request setup for the JSON and streaming question endpoints:
+// loads difficulty and profile, builds the prompt input, and resolves the
+// question-pool key and the cached asked-question history.
+
+import { buildQuestionPrompt, parseInterviewType, splitCandidates, withCandidateInstructions } from "@/lib/interview/question-prompt"
+import type { QuestionPromptInput } from "@/lib/interview/question-prompt"
+import {
+  generateQuestionHash,
+  getPooledQuestions,
+  isPoolableQuestion,
+  prefillQuestionPool,
+  questionPoolKey,
+} from "@/lib/interview/question-pool"
+import { loadAskedQuestions, recordAskedQuestions } from "@/lib/interview/question-history"
+import type { AskedQuestions } from "@/lib/interview/question-history"
+import { getConversationContext } from "@/lib/interview/conversation-memory"
+
+export const CANDIDATES_PER_GENERATION = 3
+
+export interface QuestionRequestBody {
+  interviewId: string
+  interviewType: string
+  questionNumber: number
+  previousAnswers?: any[]
+  customScenario?: any
+  questionCount?: number
+}
+
+export interface QuestionContext {
+  promptInput: QuestionPromptInput
+  poolKey: string | null
+  asked: AskedQuestions
+  seenInInterview: Set<string>
+}
+
+export async function loadQuestionContext(supabase: any, userId: string, body: QuestionRequestBody): Promise<QuestionContext> {
+  const { interviewId, interviewType, questionNumber, previousAnswers, customScenario, questionCount } = body
+
+  const { courseName, courseSubject, isAptitudeType, isAptitude, isDSAInterview } = parseInterviewType(interviewType)
+  if (courseName) {
+    console.log("[v0] Course detected:", courseName, "/", courseSubject)
+  }
+
+  let difficulty = "intermediate"
+  try {
+    const { data: interview } = await supabase.from("interviews").select("difficulty").eq("id", interviewId).single()
+
+    if (interview?.difficulty) {
+      difficulty = interview.difficulty
+    }
+  } catch (difficultyError) {
+    console.log("[v0] Could not fetch difficulty (column may not exist yet), using default:", difficulty)
+  }
+
+  console.log("[v0] Interview difficulty:", difficulty)
+
+  const [{ data: userProfile }, asked] = await Promise.all([
+    supabase
+      .from("users")
+      .select("name, preferences, experience, education, skills, resume_data")
+      .eq("id", userId)
+      .single(),
+    // Asked-question hashes are loaded once per interview and then filtered locally
+    loadAskedQuestions(supabase, userId, interviewId),
+  ])
+
+  console.log("[v0] User profile loaded for personalization")
+
+  const promptInput: QuestionPromptInput = {
+    interviewType,
+    courseName,
+    courseSubject,
+    isAptitudeType,
+    difficulty,
+    questionNumber,
+    questionCount,
+    previousAnswers: previousAnswers || [],
+    // Recent turns verbatim plus compressed older turns, within a fixed token budget
+    conversation: getConversationContext(interviewId, userId, previousAnswers || []),
+    customScenario,
+    userProfile,
+  }
+
+  // Openings and DSA/aptitude problems are served from a shared pool when the candidate has not
+  // seen the pooled question before. The pool is filled only by warmQuestionPool, whose prompt
+  // drops the profile and earlier answers; per-request generations are personalized and never pooled.
+  const poolKey = isPoolableQuestion({ questionNumber, isAptitude, isDSAInterview })
+    ? questionPoolKey({ interviewType, courseSubject, difficulty, questionNumber })
+    : null
+
+  const seenInInterview = new Set<string>(
+    (previousAnswers || []).map((qa: any) => generateQuestionHash(qa.question || "")),
+  )
+
+  return { promptInput, poolKey, asked, seenInInterview }
+}
+
+/** Returns a pooled question the user has not seen (recording it as asked), or null. */
+export async function takePooledQuestion(supabase: any, ctx: QuestionContext): Promise<string | null> {
+  if (!ctx.poolKey) return null
+  const pick = getPooledQuestions(ctx.poolKey, ctx.seenInInterview).find((c) => !ctx.asked.hashes.has(c.hash))
+  if (!pick) return null
+
+  console.log("[v0] Serving question from pool:", ctx.poolKey)
+  await recordAskedQuestions(supabase, ctx.asked, [pick])
+  return pick.text
+}
+
+/** Keeps the pool for this request's key warm without blocking the response. */
+export function warmQuestionPool(ctx: QuestionContext, generate: (prompt: string) => Promise<string>): void {
+  if (!ctx.poolKey) return
+  const prefillPrompt = withCandidateInstructions(
+    buildQuestionPrompt({ ...ctx.promptInput, previousAnswers: [], conversation: undefined, userProfile: null }),
+    CANDIDATES_PER_GENERATION,
+  )
+  prefillQuestionPool(ctx.poolKey, async () => splitCandidates(await generate(prefillPrompt)))
+}
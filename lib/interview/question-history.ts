@@ -0,0 +1,77 @@
+// Per-interview cache of the questions a user has already been asked, so the
+// question route filters candidates locally instead of querying
+// interview_questions_asked once per regeneration attempt.
+
+export interface AskedQuestions {
+  userId: string
+  hashes: Map<string, { isImportant: boolean }>
+  expiresAt: number
+}
+
+const MAX_SESSIONS = 1000
+const SESSION_TTL_MS = 2 * 60 * 60 * 1000
+
+const sessions = new Map<string, AskedQuestions>()
+
+export async function loadAskedQuestions(supabase: any, userId: string, interviewId: string): Promise<AskedQuestions> {
+  const cacheKey = interviewId || `user:${userId}`
+  const cached = sessions.get(cacheKey)
+  if (cached && cached.userId === userId && cached.expiresAt > Date.now()) {
+    return cached
+  }
+
+  const hashes = new Map<string, { isImportant: boolean }>()
+  const { data, error } = await supabase
+    .from("interview_questions_asked")
+    .select("question_hash, is_important")
+    .eq("user_id", userId)
+
+  if (error) {
+    console.log("[v0] Warning: Could not load question history:", error.message)
+  }
+  for (const row of data || []) {
+    hashes.set(row.question_hash, { isImportant: !!row.is_important })
+  }
+
+  const entry = { userId, hashes, expiresAt: Date.now() + SESSION_TTL_MS }
+  sessions.delete(cacheKey)
+  sessions.set(cacheKey, entry)
+  while (sessions.size > MAX_SESSIONS) {
+    const oldest = sessions.keys().next().value
+    if (oldest === undefined) break
+    sessions.delete(oldest)
+  }
+  return entry
+}
+
+/** True when the question may be asked: never seen before, or flagged important. */
+export function isQuestionAllowed(asked: AskedQuestions, hash: string): boolean {
+  const existing = asked.hashes.get(hash)
+  return !existing || existing.isImportant
+}
+
+/**
+ * Records asked questions through one upsert RPC (record_questions_asked) that
+ * inserts new rows and increments times_asked on existing ones atomically.
+ */
+export async function recordAskedQuestions(
+  supabase: any,
+  asked: AskedQuestions,
+  questions: Array<{ hash: string; text: string }>,
+): Promise<void> {
+  if (questions.length === 0) return
+
+  for (const q of questions) {
+    if (!asked.hashes.has(q.hash)) asked.hashes.set(q.hash, { isImportant: false })
+  }
+
+  const { error } = await supabase.rpc("record_questions_asked", {
+    p_user_id: asked.userId,
+    p_hashes: questions.map((q) => q.hash),
+    p_texts: questions.map((q) => q.text),
+  })
+
+  if (error) {
+    console.log("[v0] Could not record question history:", error.message)
+  }
+}
@@ -0,0 +1,128 @@
+// Process-wide pool of generated questions that do not depend on the candidate
+// (interview openings, DSA and aptitude problems). Pools are keyed by
+// (interviewType, courseSubject, difficulty, questionNumber bucket), evicted
+// LRU across keys and expired by TTL, and refilled in the background.
+
+export interface PooledQuestion {
+  text: string
+  hash: string
+}
+
+interface PoolEntry {
+  questions: PooledQuestion[]
+  expiresAt: number
+}
+
+const MAX_KEYS = 500
+const MAX_PER_KEY = 12
+const TARGET_PER_KEY = 6
+const TTL_MS = 6 * 60 * 60 * 1000
+
+const pools = new Map<string, PoolEntry>()
+const refilling = new Set<string>()
+
+export function generateQuestionHash(question: string): string {
+  let hash = 0
+  const str = question.toLowerCase().trim()
+  for (let i = 0; i < str.length; i++) {
+    const char = str.charCodeAt(i)
+    hash = (hash << 5) - hash + char
+    hash = hash & hash
+  }
+  return Math.abs(hash).toString(16)
+}
+
+export function questionBucket(questionNumber: number): number {
+  if (questionNumber <= 1) return 1
+  if (questionNumber <= 5) return 2
+  if (questionNumber <= 15) return 3
+  return 4
+}
+
+export function questionPoolKey(parts: {
+  interviewType: string
+  courseSubject: string
+  difficulty: string
+  questionNumber: number
+}): string {
+  return [parts.interviewType, parts.courseSubject || "-", parts.difficulty, questionBucket(parts.questionNumber)].join("|")
+}
+
+/**
+ * Only questions whose prompt carries no candidate-specific context can be shared:
+ * the opening of a conversational interview, and DSA/aptitude problems.
+ */
+export function isPoolableQuestion(opts: {
+  questionNumber: number
+  isAptitude: boolean
+  isDSAInterview: boolean
+}): boolean {
+  if (opts.isAptitude || opts.isDSAInterview) return true
+  return opts.questionNumber === 1
+}
+
+function getEntry(key: string): PoolEntry | null {
+  const entry = pools.get(key)
+  if (!entry) return null
+  if (entry.expiresAt < Date.now()) {
+    pools.delete(key)
+    return null
+  }
+  // Refresh LRU position
+  pools.delete(key)
+  pools.set(key, entry)
+  return entry
+}
+
+/** Returns pooled questions for `key`, minus any whose hash is in `exclude`, in random order. */
+export function getPooledQuestions(key: string, exclude: Set<string> = new Set()): PooledQuestion[] {
+  const entry = getEntry(key)
+  if (!entry) return []
+  const candidates = entry.questions.filter((q) => !exclude.has(q.hash))
+  for (let i = candidates.length - 1; i > 0; i--) {
+    const j = Math.floor(Math.random() * (i + 1))
+    ;[candidates[i], candidates[j]] = [candidates[j], candidates[i]]
+  }
+  return candidates
+}
+
+export function addPooledQuestion(key: string, text: string): void {
+  const hash = generateQuestionHash(text)
+  let entry = getEntry(key)
+  if (!entry) {
+    entry = { questions: [], expiresAt: Date.now() + TTL_MS }
+    pools.set(key, entry)
+    while (pools.size > MAX_KEYS) {
+      const oldest = pools.keys().next().value
+      if (oldest === undefined) break
+      pools.delete(oldest)
+    }
+  }
+  if (entry.questions.some((q) => q.hash === hash)) return
+  entry.questions.push({ text, hash })
+  if (entry.questions.length > MAX_PER_KEY) entry.questions.shift()
+}
+
+/**
+ * Tops the pool for `key` up to its target size in the background. Only one
+ * refill per key runs at a time; generation errors are logged and dropped.
+ */
+export function prefillQuestionPool(key: string, generate: () => Promise<string[]>): void {
+  if (refilling.has(key)) return
+  const current = getEntry(key)?.questions.length ?? 0
+  if (current >= TARGET_PER_KEY) return
+
+  refilling.add(key)
+  ;(async () => {
+    try {
+      for (let round = 0; round < TARGET_PER_KEY; round++) {
+        if ((getEntry(key)?.questions.length ?? 0) >= TARGET_PER_KEY) break
+        for (const text of await generate()) addPooledQuestion(key, text)
+      }
+    } catch (error) {
+      console.log("[question-pool] Prefill failed for", key, error instanceof Error ? error.message : String(error))
+    } finally {
+      refilling.delete(key)
+    }
+  })()
+}
@@ -0,0 +1,159 @@
+import type { RealtimeChannel } from "@supabase/supabase-js"
+import { createClient } from "@/lib/supabase/client"
+
+// Client-side store for per-user live data (credit balance, pending scheduled interviews).
+// Components subscribe through hooks/use-user-live-data.ts. The first subscriber loads the
+// current value over HTTP and opens one Supabase Realtime channel per browser tab that
+// listens for this user's user_credits and scheduled_interviews changes
+// (scripts/023_enable_user_realtime.sql). After that nothing is fetched until a change
+// event arrives or a hidden tab becomes visible again; the channel closes with the last subscriber.
+
+export type UserTopic = "credits" | "scheduledInterviews"
+
+interface UserLiveState {
+  credits: number | null
+  scheduledInterviews: any[] | null
+}
+
+const REFETCH_DEBOUNCE_MS = 250
+
+let state: UserLiveState = { credits: null, scheduledInterviews: null }
+const listeners = new Map<UserTopic, Set<() => void>>([
+  ["credits", new Set()],
+  ["scheduledInterviews", new Set()],
+])
+const timers = new Map<UserTopic, ReturnType<typeof setTimeout>>()
+
+let channel: RealtimeChannel | null = null
+let connecting: Promise<void> | null = null
+let live = false
+let connectedOnce = false
+
+const loaders: Record<UserTopic, () => Promise<Partial<UserLiveState> | null>> = {
+  credits: async () => {
+    const res = await fetch("/api/user/credits")
+    if (!res.ok) return null
+    const data = await res.json()
+    return { credits: data.balance ?? 0 }
+  },
+  scheduledInterviews: async () => {
+    // A failed first load shows an empty list rather than a spinner that never ends
+    const res = await fetch("/api/user/scheduled-interviews").catch(() => null)
+    if (!res?.ok) return state.scheduledInterviews === null ? { scheduledInterviews: [] } : null
+    const data = await res.json()
+    return { scheduledInterviews: data.interviews || [] }
+  },
+}
+
+function setState(patch: Partial<UserLiveState>, topic: UserTopic) {
+  state = { ...state, ...patch }
+  for (const listener of listeners.get(topic)!) listener()
+}
+
+const subscriberCount = () => listeners.get("credits")!.size + listeners.get("scheduledInterviews")!.size
+
+/** Reloads one topic over HTTP; bursts of calls within 250ms collapse into one request. */
+export function refreshUserTopic(topic: UserTopic) {
+  clearTimeout(timers.get(topic))
+  timers.set(
+    topic,
+    setTimeout(async () => {
+      timers.delete(topic)
+      try {
+        const patch = await loaders[topic]()
+        if (patch) setState(patch, topic)
+      } catch (error) {
+        console.error(`[v0] user store: failed to load ${topic}:`, error)
+      }
+    }, REFETCH_DEBOUNCE_MS),
+  )
+}
+
+function onVisibilityChange() {
+  if (document.visibilityState !== "visible") return
+  // Events can be missed while the socket was down or the tab was throttled
+  if (!live) {
+    for (const [topic, set] of listeners) if (set.size) refreshUserTopic(topic)
+  }
+}
+
+async function connect() {
+  const supabase = createClient()
+  const {
+    data: { session },
+  } = await supabase.auth.getSession()
+  const userId = session?.user?.id
+  if (!userId || channel || subscriberCount() === 0) return
+
+  channel = supabase
+    .channel(`user:${userId}`)
+    .on(
+      "postgres_changes",
+      { event: "*", schema: "public", table: "user_credits", filter: `user_id=eq.${userId}` },
+      (payload: any) => {
+        const balance = payload.new?.balance
+        if (typeof balance === "number") setState({ credits: balance }, "credits")
+        else refreshUserTopic("credits")
+      },
+    )
+    .on(
+      "postgres_changes",
+      { event: "*", schema: "public", table: "scheduled_interviews", filter: `member_id=eq.${userId}` },
+      // Rows need institution/batch names from the API join, so reload the list once
+      () => refreshUserTopic("scheduledInterviews"),
+    )
+    .subscribe((status) => {
+      const wasLive = live
+      live = status === "SUBSCRIBED"
+      if (!live || wasLive) return
+      // Catch up on anything that changed while the channel was reconnecting
+      if (connectedOnce) {
+        for (const [topic, set] of listeners) if (set.size) refreshUserTopic(topic)
+      }
+      connectedOnce = true
+    })
+
+  document.addEventListener("visibilitychange", onVisibilityChange)
+}
+
+function disconnect() {
+  document.removeEventListener("visibilitychange", onVisibilityChange)
+  if (channel) {
+    createClient().removeChannel(channel)
+    channel = null
+  }
+  live = false
+  connectedOnce = false
+  // Without a channel the cached values can go stale (or belong to a signed-out user)
+  state = { credits: null, scheduledInterviews: null }
+}
+
+export function subscribeUserTopic(topic: UserTopic, listener: () => void) {
+  const set = listeners.get(topic)!
+  const firstForTopic = set.size === 0
+  set.add(listener)
+
+  if (firstForTopic && state[topic] === null) refreshUserTopic(topic)
+  if (!channel && !connecting) {
+    connecting = connect()
+      .catch((error) => console.error("[v0] user store: realtime connect failed:", error))
+      .finally(() => {
+        connecting = null
+      })
+  }
+
+  return () => {
+    set.delete(listener)
+    if (subscriberCount() === 0) disconnect()
+  }
+}
+
+export function getUserLiveState() {
+  return state
+}
+
+const serverState: UserLiveState = { credits: null, scheduledInterviews: null }
+
+export function getUserLiveServerState() {
+  return serverState
+}
@@ -0,0 +1,202 @@
+import type { SupabaseClient } from "@supabase/supabase-js"
+import { fetchWithTimeout } from "@/lib/api/http"
+
+// Verifies Supabase access tokens locally instead of calling GoTrue's /auth/v1/user on
+// every request. HS256 tokens are checked against SUPABASE_JWT_SECRET; asymmetric
+// (ES256/RS256) tokens against the project's JWKS. Verified users are cached by token
+// hash until the token expires, so repeat calls within and across requests are free.
+// Tokens that cannot be verified locally (no secret configured) fall back to getUser().
+
+export interface AuthedUser {
+  id: string
+  email?: string
+  phone?: string
+  role?: string
+  aud: string
+  user_metadata: Record<string, any>
+  app_metadata: Record<string, any>
+}
+
+type AuthResult = { data: { user: AuthedUser | null }; error: Error | null }
+
+interface JwtClaims {
+  sub?: string
+  exp?: number
+  aud?: string | string[]
+  role?: string
+  email?: string
+  phone?: string
+  user_metadata?: Record<string, any>
+  app_metadata?: Record<string, any>
+}
+
+const MAX_CACHED_TOKENS = 5_000
+const FALLBACK_TTL_MS = 60_000
+const JWKS_TTL_MS = 10 * 60_000
+const JWKS_MIN_REFETCH_MS = 30_000
+const JWKS_FETCH_TIMEOUT_MS = 5_000
+
+const verified = new Map<string, { user: AuthedUser; expiresAt: number }>()
+let jwks: { keys: Map<string, CryptoKey>; expiresAt: number } | null = null
+let jwksFetchedAt = 0
+let jwksRefresh: Promise<void> | null = null
+let hmacKey: Promise<CryptoKey> | null = null
+
+const encoder = new TextEncoder()
+
+function base64UrlDecode(input: string): Uint8Array {
+  const base64 = input.replace(/-/g, "+").replace(/_/g, "/").padEnd(Math.ceil(input.length / 4) * 4, "=")
+  const binary = atob(base64)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i)
+  return bytes
+}
+
+const decodeJson = (segment: string) => JSON.parse(new TextDecoder().decode(base64UrlDecode(segment)))
+
+async function hashToken(token: string): Promise<string> {
+  const digest = await crypto.subtle.digest("SHA-256", encoder.encode(token))
+  return Array.from(new Uint8Array(digest), (b) => b.toString(16).padStart(2, "0")).join("")
+}
+
+function getHmacKey(secret: string) {
+  hmacKey ??= crypto.subtle.importKey("raw", encoder.encode(secret), { name: "HMAC", hash: "SHA-256" }, false, ["verify"])
+  return hmacKey
+}
+
+async function refreshJwks() {
+  jwksFetchedAt = Date.now()
+  try {
+    const response = await fetchWithTimeout(`${process.env.NEXT_PUBLIC_SUPABASE_URL}/auth/v1/.well-known/jwks.json`, {
+      timeoutMs: JWKS_FETCH_TIMEOUT_MS,
+    })
+    if (!response.ok) return
+    const { keys = [] } = await response.json()
+    const imported = new Map<string, CryptoKey>()
+    for (const jwk of keys) {
+      const params =
+        jwk.kty === "EC"
+          ? { name: "ECDSA", namedCurve: jwk.crv || "P-256" }
+          : { name: "RSASSA-PKCS1-v1_5", hash: "SHA-256" }
+      imported.set(jwk.kid, await crypto.subtle.importKey("jwk", jwk, params, false, ["verify"]))
+    }
+    jwks = { keys: imported, expiresAt: Date.now() + JWKS_TTL_MS }
+  } catch (error) {
+    console.error("[v0] JWKS fetch failed:", error instanceof Error ? error.message : error)
+  }
+}
+
+async function getJwk(kid: string): Promise<CryptoKey | null> {
+  const now = Date.now()
+  // An unknown kid can mean the keys rotated, but kid comes from the caller, so refetches
+  // are spaced at least JWKS_MIN_REFETCH_MS apart and concurrent callers share one fetch
+  const needsRefresh = !jwks || jwks.expiresAt < now || !jwks.keys.has(kid)
+  if (needsRefresh && (jwksRefresh || now - jwksFetchedAt >= JWKS_MIN_REFETCH_MS)) {
+    jwksRefresh ??= refreshJwks().finally(() => {
+      jwksRefresh = null
+    })
+    await jwksRefresh
+  }
+  if (!jwks || jwks.expiresAt < Date.now()) return null
+  return jwks.keys.get(kid) || null
+}
+
+/**
+ * Returns the token's claims if its signature verifies locally, `null` if it is invalid,
+ * or `undefined` if it cannot be checked here (HS256 without SUPABASE_JWT_SECRET).
+ */
+async function verifyJwt(token: string): Promise<JwtClaims | null | undefined> {
+  const parts = token.split(".")
+  if (parts.length !== 3) return null
+
+  const header = decodeJson(parts[0])
+  const data = encoder.encode(`${parts[0]}.${parts[1]}`)
+  const signature = base64UrlDecode(parts[2])
+  let valid: boolean
+
+  if (header.alg === "HS256") {
+    const secret = process.env.SUPABASE_JWT_SECRET
+    if (!secret) return undefined
+    valid = await crypto.subtle.verify("HMAC", await getHmacKey(secret), signature, data)
+  } else if (header.alg === "ES256" || header.alg === "RS256") {
+    const key = header.kid ? await getJwk(header.kid) : null
+    if (!key) return undefined
+    const algorithm = header.alg === "ES256" ? { name: "ECDSA", hash: "SHA-256" } : { name: "RSASSA-PKCS1-v1_5" }
+    valid = await crypto.subtle.verify(algorithm, key, signature, data)
+  } else {
+    return null
+  }
+
+  if (!valid) return null
+  const claims: JwtClaims = decodeJson(parts[1])
+  if (!claims.sub || !claims.exp || claims.exp * 1000 <= Date.now()) return null
+  if (claims.role !== "authenticated") return null
+  return claims
+}
+
+function remember(key: string, user: AuthedUser, expiresAt: number) {
+  if (verified.size >= MAX_CACHED_TOKENS) {
+    const now = Date.now()
+    for (const [k, entry] of verified) {
+      if (entry.expiresAt <= now || verified.size >= MAX_CACHED_TOKENS) verified.delete(k)
+      else break
+    }
+  }
+  verified.set(key, { user, expiresAt })
+}
+
+const unauthenticated = (message: string): AuthResult => ({ data: { user: null }, error: new Error(message) })
+
+/**
+ * Drop-in replacement for `supabase.auth.getUser()` that verifies the session's access
+ * token locally. The session is read from the client's cookies (refreshing it if expired),
+ * so the same client can still be used for RLS-scoped queries afterwards.
+ */
+export async function getAuthedUser(supabase: SupabaseClient): Promise<AuthResult> {
+  const {
+    data: { session },
+    error: sessionError,
+  } = await supabase.auth.getSession()
+  if (sessionError) return { data: { user: null }, error: sessionError }
+  const token = session?.access_token
+  if (!token) return unauthenticated("Auth session missing")
+
+  const key = await hashToken(token)
+  const now = Date.now()
+  const cached = verified.get(key)
+  if (cached && cached.expiresAt > now) return { data: { user: cached.user }, error: null }
+  if (cached) verified.delete(key)
+
+  let claims: JwtClaims | null | undefined
+  try {
+    claims = await verifyJwt(token)
+  } catch (error) {
+    console.error("[v0] auth: local token verification failed:", error instanceof Error ? error.message : error)
+    claims = undefined
+  }
+
+  if (claims === null) return unauthenticated("Invalid or expired access token")
+
+  if (claims) {
+    const user: AuthedUser = {
+      id: claims.sub!,
+      email: claims.email,
+      phone: claims.phone,
+      role: claims.role,
+      aud: Array.isArray(claims.aud) ? claims.aud[0] : claims.aud || "authenticated",
+      user_metadata: claims.user_metadata || {},
+      app_metadata: claims.app_metadata || {},
+    }
+    remember(key, user, claims.exp! * 1000)
+    return { data: { user }, error: null }
+  }
+
+  // Could not verify locally: ask GoTrue once and cache the answer briefly
+  const { data, error } = await supabase.auth.getUser(token)
+  if (error || !data.user) return { data: { user: null }, error: error || new Error("User not found") }
+
+  const user = data.user as AuthedUser
+  const exp = decodeJson(token.split(".")[1])?.exp
+  remember(key, user, Math.min(now + FALLBACK_TTL_MS, exp ? exp * 1000 : now + FALLBACK_TTL_MS))
+  return { data: { user }, error: null }
+}
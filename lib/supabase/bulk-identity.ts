@@ -0,0 +1,83 @@
+import { createRestClient } from "@/lib/supabase/rest-client"
+import { chunk, mapWithConcurrency } from "@/lib/api/batching"
+
+const AUTH_PAGE_SIZE = 1000
+const CREATE_CONCURRENCY = 8
+const UPSERT_CHUNK_SIZE = 500
+
+/**
+ * Pages through every GoTrue user exactly once and returns a lowercase
+ * email -> auth user id index.
+ */
+export async function buildAuthEmailIndex(
+  restClient: ReturnType<typeof createRestClient>,
+  pageSize = AUTH_PAGE_SIZE,
+): Promise<Map<string, string>> {
+  const index = new Map<string, string>()
+
+  for (let page = 1; ; page++) {
+    const { data, error } = await restClient.auth.admin.listUsers({ page, perPage: pageSize })
+    if (error) throw new Error(error.message || "Failed to list auth users")
+
+    const users = data?.users || []
+    for (const u of users) {
+      if (u?.email && u?.id) index.set(String(u.email).toLowerCase(), u.id)
+    }
+    if (users.length < pageSize) break
+  }
+
+  return index
+}
+
+/**
+ * Creates auth accounts for emails that are not in the index yet, with a
+ * bounded number of concurrent GoTrue calls. New ids are added to `index`.
+ */
+export async function createMissingAuthUsers(
+  restClient: ReturnType<typeof createRestClient>,
+  emails: string[],
+  index: Map<string, string>,
+  concurrency = CREATE_CONCURRENCY,
+): Promise<Array<{ email: string; reason: string }>> {
+  const missing = emails.filter((email) => !index.has(email))
+  const failed: Array<{ email: string; reason: string }> = []
+
+  await mapWithConcurrency(missing, concurrency, async (email) => {
+    const { data, error } = await restClient.auth.admin.createUser({
+      email,
+      password: Math.random().toString(36).slice(-12), // Generate random password
+      email_confirm: true,
+      user_metadata: { name: email.split("@")[0] },
+    })
+
+    if (error || !data?.user?.id) {
+      failed.push({ email, reason: error?.message || "Failed to create user" })
+      return
+    }
+    index.set(email, data.user.id)
+  })
+
+  return failed
+}
+
+/** Ensures a public.users row exists for every resolved auth user, in chunks. */
+export async function upsertPublicUsers(
+  supabase: any,
+  emails: string[],
+  index: Map<string, string>,
+  chunkSize = UPSERT_CHUNK_SIZE,
+): Promise<Array<{ email: string; reason: string }>> {
+  const failed: Array<{ email: string; reason: string }> = []
+  const rows = emails
+    .filter((email) => index.has(email))
+    .map((email) => ({ id: index.get(email)!, email, name: email.split("@")[0] }))
+
+  for (const part of chunk(rows, chunkSize)) {
+    const { error } = await supabase.from("users").upsert(part, { onConflict: "id" })
+    if (error) {
+      for (const row of part) failed.push({ email: row.email, reason: error.message })
+    }
+  }
+
+  return failed
+}
@@ -1,5 +1,6 @@
 import { createServerClient } from "@supabase/ssr"
 import { NextResponse, type NextRequest } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 export function createClient(request: NextRequest) {
   let response = NextResponse.next({
@@ -67,10 +68,8 @@ export async function updateSession(request: NextRequest) {
   )
 
   const {
-    data: { session },
-  } = await supabase.auth.getSession()
-
-  const user = session?.user
+    data: { user },
+  } = await getAuthedUser(supabase)
 
   // Redirect unauthenticated users trying to access protected routes
   if (
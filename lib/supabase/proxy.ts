@@ -1,5 +1,6 @@
 import { createServerClient } from "@supabase/ssr"
 import { NextResponse, type NextRequest } from "next/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 
 export async function updateSession(request: NextRequest) {
   const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
@@ -33,7 +34,8 @@ export async function updateSession(request: NextRequest) {
   })
 
   try {
-    await supabase.auth.getUser()
+    // Refreshes an expired session via the cookie adapter; the token itself is verified locally
+    await getAuthedUser(supabase)
   } catch (error) {
     console.error("[v0] Error refreshing Supabase session:", error)
   }
@@ -1,7 +1,29 @@
+import { Agent, fetch as undiciFetch } from "undici"
+
 const SUPABASE_URL = process.env.NEXT_PUBLIC_SUPABASE_URL!
 const ANON_KEY = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!
 const SERVICE_ROLE_KEY = process.env.SUPABASE_SERVICE_ROLE_KEY!
 
+const REQUEST_TIMEOUT_MS = 10_000
+const GET_RETRIES = 2
+const RETRY_BASE_DELAY_MS = 100
+const MAX_SOCKETS = 32
+const LATENCY_SAMPLES = 512
+
+// One keep-alive pool per process for PostgREST and GoTrue, so short queries reuse warm
+// TLS connections instead of paying a handshake each time. Requests go through undici's own
+// fetch so the Agent and the fetch implementation always come from the same undici version
+// (Node's global fetch bundles its own copy, whose major differs between Node releases).
+let dispatcher: Agent | null = null
+function getDispatcher() {
+  dispatcher ??= new Agent({
+    connections: MAX_SOCKETS,
+    keepAliveTimeout: 30_000,
+    keepAliveMaxTimeout: 120_000,
+  })
+  return dispatcher
+}
+
 interface RestClientOptions {
   useServiceRole?: boolean
 }
@@ -11,8 +33,106 @@ interface SupabaseResult<T> {
   error: any | null;
 }
 
+interface RestError {
+  message: string
+  status?: number
+}
+
+const metrics = {
+  requests: 0,
+  failures: 0,
+  retries: 0,
+  timeouts: 0,
+  latencies: new Float64Array(LATENCY_SAMPLES),
+  latencyCount: 0,
+}
+
+/** Request counters and recent latency percentiles for the REST transport. */
+export function getRestClientMetrics() {
+  const count = Math.min(metrics.latencyCount, LATENCY_SAMPLES)
+  const sorted = Array.from(metrics.latencies.subarray(0, count)).sort((a, b) => a - b)
+  const pick = (p: number) => (count ? Math.round(sorted[Math.min(count - 1, Math.floor(p * count))]) : 0)
+
+  return {
+    requests: metrics.requests,
+    failures: metrics.failures,
+    retries: metrics.retries,
+    timeouts: metrics.timeouts,
+    latencyMs: { p50: pick(0.5), p95: pick(0.95), p99: pick(0.99), max: count ? Math.round(sorted[count - 1]) : 0 },
+  }
+}
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+const isRetryableStatus = (status: number) => status === 429 || status >= 500
+
+/**
+ * Sends one request over the pooled dispatcher. GETs are idempotent and are retried
+ * with jittered backoff on network errors, timeouts, 429 and 5xx; writes are sent once.
+ */
+async function send(path: string, init: RequestInit = {}): Promise<Response> {
+  const method = (init.method || "GET").toUpperCase()
+  const attempts = method === "GET" ? GET_RETRIES + 1 : 1
+
+  for (let attempt = 1; ; attempt++) {
+    const started = performance.now()
+    metrics.requests++
+
+    try {
+      const controller = new AbortController()
+      const timeout = setTimeout(() => controller.abort(), REQUEST_TIMEOUT_MS)
+      let response: Response
+      try {
+        response = (await undiciFetch(`${SUPABASE_URL}${path}`, {
+          ...(init as any),
+          signal: controller.signal,
+          dispatcher: getDispatcher(),
+        })) as unknown as Response
+      } finally {
+        clearTimeout(timeout)
+      }
+      metrics.latencies[metrics.latencyCount++ % LATENCY_SAMPLES] = performance.now() - started
+
+      if (!response.ok && isRetryableStatus(response.status) && attempt < attempts) {
+        await response.body?.cancel()
+        metrics.retries++
+        await sleep(RETRY_BASE_DELAY_MS * 2 ** (attempt - 1) * (1 + Math.random()))
+        continue
+      }
+      if (!response.ok) metrics.failures++
+      return response
+    } catch (error) {
+      const timedOut = error instanceof Error && error.name === "AbortError"
+      if (timedOut) metrics.timeouts++
+
+      if (attempt < attempts) {
+        metrics.retries++
+        await sleep(RETRY_BASE_DELAY_MS * 2 ** (attempt - 1) * (1 + Math.random()))
+        continue
+      }
+      metrics.failures++
+      throw timedOut ? new Error(`Request to ${path.split("?")[0]} timed out after ${REQUEST_TIMEOUT_MS}ms`) : error
+    }
+  }
+}
+
+async function readError(response: Response, fallback: string): Promise<RestError> {
+  const body = await response.json().catch(() => ({}))
+  return {
+    message: body.error_description || body.msg || body.message || `${fallback} (${response.status})`,
+    status: response.status,
+  }
+}
+
+const toError = (error: unknown): RestError => ({ message: error instanceof Error ? error.message : String(error) })
+
 export function createRestClient(options: RestClientOptions = {}) {
   const apiKey = options.useServiceRole ? SERVICE_ROLE_KEY : ANON_KEY
+  const headers = {
+    apikey: apiKey,
+    Authorization: `Bearer ${apiKey}`,
+  }
+  const jsonHeaders = { ...headers, "Content-Type": "application/json" }
 
   return {
     auth: {
@@ -26,7 +146,7 @@ export function createRestClient(options: RestClientOptions = {}) {
             return { data: { user: null }, error: null }
           }
 
-          const response = await fetch(`${SUPABASE_URL}/auth/v1/user`, {
+          const response = await send("/auth/v1/user", {
             headers: {
               apikey: apiKey,
               Authorization: `Bearer ${token}`,
@@ -34,13 +154,13 @@ export function createRestClient(options: RestClientOptions = {}) {
           })
 
           if (!response.ok) {
-            return { data: { user: null }, error: null }
+            return { data: { user: null }, error: await readError(response, "Failed to get user") }
           }
 
           const user = await response.json()
           return { data: { user }, error: null }
         } catch (error) {
-          return { data: { user: null }, error: null }
+          return { data: { user: null }, error: toError(error) }
         }
       },
       admin: {
@@ -51,13 +171,9 @@ export function createRestClient(options: RestClientOptions = {}) {
           user_metadata?: any
         }): Promise<SupabaseResult<{ user: any }>> => {
           try {
-            const response = await fetch(`${SUPABASE_URL}/auth/v1/admin/users`, {
+            const response = await send("/auth/v1/admin/users", {
               method: "POST",
-              headers: {
-                "Content-Type": "application/json",
-                apikey: apiKey,
-                Authorization: `Bearer ${apiKey}`,
-              },
+              headers: jsonHeaders,
               body: JSON.stringify({
                 email: userData.email,
                 password: userData.password,
@@ -67,63 +183,49 @@ export function createRestClient(options: RestClientOptions = {}) {
             })
 
             if (!response.ok) {
-              const error = await response.json()
-              return {
-                data: null,
-                error: { message: error.error_description || error.message || "Failed to create user" },
-              }
+              return { data: null, error: await readError(response, "Failed to create user") }
             }
 
             const data = await response.json()
             return { data: { user: data }, error: null }
           } catch (error) {
-            return { data: null, error: { message: String(error) } }
+            return { data: null, error: toError(error) }
           }
         },
-        listUsers: async (): Promise<SupabaseResult<{ users: any[] }>> => {
+        listUsers: async (params: { page?: number; perPage?: number } = {}): Promise<SupabaseResult<{ users: any[] }>> => {
           try {
-            const response = await fetch(`${SUPABASE_URL}/auth/v1/admin/users`, {
-              method: "GET",
-              headers: {
-                apikey: apiKey,
-                Authorization: `Bearer ${apiKey}`,
-              },
-            })
+            const query = new URLSearchParams()
+            if (params.page) query.set("page", String(params.page))
+            if (params.perPage) query.set("per_page", String(params.perPage))
+            const qs = query.toString()
+            const response = await send(`/auth/v1/admin/users${qs ? `?${qs}` : ""}`, { headers })
 
             if (!response.ok) {
-              return { data: { users: [] }, error: null }
+              return { data: { users: [] }, error: await readError(response, "Failed to list users") }
             }
 
             const data = await response.json()
             return { data: { users: data.users || [] }, error: null }
           } catch (error) {
-            return { data: { users: [] }, error: null }
+            return { data: { users: [] }, error: toError(error) }
           }
         },
         updateUserById: async (userId: string, updates: { user_metadata?: any; email?: string }): Promise<SupabaseResult<{ user: any }>> => {
           try {
-            const response = await fetch(`${SUPABASE_URL}/auth/v1/admin/users/${userId}`, {
+            const response = await send(`/auth/v1/admin/users/${userId}`, {
               method: "PUT",
-              headers: {
-                "Content-Type": "application/json",
-                apikey: apiKey,
-                Authorization: `Bearer ${apiKey}`,
-              },
+              headers: jsonHeaders,
               body: JSON.stringify(updates),
             })
 
             if (!response.ok) {
-              const error = await response.json()
-              return {
-                data: null,
-                error: { message: error.error_description || error.message || "Failed to update user" },
-              }
+              return { data: null, error: await readError(response, "Failed to update user") }
             }
 
             const data = await response.json()
             return { data: { user: data }, error: null }
           } catch (error) {
-            return { data: null, error: { message: String(error) } }
+            return { data: null, error: toError(error) }
           }
         },
       },
@@ -133,130 +235,92 @@ export function createRestClient(options: RestClientOptions = {}) {
         eq: (column: string, value: any) => ({
           maybeSingle: async (): Promise<SupabaseResult<any>> => {
             try {
-              const response = await fetch(
-                `${SUPABASE_URL}/rest/v1/${table}?select=${columns}&${column}=eq.${value}&limit=1`,
-                {
-                  headers: {
-                    apikey: apiKey,
-                    Authorization: `Bearer ${apiKey}`,
-                  },
-                },
+              const response = await send(
+                `/rest/v1/${table}?select=${columns}&${column}=eq.${encodeURIComponent(value)}&limit=1`,
+                { headers },
               )
 
               if (!response.ok) {
-                return { data: null, error: null }
+                return { data: null, error: await readError(response, `Select from ${table} failed`) }
               }
 
               const data = await response.json()
               return { data: data[0] || null, error: null }
             } catch (error) {
-              return { data: null, error: null }
+              return { data: null, error: toError(error) }
             }
           },
-          order: <T>(orderColumn: string, options: { ascending: boolean }): Promise<SupabaseResult<T[]>> => {
-            return new Promise(async (resolve) => {
-              try {
-                const order = options.ascending ? "asc" : "desc"
-                const response = await fetch(
-                  `${SUPABASE_URL}/rest/v1/${table}?select=${columns}&${column}=eq.${value}&order=${orderColumn}.${order}`,
-                  {
-                    headers: {
-                      apikey: apiKey,
-                      Authorization: `Bearer ${apiKey}`,
-                    },
-                  },
-                )
-
-                if (!response.ok) {
-                  resolve({ data: null, error: null })
-                  return
-                }
-
-                const data = await response.json()
-                resolve({ data, error: null })
-              } catch (error) {
-                resolve({ data: null, error: null })
+          order: async <T>(orderColumn: string, options: { ascending: boolean }): Promise<SupabaseResult<T[]>> => {
+            try {
+              const order = options.ascending ? "asc" : "desc"
+              const response = await send(
+                `/rest/v1/${table}?select=${columns}&${column}=eq.${encodeURIComponent(value)}&order=${orderColumn}.${order}`,
+                { headers },
+              )
+
+              if (!response.ok) {
+                return { data: null, error: await readError(response, `Select from ${table} failed`) }
               }
-            })
+
+              const data = await response.json()
+              return { data, error: null }
+            } catch (error) {
+              return { data: null, error: toError(error) }
+            }
           },
         }),
       }),
-      insert: <T>(data: T): Promise<SupabaseResult<any>> => {
-        return new Promise(async (resolve) => {
-          try {
-            const response = await fetch(`${SUPABASE_URL}/rest/v1/${table}`, {
-              method: "POST",
-              headers: {
-                "Content-Type": "application/json",
-                apikey: apiKey,
-                Authorization: `Bearer ${apiKey}`,
-              },
-              body: JSON.stringify(data),
-            })
+      insert: async <T>(data: T): Promise<SupabaseResult<any>> => {
+        try {
+          const response = await send(`/rest/v1/${table}`, {
+            method: "POST",
+            headers: { ...jsonHeaders, Prefer: "return=minimal" },
+            body: JSON.stringify(data),
+          })
 
-            if (!response.ok) {
-              const error = await response.json()
-              resolve({ error: { message: error.message || "Insert failed" }, data: null })
-              return
-            }
+          if (!response.ok) {
+            return { error: await readError(response, "Insert failed"), data: null }
+          }
 
-            resolve({ error: null, data: null })
-          } catch (error) {
-            resolve({ error: { message: String(error) }, data: null })
+          return { error: null, data: null }
+        } catch (error) {
+          return { error: toError(error), data: null }
+        }
+      },
+      upsert: async <T>(data: T, options?: any): Promise<SupabaseResult<any>> => {
+        try {
+          const response = await send(`/rest/v1/${table}?on_conflict=id`, {
+            method: "POST",
+            headers: { ...jsonHeaders, Prefer: "resolution=merge-duplicates,return=minimal" },
+            body: JSON.stringify(data),
+          })
+
+          if (!response.ok) {
+            return { error: await readError(response, "Upsert failed"), data: null }
           }
-        })
+
+          return { error: null, data: null }
+        } catch (error) {
+          return { error: toError(error), data: null }
+        }
       },
-      upsert: <T>(data: T, options?: any): Promise<SupabaseResult<any>> => {
-        return new Promise(async (resolve) => {
+      update: <T>(data: T) => ({
+        eq: async (column: string, value: any): Promise<SupabaseResult<any>> => {
           try {
-            const response = await fetch(`${SUPABASE_URL}/rest/v1/${table}?on_conflict=id`, {
-              method: "POST",
-              headers: {
-                "Content-Type": "application/json",
-                apikey: apiKey,
-                Authorization: `Bearer ${apiKey}`,
-                Prefer: "resolution=merge-duplicates",
-              },
+            const response = await send(`/rest/v1/${table}?${column}=eq.${encodeURIComponent(value)}`, {
+              method: "PATCH",
+              headers: { ...jsonHeaders, Prefer: "return=minimal" },
               body: JSON.stringify(data),
             })
 
             if (!response.ok) {
-              const error = await response.json()
-              resolve({ error: { message: error.message || "Upsert failed" }, data: null })
-              return
+              return { error: await readError(response, "Update failed"), data: null }
             }
 
-            resolve({ error: null, data: null })
+            return { error: null, data: null }
           } catch (error) {
-            resolve({ error: { message: String(error) }, data: null })
+            return { error: toError(error), data: null }
           }
-        })
-      },
-      update: <T>(data: T) => ({
-        eq: (column: string, value: any): Promise<SupabaseResult<any>> => {
-          return new Promise(async (resolve) => {
-            try {
-              const response = await fetch(`${SUPABASE_URL}/rest/v1/${table}?${column}=eq.${value}`, {
-                method: "PATCH",
-                headers: {
-                  "Content-Type": "application/json",
-                  apikey: apiKey,
-                  Authorization: `Bearer ${apiKey}`,
-                },
-                body: JSON.stringify(data),
-              })
-
-              if (!response.ok) {
-                const error = await response.json()
-                resolve({ error: { message: error.message || "Update failed" }, data: null })
-                return
-              }
-
-              resolve({ error: null, data: null })
-            } catch (error) {
-              resolve({ error: { message: String(error) }, data: null })
-            }
-          })
         },
       }),
     }),
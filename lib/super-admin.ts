@@ -1,4 +1,5 @@
 import { createClient } from "@/lib/supabase/server"
+import { getAuthedUser } from "@/lib/supabase/auth"
 import { verifySuperAdminSession } from "@/lib/super-admin-auth"
 import { cookies } from "next/headers"
 
@@ -17,7 +18,7 @@ export async function checkSuperAdminAccess() {
   // 2) FALLBACK → SUPABASE AUTH (Legacy)
   const supabase = await createClient(cookieStore)
 
-  const { data: { user } } = await supabase.auth.getUser()
+  const { data: { user } } = await getAuthedUser(supabase)
 
   if (!user) {
     return { authorized: false, user: null }
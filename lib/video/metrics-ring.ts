@@ -0,0 +1,72 @@
+// Fixed-size store for face metric samples. Keeps the most recent `capacity` samples in a
+// Float32Array ring plus running sums for both the ring window and the whole session, so
+// memory stays constant however long the interview runs and averages are O(1).
+
+export const METRIC_KEYS = ["eyeContact", "smile", "stillness", "confidenceScore"] as const
+
+export type FaceMetrics = Record<(typeof METRIC_KEYS)[number], number>
+
+const WIDTH = METRIC_KEYS.length
+
+export class MetricsRing {
+  private samples: Float32Array
+  private windowSums = new Float64Array(WIDTH)
+  private sessionSums = new Float64Array(WIDTH)
+  private next = 0
+  private size = 0
+  private total = 0
+  private capacity: number
+
+  constructor(capacity: number) {
+    this.capacity = capacity
+    this.samples = new Float32Array(capacity * WIDTH)
+  }
+
+  push(metrics: FaceMetrics): void {
+    const offset = this.next * WIDTH
+    const evicting = this.size === this.capacity
+
+    for (let k = 0; k < WIDTH; k++) {
+      const value = metrics[METRIC_KEYS[k]]
+      if (evicting) this.windowSums[k] -= this.samples[offset + k]
+      this.samples[offset + k] = value
+      this.windowSums[k] += value
+      this.sessionSums[k] += value
+    }
+
+    this.next = (this.next + 1) % this.capacity
+    if (!evicting) this.size++
+    this.total++
+  }
+
+  /** Average over the last `capacity` samples, or null before the first sample */
+  recentAverage(): FaceMetrics | null {
+    return this.size ? toMetrics(this.windowSums, this.size) : null
+  }
+
+  /** Average over every sample since the last reset, or null before the first sample */
+  sessionAverage(): FaceMetrics | null {
+    return this.total ? toMetrics(this.sessionSums, this.total) : null
+  }
+
+  get sampleCount(): number {
+    return this.total
+  }
+
+  reset(): void {
+    this.windowSums.fill(0)
+    this.sessionSums.fill(0)
+    this.next = 0
+    this.size = 0
+    this.total = 0
+  }
+}
+
+function toMetrics(sums: Float64Array, count: number): FaceMetrics {
+  return {
+    eyeContact: Math.round(sums[0] / count),
+    smile: Math.round(sums[1] / count),
+    stillness: Math.round(sums[2] / count),
+    confidenceScore: Math.round(sums[3] / count),
+  }
+}
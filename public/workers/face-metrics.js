@@ -0,0 +1,115 @@
+// Web Worker for face metrics so per-frame pixel work stays off the main thread.
+// Receives small ImageBitmaps (already downscaled by createImageBitmap) a few times a
+// second and replies with one metrics sample per frame. The metrics are lightweight
+// pixel heuristics, not a face model:
+//   stillness   - mean luminance change from the previous frame
+//   eyeContact  - how centred the skin-coloured region (the face) is in the frame
+//   smile       - share of bright, unsaturated pixels (teeth) in the lower face
+let canvas = null
+let ctx = null
+let previousLuma = null
+
+self.onmessage = (e) => {
+  const { type } = e.data
+
+  if (type !== "frame") return
+
+  try {
+    const sample = analyzeFrame(e.data.bitmap)
+    self.postMessage({ type: "sample", sample })
+  } catch (error) {
+    self.postMessage({ type: "error", error: error.message })
+  } finally {
+    e.data.bitmap.close()
+  }
+}
+
+function analyzeFrame(bitmap) {
+  const width = bitmap.width
+  const height = bitmap.height
+  if (!canvas || canvas.width !== width || canvas.height !== height) {
+    canvas = new OffscreenCanvas(width, height)
+    ctx = canvas.getContext("2d", { willReadFrequently: true })
+    previousLuma = null
+  }
+
+  ctx.drawImage(bitmap, 0, 0)
+  const pixels = ctx.getImageData(0, 0, width, height).data
+  const count = width * height
+  const luma = new Float32Array(count)
+
+  let motion = 0
+  let skin = 0
+  let sumX = 0
+  let sumY = 0
+  let minX = width
+  let minY = height
+  let maxX = -1
+  let maxY = -1
+
+  for (let i = 0; i < count; i++) {
+    const r = pixels[i * 4]
+    const g = pixels[i * 4 + 1]
+    const b = pixels[i * 4 + 2]
+    const y = 0.299 * r + 0.587 * g + 0.114 * b
+    const cb = 128 - 0.168736 * r - 0.331264 * g + 0.5 * b
+    const cr = 128 + 0.5 * r - 0.418688 * g - 0.081312 * b
+    luma[i] = y
+
+    if (previousLuma) motion += Math.abs(y - previousLuma[i])
+
+    if (cb >= 77 && cb <= 127 && cr >= 133 && cr <= 173) {
+      const px = i % width
+      const py = (i - px) / width
+      skin++
+      sumX += px
+      sumY += py
+      if (px < minX) minX = px
+      if (px > maxX) maxX = px
+      if (py < minY) minY = py
+      if (py > maxY) maxY = py
+    }
+  }
+
+  const stillness = previousLuma ? clamp(100 - (motion / count) * 4) : 100
+  previousLuma = luma
+
+  const facePresent = skin / count > 0.03
+  let eyeContact = 0
+  let smile = 0
+
+  if (facePresent) {
+    const cx = sumX / skin / width
+    const cy = sumY / skin / height
+    const offset = Math.hypot((cx - 0.5) / 0.5, (cy - 0.45) / 0.5)
+    eyeContact = clamp(100 - offset * 120)
+
+    // Lower third of the face bounding box, where an open smile shows teeth
+    const top = Math.floor(minY + ((maxY - minY) * 2) / 3)
+    let teeth = 0
+    let area = 0
+    for (let py = top; py <= maxY; py++) {
+      for (let px = minX; px <= maxX; px++) {
+        const i = py * width + px
+        const r = pixels[i * 4]
+        const g = pixels[i * 4 + 1]
+        const b = pixels[i * 4 + 2]
+        area++
+        if (luma[i] > 170 && Math.max(r, g, b) - Math.min(r, g, b) < 30) teeth++
+      }
+    }
+    smile = area > 0 ? clamp(40 + (teeth / area) * 600) : 0
+  }
+
+  return {
+    eyeContact,
+    smile,
+    stillness,
+    confidenceScore: eyeContact * 0.4 + smile * 0.3 + stillness * 0.3,
+    facePresent,
+  }
+}
+
+function clamp(value) {
+  return Math.max(0, Math.min(100, value))
+}
@@ -0,0 +1,54 @@
+-- Atomic interview start: check balance, debit credits, create the interview and log the transaction
+-- in a single round-trip. The user_credits row is locked FOR UPDATE so concurrent starts for the
+-- same user serialize instead of both reading the same balance (lost update / double spend).
+-- Usage: SELECT public.start_interview_with_credits(p_user_id := '<uuid>', p_cost := 10, ...);
+
+CREATE OR REPLACE FUNCTION public.start_interview_with_credits(
+  p_user_id uuid,
+  p_email text,
+  p_name text,
+  p_interview_type text,
+  p_difficulty text,
+  p_question_count integer,
+  p_cost integer,
+  p_metadata jsonb DEFAULT '{}'::jsonb
+)
+RETURNS jsonb AS $$
+DECLARE
+  v_balance integer;
+  v_interview public.interviews%ROWTYPE;
+BEGIN
+  -- Make sure the profile row exists (interviews/user_credits reference public.users)
+  INSERT INTO public.users (id, email, name)
+  VALUES (p_user_id, p_email, p_name)
+  ON CONFLICT (id) DO NOTHING;
+
+  -- Lock the user's credit row and check balance
+  SELECT balance INTO v_balance FROM public.user_credits WHERE user_id = p_user_id FOR UPDATE;
+  IF v_balance IS NULL OR v_balance < p_cost THEN
+    RETURN jsonb_build_object('success', false, 'code', 'insufficient_credits', 'balance', COALESCE(v_balance, 0));
+  END IF;
+
+  -- Debit user balance
+  UPDATE public.user_credits
+  SET balance = balance - p_cost, updated_at = now()
+  WHERE user_id = p_user_id;
+
+  -- Create interview
+  INSERT INTO public.interviews (user_id, interview_type, status, started_at, difficulty, question_count)
+  VALUES (p_user_id, p_interview_type, 'in_progress', now(), COALESCE(p_difficulty, 'intermediate'), p_question_count)
+  RETURNING * INTO v_interview;
+
+  -- Record user transaction
+  INSERT INTO public.credit_transactions (user_id, delta, reason, metadata)
+  VALUES (p_user_id, -p_cost, 'interview_start', COALESCE(p_metadata, '{}'::jsonb) || jsonb_build_object('interview_id', v_interview.id));
+
+  RETURN jsonb_build_object('success', true, 'interview', to_jsonb(v_interview), 'balance', v_balance - p_cost);
+
+EXCEPTION
+  WHEN others THEN
+    RETURN jsonb_build_object('success', false, 'code', 'error', 'message', SQLERRM);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+GRANT EXECUTE ON FUNCTION public.start_interview_with_credits(uuid, text, text, text, text, integer, integer, jsonb) TO service_role;
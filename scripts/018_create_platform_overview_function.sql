@@ -0,0 +1,117 @@
+-- Super-admin overview aggregates computed in Postgres instead of in Node.
+-- credit_transactions grows with platform history, so the "credits issued" total (sum of positive
+-- deltas) is kept in a rollup table maintained by triggers. Balances and institution usage are
+-- summed with GROUP BY inside get_platform_overview(), so the dashboard costs one round-trip.
+-- Usage: SELECT public.get_platform_overview();
+--
+-- The rollup is split across 16 shard rows and each statement adds its change to one random shard,
+-- so concurrent credit writes (signup bonuses, distribute_credits_to_batch) rarely wait on the
+-- same row lock. The triggers are statement-level, so a batch distribution touches one shard once.
+-- Inserts, updates and deletes are all counted.
+--
+-- Safe to re-run: the rollup is dropped and re-seeded from credit_transactions while writes to
+-- that table are blocked, so no transaction is missed or counted twice.
+
+BEGIN;
+
+LOCK TABLE public.credit_transactions IN SHARE MODE;
+
+DROP TRIGGER IF EXISTS on_credit_transaction_rollup ON public.credit_transactions;
+DROP TRIGGER IF EXISTS on_credit_transaction_rollup_insert ON public.credit_transactions;
+DROP TRIGGER IF EXISTS on_credit_transaction_rollup_update ON public.credit_transactions;
+DROP TRIGGER IF EXISTS on_credit_transaction_rollup_delete ON public.credit_transactions;
+DROP TABLE IF EXISTS public.platform_credit_rollup;
+
+CREATE TABLE public.platform_credit_rollup (
+  shard SMALLINT PRIMARY KEY CHECK (shard >= 0 AND shard < 16),
+  credits_issued BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE public.platform_credit_rollup ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role can manage platform credit rollup" ON public.platform_credit_rollup;
+
+CREATE POLICY "Service role can manage platform credit rollup"
+  ON public.platform_credit_rollup FOR ALL
+  TO service_role
+  USING (TRUE) WITH CHECK (TRUE);
+
+-- Seed from existing history: the whole total goes to shard 0, the other shards start at zero
+INSERT INTO public.platform_credit_rollup (shard, credits_issued, updated_at)
+SELECT s, CASE WHEN s = 0 THEN t.total ELSE 0 END, now()
+FROM generate_series(0, 15) AS s,
+  (SELECT COALESCE(SUM(delta), 0) AS total FROM public.credit_transactions WHERE delta > 0) AS t;
+
+CREATE OR REPLACE FUNCTION public.bump_platform_credit_rollup()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_change BIGINT := 0;
+  v_shard SMALLINT;
+BEGIN
+  -- Only positive deltas count as issued, so an update contributes new minus old positive parts
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    SELECT v_change + COALESCE(SUM(GREATEST(delta, 0)), 0) INTO v_change FROM new_rows;
+  END IF;
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    SELECT v_change - COALESCE(SUM(GREATEST(delta, 0)), 0) INTO v_change FROM old_rows;
+  END IF;
+
+  IF v_change <> 0 THEN
+    -- Picked once: random() in the WHERE clause would be re-evaluated for every row
+    v_shard := floor(random() * 16)::SMALLINT;
+    UPDATE public.platform_credit_rollup
+    SET credits_issued = credits_issued + v_change, updated_at = now()
+    WHERE shard = v_shard;
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE TRIGGER on_credit_transaction_rollup_insert
+  AFTER INSERT ON public.credit_transactions
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.bump_platform_credit_rollup();
+
+CREATE TRIGGER on_credit_transaction_rollup_update
+  AFTER UPDATE ON public.credit_transactions
+  REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.bump_platform_credit_rollup();
+
+CREATE TRIGGER on_credit_transaction_rollup_delete
+  AFTER DELETE ON public.credit_transactions
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION public.bump_platform_credit_rollup();
+
+COMMIT;
+
+CREATE OR REPLACE FUNCTION public.get_platform_overview()
+RETURNS jsonb AS $$
+  SELECT jsonb_build_object(
+    'total_credits_issued', COALESCE((SELECT SUM(credits_issued) FROM public.platform_credit_rollup), 0),
+    'total_credits_remaining', COALESCE((SELECT SUM(balance) FROM public.user_credits), 0),
+    'total_groq_calls', COALESCE((SELECT SUM(groq_calls) FROM public.institution_usage), 0),
+    'institution_usage', COALESCE((
+      SELECT jsonb_agg(
+        jsonb_build_object(
+          'institution_id', i.id,
+          'institution_name', i.name,
+          'credits_used', COALESCE(u.credits_used, 0),
+          'groq_calls', COALESCE(u.groq_calls, 0)
+        )
+        ORDER BY i.name
+      )
+      FROM public.institutions i
+      LEFT JOIN (
+        SELECT institution_id, SUM(credits_used) AS credits_used, SUM(groq_calls) AS groq_calls
+        FROM public.institution_usage
+        GROUP BY institution_id
+      ) u ON u.institution_id = i.id
+    ), '[]'::jsonb)
+  );
+$$ LANGUAGE sql STABLE SECURITY DEFINER;
+
+GRANT EXECUTE ON FUNCTION public.get_platform_overview() TO service_role;
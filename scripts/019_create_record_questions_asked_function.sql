@@ -0,0 +1,24 @@
+-- Record one or more asked questions for a user in a single round-trip.
+-- New hashes are inserted; existing ones get times_asked incremented atomically.
+-- Runs as the caller, so the existing interview_questions_asked RLS policies still apply.
+-- Usage: SELECT public.record_questions_asked('<user_uuid>', ARRAY['abc123'], ARRAY['Question text']);
+
+CREATE OR REPLACE FUNCTION public.record_questions_asked(
+  p_user_id uuid,
+  p_hashes text[],
+  p_texts text[]
+)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.interview_questions_asked (user_id, question_hash, question_text, is_important, times_asked, last_asked_at)
+  SELECT p_user_id, h.question_hash, h.question_text, FALSE, 1, now()
+  FROM (
+    SELECT DISTINCT ON (question_hash) question_hash, question_text
+    FROM unnest(p_hashes, p_texts) AS t(question_hash, question_text)
+  ) h
+  ON CONFLICT (user_id, question_hash)
+  DO UPDATE SET times_asked = public.interview_questions_asked.times_asked + 1, last_asked_at = now();
+END;
+$$ LANGUAGE plpgsql;
+
+GRANT EXECUTE ON FUNCTION public.record_questions_asked(uuid, text[], text[]) TO authenticated;
@@ -0,0 +1,62 @@
+-- Shared rate-limit counters for lib/api/rate-limit.ts (RATE_LIMIT_STORE=postgres).
+-- One row per key holding the current and previous fixed-window counts; the previous
+-- count is weighted by its overlap with the sliding window, matching the in-memory store.
+-- UNLOGGED: counters are disposable, so they skip WAL and are simply emptied after a crash.
+-- Usage: SELECT public.rate_limit_hit('203.0.113.7', 20, 60000);  -- true when over the limit
+
+CREATE UNLOGGED TABLE IF NOT EXISTS public.rate_limit_counters (
+  key TEXT PRIMARY KEY,
+  window_start TIMESTAMPTZ NOT NULL,
+  count INTEGER NOT NULL DEFAULT 0,
+  previous_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limit_counters_window_start ON public.rate_limit_counters(window_start);
+
+ALTER TABLE public.rate_limit_counters ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.rate_limit_hit(
+  p_key TEXT,
+  p_limit INTEGER,
+  p_window_ms INTEGER
+)
+RETURNS BOOLEAN AS $$
+DECLARE
+  v_now TIMESTAMPTZ := clock_timestamp();
+  v_window INTERVAL := make_interval(secs => p_window_ms / 1000.0);
+  v_start TIMESTAMPTZ := to_timestamp(floor(extract(epoch FROM v_now) * 1000 / p_window_ms) * p_window_ms / 1000.0);
+  v_row public.rate_limit_counters;
+  v_overlap DOUBLE PRECISION;
+BEGIN
+  -- Roll the window forward (and lock the row) in the same statement that creates it
+  INSERT INTO public.rate_limit_counters AS c (key, window_start, count, previous_count)
+  VALUES (p_key, v_start, 0, 0)
+  ON CONFLICT (key) DO UPDATE SET
+    previous_count = CASE
+      WHEN c.window_start = v_start THEN c.previous_count
+      WHEN c.window_start = v_start - v_window THEN c.count
+      ELSE 0
+    END,
+    count = CASE WHEN c.window_start = v_start THEN c.count ELSE 0 END,
+    window_start = v_start
+  RETURNING * INTO v_row;
+
+  v_overlap := 1 - extract(epoch FROM (v_now - v_start)) * 1000 / p_window_ms;
+
+  IF v_row.count + v_row.previous_count * v_overlap >= p_limit THEN
+    RETURN TRUE;
+  END IF;
+
+  UPDATE public.rate_limit_counters SET count = count + 1 WHERE key = p_key;
+
+  -- Occasionally drop keys idle for a day so the table stays the size of the active set
+  IF random() < 0.001 THEN
+    DELETE FROM public.rate_limit_counters WHERE window_start < v_now - INTERVAL '1 day';
+  END IF;
+
+  RETURN FALSE;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE ALL ON FUNCTION public.rate_limit_hit(TEXT, INTEGER, INTEGER) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.rate_limit_hit(TEXT, INTEGER, INTEGER) TO service_role;
@@ -0,0 +1,232 @@
+-- Per-user score rollups for the batch leaderboard (/api/leaderboard).
+-- One row per user with result count, running score sums, the last six overall scores
+-- (oldest first) and the lowest overall score, which is everything the leaderboard needs
+-- for averages, recent improvement and badges without reading interview_results.
+-- New results are folded in incrementally by a trigger; a rewritten or deleted result
+-- (re-analysis) recomputes that one user's row.
+-- Usage: SELECT public.get_batch_leaderboard('<batch_uuid>', 'overall', 50, 0);
+
+CREATE TABLE IF NOT EXISTS public.user_score_rollups (
+  user_id UUID PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+  result_count INTEGER NOT NULL DEFAULT 0,
+  sum_overall BIGINT NOT NULL DEFAULT 0,
+  sum_technical BIGINT NOT NULL DEFAULT 0,
+  sum_communication BIGINT NOT NULL DEFAULT 0,
+  sum_problem_solving BIGINT NOT NULL DEFAULT 0,
+  sum_confidence BIGINT NOT NULL DEFAULT 0,
+  recent_overall INTEGER[] NOT NULL DEFAULT '{}',
+  min_overall INTEGER,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE public.user_score_rollups ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Service role can manage score rollups"
+  ON public.user_score_rollups FOR ALL
+  TO service_role
+  USING (TRUE) WITH CHECK (TRUE);
+
+CREATE INDEX IF NOT EXISTS idx_interviews_user_id ON public.interviews(user_id);
+CREATE INDEX IF NOT EXISTS idx_interview_results_interview_id ON public.interview_results(interview_id);
+
+-- Rebuilds one user's rollup from their results
+CREATE OR REPLACE FUNCTION public.refresh_user_score_rollup(p_user_id UUID)
+RETURNS void AS $$
+BEGIN
+  INSERT INTO public.user_score_rollups (
+    user_id, result_count, sum_overall, sum_technical, sum_communication,
+    sum_problem_solving, sum_confidence, recent_overall, min_overall, updated_at
+  )
+  SELECT
+    p_user_id,
+    COUNT(*),
+    COALESCE(SUM(r.overall_score), 0),
+    COALESCE(SUM(COALESCE(r.technical_score, 0)), 0),
+    COALESCE(SUM(COALESCE(r.communication_score, 0)), 0),
+    COALESCE(SUM(COALESCE(r.problem_solving_score, 0)), 0),
+    COALESCE(SUM(COALESCE(r.confidence_score, 0)), 0),
+    COALESCE((
+      SELECT array_agg(recent.overall_score ORDER BY recent.created_at)
+      FROM (
+        SELECT r2.overall_score, r2.created_at
+        FROM public.interview_results r2
+        JOIN public.interviews i2 ON i2.id = r2.interview_id
+        WHERE i2.user_id = p_user_id
+        ORDER BY r2.created_at DESC
+        LIMIT 6
+      ) recent
+    ), '{}'),
+    MIN(r.overall_score),
+    now()
+  FROM public.interview_results r
+  JOIN public.interviews i ON i.id = r.interview_id
+  WHERE i.user_id = p_user_id
+  ON CONFLICT (user_id) DO UPDATE SET
+    result_count = EXCLUDED.result_count,
+    sum_overall = EXCLUDED.sum_overall,
+    sum_technical = EXCLUDED.sum_technical,
+    sum_communication = EXCLUDED.sum_communication,
+    sum_problem_solving = EXCLUDED.sum_problem_solving,
+    sum_confidence = EXCLUDED.sum_confidence,
+    recent_overall = EXCLUDED.recent_overall,
+    min_overall = EXCLUDED.min_overall,
+    updated_at = now();
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+CREATE OR REPLACE FUNCTION public.apply_interview_result_rollup()
+RETURNS TRIGGER AS $$
+DECLARE
+  v_user_id UUID;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    SELECT user_id INTO v_user_id FROM public.interviews WHERE id = OLD.interview_id;
+    IF v_user_id IS NOT NULL THEN
+      PERFORM public.refresh_user_score_rollup(v_user_id);
+    END IF;
+    RETURN OLD;
+  END IF;
+
+  SELECT user_id INTO v_user_id FROM public.interviews WHERE id = NEW.interview_id;
+  IF v_user_id IS NULL THEN
+    RETURN NEW;
+  END IF;
+
+  IF TG_OP = 'UPDATE' THEN
+    PERFORM public.refresh_user_score_rollup(v_user_id);
+    RETURN NEW;
+  END IF;
+
+  INSERT INTO public.user_score_rollups AS u (
+    user_id, result_count, sum_overall, sum_technical, sum_communication,
+    sum_problem_solving, sum_confidence, recent_overall, min_overall, updated_at
+  )
+  VALUES (
+    v_user_id, 1, NEW.overall_score, COALESCE(NEW.technical_score, 0), COALESCE(NEW.communication_score, 0),
+    COALESCE(NEW.problem_solving_score, 0), COALESCE(NEW.confidence_score, 0), ARRAY[NEW.overall_score],
+    NEW.overall_score, now()
+  )
+  ON CONFLICT (user_id) DO UPDATE SET
+    result_count = u.result_count + 1,
+    sum_overall = u.sum_overall + EXCLUDED.sum_overall,
+    sum_technical = u.sum_technical + EXCLUDED.sum_technical,
+    sum_communication = u.sum_communication + EXCLUDED.sum_communication,
+    sum_problem_solving = u.sum_problem_solving + EXCLUDED.sum_problem_solving,
+    sum_confidence = u.sum_confidence + EXCLUDED.sum_confidence,
+    recent_overall = (u.recent_overall || NEW.overall_score)[
+      GREATEST(1, cardinality(u.recent_overall) - 4):cardinality(u.recent_overall) + 1
+    ],
+    min_overall = LEAST(u.min_overall, EXCLUDED.min_overall),
+    updated_at = now();
+
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+DROP TRIGGER IF EXISTS on_interview_result_rollup ON public.interview_results;
+
+CREATE TRIGGER on_interview_result_rollup
+  AFTER INSERT OR DELETE OR UPDATE OF overall_score, technical_score, communication_score,
+    problem_solving_score, confidence_score
+  ON public.interview_results
+  FOR EACH ROW
+  EXECUTE FUNCTION public.apply_interview_result_rollup();
+
+-- Backfill from existing results (safe to re-run)
+SELECT public.refresh_user_score_rollup(user_ids.user_id)
+FROM (
+  SELECT DISTINCT i.user_id
+  FROM public.interview_results r
+  JOIN public.interviews i ON i.id = r.interview_id
+  WHERE i.user_id IS NOT NULL
+) user_ids;
+
+-- Ranked, paginated leaderboard for one batch. Only members of the batch may read it.
+-- p_sort: 'overall' | 'technical' | 'communication' | 'problemSolving'
+CREATE OR REPLACE FUNCTION public.get_batch_leaderboard(
+  p_batch_id UUID,
+  p_sort TEXT DEFAULT 'overall',
+  p_limit INTEGER DEFAULT 50,
+  p_offset INTEGER DEFAULT 0
+)
+RETURNS jsonb AS $$
+DECLARE
+  v_result jsonb;
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM public.batch_members WHERE batch_id = p_batch_id AND user_id = auth.uid()
+  ) THEN
+    RETURN jsonb_build_object('success', false, 'code', 'forbidden', 'message', 'Not a member of this batch');
+  END IF;
+
+  WITH scored AS (
+    SELECT
+      u.id,
+      COALESCE(u.name, 'Unknown') AS name,
+      u.email,
+      r.result_count,
+      ROUND(r.sum_overall::numeric / r.result_count)::int AS average_score,
+      ROUND(r.sum_technical::numeric / r.result_count)::int AS technical_score,
+      ROUND(r.sum_communication::numeric / r.result_count)::int AS communication_score,
+      ROUND(r.sum_problem_solving::numeric / r.result_count)::int AS problem_solving_score,
+      ROUND(r.sum_confidence::numeric / r.result_count)::int AS confidence_score,
+      CASE
+        WHEN cardinality(r.recent_overall) >= 6 THEN ROUND(
+          (r.recent_overall[4] + r.recent_overall[5] + r.recent_overall[6]) / 3.0
+          - (r.recent_overall[1] + r.recent_overall[2] + r.recent_overall[3]) / 3.0
+        )::int
+        ELSE 0
+      END AS recent_improvement,
+      r.min_overall
+    FROM public.batch_members bm
+    JOIN public.users u ON u.id = bm.user_id
+    JOIN public.user_score_rollups r ON r.user_id = bm.user_id
+    WHERE bm.batch_id = p_batch_id AND r.result_count > 0
+  ),
+  ranked AS (
+    SELECT
+      scored.*,
+      ROW_NUMBER() OVER (
+        ORDER BY
+          CASE p_sort
+            WHEN 'technical' THEN technical_score
+            WHEN 'communication' THEN communication_score
+            WHEN 'problemSolving' THEN problem_solving_score
+            ELSE average_score
+          END DESC,
+          average_score DESC,
+          id
+      ) AS rank
+    FROM scored
+  )
+  SELECT jsonb_build_object(
+    'success', true,
+    'total', (SELECT COUNT(*) FROM scored),
+    'members', COALESCE(jsonb_agg(
+      jsonb_build_object(
+        'id', id,
+        'name', name,
+        'email', email,
+        'rank', rank,
+        'resultCount', result_count,
+        'averageScore', average_score,
+        'technicalScore', technical_score,
+        'communicationScore', communication_score,
+        'problemSolvingScore', problem_solving_score,
+        'confidenceScore', confidence_score,
+        'recentImprovement', recent_improvement,
+        'minOverall', min_overall
+      )
+      ORDER BY rank
+    ), '[]'::jsonb)
+  )
+  INTO v_result
+  FROM (
+    SELECT * FROM ranked ORDER BY rank LIMIT LEAST(GREATEST(p_limit, 1), 200) OFFSET GREATEST(p_offset, 0)
+  ) page;
+
+  RETURN v_result;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION public.get_batch_leaderboard(UUID, TEXT, INTEGER, INTEGER) TO authenticated;
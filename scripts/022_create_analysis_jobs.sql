@@ -0,0 +1,166 @@
+-- Durable queue for post-interview analysis (lib/interview/analysis-jobs.ts).
+-- /api/interview/analyze and /api/interview/trigger-analysis enqueue a job and return 202;
+-- workers claim jobs with FOR UPDATE SKIP LOCKED so any number of them can drain the queue
+-- without double-processing. There is at most one job per interview: enqueueing an
+-- interview that is already queued or running returns the existing job.
+-- Failed attempts are retried with exponential backoff until max_attempts; a job whose
+-- worker died is reclaimed once its lease expires.
+-- Usage: SELECT * FROM public.claim_analysis_jobs('worker-1', 1, 4, 300);
+
+CREATE TABLE IF NOT EXISTS public.analysis_jobs (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  interview_id UUID NOT NULL UNIQUE REFERENCES public.interviews(id) ON DELETE CASCADE,
+  user_id UUID,
+  payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+  status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'succeeded', 'failed')),
+  attempts INTEGER NOT NULL DEFAULT 0,
+  max_attempts INTEGER NOT NULL DEFAULT 5,
+  run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  locked_at TIMESTAMP WITH TIME ZONE,
+  locked_by TEXT,
+  last_error TEXT,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  completed_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_queued ON public.analysis_jobs(run_after) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS idx_analysis_jobs_running ON public.analysis_jobs(locked_at) WHERE status = 'running';
+
+ALTER TABLE public.analysis_jobs ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own analysis jobs"
+  ON public.analysis_jobs FOR SELECT
+  USING (auth.uid() = user_id);
+
+-- Queue analysis for an interview. Returns the job and whether an existing one was reused.
+-- Queued/running jobs are reused (their payload refreshed while still queued); finished
+-- jobs are re-queued so an explicit re-analysis still works.
+CREATE OR REPLACE FUNCTION public.enqueue_analysis_job(
+  p_interview_id UUID,
+  p_user_id UUID,
+  p_payload JSONB DEFAULT '{}'::jsonb
+)
+RETURNS jsonb AS $$
+DECLARE
+  v_job_id UUID;
+  v_status TEXT;
+  v_inserted BOOLEAN;
+BEGIN
+  INSERT INTO public.analysis_jobs AS j (interview_id, user_id, payload)
+  VALUES (p_interview_id, p_user_id, COALESCE(p_payload, '{}'::jsonb))
+  ON CONFLICT (interview_id) DO UPDATE SET
+    payload = CASE WHEN j.status = 'running' THEN j.payload ELSE EXCLUDED.payload END,
+    status = CASE WHEN j.status IN ('queued', 'running') THEN j.status ELSE 'queued' END,
+    attempts = CASE WHEN j.status IN ('queued', 'running') THEN j.attempts ELSE 0 END,
+    run_after = CASE WHEN j.status IN ('queued', 'running') THEN j.run_after ELSE now() END,
+    last_error = CASE WHEN j.status IN ('queued', 'running') THEN j.last_error ELSE NULL END,
+    completed_at = CASE WHEN j.status IN ('queued', 'running') THEN j.completed_at ELSE NULL END,
+    updated_at = now()
+  RETURNING j.id, j.status, (j.xmax = 0) INTO v_job_id, v_status, v_inserted;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'jobId', v_job_id,
+    'status', v_status,
+    'deduped', NOT v_inserted
+  );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Claim up to p_limit runnable jobs for one worker, keeping at most p_max_running jobs in
+-- flight across all workers so a burst of finished interviews is smoothed into a steady
+-- rate of LLM calls. Jobs running longer than p_lease_seconds are assumed abandoned.
+CREATE OR REPLACE FUNCTION public.claim_analysis_jobs(
+  p_worker TEXT,
+  p_limit INTEGER DEFAULT 1,
+  p_max_running INTEGER DEFAULT 4,
+  p_lease_seconds INTEGER DEFAULT 300
+)
+RETURNS SETOF public.analysis_jobs AS $$
+DECLARE
+  v_lease_cutoff TIMESTAMPTZ := now() - make_interval(secs => p_lease_seconds);
+  v_slots INTEGER;
+BEGIN
+  -- Serialize claims so the in-flight count below is exact
+  PERFORM pg_advisory_xact_lock(hashtext('public.claim_analysis_jobs'));
+
+  SELECT p_max_running - COUNT(*) INTO v_slots
+  FROM public.analysis_jobs
+  WHERE status = 'running' AND locked_at >= v_lease_cutoff;
+
+  IF v_slots <= 0 THEN
+    RETURN;
+  END IF;
+
+  RETURN QUERY
+  WITH next_jobs AS (
+    SELECT c.id
+    FROM public.analysis_jobs c
+    WHERE (c.status = 'queued' AND c.run_after <= now())
+       OR (c.status = 'running' AND c.locked_at < v_lease_cutoff)
+    ORDER BY c.run_after
+    LIMIT LEAST(GREATEST(p_limit, 1), v_slots)
+    FOR UPDATE SKIP LOCKED
+  )
+  UPDATE public.analysis_jobs j SET
+    status = 'running',
+    attempts = j.attempts + 1,
+    locked_at = now(),
+    locked_by = p_worker,
+    updated_at = now()
+  FROM next_jobs
+  WHERE j.id = next_jobs.id
+  RETURNING j.*;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+-- Record the outcome of a claimed job. A failure is retried after 15s, 30s, 60s, ...
+-- (capped at 15 minutes, with jitter) until max_attempts, then marked failed.
+-- Only the worker holding the job may finish it, so a reclaimed job is not overwritten.
+CREATE OR REPLACE FUNCTION public.finish_analysis_job(
+  p_job_id UUID,
+  p_worker TEXT,
+  p_error TEXT DEFAULT NULL
+)
+RETURNS jsonb AS $$
+DECLARE
+  v_job public.analysis_jobs%ROWTYPE;
+BEGIN
+  SELECT * INTO v_job FROM public.analysis_jobs WHERE id = p_job_id FOR UPDATE;
+
+  IF v_job.id IS NULL OR v_job.status <> 'running' OR v_job.locked_by IS DISTINCT FROM p_worker THEN
+    RETURN jsonb_build_object('success', false, 'code', 'not_owner', 'message', 'Job is not held by this worker');
+  END IF;
+
+  IF p_error IS NULL THEN
+    UPDATE public.analysis_jobs SET
+      status = 'succeeded', locked_at = NULL, locked_by = NULL, last_error = NULL,
+      completed_at = now(), updated_at = now()
+    WHERE id = p_job_id;
+    RETURN jsonb_build_object('success', true, 'status', 'succeeded');
+  END IF;
+
+  IF v_job.attempts >= v_job.max_attempts THEN
+    UPDATE public.analysis_jobs SET
+      status = 'failed', locked_at = NULL, locked_by = NULL, last_error = p_error,
+      completed_at = now(), updated_at = now()
+    WHERE id = p_job_id;
+    RETURN jsonb_build_object('success', true, 'status', 'failed');
+  END IF;
+
+  UPDATE public.analysis_jobs SET
+    status = 'queued', locked_at = NULL, locked_by = NULL, last_error = p_error,
+    run_after = now() + make_interval(secs => LEAST(900, 15 * power(2, v_job.attempts - 1)) * (0.75 + random() * 0.5)),
+    updated_at = now()
+  WHERE id = p_job_id;
+  RETURN jsonb_build_object('success', true, 'status', 'queued');
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+REVOKE EXECUTE ON FUNCTION public.enqueue_analysis_job(UUID, UUID, JSONB) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.claim_analysis_jobs(TEXT, INTEGER, INTEGER, INTEGER) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.finish_analysis_job(UUID, TEXT, TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.enqueue_analysis_job(UUID, UUID, JSONB) TO service_role;
+GRANT EXECUTE ON FUNCTION public.claim_analysis_jobs(TEXT, INTEGER, INTEGER, INTEGER) TO service_role;
+GRANT EXECUTE ON FUNCTION public.finish_analysis_job(UUID, TEXT, TEXT) TO service_role;
@@ -0,0 +1,79 @@
+-- Realtime change feed for per-user live data (lib/realtime/user-store.ts).
+-- The browser opens one channel per user and listens for postgres_changes on
+-- user_credits (user_id = me) and scheduled_interviews (member_id = me), replacing
+-- the 30-second polling of /api/user/credits and /api/user/scheduled-interviews.
+-- Realtime only delivers an event to subscribers whose SELECT policies allow the row, and only
+-- when RLS is enabled on the table. scheduled_interviews had no RLS, so it is enabled here,
+-- with policies, before the table is published; otherwise any anon-key client could subscribe
+-- to every schedule. Service-role clients and the SECURITY DEFINER functions (026) bypass RLS.
+-- Policies for the user-client routes:
+--   members  read their own rows (/api/user/scheduled-interviews, schedule-result) and move
+--            them to in_progress (/api/user/start-scheduled-interview)
+--   admins   read, create, update and delete their institution's rows (/api/institution/schedule/*)
+-- Safe to re-run.
+
+-- SECURITY DEFINER so the check does not depend on the RLS settings of public.users
+CREATE OR REPLACE FUNCTION public.is_institution_admin(p_institution_id UUID)
+RETURNS BOOLEAN AS $$
+  SELECT EXISTS (
+    SELECT 1 FROM public.users
+    WHERE id = auth.uid() AND institution_id = p_institution_id AND user_type = 'institution_admin'
+  );
+$$ LANGUAGE sql STABLE SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION public.is_institution_admin(UUID) TO authenticated;
+
+ALTER TABLE public.scheduled_interviews ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Members can view their scheduled interviews" ON public.scheduled_interviews;
+CREATE POLICY "Members can view their scheduled interviews"
+  ON public.scheduled_interviews FOR SELECT
+  USING (member_id = auth.uid() OR scheduled_by_id = auth.uid());
+
+DROP POLICY IF EXISTS "Members can start their scheduled interviews" ON public.scheduled_interviews;
+CREATE POLICY "Members can start their scheduled interviews"
+  ON public.scheduled_interviews FOR UPDATE
+  USING (member_id = auth.uid())
+  WITH CHECK (member_id = auth.uid() AND status = 'in_progress');
+
+DROP POLICY IF EXISTS "Institution admins can view schedules" ON public.scheduled_interviews;
+CREATE POLICY "Institution admins can view schedules"
+  ON public.scheduled_interviews FOR SELECT
+  USING (public.is_institution_admin(institution_id));
+
+DROP POLICY IF EXISTS "Institution admins can create schedules" ON public.scheduled_interviews;
+CREATE POLICY "Institution admins can create schedules"
+  ON public.scheduled_interviews FOR INSERT
+  WITH CHECK (public.is_institution_admin(institution_id) AND scheduled_by_id = auth.uid());
+
+DROP POLICY IF EXISTS "Institution admins can update schedules" ON public.scheduled_interviews;
+CREATE POLICY "Institution admins can update schedules"
+  ON public.scheduled_interviews FOR UPDATE
+  USING (public.is_institution_admin(institution_id))
+  WITH CHECK (public.is_institution_admin(institution_id));
+
+DROP POLICY IF EXISTS "Institution admins can delete schedules" ON public.scheduled_interviews;
+CREATE POLICY "Institution admins can delete schedules"
+  ON public.scheduled_interviews FOR DELETE
+  USING (public.is_institution_admin(institution_id));
+
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+    CREATE PUBLICATION supabase_realtime;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_publication_tables
+    WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'user_credits'
+  ) THEN
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.user_credits;
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_publication_tables
+    WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = 'scheduled_interviews'
+  ) THEN
+    ALTER PUBLICATION supabase_realtime ADD TABLE public.scheduled_interviews;
+  END IF;
+END $$;
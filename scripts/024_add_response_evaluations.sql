@@ -0,0 +1,18 @@
+-- Per-question evaluations for incremental scoring (lib/interview/answer-scoring.ts).
+-- /api/interview/response scores each answer in the background right after saving it,
+-- so the final analysis only merges stored evaluations and writes a short summary.
+-- evaluation holds { verdict?, communication, technical, problem_solving, confidence,
+-- strength, improvement } for answered questions and { skipped: true } for skipped ones.
+
+ALTER TABLE public.interview_responses
+ADD COLUMN IF NOT EXISTS evaluation JSONB;
+
+ALTER TABLE public.interview_responses
+ADD COLUMN IF NOT EXISTS evaluation_status TEXT NOT NULL DEFAULT 'pending'
+  CHECK (evaluation_status IN ('pending', 'scored', 'failed'));
+
+ALTER TABLE public.interview_responses
+ADD COLUMN IF NOT EXISTS evaluated_at TIMESTAMP WITH TIME ZONE;
+
+CREATE INDEX IF NOT EXISTS idx_interview_responses_interview_id
+  ON public.interview_responses(interview_id, question_number);
@@ -0,0 +1,56 @@
+-- Institution dashboard stats in one round-trip (/api/institution/stats).
+-- Members, pending schedules, completed interviews and the average score are computed with
+-- joins and aggregates here instead of shipping member and interview id lists through
+-- PostgREST .in() filters. institution_members is covered by its UNIQUE(institution_id, user_id)
+-- index; the indexes below cover the other branches so they run as index(-only) scans.
+-- Usage: SELECT public.get_institution_stats('<institution_uuid>');
+
+CREATE INDEX IF NOT EXISTS idx_interviews_user_status_covering
+  ON public.interviews(user_id, status) INCLUDE (id, completed_at);
+
+CREATE INDEX IF NOT EXISTS idx_interview_results_interview_score
+  ON public.interview_results(interview_id) INCLUDE (overall_score);
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_interviews_institution_status
+  ON public.scheduled_interviews(institution_id, status);
+
+-- Only admins of the institution may read its stats.
+-- active_members: members with a completed interview in the last 30 days.
+CREATE OR REPLACE FUNCTION public.get_institution_stats(p_institution_id UUID)
+RETURNS jsonb AS $$
+DECLARE
+  v_result jsonb;
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM public.users
+    WHERE id = auth.uid() AND institution_id = p_institution_id AND user_type = 'institution_admin'
+  ) THEN
+    RETURN jsonb_build_object('success', false, 'code', 'forbidden', 'message', 'Not an admin of this institution');
+  END IF;
+
+  WITH completed AS (
+    SELECT i.id, i.user_id, i.completed_at, r.overall_score
+    FROM public.institution_members m
+    JOIN public.interviews i ON i.user_id = m.user_id AND i.status = 'completed'
+    LEFT JOIN public.interview_results r ON r.interview_id = i.id
+    WHERE m.institution_id = p_institution_id
+  )
+  SELECT jsonb_build_object(
+    'success', true,
+    'total_members', (SELECT COUNT(*) FROM public.institution_members WHERE institution_id = p_institution_id),
+    'scheduled_interviews', (
+      SELECT COUNT(*) FROM public.scheduled_interviews
+      WHERE institution_id = p_institution_id AND status = 'pending'
+    ),
+    'total_interviews', COUNT(DISTINCT c.id),
+    'average_score', COALESCE(ROUND(AVG(c.overall_score))::int, 0),
+    'active_members', COUNT(DISTINCT c.user_id) FILTER (WHERE c.completed_at >= now() - INTERVAL '30 days')
+  )
+  INTO v_result
+  FROM completed c;
+
+  RETURN v_result;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION public.get_institution_stats(UUID) TO authenticated;
@@ -0,0 +1,85 @@
+-- Bulk batch scheduling (/api/institution/schedule/bulk).
+-- Schedules one interview for every member of a batch in a single INSERT ... SELECT instead of
+-- one HTTP request and one insert per member. Members who already have a pending interview for
+-- the same course at the same time are skipped, so a retried or double-submitted form does not
+-- create duplicates. Returns a per-member outcome list.
+-- Usage: SELECT public.schedule_batch_interviews('<batch_uuid>', 'technical', 'intermediate', now() + interval '1 day');
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_interviews_member_date
+  ON public.scheduled_interviews(member_id, scheduled_date);
+
+CREATE OR REPLACE FUNCTION public.schedule_batch_interviews(
+  p_batch_id UUID,
+  p_course TEXT,
+  p_difficulty TEXT,
+  p_scheduled_date TIMESTAMPTZ,
+  p_deadline TIMESTAMPTZ DEFAULT NULL,
+  p_duration INTEGER DEFAULT 30
+)
+RETURNS jsonb AS $$
+DECLARE
+  v_institution_id UUID;
+  v_results jsonb;
+  v_scheduled INTEGER;
+BEGIN
+  SELECT u.institution_id INTO v_institution_id
+  FROM public.users u
+  JOIN public.batches b ON b.institution_id = u.institution_id
+  WHERE u.id = auth.uid() AND u.user_type = 'institution_admin' AND b.id = p_batch_id;
+
+  IF v_institution_id IS NULL THEN
+    RETURN jsonb_build_object('success', false, 'code', 'forbidden', 'message', 'Batch not found in your institution');
+  END IF;
+
+  IF p_deadline IS NOT NULL AND p_deadline <= p_scheduled_date THEN
+    RETURN jsonb_build_object('success', false, 'code', 'invalid_deadline', 'message', 'Deadline must be after the scheduled interview time');
+  END IF;
+
+  WITH members AS (
+    SELECT bm.user_id,
+      EXISTS (
+        SELECT 1 FROM public.scheduled_interviews s
+        WHERE s.member_id = bm.user_id
+          AND s.scheduled_date = p_scheduled_date
+          AND s.course = p_course
+          AND s.status = 'pending'
+      ) AS already_scheduled
+    FROM public.batch_members bm
+    WHERE bm.batch_id = p_batch_id
+  ),
+  inserted AS (
+    INSERT INTO public.scheduled_interviews (
+      institution_id, scheduled_by_id, member_id, batch_id, course, difficulty,
+      scheduled_date, deadline, duration, status
+    )
+    SELECT v_institution_id, auth.uid(), m.user_id, p_batch_id, p_course, p_difficulty,
+      p_scheduled_date, p_deadline, GREATEST(5, LEAST(180, COALESCE(p_duration, 30))), 'pending'
+    FROM members m
+    WHERE NOT m.already_scheduled
+    RETURNING id, member_id
+  )
+  SELECT
+    COALESCE(jsonb_agg(
+      jsonb_build_object(
+        'memberId', m.user_id,
+        'status', CASE WHEN i.id IS NOT NULL THEN 'scheduled' ELSE 'skipped' END,
+        'scheduleId', i.id,
+        'reason', CASE WHEN i.id IS NULL THEN 'already scheduled' END
+      )
+    ), '[]'::jsonb),
+    COUNT(i.id)
+  INTO v_results, v_scheduled
+  FROM members m
+  LEFT JOIN inserted i ON i.member_id = m.user_id;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'institution_id', v_institution_id,
+    'scheduled', v_scheduled,
+    'skipped', jsonb_array_length(v_results) - v_scheduled,
+    'results', v_results
+  );
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION public.schedule_batch_interviews(UUID, TEXT, TEXT, TIMESTAMPTZ, TIMESTAMPTZ, INTEGER) TO authenticated;
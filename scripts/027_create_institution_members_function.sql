@@ -0,0 +1,153 @@
+-- Paginated institution member listing with interview stats (/api/institution/members).
+-- Members are joined with their completed interviews and results and grouped once, instead of
+-- two queries per member; the covering indexes from scripts/025 keep the join index-only.
+-- Pages use keyset pagination on (sort key, user_id), so the client only receives one page
+-- at a time and later pages do not re-send earlier rows.
+-- p_sort: 'name' | 'email' | 'interviews' | 'score' | 'joined'
+-- p_cursor: the next_cursor object from the previous page ({"v": ..., "id": ...}) or NULL.
+-- Usage: SELECT public.get_institution_members('<institution_uuid>', NULL, 'name', false, 50, NULL);
+
+CREATE OR REPLACE FUNCTION public.get_institution_members(
+  p_institution_id UUID,
+  p_search TEXT DEFAULT NULL,
+  p_sort TEXT DEFAULT 'name',
+  p_desc BOOLEAN DEFAULT false,
+  p_limit INTEGER DEFAULT 50,
+  p_cursor jsonb DEFAULT NULL
+)
+RETURNS jsonb AS $$
+DECLARE
+  v_text_sort BOOLEAN := p_sort IN ('name', 'email');
+  v_pattern TEXT;
+  v_cursor_text TEXT := p_cursor->>'v';
+  v_cursor_num NUMERIC;
+  v_cursor_id UUID := (p_cursor->>'id')::uuid;
+  v_limit INTEGER := LEAST(GREATEST(COALESCE(p_limit, 50), 1), 500);
+  v_rows jsonb;
+  v_total INTEGER;
+  v_has_more BOOLEAN;
+  v_last_key jsonb;
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM public.users
+    WHERE id = auth.uid() AND institution_id = p_institution_id AND user_type = 'institution_admin'
+  ) THEN
+    RETURN jsonb_build_object('success', false, 'code', 'forbidden', 'message', 'Not an admin of this institution');
+  END IF;
+
+  IF p_sort NOT IN ('name', 'email', 'interviews', 'score', 'joined') THEN
+    RETURN jsonb_build_object('success', false, 'code', 'invalid_sort', 'message', 'Unsupported sort');
+  END IF;
+
+  IF NOT v_text_sort AND v_cursor_text IS NOT NULL THEN
+    v_cursor_num := v_cursor_text::numeric;
+  END IF;
+
+  IF COALESCE(btrim(p_search), '') <> '' THEN
+    v_pattern := '%' || replace(replace(replace(btrim(p_search), '\', '\\'), '%', '\%'), '_', '\_') || '%';
+  END IF;
+
+  WITH members AS (
+    SELECT
+      m.id AS member_row_id,
+      m.user_id,
+      m.role,
+      m.joined_at,
+      u.name,
+      u.email,
+      COUNT(i.id)::int AS total_interviews,
+      COALESCE(ROUND(AVG(r.overall_score))::int, 0) AS avg_score,
+      COALESCE(MAX(i.completed_at), u.created_at) AS last_active
+    FROM public.institution_members m
+    JOIN public.users u ON u.id = m.user_id
+    LEFT JOIN public.interviews i ON i.user_id = m.user_id AND i.status = 'completed'
+    LEFT JOIN public.interview_results r ON r.interview_id = i.id
+    WHERE m.institution_id = p_institution_id
+      AND (v_pattern IS NULL OR u.name ILIKE v_pattern OR u.email ILIKE v_pattern)
+    GROUP BY m.id, m.user_id, m.role, m.joined_at, u.name, u.email, u.created_at
+  ),
+  keyed AS (
+    SELECT
+      members.*,
+      CASE p_sort WHEN 'name' THEN lower(COALESCE(name, '')) WHEN 'email' THEN lower(COALESCE(email, '')) END AS sort_text,
+      CASE p_sort
+        WHEN 'interviews' THEN total_interviews::numeric
+        WHEN 'score' THEN avg_score::numeric
+        WHEN 'joined' THEN EXTRACT(EPOCH FROM joined_at)::numeric
+        ELSE 0
+      END AS sort_num
+    FROM members
+  ),
+  page AS (
+    SELECT *
+    FROM keyed
+    WHERE v_cursor_id IS NULL
+      OR (v_text_sort AND NOT p_desc AND (sort_text, user_id) > (v_cursor_text, v_cursor_id))
+      OR (v_text_sort AND p_desc AND (sort_text, user_id) < (v_cursor_text, v_cursor_id))
+      OR (NOT v_text_sort AND NOT p_desc AND (sort_num, user_id) > (v_cursor_num, v_cursor_id))
+      OR (NOT v_text_sort AND p_desc AND (sort_num, user_id) < (v_cursor_num, v_cursor_id))
+    ORDER BY
+      CASE WHEN v_text_sort AND NOT p_desc THEN sort_text END ASC,
+      CASE WHEN v_text_sort AND p_desc THEN sort_text END DESC,
+      CASE WHEN NOT v_text_sort AND NOT p_desc THEN sort_num END ASC,
+      CASE WHEN NOT v_text_sort AND p_desc THEN sort_num END DESC,
+      CASE WHEN NOT p_desc THEN user_id END ASC,
+      CASE WHEN p_desc THEN user_id END DESC
+    LIMIT v_limit + 1
+  ),
+  ranked AS (
+    SELECT
+      page.*,
+      ROW_NUMBER() OVER (
+        ORDER BY
+          CASE WHEN v_text_sort AND NOT p_desc THEN sort_text END ASC,
+          CASE WHEN v_text_sort AND p_desc THEN sort_text END DESC,
+          CASE WHEN NOT v_text_sort AND NOT p_desc THEN sort_num END ASC,
+          CASE WHEN NOT v_text_sort AND p_desc THEN sort_num END DESC,
+          CASE WHEN NOT p_desc THEN user_id END ASC,
+          CASE WHEN p_desc THEN user_id END DESC
+      ) AS ord
+    FROM page
+  )
+  SELECT
+    COALESCE(
+      jsonb_agg(
+        jsonb_build_object(
+          'id', user_id,
+          'memberRowId', member_row_id,
+          'name', COALESCE(name, 'No name'),
+          'email', email,
+          'role', COALESCE(role, 'member'),
+          'total_interviews', total_interviews,
+          'avg_score', avg_score,
+          'last_active', last_active,
+          'joined_at', joined_at
+        ) ORDER BY ord
+      ) FILTER (WHERE ord <= v_limit),
+      '[]'::jsonb
+    ),
+    COUNT(*) > v_limit,
+    (
+      array_agg(
+        jsonb_build_object('v', CASE WHEN v_text_sort THEN sort_text ELSE sort_num::text END, 'id', user_id)
+      ) FILTER (WHERE ord = v_limit)
+    )[1]
+  INTO v_rows, v_has_more, v_last_key
+  FROM ranked;
+
+  SELECT COUNT(*) INTO v_total
+  FROM public.institution_members m
+  JOIN public.users u ON u.id = m.user_id
+  WHERE m.institution_id = p_institution_id
+    AND (v_pattern IS NULL OR u.name ILIKE v_pattern OR u.email ILIKE v_pattern);
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'members', v_rows,
+    'total', v_total,
+    'next_cursor', CASE WHEN v_has_more THEN v_last_key END
+  );
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER SET search_path = public;
+
+GRANT EXECUTE ON FUNCTION public.get_institution_members(UUID, TEXT, TEXT, BOOLEAN, INTEGER, jsonb) TO authenticated;
@@ -0,0 +1,79 @@
+/*
+  Background worker for the interview analysis queue (scripts/022_create_analysis_jobs.sql).
+
+  Repeatedly calls POST /api/interview/analysis-jobs, which claims queued jobs with
+  SKIP LOCKED and runs them until the queue is empty. Polls again immediately while
+  there is work, and backs off to --idle-ms when the queue is empty or the app is down.
+  Run as many copies as you like; the database caps how many jobs run at once
+  (ANALYSIS_MAX_CONCURRENCY on the app).
+
+  Usage:
+    ANALYSIS_WORKER_SECRET=... node scripts/analysis_worker.js [--url http://localhost:3000] [--idle-ms 5000] [--once]
+*/
+
+require('dotenv').config({ path: '.env.local' })
+const os = require('os')
+
+function parseArgs(argv) {
+  const opts = { url: process.env.APP_URL || 'http://localhost:3000', idleMs: 5000, once: false }
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i]
+    if (arg === '--once') opts.once = true
+    else if (arg === '--url') opts.url = argv[++i]
+    else if (arg === '--idle-ms') opts.idleMs = Number(argv[++i])
+  }
+  return opts
+}
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms))
+
+async function drainOnce(url, secret, workerId) {
+  const res = await fetch(`${url}/api/interview/analysis-jobs`, {
+    method: 'POST',
+    headers: { Authorization: `Bearer ${secret}`, 'x-worker-id': workerId },
+  })
+  const body = await res.json().catch(() => ({}))
+  if (!res.ok) throw new Error(body.error || `drain returned ${res.status}`)
+  return body
+}
+
+async function main() {
+  const opts = parseArgs(process.argv.slice(2))
+  const secret = process.env.ANALYSIS_WORKER_SECRET
+  if (!secret) {
+    console.error('ANALYSIS_WORKER_SECRET is required')
+    process.exit(1)
+  }
+
+  const workerId = `worker-${os.hostname()}-${process.pid}`
+  let stopping = false
+  process.on('SIGINT', () => (stopping = true))
+  process.on('SIGTERM', () => (stopping = true))
+
+  console.log(`[analysis-worker] ${workerId} draining ${opts.url}`)
+  let failures = 0
+  while (!stopping) {
+    let processed = 0
+    try {
+      const stats = await drainOnce(opts.url, secret, workerId)
+      processed = stats.processed || 0
+      failures = 0
+      if (processed > 0) console.log('[analysis-worker]', JSON.stringify(stats))
+    } catch (err) {
+      failures++
+      console.error(`[analysis-worker] drain failed (${failures}):`, err.message)
+    }
+
+    if (opts.once) break
+    if (processed === 0) await sleep(Math.min(opts.idleMs * 2 ** Math.min(failures, 4), 60_000))
+  }
+}
+
+if (require.main === module) {
+  main().catch((err) => {
+    console.error(err)
+    process.exit(1)
+  })
+}
+
+module.exports = { drainOnce }
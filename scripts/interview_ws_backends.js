@@ -0,0 +1,195 @@
+/*
+  Backends for scripts/interview_ws_server.js.
+
+  A backend set is { stt, llm, store }:
+    stt.transcribe(pcm16: Buffer) -> Promise<string>
+    llm.streamQuestion({ interview, questionNumber, history }) -> AsyncIterable<string>
+    store.authenticate(token) -> Promise<{ id } | null>
+    store.loadInterview(token, interviewId, userId) -> Promise<interview | null>
+    store.saveResponse(token, { interviewId, question, answer, questionNumber }) -> Promise<void>
+
+  createGroqBackends() talks to Groq (Whisper + Llama) and Supabase REST.
+  createMockBackends() needs no network and is what the load test uses.
+*/
+
+const SAMPLE_RATE = 16000
+const BYTES_PER_SECOND = SAMPLE_RATE * 2 // 16-bit mono PCM, as produced by public/workers/audio-processor.js
+
+const LLM_MODEL = 'llama-3.3-70b-versatile'
+const STT_MODEL = 'whisper-large-v3-turbo'
+const HISTORY_TURNS = 4
+
+// Wraps raw 16 kHz mono PCM16 in a WAV header so Whisper accepts it as a file.
+function pcm16ToWav(pcm) {
+  const header = Buffer.alloc(44)
+  header.write('RIFF', 0)
+  header.writeUInt32LE(36 + pcm.length, 4)
+  header.write('WAVE', 8)
+  header.write('fmt ', 12)
+  header.writeUInt32LE(16, 16)
+  header.writeUInt16LE(1, 20)
+  header.writeUInt16LE(1, 22)
+  header.writeUInt32LE(SAMPLE_RATE, 24)
+  header.writeUInt32LE(BYTES_PER_SECOND, 28)
+  header.writeUInt16LE(2, 32)
+  header.writeUInt16LE(16, 34)
+  header.write('data', 36)
+  header.writeUInt32LE(pcm.length, 40)
+  return Buffer.concat([header, pcm])
+}
+
+function buildQuestionMessages({ interview, questionNumber, history }) {
+  const type = interview.interview_type || 'general'
+  const difficulty = interview.difficulty || 'intermediate'
+  const total = interview.question_count || 5
+
+  const system = `You are an experienced interviewer running a ${type} interview at ${difficulty} level.
+Ask exactly one question per turn, in plain spoken English, in at most three sentences.
+Do not number the question, add headings, or include any preamble.`
+
+  const recent = history.slice(-HISTORY_TURNS)
+  const transcript = recent.map((turn) => `Interviewer: ${turn.question}\nCandidate: ${turn.answer}`).join('\n\n')
+
+  const instruction =
+    questionNumber === 1
+      ? `This is question 1 of ${total}. Greet the candidate briefly and ask an opening question.`
+      : `This is question ${questionNumber} of ${total}. Ask a follow-up that builds on the candidate's last answer, or move to a new ${type} topic if it was complete.`
+
+  return [
+    { role: 'system', content: system },
+    { role: 'user', content: transcript ? `${transcript}\n\n${instruction}` : instruction },
+  ]
+}
+
+function createSupabaseStore({ url, anonKey }) {
+  if (!url || !anonKey) {
+    throw new Error('Missing NEXT_PUBLIC_SUPABASE_URL or NEXT_PUBLIC_SUPABASE_ANON_KEY in environment')
+  }
+
+  const headers = (token) => ({
+    apikey: anonKey,
+    Authorization: `Bearer ${token}`,
+    'Content-Type': 'application/json',
+  })
+
+  return {
+    async authenticate(token) {
+      if (!token) return null
+      const res = await fetch(`${url}/auth/v1/user`, { headers: headers(token) })
+      if (!res.ok) return null
+      const user = await res.json()
+      return user && user.id ? { id: user.id } : null
+    },
+
+    async loadInterview(token, interviewId, userId) {
+      const query = `interviews?id=eq.${encodeURIComponent(interviewId)}&user_id=eq.${encodeURIComponent(userId)}&select=id,interview_type,difficulty,question_count,status`
+      const res = await fetch(`${url}/rest/v1/${query}`, { headers: headers(token) })
+      if (!res.ok) return null
+      const rows = await res.json()
+      return rows[0] || null
+    },
+
+    async saveResponse(token, { interviewId, question, answer, questionNumber }) {
+      const res = await fetch(`${url}/rest/v1/interview_responses`, {
+        method: 'POST',
+        headers: { ...headers(token), Prefer: 'return=minimal' },
+        body: JSON.stringify({ interview_id: interviewId, question, answer, question_number: questionNumber, skipped: false }),
+      })
+      if (!res.ok) throw new Error(`Failed to save response: ${res.status} ${await res.text()}`)
+    },
+  }
+}
+
+function createGroqBackends(env = process.env) {
+  const Groq = require('groq-sdk')
+  const { toFile } = require('groq-sdk')
+  const groq = new Groq({ apiKey: env.GROQ_API_KEY })
+
+  const stt = {
+    async transcribe(pcm) {
+      const file = await toFile(pcm16ToWav(pcm), 'turn.wav', { type: 'audio/wav' })
+      const result = await groq.audio.transcriptions.create({ file, model: STT_MODEL, language: 'en' })
+      return (result.text || '').trim()
+    },
+  }
+
+  const llm = {
+    async *streamQuestion(turn) {
+      const stream = await groq.chat.completions.create({
+        model: LLM_MODEL,
+        messages: buildQuestionMessages(turn),
+        temperature: 0.8,
+        max_tokens: 200,
+        stream: true,
+      })
+      for await (const chunk of stream) {
+        const token = chunk.choices[0]?.delta?.content
+        if (token) yield token
+      }
+    },
+  }
+
+  const store = createSupabaseStore({
+    url: env.NEXT_PUBLIC_SUPABASE_URL || env.SUPABASE_URL,
+    anonKey: env.NEXT_PUBLIC_SUPABASE_ANON_KEY,
+  })
+
+  return { stt, llm, store }
+}
+
+const MOCK_WORDS = ['I', 'worked', 'on', 'a', 'service', 'that', 'handled', 'requests', 'with', 'caching', 'and', 'retries']
+const MOCK_QUESTION = 'Thanks for that. Can you walk me through a design decision you made recently, and what trade-offs you considered?'
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms))
+
+// Offline stand-ins with latencies shaped like the real services: STT cost grows with
+// audio length, and the LLM has a time-to-first-token followed by a steady token rate.
+function createMockBackends({ sttBaseMs = 120, sttPerSecondMs = 25, firstTokenMs = 250, tokenMs = 15 } = {}) {
+  const saved = []
+
+  const stt = {
+    async transcribe(pcm) {
+      const seconds = pcm.length / BYTES_PER_SECOND
+      await sleep(sttBaseMs + seconds * sttPerSecondMs)
+      const count = Math.max(1, Math.round(seconds * 2.5))
+      const words = []
+      for (let i = 0; i < count; i++) words.push(MOCK_WORDS[i % MOCK_WORDS.length])
+      return words.join(' ')
+    },
+  }
+
+  const llm = {
+    async *streamQuestion({ questionNumber }) {
+      await sleep(firstTokenMs)
+      const text = questionNumber === 1 ? 'Hi, welcome. Tell me about a project you are proud of.' : MOCK_QUESTION
+      for (const token of text.split(/(?<= )/)) {
+        yield token
+        await sleep(tokenMs)
+      }
+    },
+  }
+
+  const store = {
+    saved,
+    async authenticate(token) {
+      return { id: token || 'mock-user' }
+    },
+    async loadInterview(_token, interviewId) {
+      return { id: interviewId, interview_type: 'technical', difficulty: 'intermediate', question_count: 5, status: 'in_progress' }
+    },
+    async saveResponse(_token, response) {
+      saved.push(response)
+    },
+  }
+
+  return { stt, llm, store }
+}
+
+module.exports = {
+  BYTES_PER_SECOND,
+  buildQuestionMessages,
+  createGroqBackends,
+  createMockBackends,
+  createSupabaseStore,
+  pcm16ToWav,
+}
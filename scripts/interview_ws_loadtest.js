@@ -0,0 +1,181 @@
+/*
+  Offline load test for scripts/interview_ws_server.js.
+
+  Starts the server in-process with mock STT/LLM backends (or targets --url), opens
+  --clients concurrent interviews and plays --turns answers of --seconds of synthetic
+  audio each, then reports per-turn latencies.
+
+  Usage:
+    node scripts/interview_ws_loadtest.js [--clients 100] [--turns 3] [--seconds 4] [--speed 1] [--url ws://host:3001] [--json]
+
+  --speed 2 sends audio twice as fast as real time.
+*/
+
+const WebSocket = require('ws')
+const { WS_PATH, createInterviewServer } = require('./interview_ws_server')
+const { BYTES_PER_SECOND, createMockBackends } = require('./interview_ws_backends')
+
+const CHUNK_MS = 100
+
+function parseArgs(argv) {
+  const opts = { clients: 100, turns: 3, seconds: 4, speed: 1, url: null, json: false }
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i]
+    if (arg === '--json') opts.json = true
+    else if (arg === '--url') opts.url = argv[++i]
+    else if (arg.startsWith('--')) opts[arg.slice(2)] = Number(argv[++i])
+  }
+  return opts
+}
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms))
+
+// 16 kHz PCM16 with a tone that drops out every 400 ms, so segment cuts have pauses to find.
+function syntheticChunk(index) {
+  const samples = (BYTES_PER_SECOND / 2) * (CHUNK_MS / 1000)
+  const buf = Buffer.alloc(samples * 2)
+  const voiced = index % 4 !== 3
+  for (let i = 0; voiced && i < samples; i++) {
+    buf.writeInt16LE(Math.round(8000 * Math.sin((2 * Math.PI * 220 * i) / 16000)), i * 2)
+  }
+  return buf
+}
+
+function percentile(sorted, p) {
+  if (sorted.length === 0) return null
+  const index = Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)
+  return Math.round(sorted[Math.max(0, index)])
+}
+
+function summarize(values) {
+  const sorted = [...values].sort((a, b) => a - b)
+  return { count: sorted.length, p50: percentile(sorted, 50), p95: percentile(sorted, 95), p99: percentile(sorted, 99), max: percentile(sorted, 100) }
+}
+
+// Resolves with the next server message accepted by `match`, recording when it arrived.
+function nextMessage(ws, match) {
+  return new Promise((resolve, reject) => {
+    const onMessage = (data) => {
+      const message = JSON.parse(data.toString())
+      if (message.type === 'error') {
+        cleanup()
+        reject(new Error(message.error))
+      } else if (match(message)) {
+        cleanup()
+        resolve({ message, at: performance.now() })
+      }
+    }
+    const onClose = () => {
+      cleanup()
+      reject(new Error('connection closed'))
+    }
+    const cleanup = () => {
+      ws.off('message', onMessage)
+      ws.off('close', onClose)
+    }
+    ws.on('message', onMessage)
+    ws.on('close', onClose)
+  })
+}
+
+async function runClient(baseUrl, clientIndex, opts, metrics) {
+  const ws = new WebSocket(`${baseUrl}${WS_PATH}?interviewId=load-${clientIndex}&token=load-user-${clientIndex}`)
+  await new Promise((resolve, reject) => {
+    ws.once('open', resolve)
+    ws.once('error', reject)
+  })
+
+  try {
+    await nextMessage(ws, (m) => m.type === 'audio_end')
+    const chunks = Math.round((opts.seconds * 1000) / CHUNK_MS)
+
+    for (let turn = 0; turn < opts.turns; turn++) {
+      let partials = 0
+      const countPartial = (data) => {
+        const message = JSON.parse(data.toString())
+        if (message.type === 'transcript' && !message.final) partials++
+      }
+      ws.on('message', countPartial)
+
+      ws.send(JSON.stringify({ type: 'start_listening' }))
+      for (let i = 0; i < chunks; i++) {
+        ws.send(syntheticChunk(i))
+        await sleep(CHUNK_MS / opts.speed)
+      }
+
+      const firstToken = nextMessage(ws, (m) => m.type === 'llm_token').catch(() => null)
+      const stoppedAt = performance.now()
+      ws.send(JSON.stringify({ type: 'stop_listening' }))
+
+      const [transcript, end] = await Promise.all([
+        nextMessage(ws, (m) => m.type === 'transcript' && m.final),
+        nextMessage(ws, (m) => m.type === 'audio_end' || m.type === 'interview_complete'),
+      ])
+      metrics.finalTranscriptMs.push(transcript.at - stoppedAt)
+      const token = await Promise.race([firstToken, Promise.resolve(null)])
+      if (token) metrics.firstTokenMs.push(token.at - stoppedAt)
+      metrics.turnMs.push(end.at - stoppedAt)
+      metrics.partialsPerTurn.push(partials)
+      ws.off('message', countPartial)
+      metrics.turns++
+    }
+  } finally {
+    ws.close()
+  }
+}
+
+async function main() {
+  const opts = parseArgs(process.argv.slice(2))
+  let app = null
+  let baseUrl = opts.url
+
+  if (!baseUrl) {
+    app = createInterviewServer(createMockBackends())
+    const port = await app.listen(0)
+    baseUrl = `ws://127.0.0.1:${port}`
+  }
+
+  const metrics = { turns: 0, errors: 0, finalTranscriptMs: [], firstTokenMs: [], turnMs: [], partialsPerTurn: [] }
+  const started = performance.now()
+
+  await Promise.all(
+    Array.from({ length: opts.clients }, (_, i) =>
+      runClient(baseUrl, i, opts, metrics).catch((error) => {
+        metrics.errors++
+        if (!opts.json) console.error(`client ${i}:`, error.message)
+      }),
+    ),
+  )
+
+  const elapsedMs = performance.now() - started
+  const report = {
+    clients: opts.clients,
+    turnsPerClient: opts.turns,
+    answerSeconds: opts.seconds,
+    turns: metrics.turns,
+    errors: metrics.errors,
+    elapsedMs: Math.round(elapsedMs),
+    turnsPerSecond: Number((metrics.turns / (elapsedMs / 1000)).toFixed(2)),
+    stopToFinalTranscriptMs: summarize(metrics.finalTranscriptMs),
+    stopToFirstTokenMs: summarize(metrics.firstTokenMs),
+    stopToTurnEndMs: summarize(metrics.turnMs),
+    partialTranscriptsPerTurn: summarize(metrics.partialsPerTurn),
+    server: app ? app.stats : undefined,
+  }
+
+  if (opts.json) console.log(JSON.stringify(report, null, 2))
+  else console.table(Object.fromEntries(Object.entries(report).filter(([, v]) => typeof v !== 'object' || v === null)))
+  if (!opts.json) {
+    for (const key of ['stopToFinalTranscriptMs', 'stopToFirstTokenMs', 'stopToTurnEndMs', 'partialTranscriptsPerTurn']) {
+      console.log(key, report[key])
+    }
+  }
+
+  if (app) await app.close()
+  process.exit(metrics.errors > 0 ? 1 : 0)
+}
+
+main().catch((error) => {
+  console.error(error)
+  process.exit(1)
+})
@@ -0,0 +1,318 @@
+/*
+  Standalone WebSocket server for streaming voice interviews (hooks/use-streaming-interview.ts).
+  Runs next to `next start`, since Next route handlers cannot upgrade connections.
+
+  Usage:
+    node scripts/interview_ws_server.js [--port 3001] [--mock]
+
+  Connect to ws://host:3001/api/interview/stream?interviewId=...&token=<supabase access token>
+
+  Client -> server
+    {"type":"start_listening"}    start a new answer
+    <binary>                      16 kHz mono PCM16 audio while listening
+    {"type":"stop_listening"}     the answer is over
+  Server -> client
+    {"type":"transcript","text","final"}   partial transcripts while audio arrives, then the final one
+    {"type":"llm_token","token"}           next-question tokens as they are generated
+    {"type":"question","number","question"}
+    {"type":"audio_end"}                   the interviewer's turn is over
+    {"type":"interview_complete"}
+    {"type":"error","error"}
+
+  Audio is transcribed in segments of roughly PARTIAL_SECONDS while the candidate is still
+  speaking, so on stop_listening only the short tail is left to transcribe.
+*/
+
+try {
+  require('dotenv').config({ path: '.env.local' })
+} catch {
+  // dotenv is optional; the environment may already be populated
+}
+
+const http = require('http')
+const { WebSocketServer } = require('ws')
+const { BYTES_PER_SECOND, createGroqBackends, createMockBackends } = require('./interview_ws_backends')
+
+const WS_PATH = '/api/interview/stream'
+const PARTIAL_SECONDS = 2
+const MIN_TAIL_SECONDS = 0.2
+const MAX_ANSWER_SECONDS = 180
+const HEARTBEAT_MS = 30_000
+const FALLBACK_QUESTION = 'Tell me about a challenging situation you faced and how you approached solving it.'
+
+const FRAME_BYTES = 640 // 20 ms at 16 kHz PCM16
+
+// Picks the quietest 20 ms frame in the last half second of `pcm` so segment cuts
+// fall between words rather than through them.
+function findQuietCut(pcm) {
+  const windowStart = Math.max(0, pcm.length - BYTES_PER_SECOND / 2)
+  let bestOffset = pcm.length - (pcm.length % 2)
+  let bestEnergy = Infinity
+
+  for (let offset = windowStart - (windowStart % 2); offset + FRAME_BYTES <= pcm.length; offset += FRAME_BYTES) {
+    let energy = 0
+    for (let i = offset; i < offset + FRAME_BYTES; i += 2) energy += Math.abs(pcm.readInt16LE(i))
+    if (energy < bestEnergy) {
+      bestEnergy = energy
+      bestOffset = offset
+    }
+  }
+  return bestOffset
+}
+
+function createInterviewServer({ stt, llm, store }) {
+  const stats = { connections: 0, activeConnections: 0, turns: 0, partialTranscripts: 0, errors: 0 }
+  const server = http.createServer((req, res) => {
+    if (req.url === '/health') {
+      res.writeHead(200, { 'Content-Type': 'application/json' })
+      res.end(JSON.stringify({ ok: true, ...stats }))
+      return
+    }
+    res.writeHead(404)
+    res.end()
+  })
+  const wss = new WebSocketServer({ noServer: true, maxPayload: 1024 * 1024 })
+
+  const reject = (socket, status, reason) => {
+    socket.write(`HTTP/1.1 ${status} ${reason}\r\nConnection: close\r\nContent-Length: 0\r\n\r\n`)
+    socket.destroy()
+  }
+
+  server.on('upgrade', async (req, socket, head) => {
+    const url = new URL(req.url, 'http://localhost')
+    if (url.pathname !== WS_PATH) return reject(socket, 404, 'Not Found')
+
+    const interviewId = url.searchParams.get('interviewId')
+    const token = url.searchParams.get('token')
+    if (!interviewId) return reject(socket, 400, 'Bad Request')
+
+    try {
+      const user = await store.authenticate(token)
+      if (!user) return reject(socket, 401, 'Unauthorized')
+      const interview = await store.loadInterview(token, interviewId, user.id)
+      if (!interview) return reject(socket, 404, 'Not Found')
+
+      wss.handleUpgrade(req, socket, head, (ws) => handleConnection(ws, { token, user, interview }))
+    } catch (error) {
+      console.error('[v0] ws: upgrade failed:', error.message)
+      stats.errors++
+      reject(socket, 500, 'Internal Server Error')
+    }
+  })
+
+  function handleConnection(ws, { token, interview }) {
+    stats.connections++
+    stats.activeConnections++
+    ws.isAlive = true
+    ws.on('pong', () => {
+      ws.isAlive = true
+    })
+
+    const session = {
+      questionNumber: 1,
+      currentQuestion: '',
+      history: [],
+      listening: false,
+      busy: false,
+      chunks: [],
+      pendingBytes: 0,
+      answerBytes: 0,
+      parts: [],
+      answerId: 0,
+      inFlight: null,
+    }
+
+    const send = (message) => {
+      if (ws.readyState === ws.OPEN) ws.send(JSON.stringify(message))
+    }
+
+    const fail = (error) => {
+      stats.errors++
+      console.error('[v0] ws: turn failed:', error instanceof Error ? error.message : error)
+      send({ type: 'error', error: error instanceof Error ? error.message : String(error) })
+    }
+
+    const resetAnswer = () => {
+      session.chunks = []
+      session.pendingBytes = 0
+      session.answerBytes = 0
+      session.parts = []
+      session.answerId++
+    }
+
+    // Transcribes everything buffered so far except the audio after the quietest recent
+    // frame, which stays buffered for the next segment.
+    const transcribeSegment = () => {
+      const pcm = Buffer.concat(session.chunks)
+      const cut = findQuietCut(pcm)
+      session.chunks = cut < pcm.length ? [pcm.subarray(cut)] : []
+      session.pendingBytes = pcm.length - cut
+      const answerId = session.answerId
+
+      session.inFlight = stt
+        .transcribe(pcm.subarray(0, cut))
+        .then((text) => {
+          if (answerId !== session.answerId) return
+          if (text) session.parts.push(text)
+          stats.partialTranscripts++
+          send({ type: 'transcript', text: session.parts.join(' '), final: false })
+        })
+        .catch(fail)
+        .finally(() => {
+          session.inFlight = null
+        })
+    }
+
+    const askQuestion = async () => {
+      let text = ''
+      for await (const token of llm.streamQuestion({ interview, questionNumber: session.questionNumber, history: session.history })) {
+        text += token
+        send({ type: 'llm_token', token })
+      }
+      session.currentQuestion = text.trim() || FALLBACK_QUESTION
+      send({ type: 'question', number: session.questionNumber, question: session.currentQuestion })
+      send({ type: 'audio_end' })
+    }
+
+    const finishAnswer = async () => {
+      while (session.inFlight) await session.inFlight
+
+      const tail = Buffer.concat(session.chunks)
+      if (tail.length >= MIN_TAIL_SECONDS * BYTES_PER_SECOND) {
+        const text = await stt.transcribe(tail)
+        if (text) session.parts.push(text)
+      }
+      const answer = session.parts.join(' ').trim()
+      resetAnswer()
+      send({ type: 'transcript', text: answer, final: true })
+
+      if (!answer) {
+        // Nothing usable was heard; hand the turn back so the client listens again.
+        send({ type: 'audio_end' })
+        return
+      }
+
+      stats.turns++
+      const question = session.currentQuestion
+      session.history.push({ question, answer })
+      const saving = store.saveResponse(token, {
+        interviewId: interview.id,
+        question,
+        answer,
+        questionNumber: session.questionNumber,
+      })
+
+      if (session.questionNumber >= (interview.question_count || 5)) {
+        await saving
+        send({ type: 'interview_complete' })
+        return
+      }
+
+      session.questionNumber++
+      await Promise.all([saving, askQuestion()])
+    }
+
+    const runTurn = (work) => {
+      session.busy = true
+      work()
+        .catch(fail)
+        .finally(() => {
+          session.busy = false
+        })
+    }
+
+    ws.on('message', (data, isBinary) => {
+      if (isBinary) {
+        if (!session.listening) return
+        session.chunks.push(data)
+        session.pendingBytes += data.length
+        session.answerBytes += data.length
+        if (session.answerBytes > MAX_ANSWER_SECONDS * BYTES_PER_SECOND) {
+          session.listening = false
+          resetAnswer()
+          send({ type: 'error', error: 'Answer is too long' })
+          return
+        }
+        if (session.pendingBytes >= PARTIAL_SECONDS * BYTES_PER_SECOND && !session.inFlight) transcribeSegment()
+        return
+      }
+
+      let message
+      try {
+        message = JSON.parse(data.toString())
+      } catch {
+        send({ type: 'error', error: 'Invalid message' })
+        return
+      }
+
+      if (message.type === 'start_listening') {
+        if (session.busy) return
+        resetAnswer()
+        session.listening = true
+      } else if (message.type === 'stop_listening') {
+        if (!session.listening) return
+        session.listening = false
+        runTurn(finishAnswer)
+      }
+    })
+
+    ws.on('close', () => {
+      stats.activeConnections--
+      session.listening = false
+      resetAnswer()
+    })
+
+    runTurn(askQuestion)
+  }
+
+  const heartbeat = setInterval(() => {
+    for (const ws of wss.clients) {
+      if (!ws.isAlive) {
+        ws.terminate()
+        continue
+      }
+      ws.isAlive = false
+      ws.ping()
+    }
+  }, HEARTBEAT_MS)
+  heartbeat.unref()
+
+  return {
+    server,
+    wss,
+    stats,
+    listen(port) {
+      return new Promise((resolve) => server.listen(port, () => resolve(server.address().port)))
+    },
+    close() {
+      clearInterval(heartbeat)
+      for (const ws of wss.clients) ws.terminate()
+      return new Promise((resolve) => server.close(() => resolve()))
+    },
+  }
+}
+
+async function main() {
+  const args = process.argv.slice(2)
+  const portIndex = args.indexOf('--port')
+  const port = Number(portIndex !== -1 ? args[portIndex + 1] : process.env.INTERVIEW_WS_PORT || 3001)
+  const mock = args.includes('--mock') || process.env.INTERVIEW_WS_MOCK === '1'
+
+  const backends = mock ? createMockBackends() : createGroqBackends()
+  const app = createInterviewServer(backends)
+  const bound = await app.listen(port)
+  console.log(`[v0] Interview WebSocket server listening on :${bound}${WS_PATH}${mock ? ' (mock backends)' : ''}`)
+
+  const shutdown = () => app.close().then(() => process.exit(0))
+  process.on('SIGINT', shutdown)
+  process.on('SIGTERM', shutdown)
+}
+
+if (require.main === module) {
+  main().catch((error) => {
+    console.error(error)
+    process.exit(1)
+  })
+}
+
+module.exports = { WS_PATH, createInterviewServer, findQuietCut }
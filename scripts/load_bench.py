@@ -0,0 +1,527 @@
+"""Load and soak benchmark for the interview lifecycle and dashboard endpoints.
+
+Virtual users (VUs) loop over weighted scenarios against a running app:
+    interview    start -> (question -> turn-detection -> response) x N -> analyze -> poll -> results
+    institution  /api/institution/stats, /api/institution/members (first page)
+    super_admin  /api/super-admin/overview, /api/super-admin/users
+
+Per endpoint it reports request count, throughput, error rate (by class), p50/p95/p99 latency and
+a latency histogram. --json writes the same data so runs can be diffed; --baseline compares this
+run against a stored JSON report and exits non-zero on regressions.
+
+Interview scenarios start real interviews: they deduct credits, create rows and call Groq.
+Point the benchmark at a staging project with throwaway accounts.
+
+Accounts (any scenario without credentials is dropped from the mix):
+    candidates          --users-file users.jsonl, one {"email", "password"} or {"token"} per line
+    institution admin   BENCH_INSTITUTION_EMAIL / BENCH_INSTITUTION_PASSWORD
+    super admin         SUPER_ADMIN_EMAIL / SUPER_ADMIN_PASSWORD
+Email/password accounts sign in through Supabase (SUPABASE_URL / NEXT_PUBLIC_SUPABASE_URL and
+NEXT_PUBLIC_SUPABASE_ANON_KEY) and call the API with a Bearer token.
+
+Requires aiohttp (pip install aiohttp).
+Usage:
+    python scripts/load_bench.py --users-file users.jsonl --vus 20 --duration 120
+    python scripts/load_bench.py --mix interview=0,institution=3,super_admin=1 --vus 50 --duration 1800 \\
+        --json runs/soak.json --baseline runs/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+
+import aiohttp
+
+DEFAULT_MIX = "interview=6,institution=3,super_admin=1"
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+HISTOGRAM_BOUNDS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+SAMPLE_ANSWERS = [
+    "I would start by clarifying the requirements, then sketch the data model and the main API.",
+    "In my last project I owned the caching layer; we cut p95 latency by about forty percent.",
+    "A hash map gives constant-time lookups, so I would trade some memory for speed here.",
+    "I would add monitoring first, reproduce the issue under load and then bisect the change.",
+    "I usually break the problem into smaller steps and check each one with a quick test.",
+]
+
+
+# --- metrics -----------------------------------------------------------------------------------
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+def error_class(status, error):
+    if error == "timeout":
+        return "timeout"
+    if error:
+        return "connection"
+    if status == 429:
+        return "http_429"
+    if status >= 500:
+        return "http_5xx"
+    return "http_4xx"
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.latencies_ms = []
+        self.errors = {}
+
+    def record(self, latency_ms, status, error=None, expected=(200,)):
+        self.latencies_ms.append(latency_ms)
+        if error or status not in expected:
+            self.record_failure(error_class(status, error))
+
+    def record_failure(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def report(self, elapsed_s):
+        values = sorted(self.latencies_ms)
+        count = len(values)
+        error_count = sum(self.errors.values())
+        histogram = {}
+        lower = 0
+        for bound in HISTOGRAM_BOUNDS_MS + [None]:
+            label = f"<{bound}ms" if bound is not None else f">={lower}ms"
+            histogram[label] = sum(1 for v in values if v >= lower and (bound is None or v < bound))
+            lower = bound
+        return {
+            "requests": count,
+            "throughput_rps": round(count / elapsed_s, 3) if elapsed_s > 0 else 0,
+            "error_rate": round(error_count / count, 4) if count else 0,
+            "errors": dict(sorted(self.errors.items())),
+            "latency_ms": {
+                "min": round(values[0], 1) if values else 0,
+                "p50": round(percentile(values, 50), 1),
+                "p95": round(percentile(values, 95), 1),
+                "p99": round(percentile(values, 99), 1),
+                "max": round(values[-1], 1) if values else 0,
+                "mean": round(sum(values) / count, 1) if count else 0,
+            },
+            "histogram": histogram,
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self.endpoints = {}
+        self.scenarios = {}
+        self.started = time.monotonic()
+
+    def endpoint(self, name):
+        return self.endpoints.setdefault(name, EndpointMetrics())
+
+    def scenario(self, name):
+        return self.scenarios.setdefault(name, EndpointMetrics())
+
+    def report(self):
+        elapsed = time.monotonic() - self.started
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "endpoints": {name: m.report(elapsed) for name, m in sorted(self.endpoints.items())},
+            "scenarios": {name: m.report(elapsed) for name, m in sorted(self.scenarios.items())},
+        }
+
+
+# --- HTTP --------------------------------------------------------------------------------------
+
+
+class Client:
+    """Shared connection pool; every call is timed and recorded under an endpoint name."""
+
+    def __init__(self, session, base_url, metrics, timeout_s):
+        self.session = session
+        self.base_url = base_url
+        self.metrics = metrics
+        self.timeout = aiohttp.ClientTimeout(total=timeout_s)
+
+    async def call(self, name, method, path, account=None, json_body=None, expected=(200,)):
+        headers = {}
+        cookies = None
+        if account is not None:
+            if account.get("token"):
+                headers["Authorization"] = f"Bearer {account['token']}"
+            cookies = account.get("cookies")
+
+        started = time.perf_counter()
+        status, body, error = 0, None, None
+        try:
+            async with self.session.request(
+                method, f"{self.base_url}{path}", json=json_body, headers=headers, cookies=cookies, timeout=self.timeout
+            ) as response:
+                status = response.status
+                text = await response.text()
+                try:
+                    body = json.loads(text) if text else None
+                except ValueError:
+                    body = None
+        except asyncio.TimeoutError:
+            error = "timeout"
+        except aiohttp.ClientError as e:
+            error = type(e).__name__
+
+        self.metrics.endpoint(name).record((time.perf_counter() - started) * 1000, status, error, expected)
+        ok = error is None and status in expected
+        return ok, status, body
+
+
+async def supabase_sign_in(session, email, password):
+    url = os.environ.get("SUPABASE_URL") or os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
+    anon_key = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY") or os.environ.get("SUPABASE_ANON_KEY")
+    if not url or not anon_key:
+        raise SystemExit("SUPABASE_URL and NEXT_PUBLIC_SUPABASE_ANON_KEY are required to sign in with email/password")
+    async with session.post(
+        f"{url.rstrip('/')}/auth/v1/token?grant_type=password",
+        json={"email": email, "password": password},
+        headers={"apikey": anon_key},
+    ) as response:
+        data = await response.json(content_type=None)
+        if response.status != 200 or not data.get("access_token"):
+            raise SystemExit(f"Sign-in failed for {email}: {data.get('error_description') or data.get('msg') or response.status}")
+        return {"token": data["access_token"], "user_id": data["user"]["id"], "email": email}
+
+
+async def super_admin_sign_in(session, base_url, email, password):
+    async with session.post(f"{base_url}/api/super-admin/login", json={"email": email, "password": password}) as response:
+        data = await response.json(content_type=None)
+        if response.status != 200 or not data.get("success"):
+            raise SystemExit(f"Super admin login failed: {data.get('error') or response.status}")
+        # The session cookie is replayed explicitly so the shared cookie jar stays empty
+        return {"cookies": {key: morsel.value for key, morsel in response.cookies.items()}}
+
+
+def load_user_file(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def load_accounts(session, args):
+    accounts = {"interview": [], "institution": [], "super_admin": []}
+
+    if args.users_file:
+        for entry in load_user_file(args.users_file):
+            if entry.get("token"):
+                accounts["interview"].append({"token": entry["token"], "user_id": entry.get("user_id")})
+            else:
+                accounts["interview"].append(await supabase_sign_in(session, entry["email"], entry["password"]))
+
+    institution_email = os.environ.get("BENCH_INSTITUTION_EMAIL")
+    if institution_email:
+        accounts["institution"].append(
+            await supabase_sign_in(session, institution_email, os.environ.get("BENCH_INSTITUTION_PASSWORD", ""))
+        )
+
+    super_email = os.environ.get("SUPER_ADMIN_EMAIL")
+    if super_email:
+        accounts["super_admin"].append(
+            await super_admin_sign_in(session, args.base_url, super_email, os.environ.get("SUPER_ADMIN_PASSWORD", ""))
+        )
+
+    return accounts
+
+
+# --- scenarios ---------------------------------------------------------------------------------
+
+
+async def interview_scenario(client, account, args):
+    ok, _, body = await client.call(
+        "interview.start",
+        "POST",
+        "/api/interview/start",
+        account,
+        {
+            "interviewType": args.interview_type,
+            "userId": account.get("user_id"),
+            "userEmail": account.get("email"),
+            "duration": 15,
+            "difficulty": "intermediate",
+            "questionCount": args.questions,
+        },
+    )
+    interview_id = ((body or {}).get("interview") or {}).get("id")
+    if not ok or not interview_id:
+        return False
+
+    previous_answers = []
+    for number in range(1, args.questions + 1):
+        ok, _, body = await client.call(
+            "interview.question",
+            "POST",
+            "/api/interview/question",
+            account,
+            {
+                "interviewId": interview_id,
+                "interviewType": args.interview_type,
+                "questionNumber": number,
+                "previousAnswers": previous_answers,
+                "userId": account.get("user_id"),
+                "questionCount": args.questions,
+            },
+        )
+        if not ok:
+            return False
+        question = (body or {}).get("question") or f"Question {number}"
+        answer = random.choice(SAMPLE_ANSWERS)
+
+        await client.call(
+            "interview.turn_detection",
+            "POST",
+            "/api/interview/turn-detection",
+            account,
+            {"transcript": answer, "silenceMs": random.randint(400, 2500), "context": {"question": question}},
+        )
+        ok, _, _ = await client.call(
+            "interview.response",
+            "POST",
+            "/api/interview/response",
+            account,
+            {"interviewId": interview_id, "question": question, "answer": answer, "questionNumber": number},
+        )
+        if not ok:
+            return False
+        previous_answers.append({"question": question, "answer": answer})
+        await think(args)
+
+    ok, _, _ = await client.call(
+        "interview.analyze", "POST", "/api/interview/analyze", account, {"interviewId": interview_id}, expected=(200, 202)
+    )
+    if not ok:
+        return False
+
+    # Analysis runs from the job queue; poll like the results page does
+    deadline = time.monotonic() + args.analysis_timeout
+    status = None
+    while time.monotonic() < deadline:
+        await asyncio.sleep(args.poll_interval)
+        ok, _, body = await client.call(
+            "interview.analyze_status", "GET", f"/api/interview/analyze?interviewId={interview_id}", account
+        )
+        status = (body or {}).get("status")
+        if status in ("succeeded", "failed"):
+            break
+    if status != "succeeded":
+        return False
+
+    ok, _, _ = await client.call("interview.results", "GET", f"/api/interview/results?interviewId={interview_id}", account)
+    return ok
+
+
+async def institution_scenario(client, account, args):
+    ok_stats, _, _ = await client.call("institution.stats", "GET", "/api/institution/stats", account)
+    ok_members, _, _ = await client.call(
+        "institution.members", "GET", "/api/institution/members?limit=50&sort=score&order=desc", account
+    )
+    return ok_stats and ok_members
+
+
+async def super_admin_scenario(client, account, args):
+    ok_overview, _, _ = await client.call("super_admin.overview", "GET", "/api/super-admin/overview", account)
+    ok_users, _, _ = await client.call("super_admin.users", "GET", "/api/super-admin/users?limit=50", account)
+    return ok_overview and ok_users
+
+
+SCENARIOS = {
+    "interview": interview_scenario,
+    "institution": institution_scenario,
+    "super_admin": super_admin_scenario,
+}
+
+
+async def think(args):
+    if args.think_time > 0:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * args.think_time)
+
+
+async def virtual_user(index, client, accounts, mix, args, stop_at):
+    # Ramp-up: VUs start evenly spread over the ramp window
+    if args.ramp_up > 0:
+        await asyncio.sleep(args.ramp_up * index / max(1, args.vus))
+    names, weights = zip(*mix)
+    iterations = 0
+    while time.monotonic() < stop_at and (not args.iterations or iterations < args.iterations):
+        name = random.choices(names, weights=weights)[0]
+        pool = accounts[name]
+        account = pool[(index + iterations) % len(pool)]
+        started = time.perf_counter()
+        try:
+            failure = None if await SCENARIOS[name](client, account, args) else "failed_step"
+        except Exception as e:  # a broken scenario is a failed iteration, not a dead VU
+            failure = f"exception:{type(e).__name__}"
+        scenario = client.metrics.scenario(name)
+        scenario.latencies_ms.append((time.perf_counter() - started) * 1000)
+        if failure:
+            scenario.record_failure(failure)
+        iterations += 1
+        await think(args)
+
+
+async def report_progress(metrics, interval):
+    while True:
+        await asyncio.sleep(interval)
+        report = metrics.report()
+        total = sum(e["requests"] for e in report["endpoints"].values())
+        errors = sum(sum(e["errors"].values()) for e in report["endpoints"].values())
+        print(f"[{report['elapsed_s']:7.1f}s] {total} requests, {errors} errors", file=sys.stderr)
+
+
+# --- baseline diff -----------------------------------------------------------------------------
+
+
+def compare_to_baseline(current, baseline, max_regression):
+    """Returns (lines, regressed) comparing p95 latency and error rate per endpoint."""
+    lines = []
+    regressed = False
+    for name, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            lines.append(f"  {name:28} new endpoint")
+            continue
+        p95_now, p95_before = now["latency_ms"]["p95"], before["latency_ms"]["p95"]
+        change = (p95_now - p95_before) / p95_before if p95_before else 0.0
+        error_delta = now["error_rate"] - before["error_rate"]
+        flag = ""
+        if change > max_regression or error_delta > 0.01:
+            flag = "  REGRESSION"
+            regressed = True
+        lines.append(
+            f"  {name:28} p95 {p95_before:8.1f} -> {p95_now:8.1f}ms ({change:+.0%})"
+            f"  errors {before['error_rate']:.2%} -> {now['error_rate']:.2%}{flag}"
+        )
+    return lines, regressed
+
+
+def print_report(report, out=sys.stdout):
+    print(f"\nEndpoints ({report['elapsed_s']}s)", file=out)
+    print(f"  {'endpoint':28} {'reqs':>7} {'rps':>7} {'err%':>7} {'p50':>8} {'p95':>8} {'p99':>8}", file=out)
+    for name, e in report["endpoints"].items():
+        latency = e["latency_ms"]
+        print(
+            f"  {name:28} {e['requests']:7d} {e['throughput_rps']:7.2f} {e['error_rate']:7.2%}"
+            f" {latency['p50']:8.1f} {latency['p95']:8.1f} {latency['p99']:8.1f}",
+            file=out,
+        )
+        if e["errors"]:
+            print(f"  {'':28} errors: {', '.join(f'{k} {v}' for k, v in e['errors'].items())}", file=out)
+    print("\nScenarios (full iteration)", file=out)
+    for name, s in report["scenarios"].items():
+        print(
+            f"  {name:28} {s['requests']:7d} runs  {s['error_rate']:7.2%} failed"
+            f"  p50 {s['latency_ms']['p50'] / 1000:.1f}s  p95 {s['latency_ms']['p95'] / 1000:.1f}s",
+            file=out,
+        )
+
+
+# --- main --------------------------------------------------------------------------------------
+
+
+def parse_mix(value):
+    mix = []
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r} (expected {', '.join(SCENARIOS)})")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load/soak benchmark for interview and dashboard endpoints.")
+    parser.add_argument("--base-url", default=os.environ.get("BASE_URL", "http://localhost:3000"))
+    parser.add_argument("--users-file", help="JSONL of candidate accounts: {email, password} or {token, user_id}")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--vus", type=int, default=10, help="concurrent virtual users (default: 10)")
+    parser.add_argument("--duration", type=float, default=60, help="run time in seconds (default: 60)")
+    parser.add_argument("--ramp-up", type=float, default=10, help="seconds to start all VUs (default: 10)")
+    parser.add_argument("--iterations", type=int, default=0, help="stop each VU after N scenarios (default: no limit)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="mean pause between steps in seconds (default: 1)")
+    parser.add_argument("--questions", type=int, default=3, help="questions per interview (default: 3)")
+    parser.add_argument("--interview-type", default="technical")
+    parser.add_argument("--timeout", type=float, default=60, help="per-request timeout in seconds (default: 60)")
+    parser.add_argument("--analysis-timeout", type=float, default=180, help="max wait for analysis in seconds (default: 180)")
+    parser.add_argument("--poll-interval", type=float, default=3)
+    parser.add_argument("--json", dest="json_out", help="write the report as JSON to this path ('-' for stdout; the table then goes to stderr)")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 increase vs baseline (default: 0.2)")
+    args = parser.parse_args(argv)
+    args.base_url = args.base_url.rstrip("/")
+    return args
+
+
+async def run(args):
+    metrics = Metrics()
+    connector = aiohttp.TCPConnector(limit=max(10, args.vus * 2))
+    async with aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar()) as session:
+        accounts = await load_accounts(session, args)
+        mix = [(name, weight) for name, weight in args.mix if weight > 0 and accounts[name]]
+        for name, weight in args.mix:
+            if weight > 0 and not accounts[name]:
+                print(f"Skipping scenario {name}: no credentials configured", file=sys.stderr)
+        if not mix:
+            raise SystemExit("No runnable scenarios; see the account options in --help")
+
+        client = Client(session, args.base_url, metrics, args.timeout)
+        metrics.started = time.monotonic()
+        started_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        stop_at = metrics.started + args.duration
+        progress = asyncio.create_task(report_progress(metrics, 10))
+        try:
+            await asyncio.gather(*(virtual_user(i, client, accounts, mix, args, stop_at) for i in range(args.vus)))
+        finally:
+            progress.cancel()
+
+    report = {
+        "meta": {
+            "base_url": args.base_url,
+            "started_at": started_at,
+            "vus": args.vus,
+            "duration_s": args.duration,
+            "mix": dict(mix),
+            "questions": args.questions,
+            "interview_type": args.interview_type,
+        },
+        **metrics.report(),
+    }
+    # With --json - stdout carries only the JSON document; the human-readable output goes to stderr
+    out = sys.stderr if args.json_out == "-" else sys.stdout
+    print_report(report, out)
+
+    if args.json_out == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json_out}", file=out)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressed = compare_to_baseline(report, baseline, args.max_regression)
+        print(f"\nCompared with {args.baseline}", file=out)
+        print("\n".join(lines), file=out)
+        return 1 if regressed else 0
+    return 0
+
+
+def main():
+    args = parse_args()
+    try:
+        sys.exit(asyncio.run(run(args)))
+    except KeyboardInterrupt:
+        print("\nInterrupted.", file=sys.stderr)
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
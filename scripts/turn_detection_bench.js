@@ -0,0 +1,152 @@
+// Offline replay benchmark for end-of-turn detection.
+// Replays labelled transcript snapshots (one JSON object per line: question, transcript,
+// silenceMs, complete) through the local classifier in lib/audio/turn-end.ts and reports
+// accuracy, premature cuts and decision latency for three strategies:
+//   heuristic - local classifier only
+//   hybrid    - local classifier, LLM for low-confidence snapshots (what the app does)
+//   llm       - LLM for every snapshot (the previous behaviour)
+// LLM strategies call Groq only with --live (needs GROQ_API_KEY); otherwise LLM calls are
+// counted and charged a fixed --llm-latency-ms, and their accuracy is reported as unknown.
+//
+// Requires Node 22.18+ (loads the TypeScript module via built-in type stripping).
+// Usage: node scripts/turn_detection_bench.js [file.jsonl] [--live] [--llm-latency-ms=450] [--json]
+const fs = require('fs')
+const path = require('path')
+const { classifyTurnEnd, needsLLMCheck, buildTurnDetectionPrompt } = require('../lib/audio/turn-end.ts')
+
+const DEFAULT_FIXTURE = path.join(__dirname, 'test_files', 'turn_transcripts.jsonl')
+const GROQ_URL = 'https://api.groq.com/openai/v1/chat/completions'
+
+function parseArgs(argv) {
+  const options = { file: DEFAULT_FIXTURE, live: false, llmLatencyMs: 450, json: false }
+  for (const arg of argv) {
+    if (arg === '--live') options.live = true
+    else if (arg === '--json') options.json = true
+    else if (arg.startsWith('--llm-latency-ms=')) options.llmLatencyMs = Number(arg.split('=')[1])
+    else options.file = arg
+  }
+  return options
+}
+
+function loadSamples(file) {
+  return fs
+    .readFileSync(file, 'utf8')
+    .split('\n')
+    .filter((line) => line.trim())
+    .map((line) => JSON.parse(line))
+}
+
+async function askLLM(sample) {
+  const started = performance.now()
+  const response = await fetch(GROQ_URL, {
+    method: 'POST',
+    headers: { Authorization: `Bearer ${process.env.GROQ_API_KEY}`, 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      model: 'llama-3.3-70b-versatile',
+      temperature: 0.3,
+      messages: [{ role: 'user', content: buildTurnDetectionPrompt(sample.transcript, sample.question) }],
+    }),
+  })
+  if (!response.ok) throw new Error(`Groq returned ${response.status}`)
+  const body = await response.json()
+  const text = body.choices[0].message.content.replace(/```json\n?|\n?```/g, '').trim()
+  const analysis = JSON.parse(text)
+  return { isComplete: Boolean(analysis.isComplete), latencyMs: performance.now() - started }
+}
+
+const percentile = (sorted, p) => (sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))] : 0)
+
+function summarize(name, decisions) {
+  const scored = decisions.filter((d) => d.predicted !== null)
+  const correct = scored.filter((d) => d.predicted === d.expected).length
+  const latencies = decisions.map((d) => d.latencyMs).sort((a, b) => a - b)
+  const round = (n) => Math.round(n * 1000) / 1000
+
+  return {
+    strategy: name,
+    samples: decisions.length,
+    scored: scored.length,
+    accuracy: scored.length ? round(correct / scored.length) : null,
+    prematureCuts: scored.filter((d) => d.predicted && !d.expected).length,
+    missedEnds: scored.filter((d) => !d.predicted && d.expected).length,
+    llmCalls: decisions.filter((d) => d.usedLLM).length,
+    latencyMs: {
+      mean: round(latencies.reduce((sum, n) => sum + n, 0) / (latencies.length || 1)),
+      p50: round(percentile(latencies, 0.5)),
+      p95: round(percentile(latencies, 0.95)),
+      max: round(latencies[latencies.length - 1] || 0),
+    },
+  }
+}
+
+async function run(options) {
+  const samples = loadSamples(options.file)
+  const llmCache = new Map()
+
+  const llmDecision = async (sample, index) => {
+    if (!options.live) return { isComplete: null, latencyMs: options.llmLatencyMs }
+    if (!llmCache.has(index)) llmCache.set(index, await askLLM(sample))
+    return llmCache.get(index)
+  }
+
+  const strategies = {
+    heuristic: async (sample) => {
+      const started = performance.now()
+      const result = classifyTurnEnd(sample)
+      return { predicted: result.isComplete, latencyMs: performance.now() - started, usedLLM: false }
+    },
+    hybrid: async (sample, index) => {
+      const started = performance.now()
+      const result = classifyTurnEnd(sample)
+      const localMs = performance.now() - started
+      if (!needsLLMCheck(result)) return { predicted: result.isComplete, latencyMs: localMs, usedLLM: false }
+      const llm = await llmDecision(sample, index)
+      return { predicted: llm.isComplete, latencyMs: localMs + llm.latencyMs, usedLLM: true }
+    },
+    llm: async (sample, index) => {
+      const llm = await llmDecision(sample, index)
+      return { predicted: llm.isComplete, latencyMs: llm.latencyMs, usedLLM: true }
+    },
+  }
+
+  const report = { file: path.relative(process.cwd(), options.file), live: options.live, strategies: [] }
+  for (const [name, decide] of Object.entries(strategies)) {
+    const decisions = []
+    for (let i = 0; i < samples.length; i++) {
+      decisions.push({ expected: samples[i].complete, ...(await decide(samples[i], i)) })
+    }
+    report.strategies.push(summarize(name, decisions))
+  }
+  return report
+}
+
+if (require.main === module) {
+  const options = parseArgs(process.argv.slice(2))
+  if (options.live && !process.env.GROQ_API_KEY) {
+    console.error('--live requires GROQ_API_KEY')
+    process.exit(1)
+  }
+
+  run(options)
+    .then((report) => {
+      if (options.json) {
+        console.log(JSON.stringify(report, null, 2))
+        return
+      }
+      console.log(`Replayed ${report.strategies[0].samples} snapshots from ${report.file}${report.live ? ' (live LLM)' : ''}`)
+      for (const s of report.strategies) {
+        const accuracy = s.accuracy === null ? 'n/a' : `${(s.accuracy * 100).toFixed(1)}%`
+        console.log(
+          `${s.strategy.padEnd(10)} accuracy ${accuracy.padStart(6)} (${s.scored}/${s.samples} scored)  ` +
+            `premature ${s.prematureCuts}  missed ${s.missedEnds}  llm calls ${s.llmCalls}  ` +
+            `latency mean ${s.latencyMs.mean}ms p95 ${s.latencyMs.p95}ms`,
+        )
+      }
+    })
+    .catch((err) => {
+      console.error(err)
+      process.exit(1)
+    })
+}
+
+module.exports = { run, loadSamples, summarize }
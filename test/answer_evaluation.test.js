@@ -0,0 +1,48 @@
+const assert = require('assert')
+const { test } = require('node:test')
+require('./helpers/ts-require')
+
+const response = (n, answer, evaluation) => ({ question_number: n, question: `Question ${n}`, answer, evaluation })
+
+test('DSA merge scores verdicts per question and caps by participation', () => {
+  const { mergeEvaluations } = require('../lib/interview/answer-evaluation.ts')
+
+  const merged = mergeEvaluations(
+    [
+      response(1, 'two pointers', { verdict: 'Fully Correct', communication: 0, technical: 90, problem_solving: 90, confidence: 0 }),
+      response(2, 'hash map', { verdict: 'Partially Correct (correct approach)', communication: 0, technical: 50, problem_solving: 50, confidence: 0 }),
+      response(3, 'brute force', { verdict: 'Incorrect', communication: 0, technical: 10, problem_solving: 10, confidence: 0 }),
+      response(4, '[SKIPPED]', { skipped: true, communication: 0, technical: 0, problem_solving: 0, confidence: 0 }),
+    ],
+    'dsa-arrays',
+  )
+
+  // 25 + 12.5 of 100 points
+  assert.strictEqual(merged.dsa_score, 38)
+  assert.strictEqual(merged.overall_score, 38)
+  assert.strictEqual(merged.correct_answers_count, '1/4')
+  assert.strictEqual(merged.wrong_answers_count, 1)
+  assert.strictEqual(merged.not_answered_questions_count, 1)
+  assert.deepStrictEqual(Object.keys(merged.evaluations), ['Q1', 'Q2', 'Q3'])
+})
+
+test('soft-skill merge averages answered questions and scales by participation', () => {
+  const { mergeEvaluations, parseAnswerEvaluation } = require('../lib/interview/answer-evaluation.ts')
+
+  const scored = parseAnswerEvaluation(
+    'Here you go: {"communication": 80, "technical": 70, "problem_solving": 60, "confidence": 90, "strength": "clear STAR story",}',
+    'behavioral',
+  )
+  assert.strictEqual(scored.technical, 70)
+  assert.strictEqual(scored.strength, 'clear STAR story')
+
+  // Malformed output still yields scores for that one question
+  const partial = parseAnswerEvaluation('communication: 55, technical: 65 and then it broke', 'behavioral')
+  assert.strictEqual(partial.communication, 55)
+  assert.strictEqual(partial.confidence, 0)
+
+  const merged = mergeEvaluations([response(1, 'answer', scored), response(2, '', null)], 'behavioral')
+  assert.strictEqual(merged.answered_questions, 1)
+  assert.strictEqual(merged.communication_score, 40)
+  assert.strictEqual(merged.overall_score, 37)
+})
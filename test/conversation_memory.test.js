@@ -0,0 +1,33 @@
+const assert = require('assert')
+const { test } = require('node:test')
+require('./helpers/ts-require')
+
+const turns = (n) =>
+  Array.from({ length: n }, (_, i) => ({
+    question: `Question ${i + 1}: tell me about a system you designed and the trade-offs you made?`,
+    answer: `Answer ${i + 1}. ${'I split the service into smaller components and measured latency before and after. '.repeat(12)}`,
+  }))
+
+test('conversation memory keeps recent turns verbatim and stays within the budget', () => {
+  const { getConversationContext, estimateTokens } = require('../lib/interview/conversation-memory.ts')
+
+  const early = getConversationContext('interview-a', 'user-1', turns(4))
+  const late = getConversationContext('interview-a', 'user-1', turns(25))
+
+  assert.strictEqual(late.turnCount, 25)
+  assert.ok(late.transcript.includes('Q25: Question 25'))
+  assert.ok(late.transcript.includes('EARLIER IN THE INTERVIEW'))
+  assert.ok(late.transcript.includes('not shown'))
+  assert.ok(estimateTokens(late.transcript) <= 1300)
+  assert.ok(late.transcript.length < early.transcript.length * 2)
+  assert.strictEqual(late.previousQuestions.length, 12)
+})
+
+test('conversation memory rebuilds when the turns do not match the cached notes', () => {
+  const { getConversationContext, buildConversationContext } = require('../lib/interview/conversation-memory.ts')
+
+  getConversationContext('interview-b', 'user-1', turns(10))
+  // A different user or a shorter history must not reuse the cached notes
+  const other = getConversationContext('interview-b', 'user-2', turns(5))
+  assert.deepStrictEqual(other, buildConversationContext(turns(5)))
+})
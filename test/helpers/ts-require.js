@@ -0,0 +1,15 @@
+// Lets tests require() the lib/*.ts modules on every supported runtime. Node 22.18+ strips
+// types natively; on older versions (the repo's Node 20) each .ts file is transpiled to
+// CommonJS with the project's typescript devDependency.
+const fs = require('fs')
+
+if (!process.features.typescript && !require.extensions['.ts']) {
+  require.extensions['.ts'] = function (module, filename) {
+    const ts = require('typescript')
+    const { outputText } = ts.transpileModule(fs.readFileSync(filename, 'utf8'), {
+      fileName: filename,
+      compilerOptions: { module: ts.ModuleKind.CommonJS, target: ts.ScriptTarget.ES2022, esModuleInterop: true },
+    })
+    module._compile(outputText, filename)
+  }
+}
@@ -0,0 +1,76 @@
+const assert = require('assert')
+const { test } = require('node:test')
+const WebSocket = require('ws')
+
+const { WS_PATH, createInterviewServer } = require('../scripts/interview_ws_server')
+const { BYTES_PER_SECOND, createMockBackends } = require('../scripts/interview_ws_backends')
+
+function collect(ws) {
+  const messages = []
+  ws.on('message', (data, isBinary) => {
+    if (!isBinary) messages.push(JSON.parse(data.toString()))
+  })
+  return messages
+}
+
+async function waitFor(messages, predicate, timeoutMs = 5000) {
+  const deadline = Date.now() + timeoutMs
+  while (Date.now() < deadline) {
+    const found = messages.find(predicate)
+    if (found) return found
+    await new Promise((resolve) => setTimeout(resolve, 10))
+  }
+  throw new Error('timed out waiting for message')
+}
+
+test('interview ws server: question, partial transcripts, final transcript and next question', { timeout: 15_000 }, async () => {
+  const backends = createMockBackends({ sttBaseMs: 5, sttPerSecondMs: 1, firstTokenMs: 5, tokenMs: 0 })
+  const app = createInterviewServer(backends)
+  const port = await app.listen(0)
+
+  const ws = new WebSocket(`ws://127.0.0.1:${port}${WS_PATH}?interviewId=int-1&token=user-1`)
+  const messages = collect(ws)
+  await new Promise((resolve) => ws.once('open', resolve))
+
+  try {
+    const first = await waitFor(messages, (m) => m.type === 'question')
+    assert.equal(first.number, 1)
+    assert.ok(messages.some((m) => m.type === 'llm_token'))
+    await waitFor(messages, (m) => m.type === 'audio_end')
+    messages.length = 0
+
+    ws.send(JSON.stringify({ type: 'start_listening' }))
+    const chunk = Buffer.alloc(BYTES_PER_SECOND / 2)
+    for (let i = 0; i < 10; i++) {
+      ws.send(chunk)
+      await new Promise((resolve) => setTimeout(resolve, 20))
+    }
+    await waitFor(messages, (m) => m.type === 'transcript' && !m.final)
+    ws.send(JSON.stringify({ type: 'stop_listening' }))
+
+    const final = await waitFor(messages, (m) => m.type === 'transcript' && m.final)
+    assert.ok(final.text.length > 0)
+    const next = await waitFor(messages, (m) => m.type === 'question')
+    assert.equal(next.number, 2)
+    await waitFor(messages, (m) => m.type === 'audio_end')
+
+    assert.equal(backends.store.saved.length, 1)
+    assert.equal(backends.store.saved[0].interviewId, 'int-1')
+    assert.equal(backends.store.saved[0].answer, final.text)
+  } finally {
+    ws.close()
+    await app.close()
+  }
+})
+
+test('interview ws server: rejects upgrades without an interviewId', { timeout: 5_000 }, async () => {
+  const app = createInterviewServer(createMockBackends())
+  const port = await app.listen(0)
+  try {
+    const ws = new WebSocket(`ws://127.0.0.1:${port}${WS_PATH}`)
+    const status = await new Promise((resolve) => ws.once('unexpected-response', (_req, res) => resolve(res.statusCode)))
+    assert.equal(status, 400)
+  } finally {
+    await app.close()
+  }
+})
@@ -0,0 +1,61 @@
+const assert = require('assert')
+const { test } = require('node:test')
+require('./helpers/ts-require')
+
+function requestOf(body, chunkSize) {
+  const boundary = '----formboundary7MA4YWxk'
+  const bytes = new TextEncoder().encode(body.replaceAll('BOUNDARY', boundary))
+  let offset = 0
+  const stream = new ReadableStream({
+    pull(controller) {
+      if (offset >= bytes.length) return controller.close()
+      controller.enqueue(bytes.slice(offset, offset + chunkSize))
+      offset += chunkSize
+    },
+  })
+  return new Request('http://localhost/upload', {
+    method: 'POST',
+    headers: { 'content-type': `multipart/form-data; boundary=${boundary}` },
+    body: stream,
+    duplex: 'half',
+  })
+}
+
+const BODY = [
+  '--BOUNDARY',
+  'Content-Disposition: form-data; name="note"',
+  '',
+  'ignored field\r\n--BOUNDAR not a delimiter',
+  '--BOUNDARY',
+  'Content-Disposition: form-data; name="file"; filename="roster.csv"',
+  'Content-Type: text/csv',
+  '',
+  'name,email\r\nAda,ada@example.com\r\nGrace,grace@example.org',
+  '--BOUNDARY--',
+  '',
+].join('\r\n')
+
+test('multipart reader streams the file part whatever the chunk boundaries', async () => {
+  const { readMultipartFile } = require('../lib/api/multipart.ts')
+
+  for (const chunkSize of [1, 3, 7, 64, 4096]) {
+    const file = await readMultipartFile(requestOf(BODY, chunkSize))
+    assert.strictEqual(file.name, 'roster.csv')
+    assert.strictEqual(file.type, 'text/csv')
+    const text = new TextDecoder().decode(await file.arrayBuffer())
+    assert.strictEqual(text, 'name,email\r\nAda,ada@example.com\r\nGrace,grace@example.org', `chunk size ${chunkSize}`)
+  }
+})
+
+test('multipart reader returns null without the field and rejects other bodies', async () => {
+  const { readMultipartFile, MultipartError } = require('../lib/api/multipart.ts')
+
+  assert.strictEqual(await readMultipartFile(requestOf(BODY, 5), 'missing'), null)
+
+  const truncated = requestOf(BODY.slice(0, BODY.indexOf('Grace')), 16)
+  const file = await readMultipartFile(truncated)
+  await assert.rejects(file.arrayBuffer(), MultipartError)
+
+  const json = new Request('http://localhost/upload', { method: 'POST', body: '{}', headers: { 'content-type': 'application/json' } })
+  await assert.rejects(readMultipartFile(json), MultipartError)
+})
@@ -0,0 +1,41 @@
+const assert = require('assert')
+const { test } = require('node:test')
+require('./helpers/ts-require')
+
+function streamOf(chunks) {
+  const encoder = new TextEncoder()
+  return new ReadableStream({
+    start(controller) {
+      for (const c of chunks) controller.enqueue(typeof c === 'string' ? encoder.encode(c) : c)
+      controller.close()
+    },
+  })
+}
+
+test('roster stream scan splits lines across chunks and dedupes emails', async () => {
+  const { scanRosterStream } = require('../lib/institution/roster-parse.ts')
+
+  // "é" split across two chunks and a line break split from its carriage return
+  const bytes = new TextEncoder().encode('José,jose@example.com\r\n')
+  const scan = await scanRosterStream(
+    streamOf([
+      'name,email\r\nAda,ADA@Example.com\r',
+      '\nGrace,grace@exa',
+      'mple.org,ada@example.com\n',
+      bytes.slice(0, 4),
+      bytes.slice(4),
+      'no email here',
+    ]),
+  )
+
+  assert.deepStrictEqual([...scan.emails], ['ada@example.com', 'grace@example.org', 'jose@example.com'])
+  assert.strictEqual(scan.rows, 5)
+  assert.strictEqual(scan.duplicates, 1)
+})
+
+test('roster scan stops at the email limit', async () => {
+  const { scanRosterStream, RosterTooLargeError } = require('../lib/institution/roster-parse.ts')
+
+  const lines = Array.from({ length: 6 }, (_, i) => `user${i}@example.com\n`)
+  await assert.rejects(scanRosterStream(streamOf(lines), { limit: 5 }), RosterTooLargeError)
+})
@@ -0,0 +1,41 @@
+const assert = require('assert')
+const { test } = require('node:test')
+require('./helpers/ts-require')
+const path = require('path')
+
+test('turn-end classifier separates clear cases locally', () => {
+  const { classifyTurnEnd, needsLLMCheck } = require('../lib/audio/turn-end.ts')
+
+  const done = classifyTurnEnd({ transcript: "I've used React hooks for three years. That's about it.", silenceMs: 600 })
+  assert.strictEqual(done.isComplete, true)
+  assert.strictEqual(needsLLMCheck(done), false)
+
+  const filler = classifyTurnEnd({ transcript: 'I think the main reason is um', silenceMs: 600 })
+  assert.strictEqual(filler.isComplete, false)
+  assert.strictEqual(filler.hasActiveFiller, true)
+  assert.strictEqual(needsLLMCheck(filler), false)
+
+  const connective = classifyTurnEnd({ transcript: 'We migrated the database and', silenceMs: 900 })
+  assert.strictEqual(connective.isComplete, false)
+
+  // Silence moves an unpunctuated answer towards complete
+  const text = 'I would cache the hottest keys in memory'
+  assert.ok(
+    classifyTurnEnd({ transcript: text, silenceMs: 1500 }).probability >
+      classifyTurnEnd({ transcript: text, silenceMs: 100 }).probability,
+  )
+})
+
+test('turn-end replay benchmark: hybrid makes no premature cuts on the fixture', async () => {
+  const { run } = require('../scripts/turn_detection_bench')
+  const report = await run({
+    file: path.join(__dirname, '..', 'scripts', 'test_files', 'turn_transcripts.jsonl'),
+    live: false,
+    llmLatencyMs: 450,
+  })
+  const byName = Object.fromEntries(report.strategies.map((s) => [s.strategy, s]))
+
+  assert.ok(byName.heuristic.accuracy >= 0.9, `heuristic accuracy ${byName.heuristic.accuracy}`)
+  assert.strictEqual(byName.hybrid.prematureCuts, 0)
+  assert.ok(byName.hybrid.llmCalls < byName.llm.llmCalls / 2, 'hybrid should defer only a minority of turns to the LLM')
+})